@@ -34,10 +34,13 @@
         print('Could not load Core CLR runtime, on non-Windows OS, so falling back to Mono.')
 
 from cmdty_storage.__version__ import __version__
-from cmdty_storage.cmdty_storage import CmdtyStorage, RatchetInterp
+from cmdty_storage.cmdty_storage import CmdtyStorage, RatchetInterp, TerminalValueAtSpot, TerminalValueAtFixedPrice, \
+    TerminalInventoryTargetPenalty
 from cmdty_storage.intrinsic import intrinsic_value
 from cmdty_storage.trinomial import trinomial_value, trinomial_deltas
-from cmdty_storage.multi_factor import three_factor_seasonal_value, multi_factor_value, value_from_sims, SimulationDataReturned
+from cmdty_storage.multi_factor import three_factor_seasonal_value, multi_factor_value, value_from_sims, \
+    value_with_policy, value_curve_scenarios, value_portfolio, value_inventory_curve, SimulationDataReturned, \
+    MultiFactorExercisePolicy, MultiFactorCurveScenarioResults, MultiFactorPortfolioResults, MultiFactorInventoryCurveResults
 from cmdty_storage.multi_factor_diffusion_model import MultiFactorModel
 from cmdty_storage.multi_factor_spot_sim import MultiFactorSpotSim
 from cmdty_storage.utils import FREQ_TO_PERIOD_TYPE, numerics_provider
@@ -23,6 +23,7 @@
 
 
 import clr
+import System as dotnet
 import System.Collections.Generic as dotnet_cols_gen
 import pathlib as pl
 clr.AddReference(str(pl.Path('cmdty_storage/lib/Cmdty.Core.Simulation')))
@@ -34,6 +35,8 @@
 
 FactorCorrsType = tp.Optional[tp.Union[float, np.ndarray]]
 
+RNG_TYPES = ('mersenne_twister', 'sobol')
+
 
 def create_net_multi_factor_params(factor_corrs, factors, time_period_type):
     net_factors = dotnet_cols_gen.List[net_sim.MultiFactor.Factor[time_period_type]]()
@@ -46,6 +49,23 @@ def create_net_multi_factor_params(factor_corrs, factors, time_period_type):
     return net_multi_factor_params
 
 
+def validate_rng(rng: str):
+    if rng not in RNG_TYPES:
+        raise ValueError("rng parameter value of '{}' not supported. The allowable values are {}.".format(
+            rng, ', '.join(RNG_TYPES)))
+
+
+def create_net_sobol_model_inputs(factor_corrs, factors, time_period_type):
+    """Creates the mean reversions, factor volatility curves and correlations in the form used by the .NET Sobol
+    and streamed simulators."""
+    net_mean_reversions = dotnet.Array[dotnet.Double]([float(mean_reversion) for mean_reversion, _ in factors])
+    net_factor_vols = dotnet_cols_gen.List[dotnet_cols_gen.IReadOnlyDictionary[time_period_type, dotnet.Double]]()
+    for _, vol_curve in factors:
+        net_factor_vols.Add(utils.curve_to_net_dict(vol_curve, time_period_type))
+    net_factor_corrs = utils.as_net_array(factor_corrs)
+    return net_mean_reversions, net_factor_vols, net_factor_corrs
+
+
 def validate_multi_factor_params(  # TODO unit test validation fails
         factors: tp.Collection[tp.Tuple[float, utils.CurveType]],
         factor_corrs: FactorCorrsType) -> np.ndarray:
@@ -32,6 +32,7 @@
 from typing import Union, Callable, Iterable, Tuple, NamedTuple, Optional
 from datetime import datetime, date
 import pandas as pd
+import numpy as np
 from enum import Enum
 from cmdty_storage import utils
 import logging
@@ -49,6 +50,31 @@ class RatchetInterp(Enum):
     STEP = 2
 
 
+class TerminalValueAtSpot(NamedTuple):
+    """Terminal storage NPV equal to final inventory * (cmdty price * spot_multiple - per_unit_cost). Evaluated in .NET."""
+    spot_multiple: float = 1.0
+    per_unit_cost: float = 0.0
+
+
+class TerminalValueAtFixedPrice(NamedTuple):
+    """Terminal storage NPV equal to final inventory * price_per_unit. Evaluated in .NET."""
+    price_per_unit: float
+
+
+class TerminalInventoryTargetPenalty(NamedTuple):
+    """
+    Terminal storage NPV equal to a penalty, linear in the shortfall below, or excess above, target_inventory.
+    Evaluated in .NET.
+    """
+    target_inventory: float
+    penalty_per_unit_below: float
+    penalty_per_unit_above: float
+
+
+TerminalStorageNpvType = Union[None, Callable[[float, float], float], TerminalValueAtSpot, TerminalValueAtFixedPrice,
+                               TerminalInventoryTargetPenalty]
+
+
 RatchetsType = Optional[Union[Iterable[Tuple[str, Iterable[Tuple[float, float, float]]]],
                      Iterable[Tuple[date, Iterable[Tuple[float, float, float]]]],
                      Iterable[Tuple[datetime, Iterable[Tuple[float, float, float]]]],
@@ -71,9 +97,20 @@ def __init__(self,
                  max_withdrawal_rate: Union[None, float, int, pd.Series] = None,
                  cmdty_consumed_inject: Union[None, float, int, pd.Series] = None,
                  cmdty_consumed_withdraw: Union[None, float, int, pd.Series] = None,
-                 terminal_storage_npv: Union[None, Callable[[float, float], float]] = None,
+                 terminal_storage_npv: TerminalStorageNpvType = None,
                  inventory_loss: Union[None, float, int, pd.Series] = None,
-                 inventory_cost: Union[None, float, int, pd.Series] = None):
+                 inventory_cost: Union[None, float, int, pd.Series] = None,
+                 vectorized_terminal_storage_npv: bool = False):
+        """
+        Args:
+            terminal_storage_npv: None if the storage must be empty at the end, otherwise either a callable mapping
+                cmdty price and final inventory to the NPV of inventory left in storage at the end, or an instance of
+                one of the built-in terminal value types TerminalValueAtSpot, TerminalValueAtFixedPrice or
+                TerminalInventoryTargetPenalty, which are evaluated without calling back into Python.
+            vectorized_terminal_storage_npv: If True terminal_storage_npv is called with numpy arrays of cmdty prices
+                and final inventories, and should return a numpy array of NPVs. This greatly reduces the number of
+                calls from .NET into Python during Monte Carlo valuation.
+        """
 
         if freq not in utils.FREQ_TO_PERIOD_TYPE:
             raise ValueError("freq parameter value of '{}' not supported. The allowable values can be found in the keys of the dict curves.FREQ_TO_PERIOD_TYPE.".format(freq))
@@ -195,6 +232,19 @@ def __init__(self,
         builder = net_cs.IAddTerminalStorageState[time_period_type](builder)
         if terminal_storage_npv is None:
             builder.MustBeEmptyAtEnd()
+        elif isinstance(terminal_storage_npv, TerminalValueAtSpot):
+            net_cs.CmdtyStorageBuilderExtensions.WithTerminalInventoryValuedAtSpot[time_period_type](
+                builder, terminal_storage_npv.spot_multiple, terminal_storage_npv.per_unit_cost)
+        elif isinstance(terminal_storage_npv, TerminalValueAtFixedPrice):
+            net_cs.CmdtyStorageBuilderExtensions.WithTerminalInventoryValuedAtFixedPrice[time_period_type](
+                builder, terminal_storage_npv.price_per_unit)
+        elif isinstance(terminal_storage_npv, TerminalInventoryTargetPenalty):
+            net_cs.CmdtyStorageBuilderExtensions.WithTerminalInventoryTargetPenalty[time_period_type](
+                builder, terminal_storage_npv.target_inventory, terminal_storage_npv.penalty_per_unit_below,
+                terminal_storage_npv.penalty_per_unit_above)
+        elif vectorized_terminal_storage_npv:
+            net_cs.CmdtyStorageBuilderExtensions.WithVectorizedTerminalInventoryNpv[time_period_type](
+                builder, _wrap_vectorized_terminal_npv_for_dotnet(terminal_storage_npv))
         else:
             builder.WithTerminalInventoryNpv(dotnet.Func[dotnet.Double, dotnet.Double, dotnet.Double](terminal_storage_npv))
 
@@ -276,3 +326,12 @@ def inventory_cost(self, period, inventory) -> float:
             return net_inventory_cost[0].Amount
         return 0.0
 
+
+def _wrap_vectorized_terminal_npv_for_dotnet(py_terminal_npv_func):
+    def wrapped_function(net_cmdty_prices, net_final_inventories):
+        terminal_npvs = py_terminal_npv_func(utils.as_numpy_array(net_cmdty_prices),
+                                             utils.as_numpy_array(net_final_inventories))
+        return utils.as_net_array(np.asarray(terminal_npvs, dtype=np.float64))
+
+    net_double_array = dotnet.Array[dotnet.Double]
+    return dotnet.Func[net_double_array, net_double_array, net_double_array](wrapped_function)
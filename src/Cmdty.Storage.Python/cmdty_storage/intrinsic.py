@@ -59,7 +59,7 @@ def intrinsic_value(cmdty_storage: CmdtyStorage,
     time_period_type = utils.FREQ_TO_PERIOD_TYPE[cmdty_storage.freq]
     current_period = utils.from_datetime_like(val_date, time_period_type)
     net_forward_curve = utils.series_to_double_time_series(forward_curve, time_period_type)
-    net_settlement_rule = utils.wrap_settle_for_dotnet(settlement_rule, cmdty_storage.freq)
+    net_settlement_rule = utils.wrap_settle_table_for_dotnet(settlement_rule, cmdty_storage, current_period)
     interest_rate_time_series = utils.series_to_double_time_series(interest_rates, utils.FREQ_TO_PERIOD_TYPE['D'])
     return net_intrinsic_calc(cmdty_storage, current_period, interest_rate_time_series, inventory, net_forward_curve,
                                  net_settlement_rule, num_inventory_grid_points, numerical_tolerance, time_period_type)
@@ -91,21 +91,13 @@ def profile_to_data_frame(freq, net_profile):
     else:
         profile_start = utils.net_datetime_to_py_datetime(net_profile.Indices[0].Start)
         index = pd.period_range(start=profile_start, freq=freq, periods=net_profile.Count)
-    inventories = [None] * net_profile.Count
-    inject_withdraw_volumes = [None] * net_profile.Count
-    cmdty_consumed = [None] * net_profile.Count
-    inventory_loss = [None] * net_profile.Count
-    net_volume = [None] * net_profile.Count
-    period_pv = [None] * net_profile.Count
-    for i, profile_data in enumerate(net_profile.Data):
-        inventories[i] = profile_data.Inventory
-        inject_withdraw_volumes[i] = profile_data.InjectWithdrawVolume
-        cmdty_consumed[i] = profile_data.CmdtyConsumed
-        inventory_loss[i] = profile_data.InventoryLoss
-        net_volume[i] = profile_data.NetVolume
-        period_pv[i] = profile_data.PeriodPv
-    data_frame_data = {'inventory': inventories, 'inject_withdraw_volume': inject_withdraw_volumes,
-                       'cmdty_consumed': cmdty_consumed, 'inventory_loss': inventory_loss, 'net_volume': net_volume,
-                       'period_pv': period_pv}
+    time_period_type = utils.FREQ_TO_PERIOD_TYPE[freq]
+    columns = net_cs.PythonHelpers.StorageProfileColumns.FromProfile[time_period_type](net_profile)
+    data_frame_data = {'inventory': utils.as_numpy_array(columns.Inventory),
+                       'inject_withdraw_volume': utils.as_numpy_array(columns.InjectWithdrawVolume),
+                       'cmdty_consumed': utils.as_numpy_array(columns.CmdtyConsumed),
+                       'inventory_loss': utils.as_numpy_array(columns.InventoryLoss),
+                       'net_volume': utils.as_numpy_array(columns.NetVolume),
+                       'period_pv': utils.as_numpy_array(columns.PeriodPv)}
     data_frame = pd.DataFrame(data=data_frame_data, index=index)
     return data_frame
@@ -31,14 +31,19 @@
 import Cmdty.Core.Simulation.MultiFactor as net_mf
 clr.AddReference(str(pl.Path('cmdty_storage/lib/Cmdty.Core.Common')))
 import Cmdty.Core.Common as net_cc
+clr.AddReference(str(pl.Path('cmdty_storage/lib/Cmdty.TimeSeries')))
+import Cmdty.TimeSeries as ts
 
 import pandas as pd
+import numpy as np
 from datetime import date
 import typing as tp
 from cmdty_storage import utils, CmdtyStorage
 import cmdty_storage.intrinsic as cs_intrinsic
 from cmdty_storage import _multi_factor_common as mfc
+from cmdty_storage import multi_factor_diffusion_model as mfdm
 import logging
+import time
 from enum import Flag
 
 logger: logging.Logger = logging.getLogger('cmdty.storage.multi-factor')
@@ -71,6 +76,65 @@ class TriggerPriceProfile(tp.NamedTuple):
     withdraw_triggers: tp.List[TriggerPricePoint]
 
 
+class MultiFactorValuationTimings(tp.NamedTuple):
+    """
+    Elapsed time in seconds of each phase of a Monte Carlo valuation. The lsmc_ prefixed fields are measured by the .NET
+    LSMC valuation, with lsmc_pseudo_inverse and lsmc_regression included in lsmc_backward_induction.
+    """
+    total: float
+    input_conversion: float
+    basis_function_compile: float
+    intrinsic: float
+    lsmc_total: float
+    lsmc_regression_price_sim: float
+    lsmc_valuation_price_sim: float
+    lsmc_backward_induction: float
+    lsmc_pseudo_inverse: float
+    lsmc_regression: float
+    lsmc_forward_sim: float
+    results_conversion: float
+
+
+class MultiFactorExercisePolicy(tp.NamedTuple):
+    """
+    Exercise policy calculated by the LSMC backward induction, which value_with_policy uses to value new simulations, or an
+    updated forward curve, without performing the regression simulation and backward induction. inventory_grids is indexed
+    by period, with values being arrays of inventory grid points. regression_coeffs is indexed by the period of the
+    regressors, with values being 2-dimensional arrays with a row per next period inventory grid point and a column per
+    basis function.
+    """
+    val_date: pd.Period
+    inventory: float
+    basis_funcs: str
+    inventory_grid_spacing: float
+    inventory_grids: pd.Series
+    regression_coeffs: pd.Series
+    current_period_continuation_values: np.ndarray
+
+    def save(self, file) -> None:
+        """Saves the exercise policy to a NumPy .npz file, which can be read using MultiFactorExercisePolicy.load."""
+        columns = _exercise_policy_columns(self)
+        np.savez_compressed(file, freq=np.array(self.val_date.freqstr), val_date=np.array(str(self.val_date)),
+                            inventory=np.array(self.inventory), basis_funcs=np.array(self.basis_funcs),
+                            inventory_grid_spacing=np.array(self.inventory_grid_spacing),
+                            grids_start=np.array(str(self.inventory_grids.index[0])), **columns)
+
+    @staticmethod
+    def load(file) -> 'MultiFactorExercisePolicy':
+        """Loads an exercise policy from a NumPy .npz file created by MultiFactorExercisePolicy.save."""
+        with np.load(file, allow_pickle=False) as npz_file:
+            freq = str(npz_file['freq'])
+            return _exercise_policy_from_columns(pd.Period(str(npz_file['val_date']), freq=freq),
+                                                 float(npz_file['inventory']), str(npz_file['basis_funcs']),
+                                                 float(npz_file['inventory_grid_spacing']),
+                                                 pd.Period(str(npz_file['grids_start']), freq=freq),
+                                                 npz_file['grid_lengths'], npz_file['grid_points'],
+                                                 int(npz_file['regression_period_offset']),
+                                                 int(npz_file['num_regression_periods']),
+                                                 npz_file['regression_coeffs'],
+                                                 npz_file['current_period_continuation_values'])
+
+
 class MultiFactorValuationResults(tp.NamedTuple):
     npv: float
     val_sim_standard_error: float
@@ -89,13 +153,48 @@ class MultiFactorValuationResults(tp.NamedTuple):
     sim_net_volume: pd.DataFrame
     sim_pv: pd.DataFrame
     trigger_prices: pd.DataFrame
-    trigger_profiles: pd.Series
+    trigger_profiles: tp.Union[pd.Series, pd.DataFrame]
+    val_sim_num_sims: int
+    val_sim_convergence: pd.DataFrame
+    timings: MultiFactorValuationTimings
+    exercise_policy: MultiFactorExercisePolicy
 
     @property
     def extrinsic_npv(self):
         return self.npv - self.intrinsic_npv
 
 
+class MultiFactorCurveScenarioResults(tp.NamedTuple):
+    """
+    Results of value_curve_scenarios. npvs is indexed by scenario with columns npv and val_sim_standard_error. deltas
+    has a row per scenario and a column per delivery period.
+    """
+    npvs: pd.DataFrame
+    deltas: pd.DataFrame
+
+
+class MultiFactorPortfolioResults(tp.NamedTuple):
+    """
+    Results of value_portfolio. facility_results maps each facility key to its valuation results. npv, intrinsic_npv and
+    deltas are summed over all facilities.
+    """
+    npv: float
+    intrinsic_npv: float
+    deltas: pd.Series
+    facility_results: tp.Dict[tp.Hashable, MultiFactorValuationResults]
+
+
+class MultiFactorInventoryCurveResults(tp.NamedTuple):
+    """
+    Results of value_inventory_curve. npv, npv_inventory_derivative and val_sim_standard_error are indexed by starting
+    inventory, in ascending order. deltas has a row per starting inventory and a column per delivery period.
+    """
+    npv: pd.Series
+    npv_inventory_derivative: pd.Series
+    val_sim_standard_error: pd.Series
+    deltas: pd.DataFrame
+
+
 def three_factor_seasonal_value(cmdty_storage: CmdtyStorage,
                                 val_date: utils.TimePeriodSpecType,
                                 inventory: float,
@@ -115,24 +214,48 @@ def three_factor_seasonal_value(cmdty_storage: CmdtyStorage,
                                 num_inventory_grid_points: int = 100,
                                 numerical_tolerance: float = 1E-12,
                                 on_progress_update: tp.Optional[tp.Callable[[float], None]] = None,
-                                sim_data_returned: tp.Optional[SimulationDataReturned] = SimulationDataReturned.ALL # TODO on next major version increment change this to default to NONE
+                                sim_data_returned: tp.Optional[SimulationDataReturned] = SimulationDataReturned.ALL, # TODO on next major version increment change this to default to NONE
+                                columnar_trigger_profiles: bool = False,
+                                max_threads: tp.Optional[int] = None,
+                                rng: str = 'mersenne_twister',
+                                antithetic: bool = True,
+                                intrinsic_control_variate: bool = False,
+                                target_val_sim_standard_error: tp.Optional[float] = None,
+                                val_sim_batch_size: tp.Optional[int] = None,
+                                stream_sims: tp.Optional[bool] = None
                                 ) -> MultiFactorValuationResults:
+    mfc.validate_rng(rng)
+    stream_sims = _stream_sims_or_default(stream_sims, rng, sim_data_returned)
+    _validate_stream_sims(stream_sims, rng, sim_data_returned)
     time_period_type = utils.FREQ_TO_PERIOD_TYPE[cmdty_storage.freq]
-    net_current_period = utils.from_datetime_like(val_date, time_period_type)
-    net_multi_factor_params = net_mf.MultiFactorParameters.For3FactorSeasonal[time_period_type](
-        spot_mean_reversion, spot_vol, long_term_vol, seasonal_vol, net_current_period,
-        cmdty_storage.net_storage.EndPeriod)
     # Transform factors x_st -> x0, x_lt -> x1, x_sw -> x2
     basis_func_transformed = basis_funcs.replace('x_st', 'x0').replace('x_lt', 'x1').replace('x_sw', 'x2')
 
-    def add_multi_factor_sim(net_lsmc_params_builder):
-        net_lsmc_params_builder.SimulateWithMultiFactorModelAndMersenneTwister(net_multi_factor_params, num_sims, seed,
-                                                                               fwd_sim_seed)
+    if rng == 'sobol' or stream_sims:
+        factors, factor_corrs = mfdm._create_3_factor_season_params(cmdty_storage.freq, spot_mean_reversion, spot_vol,
+                                                                    long_term_vol, seasonal_vol, val_date,
+                                                                    cmdty_storage.end)
+        create_add_sim = _create_add_streamed_sim if stream_sims else _create_add_sobol_sim
+        add_multi_factor_sim = create_add_sim(factors, factor_corrs, time_period_type, num_sims, seed, fwd_sim_seed,
+                                              antithetic)
+    else:
+        net_current_period = utils.from_datetime_like(val_date, time_period_type)
+        net_multi_factor_params = net_mf.MultiFactorParameters.For3FactorSeasonal[time_period_type](
+            spot_mean_reversion, spot_vol, long_term_vol, seasonal_vol, net_current_period,
+            cmdty_storage.net_storage.EndPeriod)
+
+        def add_multi_factor_sim(net_lsmc_params_builder):
+            net_lsmc_params_builder.SimulateWithMultiFactorModelAndMersenneTwister(net_multi_factor_params, num_sims,
+                                                                                   seed, fwd_sim_seed, antithetic)
 
     return _net_multi_factor_calc(cmdty_storage, fwd_curve, interest_rates, inventory, add_multi_factor_sim,
                                   num_inventory_grid_points, numerical_tolerance, on_progress_update,
                                   basis_func_transformed, settlement_rule, time_period_type,
-                                  val_date, discount_deltas, extra_decisions, sim_data_returned)
+                                  val_date, discount_deltas, extra_decisions, sim_data_returned,
+                                  columnar_trigger_profiles, max_threads,
+                                  intrinsic_control_variate, target_val_sim_standard_error,
+                                  _val_sim_batch_size(num_sims, val_sim_batch_size, target_val_sim_standard_error),
+                                  None)
 
 
 def multi_factor_value(cmdty_storage: CmdtyStorage,
@@ -152,20 +275,36 @@ def multi_factor_value(cmdty_storage: CmdtyStorage,
                        num_inventory_grid_points: int = 100,
                        numerical_tolerance: float = 1E-12,
                        on_progress_update: tp.Optional[tp.Callable[[float], None]] = None,
-                       sim_data_returned: tp.Optional[SimulationDataReturned] = SimulationDataReturned.ALL # TODO on next major version increment change this to default to NONE
+                       sim_data_returned: tp.Optional[SimulationDataReturned] = SimulationDataReturned.ALL, # TODO on next major version increment change this to default to NONE
+                       columnar_trigger_profiles: bool = False,
+                       max_threads: tp.Optional[int] = None,
+                       rng: str = 'mersenne_twister',
+                       antithetic: bool = True,
+                       intrinsic_control_variate: bool = False,
+                       target_val_sim_standard_error: tp.Optional[float] = None,
+                       val_sim_batch_size: tp.Optional[int] = None,
+                       stream_sims: tp.Optional[bool] = None
                        ) -> MultiFactorValuationResults:
+    mfc.validate_rng(rng)
+    stream_sims = _stream_sims_or_default(stream_sims, rng, sim_data_returned)
+    _validate_stream_sims(stream_sims, rng, sim_data_returned)
     factor_corrs = mfc.validate_multi_factor_params(factors, factor_corrs)
     time_period_type = utils.FREQ_TO_PERIOD_TYPE[cmdty_storage.freq]
-    net_multi_factor_params = mfc.create_net_multi_factor_params(factor_corrs, factors, time_period_type)
-
-    def add_multi_factor_sim(net_lsmc_params_builder):
-        net_lsmc_params_builder.SimulateWithMultiFactorModelAndMersenneTwister(net_multi_factor_params, num_sims,
-                                                                               seed, fwd_sim_seed)
+    if stream_sims:
+        add_multi_factor_sim = _create_add_streamed_sim(factors, factor_corrs, time_period_type, num_sims, seed,
+                                                        fwd_sim_seed, antithetic)
+    else:
+        add_multi_factor_sim = _create_add_multi_factor_sim(rng, factors, factor_corrs, time_period_type, num_sims,
+                                                            seed, fwd_sim_seed, antithetic)
 
     return _net_multi_factor_calc(cmdty_storage, fwd_curve, interest_rates, inventory, add_multi_factor_sim,
                                   num_inventory_grid_points, numerical_tolerance, on_progress_update,
                                   basis_funcs, settlement_rule, time_period_type,
-                                  val_date, discount_deltas, extra_decisions, sim_data_returned)
+                                  val_date, discount_deltas, extra_decisions, sim_data_returned,
+                                  columnar_trigger_profiles, max_threads,
+                                  intrinsic_control_variate, target_val_sim_standard_error,
+                                  _val_sim_batch_size(num_sims, val_sim_batch_size, target_val_sim_standard_error),
+                                  None)
 
 
 def value_from_sims(cmdty_storage: CmdtyStorage,
@@ -184,7 +323,10 @@ def value_from_sims(cmdty_storage: CmdtyStorage,
                     num_inventory_grid_points: int = 100,
                     numerical_tolerance: float = 1E-12,
                     on_progress_update: tp.Optional[tp.Callable[[float], None]] = None,
-                    sim_data_returned: tp.Optional[SimulationDataReturned] = SimulationDataReturned.ALL # TODO on next major version increment change this to default to NONE
+                    sim_data_returned: tp.Optional[SimulationDataReturned] = SimulationDataReturned.ALL, # TODO on next major version increment change this to default to NONE
+                    columnar_trigger_profiles: bool = False,
+                    max_threads: tp.Optional[int] = None,
+                    intrinsic_control_variate: bool = False
                     ) -> MultiFactorValuationResults:
     time_period_type = utils.FREQ_TO_PERIOD_TYPE[cmdty_storage.freq]
     net_sim_results_regress = _create_net_spot_sim_results(sim_spot_regress, sim_factors_regress, time_period_type)
@@ -196,7 +338,420 @@ def add_sim_results(net_lsmc_params_builder):
     return _net_multi_factor_calc(cmdty_storage, fwd_curve, interest_rates, inventory, add_sim_results,
                                   num_inventory_grid_points, numerical_tolerance, on_progress_update,
                                   basis_funcs, settlement_rule, time_period_type,
-                                  val_date, discount_deltas, extra_decisions, sim_data_returned)
+                                  val_date, discount_deltas, extra_decisions, sim_data_returned,
+                                  columnar_trigger_profiles, max_threads,
+                                  intrinsic_control_variate, None, None, None)
+
+
+def value_with_policy(cmdty_storage: CmdtyStorage,
+                      val_date: utils.TimePeriodSpecType,
+                      inventory: float,
+                      fwd_curve: pd.Series,
+                      interest_rates: pd.Series,  # TODO change this to function which returns discount factor, i.e. delegate DF calc to caller.
+                      settlement_rule: tp.Callable[[pd.Period], date],
+                      exercise_policy: MultiFactorExercisePolicy,
+                      factors: tp.Collection[tp.Tuple[float, utils.CurveType]],
+                      factor_corrs: mfc.FactorCorrsType,
+                      num_sims: int,
+                      discount_deltas: bool,
+                      seed: tp.Optional[int] = None,
+                      extra_decisions: tp.Optional[int] = None,
+                      num_inventory_grid_points: int = 100,
+                      numerical_tolerance: float = 1E-12,
+                      on_progress_update: tp.Optional[tp.Callable[[float], None]] = None,
+                      sim_data_returned: tp.Optional[SimulationDataReturned] = SimulationDataReturned.NONE,
+                      columnar_trigger_profiles: bool = False,
+                      max_threads: tp.Optional[int] = None,
+                      rng: str = 'mersenne_twister',
+                      antithetic: bool = True,
+                      intrinsic_control_variate: bool = False
+                      ) -> MultiFactorValuationResults:
+    """
+    Values storage using the exercise policy of an earlier valuation, held in the exercise_policy field of its results,
+    performing only the forward simulation of optimal decisions on num_sims new simulations. The regression simulation
+    and backward induction are not performed. The valuation date, inventory and storage must be the same as those used to
+    calculate exercise_policy, but the forward curve, interest rates and factors can differ. num_inventory_grid_points is
+    only used by the intrinsic valuation, with the inventory grids taken from exercise_policy.
+    """
+    mfc.validate_rng(rng)
+    factor_corrs = mfc.validate_multi_factor_params(factors, factor_corrs)
+    time_period_type = utils.FREQ_TO_PERIOD_TYPE[cmdty_storage.freq]
+    if exercise_policy.val_date != pd.Period(val_date, freq=cmdty_storage.freq):
+        raise ValueError('val_date must equal the val_date of exercise_policy.')
+    if exercise_policy.inventory != inventory:
+        raise ValueError('inventory must equal the inventory of exercise_policy.')
+
+    # The valuation simulation is generated from seed, as no regression simulation is performed
+    add_multi_factor_sim = _create_add_multi_factor_sim(rng, factors, factor_corrs, time_period_type, num_sims, seed,
+                                                        None, antithetic)
+
+    return _net_multi_factor_calc(cmdty_storage, fwd_curve, interest_rates, inventory, add_multi_factor_sim,
+                                  num_inventory_grid_points, numerical_tolerance, on_progress_update,
+                                  exercise_policy.basis_funcs, settlement_rule, time_period_type,
+                                  val_date, discount_deltas, extra_decisions, sim_data_returned,
+                                  columnar_trigger_profiles, max_threads,
+                                  intrinsic_control_variate, None, None, exercise_policy)
+
+
+def value_curve_scenarios(cmdty_storage: CmdtyStorage,
+                          val_date: utils.TimePeriodSpecType,
+                          inventory: float,
+                          fwd_curve: pd.Series,
+                          scenarios: tp.Union[tp.Mapping[tp.Hashable, tp.Union[pd.Series, float]],
+                                              tp.Sequence[tp.Union[pd.Series, float]]],
+                          interest_rates: pd.Series,  # TODO change this to function which returns discount factor, i.e. delegate DF calc to caller.
+                          settlement_rule: tp.Callable[[pd.Period], date],
+                          factors: tp.Collection[tp.Tuple[float, utils.CurveType]],
+                          factor_corrs: mfc.FactorCorrsType,
+                          num_sims: int,
+                          basis_funcs: str,
+                          discount_deltas: bool,
+                          scenarios_are_shifts: bool = False,
+                          seed: tp.Optional[int] = None,
+                          fwd_sim_seed: tp.Optional[int] = None,
+                          extra_decisions: tp.Optional[int] = None,
+                          num_inventory_grid_points: int = 100,
+                          numerical_tolerance: float = 1E-12,
+                          on_progress_update: tp.Optional[tp.Callable[[float], None]] = None,
+                          max_threads: tp.Optional[int] = None,
+                          max_scenario_threads: tp.Optional[int] = None,
+                          rng: str = 'mersenne_twister',
+                          antithetic: bool = True,
+                          intrinsic_control_variate: bool = False
+                          ) -> MultiFactorCurveScenarioResults:
+    """
+    Values storage for each of a number of forward curve scenarios, simulating the multi-factor model only once. In the
+    multi-factor model the simulated spot price is the forward price multiplied by a stochastic term which doesn't depend
+    on the forward curve, so the spot simulations for fwd_curve are rescaled to each scenario curve. This gives the same
+    results as calling multi_factor_value with each scenario curve and the same seeds, but avoids repeated simulation.
+
+    scenarios is either a mapping from scenario name to scenario, or a sequence of scenarios, in which case the results
+    are indexed by position. If scenarios_are_shifts is False each scenario is a forward curve, otherwise each scenario
+    is an additive shift to fwd_curve, being either a float, or a Series which is treated as zero for periods it doesn't
+    contain. Up to max_scenario_threads scenarios, which defaults to the number of processors, are valued concurrently,
+    with each valuation using up to max_threads threads. The simulated spot prices are rescaled to each scenario one
+    period at a time, so the simulation is not copied for each concurrent scenario.
+    """
+    mfc.validate_rng(rng)
+    factor_corrs = mfc.validate_multi_factor_params(factors, factor_corrs)
+    if cmdty_storage.freq != fwd_curve.index.freqstr:
+        raise ValueError("cmdty_storage and forward_curve have different frequencies.")
+    time_period_type = utils.FREQ_TO_PERIOD_TYPE[cmdty_storage.freq]
+    if isinstance(scenarios, tp.Mapping):
+        scenario_keys = list(scenarios.keys())
+        scenario_values = list(scenarios.values())
+    else:
+        scenario_values = list(scenarios)
+        scenario_keys = list(range(len(scenario_values)))
+    if scenarios_are_shifts:
+        scenario_curves = [fwd_curve + (shift.reindex(fwd_curve.index, fill_value=0.0) if isinstance(shift, pd.Series)
+                                        else shift) for shift in scenario_values]
+    else:
+        scenario_curves = scenario_values
+    net_scenario_curves = dotnet_cols_gen.List[ts.TimeSeries[time_period_type, dotnet.Double]]()
+    for scenario_curve in scenario_curves:
+        if cmdty_storage.freq != scenario_curve.index.freqstr:
+            raise ValueError("cmdty_storage and scenario forward curve have different frequencies.")
+        net_scenario_curves.Add(utils.series_to_double_time_series(scenario_curve, time_period_type))
+
+    net_current_period = utils.from_datetime_like(val_date, time_period_type)
+    net_interest_rate_time_series = utils.series_to_double_time_series(interest_rates, utils.FREQ_TO_PERIOD_TYPE['D'])
+    logger.info('Compiling basis functions. Takes a few seconds on the first run.')
+    net_basis_functions = net_cs.BasisFunctionsBuilder.Parse(basis_funcs)
+    logger.info('Compilation of basis functions complete.')
+    net_lsmc_params_builder = _create_net_lsmc_params_builder(
+        cmdty_storage, utils.series_to_double_time_series(fwd_curve, time_period_type), net_current_period, inventory,
+        utils.wrap_settle_table_for_dotnet(settlement_rule, cmdty_storage, net_current_period),
+        net_cs.StorageHelper.CreateAct65ContCompDiscounterFromSeries(net_interest_rate_time_series),
+        num_inventory_grid_points, numerical_tolerance, net_basis_functions, SimulationDataReturned.NONE,
+        intrinsic_control_variate, utils.wrap_on_progress_for_dotnet(on_progress_update), discount_deltas,
+        extra_decisions, max_threads, time_period_type)
+    _create_add_multi_factor_sim(rng, factors, factor_corrs, time_period_type, num_sims, seed, fwd_sim_seed,
+                                 antithetic)(net_lsmc_params_builder)
+
+    logger.info('Calculating LSMC value of %d forward curve scenarios.', len(scenario_keys))
+    net_logger = utils.create_net_log_adapter(logger, net_cs.LsmcStorageValuation)
+    lsmc = net_cs.LsmcStorageValuation(net_logger)
+    if max_scenario_threads is None:
+        max_scenario_threads = dotnet.Environment.ProcessorCount
+    net_scenario_results = lsmc.CalculateForwardCurveScenarios[time_period_type](net_lsmc_params_builder,
+                                                                                net_scenario_curves, max_scenario_threads)
+    logger.info('Calculation of LSMC value of forward curve scenarios complete.')
+
+    scenario_index = pd.Index(scenario_keys, name='scenario')
+    npvs = pd.DataFrame(data={'npv': [net_results.Npv for net_results in net_scenario_results],
+                              'val_sim_standard_error': [net_results.ValuationSimStandardError
+                                                         for net_results in net_scenario_results]},
+                        index=scenario_index)
+    deltas = pd.DataFrame([utils.net_time_series_to_pandas_series(net_results.Deltas, cmdty_storage.freq)
+                           for net_results in net_scenario_results], index=scenario_index)
+    return MultiFactorCurveScenarioResults(npvs, deltas)
+
+
+def value_portfolio(storages: tp.Union[tp.Mapping[tp.Hashable, CmdtyStorage], tp.Sequence[CmdtyStorage]],
+                    inventories: tp.Union[tp.Mapping[tp.Hashable, float], tp.Sequence[float]],
+                    val_date: utils.TimePeriodSpecType,
+                    fwd_curve: pd.Series,
+                    interest_rates: pd.Series,  # TODO change this to function which returns discount factor, i.e. delegate DF calc to caller.
+                    settlement_rule: tp.Callable[[pd.Period], date],
+                    factors: tp.Collection[tp.Tuple[float, utils.CurveType]],
+                    factor_corrs: mfc.FactorCorrsType,
+                    num_sims: int,
+                    basis_funcs: str,
+                    discount_deltas: bool,
+                    seed: tp.Optional[int] = None,
+                    fwd_sim_seed: tp.Optional[int] = None,
+                    extra_decisions: tp.Optional[int] = None,
+                    num_inventory_grid_points: int = 100,
+                    numerical_tolerance: float = 1E-12,
+                    on_progress_update: tp.Optional[tp.Callable[[float], None]] = None,
+                    sim_data_returned: tp.Optional[SimulationDataReturned] = SimulationDataReturned.NONE,
+                    columnar_trigger_profiles: bool = False,
+                    max_threads: tp.Optional[int] = None,
+                    max_facility_threads: tp.Optional[int] = None,
+                    rng: str = 'mersenne_twister',
+                    antithetic: bool = True,
+                    intrinsic_control_variate: bool = False
+                    ) -> MultiFactorPortfolioResults:
+    """
+    Values a portfolio of storage facilities with the same forward curve and multi-factor model. The regression and
+    valuation simulations are generated once, over the periods spanned by all facilities, and the basis functions are
+    compiled once, with both shared by the valuations of all facilities.
+
+    storages is either a mapping from facility name to storage, or a sequence of storages, in which case results are
+    keyed by position. inventories must have the same keys, or length, as storages. Up to max_facility_threads facilities,
+    which defaults to the number of processors, are valued concurrently, with each valuation using up to max_threads
+    threads. The timings of each facility include the shared input conversion and basis function compilation.
+    """
+    mfc.validate_rng(rng)
+    factor_corrs = mfc.validate_multi_factor_params(factors, factor_corrs)
+    if isinstance(storages, tp.Mapping):
+        facility_keys = list(storages.keys())
+        if not isinstance(inventories, tp.Mapping) or set(inventories.keys()) != set(facility_keys):
+            raise ValueError('inventories must have the same keys as storages.')
+        facility_inventories = [inventories[key] for key in facility_keys]
+    else:
+        facility_keys = list(range(len(storages)))
+        facility_inventories = list(inventories)
+        if len(facility_inventories) != len(facility_keys):
+            raise ValueError('inventories must have the same length as storages.')
+    facility_storages = [storages[key] for key in facility_keys]
+    if len(facility_storages) == 0:
+        raise ValueError('storages cannot be empty.')
+    freq = facility_storages[0].freq
+    if any(cmdty_storage.freq != freq for cmdty_storage in facility_storages):
+        raise ValueError('All storages must have the same frequency.')
+    if freq != fwd_curve.index.freqstr:
+        raise ValueError("storages and forward_curve have different frequencies.")
+    start_time = time.perf_counter()
+    time_period_type = utils.FREQ_TO_PERIOD_TYPE[freq]
+    net_forward_curve = utils.series_to_double_time_series(fwd_curve, time_period_type)
+    net_current_period = utils.from_datetime_like(val_date, time_period_type)
+    net_interest_rate_time_series = utils.series_to_double_time_series(interest_rates, utils.FREQ_TO_PERIOD_TYPE['D'])
+    net_discount_func = net_cs.StorageHelper.CreateAct65ContCompDiscounterFromSeries(net_interest_rate_time_series)
+    net_settlement_rules = [utils.wrap_settle_table_for_dotnet(settlement_rule, cmdty_storage, net_current_period)
+                            for cmdty_storage in facility_storages]
+    input_conversion_time = time.perf_counter() - start_time
+
+    logger.info('Compiling basis functions. Takes a few seconds on the first run.')
+    basis_function_compile_start_time = time.perf_counter()
+    net_basis_functions = net_cs.BasisFunctionsBuilder.Parse(basis_funcs)
+    logger.info('Compilation of basis functions complete.')
+    basis_function_compile_time = time.perf_counter() - basis_function_compile_start_time
+
+    logger.info('Calculating intrinsic value of %d facilities.', len(facility_keys))
+    intrinsic_results = []
+    intrinsic_times = []
+    for cmdty_storage, inventory, net_settlement_rule in zip(facility_storages, facility_inventories,
+                                                             net_settlement_rules):
+        intrinsic_start_time = time.perf_counter()
+        intrinsic_results.append(cs_intrinsic.net_intrinsic_calc(cmdty_storage, net_current_period,
+                                                                 net_interest_rate_time_series, inventory,
+                                                                 net_forward_curve, net_settlement_rule,
+                                                                 num_inventory_grid_points, numerical_tolerance,
+                                                                 time_period_type))
+        intrinsic_times.append(time.perf_counter() - intrinsic_start_time)
+    logger.info('Calculation of intrinsic value complete.')
+
+    if sim_data_returned is None:
+        sim_data_returned = SimulationDataReturned.NONE
+    net_facility_builders = net_cs.PythonHelpers.ObjectFactory.CreateLsmcValuationParamsBuilderList[time_period_type]()
+    for cmdty_storage, inventory, net_settlement_rule in zip(facility_storages, facility_inventories,
+                                                             net_settlement_rules):
+        net_facility_builders.Add(_create_net_lsmc_params_builder(
+            cmdty_storage, net_forward_curve, net_current_period, inventory, net_settlement_rule, net_discount_func,
+            num_inventory_grid_points, numerical_tolerance, net_basis_functions, sim_data_returned,
+            intrinsic_control_variate, None, discount_deltas, extra_decisions, max_threads, time_period_type))
+    # Progress is reported by CalculatePortfolio using the first builder, whose simulation generators are used for all
+    net_on_progress = utils.wrap_on_progress_for_dotnet(on_progress_update)
+    if net_on_progress is not None:
+        net_facility_builders[0].OnProgressUpdate = net_on_progress
+    _create_add_multi_factor_sim(rng, factors, factor_corrs, time_period_type, num_sims, seed, fwd_sim_seed,
+                                 antithetic)(net_facility_builders[0])
+
+    logger.info('Calculating LSMC value of %d facilities.', len(facility_keys))
+    net_logger = utils.create_net_log_adapter(logger, net_cs.LsmcStorageValuation)
+    lsmc = net_cs.LsmcStorageValuation(net_logger)
+    if max_facility_threads is None:
+        max_facility_threads = dotnet.Environment.ProcessorCount
+    net_portfolio_results = lsmc.CalculatePortfolio[time_period_type](net_facility_builders, max_facility_threads)
+    logger.info('Calculation of LSMC value of facilities complete.')
+
+    facility_results = {}
+    for facility_index, facility_key in enumerate(facility_keys):
+        results_conversion_start_time = time.perf_counter()
+        net_val_results = net_portfolio_results[facility_index]
+        results = _multi_factor_results_from_net(facility_storages[facility_index], net_val_results,
+                                                 intrinsic_results[facility_index],
+                                                 columnar_trigger_profiles, basis_funcs, None)
+        results_conversion_time = time.perf_counter() - results_conversion_start_time
+        net_timings = net_val_results.Timings
+        total_time = input_conversion_time + basis_function_compile_time + intrinsic_times[facility_index] + \
+            net_timings.Total.TotalSeconds + results_conversion_time
+        facility_results[facility_key] = results._replace(timings=_create_timings(
+            net_timings, total_time, input_conversion_time, basis_function_compile_time,
+            intrinsic_times[facility_index], results_conversion_time))
+
+    facility_deltas = [results.deltas for results in facility_results.values() if len(results.deltas) > 0]
+    deltas = pd.concat(facility_deltas, axis=1).sum(axis=1) if facility_deltas else pd.Series(dtype='float64')
+    return MultiFactorPortfolioResults(sum(results.npv for results in facility_results.values()),
+                                       sum(results.intrinsic_npv for results in facility_results.values()),
+                                       deltas, facility_results)
+
+
+def value_inventory_curve(cmdty_storage: CmdtyStorage,
+                          val_date: utils.TimePeriodSpecType,
+                          inventories: tp.Iterable[float],
+                          fwd_curve: pd.Series,
+                          interest_rates: pd.Series,  # TODO change this to function which returns discount factor, i.e. delegate DF calc to caller.
+                          settlement_rule: tp.Callable[[pd.Period], date],
+                          factors: tp.Collection[tp.Tuple[float, utils.CurveType]],
+                          factor_corrs: mfc.FactorCorrsType,
+                          num_sims: int,
+                          basis_funcs: str,
+                          discount_deltas: bool,
+                          seed: tp.Optional[int] = None,
+                          fwd_sim_seed: tp.Optional[int] = None,
+                          extra_decisions: tp.Optional[int] = None,
+                          num_inventory_grid_points: int = 100,
+                          numerical_tolerance: float = 1E-12,
+                          on_progress_update: tp.Optional[tp.Callable[[float], None]] = None,
+                          max_threads: tp.Optional[int] = None,
+                          rng: str = 'mersenne_twister',
+                          antithetic: bool = True,
+                          intrinsic_control_variate: bool = False
+                          ) -> MultiFactorInventoryCurveResults:
+    """
+    Values storage for each of a number of starting inventories from a single LSMC backward induction, which is
+    performed over the inventories reachable from all of the starting inventories. The forward simulation is then
+    performed from each starting inventory using the same simulated prices, so the NPV curve is not distorted by
+    simulation noise. npv_inventory_derivative is calculated by finite differences of the NPV curve, so is NaN if only
+    one starting inventory is given.
+    """
+    mfc.validate_rng(rng)
+    factor_corrs = mfc.validate_multi_factor_params(factors, factor_corrs)
+    if cmdty_storage.freq != fwd_curve.index.freqstr:
+        raise ValueError("cmdty_storage and forward_curve have different frequencies.")
+    inventories = np.sort(np.asarray(list(inventories), dtype=np.float64))
+    if len(inventories) == 0:
+        raise ValueError('inventories cannot be empty.')
+    if np.any(np.diff(inventories) == 0.0):
+        raise ValueError('inventories cannot contain duplicates.')
+    time_period_type = utils.FREQ_TO_PERIOD_TYPE[cmdty_storage.freq]
+    net_current_period = utils.from_datetime_like(val_date, time_period_type)
+    net_interest_rate_time_series = utils.series_to_double_time_series(interest_rates, utils.FREQ_TO_PERIOD_TYPE['D'])
+    logger.info('Compiling basis functions. Takes a few seconds on the first run.')
+    net_basis_functions = net_cs.BasisFunctionsBuilder.Parse(basis_funcs)
+    logger.info('Compilation of basis functions complete.')
+    net_lsmc_params_builder = _create_net_lsmc_params_builder(
+        cmdty_storage, utils.series_to_double_time_series(fwd_curve, time_period_type), net_current_period,
+        float(inventories[0]), utils.wrap_settle_table_for_dotnet(settlement_rule, cmdty_storage, net_current_period),
+        net_cs.StorageHelper.CreateAct65ContCompDiscounterFromSeries(net_interest_rate_time_series),
+        num_inventory_grid_points, numerical_tolerance, net_basis_functions, SimulationDataReturned.NONE,
+        intrinsic_control_variate, utils.wrap_on_progress_for_dotnet(on_progress_update), discount_deltas,
+        extra_decisions, max_threads, time_period_type)
+    _create_add_multi_factor_sim(rng, factors, factor_corrs, time_period_type, num_sims, seed, fwd_sim_seed,
+                                 antithetic)(net_lsmc_params_builder)
+
+    logger.info('Calculating LSMC value of %d starting inventories.', len(inventories))
+    net_logger = utils.create_net_log_adapter(logger, net_cs.LsmcStorageValuation)
+    lsmc = net_cs.LsmcStorageValuation(net_logger)
+    net_curve_results = lsmc.CalculateInventoryValueCurve[time_period_type](net_lsmc_params_builder,
+                                                                           utils.as_net_array(inventories))
+    logger.info('Calculation of LSMC value of starting inventories complete.')
+
+    inventory_index = pd.Index(inventories, name='inventory')
+    npv = pd.Series([net_results.Npv for net_results in net_curve_results], index=inventory_index)
+    if len(inventories) > 1:
+        npv_inventory_derivative = pd.Series(np.gradient(npv.values, inventories), index=inventory_index)
+    else:
+        npv_inventory_derivative = pd.Series(np.nan, index=inventory_index)
+    val_sim_standard_error = pd.Series([net_results.ValuationSimStandardError for net_results in net_curve_results],
+                                       index=inventory_index)
+    deltas = pd.DataFrame([utils.net_time_series_to_pandas_series(net_results.Deltas, cmdty_storage.freq)
+                           for net_results in net_curve_results], index=inventory_index)
+    return MultiFactorInventoryCurveResults(npv, npv_inventory_derivative, val_sim_standard_error, deltas)
+
+
+def _val_sim_batch_size(num_sims, val_sim_batch_size, target_val_sim_standard_error):
+    # Adaptive valuation requires batches, which default to a tenth of the maximum number of simulations
+    if val_sim_batch_size is None and target_val_sim_standard_error is not None:
+        return max(num_sims // 10, 1)
+    return val_sim_batch_size
+
+
+def _create_add_multi_factor_sim(rng, factors, factor_corrs, time_period_type, num_sims, seed, fwd_sim_seed, antithetic):
+    if rng == 'sobol':
+        return _create_add_sobol_sim(factors, factor_corrs, time_period_type, num_sims, seed, fwd_sim_seed, antithetic)
+    net_multi_factor_params = mfc.create_net_multi_factor_params(factor_corrs, factors, time_period_type)
+
+    def add_multi_factor_sim(net_lsmc_params_builder):
+        net_lsmc_params_builder.SimulateWithMultiFactorModelAndMersenneTwister(net_multi_factor_params, num_sims,
+                                                                               seed, fwd_sim_seed, antithetic)
+    return add_multi_factor_sim
+
+
+def _create_add_sobol_sim(factors, factor_corrs, time_period_type, num_sims, seed, fwd_sim_seed, antithetic):
+    net_mean_reversions, net_factor_vols, net_factor_corrs = mfc.create_net_sobol_model_inputs(factor_corrs, factors,
+                                                                                               time_period_type)
+
+    def add_sobol_sim(net_lsmc_params_builder):
+        net_lsmc_params_builder.SimulateWithMultiFactorModelAndSobol(net_mean_reversions, net_factor_vols,
+                                                                     net_factor_corrs, num_sims, seed, fwd_sim_seed,
+                                                                     antithetic)
+    return add_sobol_sim
+
+
+def _stream_sims_or_default(stream_sims, rng, sim_data_returned):
+    # By default simulations are streamed if the simulated spot prices and factors are not returned, so the spot prices
+    # and factors of all periods are never held in memory
+    if stream_sims is not None:
+        return stream_sims
+    return rng == 'mersenne_twister' and (sim_data_returned is None or
+                                          not sim_data_returned & (SimulationDataReturned.SPOT_ALL |
+                                                                   SimulationDataReturned.FACTORS_ALL))
+
+
+def _validate_stream_sims(stream_sims, rng, sim_data_returned):
+    # Streamed simulations only hold the most recently simulated periods, so the simulated data cannot be returned
+    if not stream_sims:
+        return
+    if rng != 'mersenne_twister':
+        raise ValueError("stream_sims can only be True if rng is 'mersenne_twister'.")
+    if sim_data_returned is not None and \
+            sim_data_returned & (SimulationDataReturned.SPOT_ALL | SimulationDataReturned.FACTORS_ALL):
+        raise ValueError("sim_data_returned cannot include simulated spot prices or factors if stream_sims is True.")
+
+
+def _create_add_streamed_sim(factors, factor_corrs, time_period_type, num_sims, seed, fwd_sim_seed, antithetic):
+    net_mean_reversions, net_factor_vols, net_factor_corrs = mfc.create_net_sobol_model_inputs(factor_corrs, factors,
+                                                                                               time_period_type)
+
+    def add_streamed_sim(net_lsmc_params_builder):
+        net_lsmc_params_builder.SimulateWithMultiFactorModelStreamed(net_mean_reversions, net_factor_vols,
+                                                                     net_factor_corrs, num_sims, seed, fwd_sim_seed,
+                                                                     antithetic)
+    return add_streamed_sim
 
 
 def _create_net_spot_sim_results(sim_spot, sim_factors, time_period_type):
@@ -211,22 +766,26 @@ def _create_net_spot_sim_results(sim_spot, sim_factors, time_period_type):
 def _net_multi_factor_calc(cmdty_storage, fwd_curve, interest_rates, inventory, add_sim_to_val_params,
                            num_inventory_grid_points, numerical_tolerance, on_progress_update,
                            basis_funcs, settlement_rule, time_period_type,
-                           val_date, discount_deltas, extra_decisions, sim_data_returned):
+                           val_date, discount_deltas, extra_decisions, sim_data_returned,
+                           columnar_trigger_profiles, max_threads, intrinsic_control_variate,
+                           target_val_sim_standard_error, val_sim_batch_size, exercise_policy):
     if cmdty_storage.freq != fwd_curve.index.freqstr:
         raise ValueError("cmdty_storage and forward_curve have different frequencies.")
+    start_time = time.perf_counter()
     # Convert inputs to .NET types
     net_forward_curve = utils.series_to_double_time_series(fwd_curve, time_period_type)
     net_current_period = utils.from_datetime_like(val_date, time_period_type)
-    net_grid_calc = net_cs.FixedSpacingStateSpaceGridCalc.CreateForFixedNumberOfPointsOnGlobalInventoryRange[
-        time_period_type](cmdty_storage.net_storage, num_inventory_grid_points)
-    net_settlement_rule = utils.wrap_settle_for_dotnet(settlement_rule, cmdty_storage.freq)
+    net_settlement_rule = utils.wrap_settle_table_for_dotnet(settlement_rule, cmdty_storage,
+                                                              net_current_period)
     net_interest_rate_time_series = utils.series_to_double_time_series(interest_rates, utils.FREQ_TO_PERIOD_TYPE['D'])
     net_discount_func = net_cs.StorageHelper.CreateAct65ContCompDiscounterFromSeries(net_interest_rate_time_series)
     net_on_progress = utils.wrap_on_progress_for_dotnet(on_progress_update)
+    input_conversion_end_time = time.perf_counter()
 
     logger.info('Compiling basis functions. Takes a few seconds on the first run.')
     net_basis_functions = net_cs.BasisFunctionsBuilder.Parse(basis_funcs)
     logger.info('Compilation of basis functions complete.')
+    basis_function_compile_end_time = time.perf_counter()
 
     # Intrinsic calc
     logger.info('Calculating intrinsic value.')
@@ -235,38 +794,59 @@ def _net_multi_factor_calc(cmdty_storage, fwd_curve, interest_rates, inventory,
                                                        num_inventory_grid_points,
                                                        numerical_tolerance, time_period_type)
     logger.info('Calculation of intrinsic value complete.')
+    intrinsic_end_time = time.perf_counter()
 
     # Multi-factor calc
-    # TODO: pass sim_data_returned through to .NET API do avoid this simulation data even getting allocated
+    # Per-simulation result panels not specified in sim_data_returned are not allocated by the .NET valuation, and
+    # empty panels are not copied to Python. Unless stream_sims is False, the simulated spot prices and factors of all
+    # periods are only held in memory if sim_data_returned includes them
+    if sim_data_returned is None:
+        sim_data_returned = SimulationDataReturned.NONE
     logger.info('Calculating LSMC value.')
     net_logger = utils.create_net_log_adapter(logger, net_cs.LsmcStorageValuation)
     lsmc = net_cs.LsmcStorageValuation(net_logger)
-    net_lsmc_params_builder = net_cs.PythonHelpers.ObjectFactory.CreateLsmcValuationParamsBuilder[time_period_type]()
-    net_lsmc_params_builder.CurrentPeriod = net_current_period
-    net_lsmc_params_builder.Inventory = inventory
-    net_lsmc_params_builder.ForwardCurve = net_forward_curve
-    net_lsmc_params_builder.Storage = cmdty_storage.net_storage
-    net_lsmc_params_builder.SettleDateRule = net_settlement_rule
-    net_lsmc_params_builder.DiscountFactors = net_discount_func
-    net_lsmc_params_builder.GridCalc = net_grid_calc
-    net_lsmc_params_builder.NumericalTolerance = numerical_tolerance
-    net_lsmc_params_builder.BasisFunctions = net_basis_functions
-    net_lsmc_params_builder.SimulationDataReturned = net_cs.SimulationDataReturned(sim_data_returned.value)
-    if net_on_progress is not None:
-        net_lsmc_params_builder.OnProgressUpdate = net_on_progress
-    net_lsmc_params_builder.DiscountDeltas = discount_deltas
-    if extra_decisions is not None:
-        net_lsmc_params_builder.ExtraDecisions = extra_decisions
+    net_lsmc_params_builder = _create_net_lsmc_params_builder(cmdty_storage, net_forward_curve, net_current_period,
+                                                              inventory, net_settlement_rule, net_discount_func,
+                                                              num_inventory_grid_points, numerical_tolerance,
+                                                              net_basis_functions, sim_data_returned,
+                                                              intrinsic_control_variate, net_on_progress,
+                                                              discount_deltas, extra_decisions, max_threads,
+                                                              time_period_type)
     add_sim_to_val_params(net_lsmc_params_builder)
+    if val_sim_batch_size is not None:
+        net_lsmc_params_builder.ValuationSimBatchSize = val_sim_batch_size
+    if target_val_sim_standard_error is not None:
+        net_lsmc_params_builder.TargetValuationSimStandardError = target_val_sim_standard_error
+    if exercise_policy is not None:
+        net_lsmc_params_builder.ExercisePolicy = _exercise_policy_to_net(exercise_policy, net_basis_functions.Length,
+                                                                         time_period_type)
 
     net_lsmc_params = net_lsmc_params_builder.Build()
     net_val_results = lsmc.Calculate[time_period_type](net_lsmc_params)
     logger.info('Calculation of LSMC value complete.')
+    lsmc_end_time = time.perf_counter()
+
+    results = _multi_factor_results_from_net(cmdty_storage, net_val_results, intrinsic_result,
+                                             columnar_trigger_profiles, basis_funcs, exercise_policy)
+    end_time = time.perf_counter()
+    timings = _create_timings(net_val_results.Timings, end_time - start_time, input_conversion_end_time - start_time,
+                              basis_function_compile_end_time - input_conversion_end_time,
+                              intrinsic_end_time - basis_function_compile_end_time, end_time - lsmc_end_time)
+    return results._replace(timings=timings)
+
 
+def _multi_factor_results_from_net(cmdty_storage, net_val_results, intrinsic_result,
+                                   columnar_trigger_profiles, basis_funcs, exercise_policy) -> MultiFactorValuationResults:
+    """Converts .NET LSMC valuation results to MultiFactorValuationResults, with the timings field set to None."""
     deltas = utils.net_time_series_to_pandas_series(net_val_results.Deltas, cmdty_storage.freq)
     expected_profile = cs_intrinsic.profile_to_data_frame(cmdty_storage.freq, net_val_results.ExpectedStorageProfile)
     trigger_prices = _trigger_prices_to_data_frame(cmdty_storage.freq, net_val_results.TriggerPrices)
-    trigger_profiles = _trigger_profiles_to_data_frame(cmdty_storage.freq, net_val_results.TriggerPriceVolumeProfiles)
+    if columnar_trigger_profiles:
+        trigger_profiles = _trigger_profiles_to_long_data_frame(cmdty_storage.freq,
+                                                                net_val_results.TriggerPriceVolumeProfiles)
+    else:
+        trigger_profiles = _trigger_profiles_to_data_frame(cmdty_storage.freq,
+                                                           net_val_results.TriggerPriceVolumeProfiles)
     sim_spot_regress = utils.net_panel_to_data_frame(net_val_results.RegressionSpotPriceSim, cmdty_storage.freq)
     sim_spot_valuation = utils.net_panel_to_data_frame(net_val_results.ValuationSpotPriceSim, cmdty_storage.freq)
     sim_inventory = utils.net_panel_to_data_frame(net_val_results.InventoryBySim, cmdty_storage.freq)
@@ -277,13 +857,135 @@ def _net_multi_factor_calc(cmdty_storage, fwd_curve, interest_rates, inventory,
     sim_pv = utils.net_panel_to_data_frame(net_val_results.PvByPeriodAndSim, cmdty_storage.freq)
     sim_factors_regress = _net_panel_enumerable_to_data_frame_tuple(net_val_results.RegressionMarkovFactors, cmdty_storage.freq)
     sim_factors_valuation = _net_panel_enumerable_to_data_frame_tuple(net_val_results.ValuationMarkovFactors, cmdty_storage.freq)
+    val_sim_convergence = _val_sim_convergence_to_data_frame(net_val_results.ValuationSimConvergence)
+    if exercise_policy is None and net_val_results.ExercisePolicy is not None:
+        exercise_policy = _exercise_policy_from_net(net_val_results.ExercisePolicy, cmdty_storage.freq, basis_funcs)
 
     return MultiFactorValuationResults(net_val_results.Npv, net_val_results.ValuationSimStandardError, deltas, expected_profile,
                                        intrinsic_result.npv, intrinsic_result.profile, sim_spot_regress,
                                        sim_spot_valuation, sim_factors_regress, sim_factors_valuation,
                                        sim_inventory, sim_inject_withdraw,
                                        sim_cmdty_consumed, sim_inventory_loss, sim_net_volume, sim_pv,
-                                       trigger_prices, trigger_profiles)
+                                       trigger_prices, trigger_profiles, net_val_results.NumValuationSims,
+                                       val_sim_convergence, None, exercise_policy)
+
+
+def _create_timings(net_timings, total, input_conversion, basis_function_compile, intrinsic,
+                    results_conversion) -> MultiFactorValuationTimings:
+    return MultiFactorValuationTimings(total=total,
+                                       input_conversion=input_conversion,
+                                       basis_function_compile=basis_function_compile,
+                                       intrinsic=intrinsic,
+                                       lsmc_total=net_timings.Total.TotalSeconds,
+                                       lsmc_regression_price_sim=net_timings.RegressionPriceSimulation.TotalSeconds,
+                                       lsmc_valuation_price_sim=net_timings.ValuationPriceSimulation.TotalSeconds,
+                                       lsmc_backward_induction=net_timings.BackwardInduction.TotalSeconds,
+                                       lsmc_pseudo_inverse=net_timings.PseudoInverse.TotalSeconds,
+                                       lsmc_regression=net_timings.Regression.TotalSeconds,
+                                       lsmc_forward_sim=net_timings.ForwardSimulation.TotalSeconds,
+                                       results_conversion=results_conversion)
+
+
+def _create_net_lsmc_params_builder(cmdty_storage, net_forward_curve, net_current_period, inventory,
+                                    net_settlement_rule, net_discount_func, num_inventory_grid_points,
+                                    numerical_tolerance, net_basis_functions, sim_data_returned,
+                                    intrinsic_control_variate, net_on_progress, discount_deltas, extra_decisions,
+                                    max_threads, time_period_type):
+    """Creates the .NET LSMC valuation parameters builder, without the simulation generators being set."""
+    net_grid_calc = net_cs.FixedSpacingStateSpaceGridCalc.CreateForFixedNumberOfPointsOnGlobalInventoryRange[
+        time_period_type](cmdty_storage.net_storage, num_inventory_grid_points)
+    net_lsmc_params_builder = net_cs.PythonHelpers.ObjectFactory.CreateLsmcValuationParamsBuilder[time_period_type]()
+    net_lsmc_params_builder.CurrentPeriod = net_current_period
+    net_lsmc_params_builder.Inventory = inventory
+    net_lsmc_params_builder.ForwardCurve = net_forward_curve
+    net_lsmc_params_builder.Storage = cmdty_storage.net_storage
+    net_lsmc_params_builder.SettleDateRule = net_settlement_rule
+    net_lsmc_params_builder.DiscountFactors = net_discount_func
+    net_lsmc_params_builder.GridCalc = net_grid_calc
+    net_lsmc_params_builder.NumericalTolerance = numerical_tolerance
+    net_lsmc_params_builder.BasisFunctions = net_basis_functions
+    net_lsmc_params_builder.SimulationDataReturned = net_cs.SimulationDataReturned(sim_data_returned.value)
+    net_lsmc_params_builder.IntrinsicControlVariate = intrinsic_control_variate
+    if net_on_progress is not None:
+        net_lsmc_params_builder.OnProgressUpdate = net_on_progress
+    net_lsmc_params_builder.DiscountDeltas = discount_deltas
+    if extra_decisions is not None:
+        net_lsmc_params_builder.ExtraDecisions = extra_decisions
+    if max_threads is not None:
+        net_lsmc_params_builder.MaxDegreeOfParallelism = max_threads
+    return net_lsmc_params_builder
+
+
+def _val_sim_convergence_to_data_frame(net_convergence_points) -> pd.DataFrame:
+    data_frame_data = {'num_sims': [point.NumSims for point in net_convergence_points],
+                       'npv': [point.Npv for point in net_convergence_points],
+                       'standard_error': [point.StandardError for point in net_convergence_points]}
+    return pd.DataFrame(data=data_frame_data)
+
+
+def _exercise_policy_from_net(net_exercise_policy, freq, basis_funcs) -> MultiFactorExercisePolicy:
+    time_period_type = utils.FREQ_TO_PERIOD_TYPE[freq]
+    columns = net_cs.PythonHelpers.ExercisePolicyColumns.FromExercisePolicy[time_period_type](net_exercise_policy)
+    return _exercise_policy_from_columns(
+        utils.net_time_period_to_pandas_period(net_exercise_policy.CurrentPeriod, freq), net_exercise_policy.Inventory,
+        basis_funcs, net_exercise_policy.InventoryGridSpacing,
+        utils.net_time_period_to_pandas_period(net_exercise_policy.InventorySpaceGrids.Indices[0], freq),
+        utils.as_numpy_array(columns.GridLengths), utils.as_numpy_array(columns.GridPoints),
+        columns.RegressionPeriodOffset, columns.NumRegressionPeriods, utils.as_numpy_array(columns.RegressionCoefficients),
+        utils.as_numpy_array(columns.CurrentPeriodContinuationValues))
+
+
+def _exercise_policy_from_columns(val_date, inventory, basis_funcs, inventory_grid_spacing, grids_start, grid_lengths,
+                                  grid_points, regression_period_offset, num_regression_periods, regression_coeffs,
+                                  current_period_continuation_values) -> MultiFactorExercisePolicy:
+    grids_index = pd.period_range(start=grids_start, periods=len(grid_lengths), freq=grids_start.freqstr)
+    grids = np.split(grid_points, np.cumsum(grid_lengths)[:-1])
+    # Regression coefficients for a period have a row per inventory grid point of the next period
+    coeffs_grid_lengths = grid_lengths[regression_period_offset + 1:regression_period_offset + 1 + num_regression_periods]
+    num_basis_funcs = len(regression_coeffs) // coeffs_grid_lengths.sum() if num_regression_periods > 0 else 0
+    coeffs = [period_coeffs.reshape(-1, num_basis_funcs) for period_coeffs in
+              np.split(regression_coeffs, np.cumsum(coeffs_grid_lengths * num_basis_funcs)[:-1])] \
+        if num_regression_periods > 0 else []
+    coeffs_index = grids_index[regression_period_offset:regression_period_offset + num_regression_periods]
+    return MultiFactorExercisePolicy(val_date, inventory, basis_funcs, inventory_grid_spacing,
+                                     _arrays_to_series(grids, grids_index), _arrays_to_series(coeffs, coeffs_index),
+                                     current_period_continuation_values)
+
+
+def _arrays_to_series(arrays, index) -> pd.Series:
+    # Populated element by element so that arrays of equal length are not combined into a 2-dimensional array
+    data = np.empty(len(arrays), dtype=object)
+    for i, array in enumerate(arrays):
+        data[i] = array
+    return pd.Series(data=data, index=index)
+
+
+def _exercise_policy_columns(exercise_policy: MultiFactorExercisePolicy) -> tp.Dict[str, np.ndarray]:
+    grid_lengths = np.array([len(grid) for grid in exercise_policy.inventory_grids], dtype=np.int32)
+    num_regression_periods = len(exercise_policy.regression_coeffs)
+    regression_period_offset = exercise_policy.inventory_grids.index.get_loc(exercise_policy.regression_coeffs.index[0]) \
+        if num_regression_periods > 0 else 0
+    regression_coeffs = np.concatenate([np.ravel(period_coeffs) for period_coeffs in exercise_policy.regression_coeffs]) \
+        if num_regression_periods > 0 else np.empty(0)
+    return {'grid_lengths': grid_lengths,
+            'grid_points': np.concatenate(list(exercise_policy.inventory_grids)).astype(np.float64),
+            'regression_period_offset': np.array(regression_period_offset),
+            'num_regression_periods': np.array(num_regression_periods),
+            'regression_coeffs': regression_coeffs.astype(np.float64),
+            'current_period_continuation_values': np.asarray(exercise_policy.current_period_continuation_values,
+                                                             dtype=np.float64)}
+
+
+def _exercise_policy_to_net(exercise_policy: MultiFactorExercisePolicy, num_basis_funcs, time_period_type):
+    columns = _exercise_policy_columns(exercise_policy)
+    return net_cs.PythonHelpers.ExercisePolicyColumns.ToExercisePolicy[time_period_type](
+        utils.from_datetime_like(exercise_policy.val_date, time_period_type), exercise_policy.inventory, num_basis_funcs,
+        exercise_policy.inventory_grid_spacing,
+        utils.from_datetime_like(exercise_policy.inventory_grids.index[0], time_period_type),
+        utils.as_net_array(columns['grid_lengths']), utils.as_net_array(columns['grid_points']),
+        int(columns['regression_period_offset']), int(columns['num_regression_periods']),
+        utils.as_net_array(columns['regression_coeffs']),
+        utils.as_net_array(columns['current_period_continuation_values']))
 
 
 def _net_panel_enumerable_to_data_frame_tuple(net_panel_enumerable, freq) -> tp.Tuple[pd.DataFrame, ...]:
@@ -292,19 +994,12 @@ def _net_panel_enumerable_to_data_frame_tuple(net_panel_enumerable, freq) -> tp.
 
 def _trigger_prices_to_data_frame(freq, net_trigger_prices) -> pd.DataFrame:
     index = _create_period_index(freq, net_trigger_prices)
-    inject_volume = _create_empty_list(net_trigger_prices.Count)
-    inject_trigger_price = _create_empty_list(net_trigger_prices.Count)
-    withdraw_volume = _create_empty_list(net_trigger_prices.Count)
-    withdraw_trigger_price = _create_empty_list(net_trigger_prices.Count)
-    for i, trig in enumerate(net_trigger_prices.Data):
-        if trig.HasInjectPrice:
-            inject_volume[i] = trig.MaxInjectVolume
-            inject_trigger_price[i] = trig.MaxInjectTriggerPrice
-        if trig.HasWithdrawPrice:
-            withdraw_volume[i] = trig.MaxWithdrawVolume
-            withdraw_trigger_price[i] = trig.MaxWithdrawTriggerPrice
-    data_frame_data = {'inject_volume': inject_volume, 'inject_trigger_price': inject_trigger_price,
-                       'withdraw_volume': withdraw_volume, 'withdraw_trigger_price': withdraw_trigger_price}
+    time_period_type = utils.FREQ_TO_PERIOD_TYPE[freq]
+    columns = net_cs.PythonHelpers.TriggerPriceColumns.FromTriggerPrices[time_period_type](net_trigger_prices)
+    data_frame_data = {'inject_volume': utils.as_numpy_array(columns.MaxInjectVolume),
+                       'inject_trigger_price': utils.as_numpy_array(columns.MaxInjectTriggerPrice),
+                       'withdraw_volume': utils.as_numpy_array(columns.MaxWithdrawVolume),
+                       'withdraw_trigger_price': utils.as_numpy_array(columns.MaxWithdrawTriggerPrice)}
     data_frame = pd.DataFrame(data=data_frame_data, index=index)
     return data_frame
 
@@ -329,3 +1024,19 @@ def _trigger_profiles_to_data_frame(freq, net_trigger_profiles) -> pd.Series:
         withdraw_triggers = [TriggerPricePoint(x.Volume, x.Price) for x in prof.WithdrawTriggerPrices]
         profiles_list[i] = TriggerPriceProfile(inject_triggers, withdraw_triggers)
     return pd.Series(data=profiles_list, index=index)
+
+
+def _trigger_profiles_to_long_data_frame(freq, net_trigger_profiles) -> pd.DataFrame:
+    """
+    Creates long-form DataFrame of trigger price profiles, with one row per trigger price point and columns period,
+    side ('inject' or 'withdraw'), volume and price.
+    """
+    time_period_type = utils.FREQ_TO_PERIOD_TYPE[freq]
+    columns = net_cs.PythonHelpers.TriggerPriceProfileColumns.FromProfiles[time_period_type](net_trigger_profiles)
+    period_index = _create_period_index(freq, net_trigger_profiles)
+    period_offsets = utils.as_numpy_array(columns.PeriodOffset)
+    is_inject = utils.as_numpy_array(columns.IsInject)
+    side = pd.Categorical.from_codes(np.where(is_inject, 0, 1), categories=['inject', 'withdraw'])
+    data_frame_data = {'period': period_index[period_offsets], 'side': side,
+                       'volume': utils.as_numpy_array(columns.Volume), 'price': utils.as_numpy_array(columns.Price)}
+    return pd.DataFrame(data=data_frame_data)
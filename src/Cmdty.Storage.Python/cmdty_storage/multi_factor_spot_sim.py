@@ -34,6 +34,8 @@
 
 clr.AddReference(str(pl.Path('cmdty_storage/lib/Cmdty.Core.Simulation')))
 import Cmdty.Core.Simulation as net_sim
+clr.AddReference(str(pl.Path('cmdty_storage/lib/Cmdty.Storage')))
+import Cmdty.Storage as net_cs
 
 
 class MultiFactorSpotSim:
@@ -48,7 +50,9 @@ def __init__(self,
                  seed: tp.Optional[int] = None,
                  antithetic: bool = False,
                  # time_func: Callable[[Union[datetime, date], Union[datetime, date]], float] TODO add this back in
+                 rng: str = 'mersenne_twister'
                  ):
+        mfc.validate_rng(rng)
         factor_corrs = mfc.validate_multi_factor_params(factors, factor_corrs)
         if freq not in utils.FREQ_TO_PERIOD_TYPE:
             raise ValueError("freq parameter value of '{}' not supported. The allowable values can be found in the "
@@ -56,26 +60,39 @@ def __init__(self,
 
         time_period_type = utils.FREQ_TO_PERIOD_TYPE[freq]
 
-        net_multi_factor_params = mfc.create_net_multi_factor_params(factor_corrs, factors, time_period_type)
         net_forward_curve = utils.curve_to_net_dict(fwd_curve, time_period_type)
         net_current_date = utils.py_date_like_to_net_datetime(current_date)
         net_time_func = dotnet.Func[dotnet.DateTime, dotnet.DateTime, dotnet.Double](net_sim.TimeFunctions.Act365)
         net_sim_periods = dotnet_cols_gen.List[time_period_type]()
         [net_sim_periods.Add(utils.from_datetime_like(p, time_period_type)) for p in sim_periods]
 
-        if seed is None:
-            mt_rand = net_sim.MersenneTwisterGenerator(antithetic)
+        if rng == 'sobol':
+            net_mean_reversions, net_factor_vols, net_factor_corrs = mfc.create_net_sobol_model_inputs(
+                factor_corrs, factors, time_period_type)
+            net_seed = None if seed is None else dotnet.Nullable[dotnet.Int32](seed)
+            self._net_simulator = net_cs.SobolMultiFactorSpotSimulator[time_period_type](
+                net_mean_reversions, net_factor_vols, net_factor_corrs, net_current_date, net_forward_curve,
+                net_sim_periods, net_time_func, net_seed, antithetic)
         else:
-            mt_rand = net_sim.MersenneTwisterGenerator(seed, antithetic)
-        mt_rand = net_sim.IStandardNormalGeneratorWithSeed(mt_rand)
+            if seed is None:
+                mt_rand = net_sim.MersenneTwisterGenerator(antithetic)
+            else:
+                mt_rand = net_sim.MersenneTwisterGenerator(seed, antithetic)
+            mt_rand = net_sim.IStandardNormalGeneratorWithSeed(mt_rand)
 
-        self._net_simulator = net_sim.MultiFactor.MultiFactorSpotPriceSimulator[time_period_type](
-            net_multi_factor_params, net_current_date, net_forward_curve, net_sim_periods, net_time_func, mt_rand)
+            net_multi_factor_params = mfc.create_net_multi_factor_params(factor_corrs, factors, time_period_type)
+            self._net_simulator = net_sim.MultiFactor.MultiFactorSpotPriceSimulator[time_period_type](
+                net_multi_factor_params, net_current_date, net_forward_curve, net_sim_periods, net_time_func, mt_rand)
         self._sim_periods = [_to_pd_period(freq, p) for p in sim_periods]
         self._freq = freq
+        self._rng = rng
 
     def simulate(self, num_sims: int) -> pd.DataFrame:
         net_sim_results = self._net_simulator.Simulate(num_sims)
+        if self._rng == 'sobol':
+            spot_sim = utils.net_panel_to_data_frame(net_sim_results.SpotPriceSims, self._freq)
+            spot_sim.index = pd.PeriodIndex(data=self._sim_periods, freq=self._freq)
+            return spot_sim
         spot_sim_array = utils.as_numpy_array(net_sim_results.SpotPrices)
         spot_sim_array.resize((net_sim_results.NumSteps, net_sim_results.NumSims))
         period_index = pd.PeriodIndex(data=self._sim_periods, freq=self._freq)
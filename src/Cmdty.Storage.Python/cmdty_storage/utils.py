@@ -24,6 +24,7 @@
 import pandas as pd
 import numpy as np
 import ctypes
+import contextlib
 import clr
 import System as dotnet
 import System.Collections.Generic as dotnet_cols_gen
@@ -76,17 +77,24 @@ def net_time_period_to_pandas_period(net_time_period, freq):
 
 def series_to_double_time_series(series, time_period_type):
     """Converts an instance of pandas Series to a Cmdty.TimeSeries.TimeSeries type with Double data type."""
-    return series_to_time_series(series, time_period_type, dotnet.Double, lambda x: x)
+    net_indices = _contiguous_net_indices(series.index, time_period_type)
+    if net_indices is None:
+        return series_to_time_series(series, time_period_type, dotnet.Double, lambda x: x)
+    net_values = as_net_array(np.ascontiguousarray(series.values, dtype=np.float64))
+    return ts.TimeSeries[time_period_type, dotnet.Double](net_indices, net_values)
 
 
 def series_to_time_series(series, time_period_type, net_data_type, data_selector):
     """Converts an instance of pandas Series to a Cmdty.TimeSeries.TimeSeries."""
     series_len = len(series)
-    net_indices = dotnet.Array.CreateInstance(time_period_type, series_len)
-    net_values = dotnet.Array.CreateInstance(net_data_type, series_len)
+    net_indices = _contiguous_net_indices(series.index, time_period_type)
+    if net_indices is None:
+        net_indices = dotnet.Array.CreateInstance(time_period_type, series_len)
+        for i in range(series_len):
+            net_indices[i] = from_datetime_like(series.index[i], time_period_type)
 
+    net_values = dotnet.Array.CreateInstance(net_data_type, series_len)
     for i in range(series_len):
-        net_indices[i] = from_datetime_like(series.index[i], time_period_type)
         net_values[i] = data_selector(series.values[i])
 
     return ts.TimeSeries[time_period_type, net_data_type](net_indices, net_values)
@@ -96,13 +104,33 @@ def data_frame_to_net_double_panel(data_frame: pd.DataFrame, time_period_type):
     """Converts an instance of pandas DataFrame to a Cmdty.Core.Common.Panel<T, double>."""
     num_periods = len(data_frame.index)
     num_cols = len(data_frame.columns)
-    net_indices = dotnet.Array.CreateInstance(time_period_type, num_periods)
-    for i in range(num_periods):
-        net_indices[i] = from_datetime_like(data_frame.index[i], time_period_type)
-    net_values = as_net_array(data_frame.values.flatten(order='C'))
+    net_indices = _contiguous_net_indices(data_frame.index, time_period_type)
+    if net_indices is None:
+        net_indices = dotnet.Array.CreateInstance(time_period_type, num_periods)
+        for i in range(num_periods):
+            net_indices[i] = from_datetime_like(data_frame.index[i], time_period_type)
+    net_values = as_net_array(np.ascontiguousarray(data_frame.values, dtype=np.float64).ravel())
     return net_cc.Panel[time_period_type, dotnet.Double](net_values, net_indices, num_cols)
 
 
+def _contiguous_net_indices(index, time_period_type):
+    """
+    Creates a .NET array of time periods from a pandas PeriodIndex in bulk, by offsetting from the first period.
+    Returns None if the index is not a contiguous PeriodIndex with granularity matching time_period_type, in
+    which case the caller should fall back to converting each element individually.
+    """
+    num_periods = len(index)
+    if not isinstance(index, pd.PeriodIndex) or num_periods == 0:
+        return None
+    if num_periods > 1 and not np.all(np.diff(index.asi8) == index.freq.n):
+        return None
+    net_start = from_datetime_like(index[0], time_period_type)
+    net_end = from_datetime_like(index[-1], time_period_type)
+    if net_end.OffsetFrom(net_start) != num_periods - 1:
+        return None
+    return net_cs.PythonHelpers.TimeSeriesHelper.ContiguousPeriods[time_period_type](net_start, num_periods)
+
+
 def net_time_series_to_pandas_series(net_time_series, freq):
     """Converts an instance of class Cmdty.TimeSeries.TimeSeries to a pandas Series"""
     if net_time_series.IsEmpty:
@@ -110,8 +138,8 @@ def net_time_series_to_pandas_series(net_time_series, freq):
     curve_start = net_time_series.Indices[0].Start
     curve_start_datetime = net_datetime_to_py_datetime(curve_start)
     index = pd.period_range(start=curve_start_datetime, freq=freq, periods=net_time_series.Count)
-    prices = [net_time_series.Data[idx] for idx in range(0, net_time_series.Count)]
-    return pd.Series(prices, index)
+    net_data = net_cs.PythonHelpers.TimeSeriesHelper.DataToArray[FREQ_TO_PERIOD_TYPE[freq]](net_time_series)
+    return pd.Series(as_numpy_array(net_data), index)
 
 
 def is_scalar(arg):
@@ -160,6 +188,42 @@ def wrapped_function(net_time_period):
     return dotnet.Func[time_period_type, net_tp.Day](wrapped_function)
 
 
+def wrap_settle_table_for_dotnet(py_settle_func, cmdty_storage, net_current_period):
+    """
+    Evaluates py_settle_func for every period from the earlier of the current period and storage start, to the
+    storage end, and returns a .NET Func<T, Day> which looks up the results in a table, hence avoiding .NET calling
+    back into Python for each period. Periods outside of this range are evaluated by calling py_settle_func.
+    """
+    freq = cmdty_storage.freq
+    start = min(net_time_period_to_pandas_period(net_current_period, freq), cmdty_storage.start)
+    end = cmdty_storage.end
+    net_fallback_settle_rule = wrap_settle_for_dotnet(py_settle_func, freq)
+    if start > end:
+        return net_fallback_settle_rule
+    periods = pd.period_range(start=start, end=end, freq=freq)
+    day_offsets = _settle_day_offsets(py_settle_func, periods)
+    time_period_type = FREQ_TO_PERIOD_TYPE[freq]
+    net_start = from_datetime_like(periods[0], time_period_type)
+    settle_date_lookup = net_cs.PythonHelpers.SettleDateLookup[time_period_type](
+        net_start, net_tp.Day(1970, 1, 1), as_net_array(day_offsets), net_fallback_settle_rule)
+    return settle_date_lookup.SettleDateRule
+
+
+def _settle_day_offsets(py_settle_func, periods: pd.PeriodIndex) -> np.ndarray:
+    """
+    Returns the settlement days for each period, as number of days since 1970-01-01. The settlement function is
+    called once for each period, with a pandas Period, as it is for all valuation functions.
+    """
+    epoch = date(1970, 1, 1)
+    day_offsets = np.empty(len(periods), dtype=np.int32)
+    for i, period in enumerate(periods):
+        settle_date = py_settle_func(period)
+        if isinstance(settle_date, str):
+            settle_date = dateutil.parser.parse(settle_date)
+        day_offsets[i] = (date(settle_date.year, settle_date.month, settle_date.day) - epoch).days
+    return day_offsets
+
+
 def wrap_on_progress_for_dotnet(py_on_progress):
     if py_on_progress is None:
         return None
@@ -311,13 +375,68 @@ def numerics_provider() -> str:
 
 
 def net_panel_to_data_frame(net_panel, freq: str) -> pd.DataFrame:
+    """Converts a Cmdty.Core.Common.Panel<T, double> to a pandas DataFrame, copying the data in bulk."""
     if net_panel.IsEmpty:
         return pd.DataFrame()
-    np_array = as_numpy_array(net_panel.RawData)
-    np_array.resize((net_panel.NumRows, net_panel.NumCols))
+    num_rows, num_cols = net_panel.NumRows, net_panel.NumCols
+    np_array = as_numpy_array(net_panel.RawData)[:num_rows * num_cols].reshape((num_rows, num_cols))
+    return pd.DataFrame(data=np_array, index=_net_panel_period_index(net_panel, freq))
+
+
+@contextlib.contextmanager
+def pinned_numpy_view(net_array) -> tp.Iterator[np.ndarray]:
+    """
+    Context manager yielding a `numpy.ndarray` which is a zero-copy view on the memory of a CLR `System.Array`.
+    The array is pinned, so that it cannot be moved by the .NET garbage collector, for the duration of the with
+    block. The view must not be used after exiting the with block; use as_numpy_array if a copy is required.
+    """
+    dims = tuple(net_array.GetLength(idx) for idx in range(net_array.Rank))
+    net_type = net_array.GetType().GetElementType().Name
+    try:
+        dtype = _MAP_NET_NP[net_type]
+    except KeyError:
+        raise NotImplementedError("pinned_numpy_view does not yet support System type {}".format(net_type))
+
+    handle = dotnet.Runtime.InteropServices.GCHandle.Alloc(net_array,
+                                                           dotnet.Runtime.InteropServices.GCHandleType.Pinned)
+    try:
+        num_bytes = int(np.prod(dims)) * dtype.itemsize
+        if num_bytes == 0:
+            yield np.empty(dims, dtype=dtype)
+        else:
+            source_ptr = handle.AddrOfPinnedObject().ToInt64()
+            buffer = (ctypes.c_byte * num_bytes).from_address(source_ptr)
+            yield np.frombuffer(buffer, dtype=dtype).reshape(dims)
+    finally:
+        handle.Free()
+
+
+@contextlib.contextmanager
+def net_panel_data_frame_view(net_panel, freq: str) -> tp.Iterator[pd.DataFrame]:
+    """
+    Context manager yielding a pandas DataFrame backed by a zero-copy view on the data of a
+    Cmdty.Core.Common.Panel<T, double>. See pinned_numpy_view for restrictions on the lifetime of the view.
+    """
+    if net_panel.IsEmpty:
+        yield pd.DataFrame()
+        return
+    with pinned_numpy_view(net_panel.RawData) as np_view:
+        num_rows, num_cols = net_panel.NumRows, net_panel.NumCols
+        np_view = np_view[:num_rows * num_cols].reshape((num_rows, num_cols))
+        yield pd.DataFrame(data=np_view, index=_net_panel_period_index(net_panel, freq), copy=False)
+
+
+def _net_panel_period_index(net_panel, freq: str) -> pd.PeriodIndex:
+    """
+    Creates the PeriodIndex for the rows of a Panel. For contiguous row keys this is calculated from the first row
+    key and the number of rows, otherwise each row key is converted individually.
+    """
+    time_period_type = FREQ_TO_PERIOD_TYPE[freq]
+    if net_cs.PythonHelpers.TimeSeriesHelper.IsContiguous[time_period_type](net_panel.RowKeys):
+        first_period = net_time_period_to_pandas_period(next(iter(net_panel.RowKeys)), freq)
+        return pd.period_range(start=first_period, freq=freq, periods=net_panel.NumRows)
     sim_periods = [net_time_period_to_pandas_period(p, freq) for p in net_panel.RowKeys]
-    period_index = pd.PeriodIndex(data=sim_periods, freq=freq)
-    return pd.DataFrame(data=np_array, index=period_index)
+    return pd.PeriodIndex(data=sim_periods, freq=freq)
 
 
 def create_net_log_adapter(logger, net_logger_type):
@@ -26,6 +26,7 @@
 from datetime import datetime
 import pandas as pd
 from tests import utils
+from cmdty_storage import utils as cs_utils
 
 
 class TestCmdtyStorage(unittest.TestCase):
@@ -199,6 +200,24 @@ def test_terminal_storage_npv_evaluates_to_function_specified(self):
                 self.assertEqual(TestCmdtyStorage._default_terminal_npv_calc(cmdty_price, terminal_inventory), 
                                  storage.terminal_storage_npv(cmdty_price, terminal_inventory))
 
+    def test_terminal_storage_npv_vectorized_evaluates_to_function_specified(self):
+        def vectorized_terminal_npv(cmdty_prices, terminal_inventories):
+            return TestCmdtyStorage._default_terminal_npv_calc(cmdty_prices, terminal_inventories)
+        storage = cs.CmdtyStorage(self._default_freq, self._default_storage_start, self._default_storage_end,
+                                  self._constant_injection_cost, self._constant_withdrawal_cost,
+                                  ratchets=self._default_ratchets, ratchet_interp=self._default_ratchets_interp,
+                                  terminal_storage_npv=vectorized_terminal_npv, vectorized_terminal_storage_npv=True)
+        for cmdty_price in [0.0, 23.85, 75.9, 100.22]:
+            for terminal_inventory in [0.0, 500.58, 1268.65, 1800.0]:
+                self.assertAlmostEqual(TestCmdtyStorage._default_terminal_npv_calc(cmdty_price, terminal_inventory),
+                                       storage.terminal_storage_npv(cmdty_price, terminal_inventory), places=10)
+
+    def test_terminal_storage_npv_built_in_terminal_value_at_spot(self):
+        storage = self._create_storage(terminal_storage_npv=cs.TerminalValueAtSpot(spot_multiple=0.9,
+                                                                                  per_unit_cost=0.25))
+        self.assertAlmostEqual((40.0 * 0.9 - 0.25) * 500.0, storage.terminal_storage_npv(40.0, 500.0), places=10)
+        self.assertEqual(False, storage.empty_at_end)
+
     def test_inject_withdraw_range_linearly_interpolated(self):
         storage = self._create_storage()
         # Inventory half way between pillars, so assert against mean of min/max inject/withdraw at the pillars
@@ -440,6 +459,79 @@ def test_numerics_provider_mkl(self):
         provider = cs.numerics_provider()
         self.assertEqual(provider, 'Intel MKL (x64; revision 13; ahead revision 12; MKL 2020.0 Update 1)')
 
+    def test_series_to_double_time_series_contiguous_index(self):
+        series = pd.Series(data=[1.5, 2.5, 3.5, 4.5],
+                           index=pd.period_range(start='2021-04-30 22:00', freq='H', periods=4))
+        net_ts = cs_utils.series_to_double_time_series(series, cs_utils.FREQ_TO_PERIOD_TYPE['H'])
+        self.assertEqual(4, net_ts.Count)
+        round_trip = cs_utils.net_time_series_to_pandas_series(net_ts, 'H')
+        pd.testing.assert_series_equal(series, round_trip)
+
+    def test_series_to_double_time_series_irregular_index(self):
+        index = pd.PeriodIndex([pd.Period('2021-04-01', freq='D'), pd.Period('2021-04-03', freq='D')])
+        series = pd.Series(data=[10.0, 11.0], index=index)
+        net_ts = cs_utils.series_to_double_time_series(series, cs_utils.FREQ_TO_PERIOD_TYPE['D'])
+        self.assertEqual(2, net_ts.Count)
+        self.assertEqual(3, net_ts.Indices[1].Day)
+        self.assertEqual(11.0, net_ts.Data[1])
+
+    def test_data_frame_to_net_double_panel_contiguous_index(self):
+        data_frame = pd.DataFrame(data=[[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]],
+                                  index=pd.period_range(start='2021-12-31', freq='D', periods=3))
+        net_panel = cs_utils.data_frame_to_net_double_panel(data_frame, cs_utils.FREQ_TO_PERIOD_TYPE['D'])
+        self.assertEqual(3, net_panel.NumRows)
+        self.assertEqual(2, net_panel.NumCols)
+        self.assertEqual(2022, list(net_panel.RowKeys)[2].Year)
+        self.assertEqual(6.0, net_panel.RawData[5])
+
+    def test_net_panel_to_data_frame_round_trip(self):
+        data_frame = pd.DataFrame(data=[[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]],
+                                  index=pd.period_range(start='2021-12-31', freq='D', periods=3))
+        net_panel = cs_utils.data_frame_to_net_double_panel(data_frame, cs_utils.FREQ_TO_PERIOD_TYPE['D'])
+        round_trip = cs_utils.net_panel_to_data_frame(net_panel, 'D')
+        pd.testing.assert_frame_equal(data_frame, round_trip)
+
+    def test_net_panel_data_frame_view_shares_memory(self):
+        data_frame = pd.DataFrame(data=[[1.0, 2.0], [3.0, 4.0]],
+                                  index=pd.period_range(start='2021-12-31', freq='D', periods=2))
+        net_panel = cs_utils.data_frame_to_net_double_panel(data_frame, cs_utils.FREQ_TO_PERIOD_TYPE['D'])
+        with cs_utils.net_panel_data_frame_view(net_panel, 'D') as data_frame_view:
+            pd.testing.assert_frame_equal(data_frame, data_frame_view)
+            net_panel.RawData[3] = 10.0
+            self.assertEqual(10.0, data_frame_view.iloc[1, 1])
+
+    def test_settle_day_offsets_period_and_date_returning_rules_equal(self):
+        periods = pd.period_range(start='2021-12-30', end='2022-02-02', freq='D')
+
+        def vectorizable_rule(period):
+            return period.asfreq('M').asfreq('D', 'end') + 20
+
+        def scalar_rule(period):
+            if period.month == 12:
+                return datetime(2022, 1, 20)
+            return (period.asfreq('M').asfreq('D', 'end') + 20).strftime('%Y-%m-%d')
+
+        vectorized_offsets = cs_utils._settle_day_offsets(vectorizable_rule, periods)
+        scalar_offsets = cs_utils._settle_day_offsets(scalar_rule, periods)
+        self.assertEqual(list(vectorized_offsets), list(scalar_offsets))
+        self.assertEqual((datetime(2022, 3, 20) - datetime(1970, 1, 1)).days, vectorized_offsets[-1])
+
+    def test_settle_day_offsets_rule_failing_on_index_input_called_per_period(self):
+        periods = pd.period_range(start='2021-12-30', end='2022-02-02', freq='D')
+        called_with = []
+
+        def period_only_rule(period):
+            called_with.append(period)
+            if not isinstance(period, pd.Period):
+                raise TypeError('Settlement rule only accepts a single period.')
+            return period.asfreq('M').asfreq('D', 'end') + 20
+
+        day_offsets = cs_utils._settle_day_offsets(period_only_rule, periods)
+        self.assertEqual(len(periods), len(day_offsets))
+        self.assertTrue(all(isinstance(period, pd.Period) for period in called_with))
+        self.assertEqual((datetime(2022, 1, 20) - datetime(1970, 1, 1)).days, day_offsets[0])
+        self.assertEqual((datetime(2022, 3, 20) - datetime(1970, 1, 1)).days, day_offsets[-1])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -22,9 +22,12 @@
 # OTHER DEALINGS IN THE SOFTWARE.
 
 import unittest
+import tempfile
 import pandas as pd
-from cmdty_storage import CmdtyStorage, three_factor_seasonal_value, \
-    multi_factor_value, value_from_sims, SimulationDataReturned
+import numpy as np
+from cmdty_storage import CmdtyStorage, TerminalValueAtSpot, three_factor_seasonal_value, \
+    multi_factor_value, value_from_sims, value_with_policy, value_curve_scenarios, value_portfolio, \
+    value_inventory_curve, SimulationDataReturned, MultiFactorExercisePolicy
 from tests import utils
 from os import path
 
@@ -115,6 +118,13 @@ def on_progress(progress):
         self.assertEqual(len(factors), len(multi_factor_val.sim_factors_valuation))
         for sim_factor_valuation in multi_factor_val.sim_factors_valuation:
             self.assertEqual((123, num_sims), sim_factor_valuation.shape)
+        self.assertEqual(num_sims, multi_factor_val.val_sim_num_sims)
+        # Timings
+        timings = multi_factor_val.timings
+        self.assertGreater(timings.lsmc_total, 0.0)
+        self.assertLessEqual(timings.input_conversion + timings.basis_function_compile + timings.intrinsic +
+                             timings.lsmc_total + timings.results_conversion, timings.total)
+        self.assertLessEqual(timings.lsmc_pseudo_inverse + timings.lsmc_regression, timings.lsmc_backward_induction)
 
         regress_deltas, regress_expected_profile, regress_intrinsic_profile, regress_trigger_prices = \
             self._load_valuation_results_csvs('multi_factor_test-1')
@@ -196,6 +206,190 @@ def twentieth_of_next_month(period): return period.asfreq('M').asfreq('D', 'end'
         self.assertTrue(multi_factor_val.expected_profile.equals(value_from_sims_result.expected_profile))
         self.assertEqual(multi_factor_val.intrinsic_npv, value_from_sims_result.intrinsic_npv)
 
+    def test_value_with_policy_saved_and_loaded_same_valuation_sims_as_multi_factor_value(self):
+        """Test which runs multi_factor_value, saves and loads the exercise policy from the results, then passes it to
+        value_with_policy with the seed used by multi_factor_value for the valuation simulation. Both valuations calculate
+        the terminal value of the forward simulation from the valuation simulation, so the results should be identical."""
+        storage_start = '2019-12-01'
+        storage_end = '2020-04-01'
+        cmdty_storage = CmdtyStorage('D', storage_start, storage_end, 1.23, 0.98, min_inventory=0.0,
+                                     max_inventory=100000.0, max_injection_rate=700.0, max_withdrawal_rate=700.0,
+                                     terminal_storage_npv=TerminalValueAtSpot(0.9, 0.5))
+        inventory = 0.0
+        val_date = '2019-08-29'
+        forward_curve = utils.create_piecewise_flat_series([23.87, 150.32, 150.32],
+                                                           [val_date, '2020-03-12', storage_end], freq='D')
+        interest_rate_curve = pd.Series(index=pd.period_range(val_date, '2020-06-01', freq='D'), dtype='float64')
+        interest_rate_curve[:] = 0.03
+
+        def twentieth_of_next_month(period): return period.asfreq('M').asfreq('D', 'end') + 20
+
+        spot_volatility = pd.Series(index=pd.period_range(val_date, '2020-06-01', freq='D'), dtype='float64')
+        spot_volatility[:] = 1.15
+        long_term_vol = pd.Series(index=pd.period_range(val_date, '2020-06-01', freq='D'), dtype='float64')
+        long_term_vol[:] = 0.14
+        factors = [(0.0, long_term_vol),
+                   (16.2, spot_volatility)]
+        factor_corrs = 0.64
+        num_sims = 500
+        fwd_sim_seed = 12
+        basis_funcs = '1 + x0 + x0**2 + x1 + x1*x1'
+
+        multi_factor_val = multi_factor_value(cmdty_storage, val_date, inventory, forward_curve,
+                                              interest_rate_curve, twentieth_of_next_month,
+                                              factors, factor_corrs, num_sims, basis_funcs, False,
+                                              seed=11, fwd_sim_seed=fwd_sim_seed)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            policy_path = path.join(temp_dir, 'policy.npz')
+            multi_factor_val.exercise_policy.save(policy_path)
+            loaded_policy = MultiFactorExercisePolicy.load(policy_path)
+        self.assertEqual(multi_factor_val.exercise_policy.val_date, loaded_policy.val_date)
+        self.assertEqual(basis_funcs, loaded_policy.basis_funcs)
+        for period, period_coeffs in multi_factor_val.exercise_policy.regression_coeffs.items():
+            np.testing.assert_array_equal(period_coeffs, loaded_policy.regression_coeffs[period])
+
+        value_with_policy_result = value_with_policy(cmdty_storage, val_date, inventory, forward_curve,
+                                                     interest_rate_curve, twentieth_of_next_month, loaded_policy,
+                                                     factors, factor_corrs, num_sims, False, seed=fwd_sim_seed)
+        self.assertEqual(multi_factor_val.npv, value_with_policy_result.npv)
+        self.assertTrue(multi_factor_val.deltas.equals(value_with_policy_result.deltas))
+        self.assertTrue(multi_factor_val.expected_profile.equals(value_with_policy_result.expected_profile))
+        self.assertEqual(0.0, value_with_policy_result.timings.lsmc_regression_price_sim)
+
+    def test_value_curve_scenarios_shifts_same_as_multi_factor_value_with_shifted_curves(self):
+        """Test which checks that valuing forward curve shift scenarios from one simulation gives the same results as
+        multi_factor_value with each shifted forward curve and the same seeds, as the simulated spot prices are
+        proportional to the forward curve."""
+        storage_start = '2019-12-01'
+        storage_end = '2020-04-01'
+        cmdty_storage = CmdtyStorage('D', storage_start, storage_end, 1.23, 0.98, min_inventory=0.0,
+                                     max_inventory=100000.0, max_injection_rate=700.0, max_withdrawal_rate=700.0)
+        inventory = 0.0
+        val_date = '2019-08-29'
+        forward_curve = utils.create_piecewise_flat_series([23.87, 150.32, 150.32],
+                                                           [val_date, '2020-03-12', storage_end], freq='D')
+        interest_rate_curve = pd.Series(index=pd.period_range(val_date, '2020-06-01', freq='D'), dtype='float64')
+        interest_rate_curve[:] = 0.03
+
+        def twentieth_of_next_month(period): return period.asfreq('M').asfreq('D', 'end') + 20
+
+        spot_volatility = pd.Series(index=pd.period_range(val_date, '2020-06-01', freq='D'), dtype='float64')
+        spot_volatility[:] = 1.15
+        long_term_vol = pd.Series(index=pd.period_range(val_date, '2020-06-01', freq='D'), dtype='float64')
+        long_term_vol[:] = 0.14
+        factors = [(0.0, long_term_vol),
+                   (16.2, spot_volatility)]
+        factor_corrs = 0.64
+        num_sims = 500
+        basis_funcs = '1 + x0 + x0**2 + x1 + x1*x1'
+        winter_shift = pd.Series(-4.5, index=pd.period_range('2020-01-01', '2020-02-29', freq='D'))
+        shifts = {'base': 0.0, 'up': 2.5, 'winter_down': winter_shift}
+
+        scenario_results = value_curve_scenarios(cmdty_storage, val_date, inventory, forward_curve, shifts,
+                                                 interest_rate_curve, twentieth_of_next_month, factors, factor_corrs,
+                                                 num_sims, basis_funcs, False, scenarios_are_shifts=True, seed=11,
+                                                 fwd_sim_seed=12, max_scenario_threads=2)
+        self.assertListEqual(list(shifts.keys()), list(scenario_results.npvs.index))
+        shifted_curves = [forward_curve, forward_curve + 2.5,
+                          forward_curve + winter_shift.reindex(forward_curve.index, fill_value=0.0)]
+        for scenario, shifted_curve in zip(shifts.keys(), shifted_curves):
+            multi_factor_val = multi_factor_value(cmdty_storage, val_date, inventory, shifted_curve,
+                                                  interest_rate_curve, twentieth_of_next_month, factors, factor_corrs,
+                                                  num_sims, basis_funcs, False, seed=11, fwd_sim_seed=12,
+                                                  sim_data_returned=SimulationDataReturned.NONE, stream_sims=False)
+            self.assertAlmostEqual(multi_factor_val.npv, scenario_results.npvs.loc[scenario, 'npv'], places=6)
+            np.testing.assert_allclose(multi_factor_val.deltas.values,
+                                       scenario_results.deltas.loc[scenario, multi_factor_val.deltas.index].values,
+                                       atol=1E-8)
+
+    def test_value_portfolio_same_as_multi_factor_value_of_each_facility(self):
+        """Test which checks that valuing a portfolio of facilities with the same active period, and so the same
+        simulated periods, gives the same results as multi_factor_value of each facility with the same seeds."""
+        storage_start = '2019-12-01'
+        storage_end = '2020-04-01'
+        storages = {'small': CmdtyStorage('D', storage_start, storage_end, 1.23, 0.98, min_inventory=0.0,
+                                          max_inventory=100000.0, max_injection_rate=700.0,
+                                          max_withdrawal_rate=700.0),
+                    'fast': CmdtyStorage('D', storage_start, storage_end, 0.52, 0.41, min_inventory=0.0,
+                                         max_inventory=250000.0, max_injection_rate=3500.0,
+                                         max_withdrawal_rate=4000.0)}
+        inventories = {'small': 0.0, 'fast': 0.0}
+        val_date = '2019-08-29'
+        forward_curve = utils.create_piecewise_flat_series([23.87, 150.32, 150.32],
+                                                           [val_date, '2020-03-12', storage_end], freq='D')
+        interest_rate_curve = pd.Series(index=pd.period_range(val_date, '2020-06-01', freq='D'), dtype='float64')
+        interest_rate_curve[:] = 0.03
+
+        def twentieth_of_next_month(period): return period.asfreq('M').asfreq('D', 'end') + 20
+
+        spot_volatility = pd.Series(index=pd.period_range(val_date, '2020-06-01', freq='D'), dtype='float64')
+        spot_volatility[:] = 1.15
+        long_term_vol = pd.Series(index=pd.period_range(val_date, '2020-06-01', freq='D'), dtype='float64')
+        long_term_vol[:] = 0.14
+        factors = [(0.0, long_term_vol),
+                   (16.2, spot_volatility)]
+        factor_corrs = 0.64
+        num_sims = 500
+        basis_funcs = '1 + x0 + x0**2 + x1 + x1*x1'
+
+        portfolio_results = value_portfolio(storages, inventories, val_date, forward_curve, interest_rate_curve,
+                                            twentieth_of_next_month, factors, factor_corrs, num_sims, basis_funcs,
+                                            False, seed=11, fwd_sim_seed=12, max_facility_threads=2)
+        self.assertListEqual(list(storages.keys()), list(portfolio_results.facility_results.keys()))
+        for facility, cmdty_storage in storages.items():
+            multi_factor_val = multi_factor_value(cmdty_storage, val_date, inventories[facility], forward_curve,
+                                                  interest_rate_curve, twentieth_of_next_month, factors, factor_corrs,
+                                                  num_sims, basis_funcs, False, seed=11, fwd_sim_seed=12,
+                                                  sim_data_returned=SimulationDataReturned.NONE, stream_sims=False)
+            facility_results = portfolio_results.facility_results[facility]
+            self.assertEqual(multi_factor_val.npv, facility_results.npv)
+            self.assertTrue(multi_factor_val.deltas.equals(facility_results.deltas))
+        self.assertAlmostEqual(sum(results.npv for results in portfolio_results.facility_results.values()),
+                               portfolio_results.npv)
+        expected_deltas = portfolio_results.facility_results['small'].deltas + \
+            portfolio_results.facility_results['fast'].deltas
+        np.testing.assert_allclose(expected_deltas.values, portfolio_results.deltas[expected_deltas.index].values)
+
+    def test_value_inventory_curve_npvs_within_standard_errors_of_multi_factor_value_at_each_inventory(self):
+        storage_start = '2019-12-01'
+        storage_end = '2020-04-01'
+        cmdty_storage = CmdtyStorage('D', storage_start, storage_end, 1.23, 0.98, min_inventory=0.0,
+                                     max_inventory=100000.0, max_injection_rate=700.0, max_withdrawal_rate=700.0)
+        val_date = '2019-08-29'
+        forward_curve = utils.create_piecewise_flat_series([23.87, 150.32, 150.32],
+                                                           [val_date, '2020-03-12', storage_end], freq='D')
+        interest_rate_curve = pd.Series(index=pd.period_range(val_date, '2020-06-01', freq='D'), dtype='float64')
+        interest_rate_curve[:] = 0.03
+
+        def twentieth_of_next_month(period): return period.asfreq('M').asfreq('D', 'end') + 20
+
+        spot_volatility = pd.Series(index=pd.period_range(val_date, '2020-06-01', freq='D'), dtype='float64')
+        spot_volatility[:] = 1.15
+        long_term_vol = pd.Series(index=pd.period_range(val_date, '2020-06-01', freq='D'), dtype='float64')
+        long_term_vol[:] = 0.14
+        factors = [(0.0, long_term_vol),
+                   (16.2, spot_volatility)]
+        factor_corrs = 0.64
+        num_sims = 500
+        basis_funcs = '1 + x0 + x0**2 + x1 + x1*x1'
+        inventories = [20000.0, 0.0, 10000.0]
+
+        curve_results = value_inventory_curve(cmdty_storage, val_date, inventories, forward_curve,
+                                              interest_rate_curve, twentieth_of_next_month, factors, factor_corrs,
+                                              num_sims, basis_funcs, False, seed=11, fwd_sim_seed=12)
+        self.assertListEqual(sorted(inventories), list(curve_results.npv.index))
+        self.assertListEqual(sorted(inventories), list(curve_results.deltas.index))
+        for inventory in inventories:
+            multi_factor_val = multi_factor_value(cmdty_storage, val_date, inventory, forward_curve,
+                                                  interest_rate_curve, twentieth_of_next_month, factors, factor_corrs,
+                                                  num_sims, basis_funcs, False, seed=11, fwd_sim_seed=12,
+                                                  sim_data_returned=SimulationDataReturned.NONE)
+            max_difference = 4.0 * (multi_factor_val.val_sim_standard_error +
+                                    curve_results.val_sim_standard_error[inventory])
+            self.assertAlmostEqual(multi_factor_val.npv, curve_results.npv[inventory], delta=max_difference)
+        expected_derivative = np.gradient(curve_results.npv.values, curve_results.npv.index.values)
+        np.testing.assert_allclose(expected_derivative, curve_results.npv_inventory_derivative.values)
+
     def test_three_factor_seasonal_regression(self):
         storage_start = '2019-12-01'
         storage_end = '2020-04-01'
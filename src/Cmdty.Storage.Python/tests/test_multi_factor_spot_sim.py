@@ -88,6 +88,43 @@ def test_regression(self):
         self.assertEqual(42.812676607997183, sim4['2021-01-15'])
         self.assertEqual(76.586790647813046, sim4['2021-07-30'])
 
+    def test_simulate_rng_sobol_same_seed_same_sims_mean_close_to_forward(self):
+        factors = [(0.0, {date(2020, 8, 1): 0.35, date(2021, 7, 30): 0.32}),
+                   (2.5, {date(2020, 8, 1): 0.15, date(2021, 7, 30): 0.21})]
+        factor_corrs = 0.6
+        fwd_curve = {date(2020, 8, 1): 56.85, date(2021, 7, 30): 62.453}
+        current_date = date(2020, 7, 27)
+        spot_periods_to_sim = list(fwd_curve.keys())
+        num_sims = 1024
+        sim_spot_prices = MultiFactorSpotSim('D', factors, factor_corrs, current_date, fwd_curve,
+                                             spot_periods_to_sim, 12, rng='sobol').simulate(num_sims)
+        sim_spot_prices_same_seed = MultiFactorSpotSim('D', factors, factor_corrs, current_date, fwd_curve,
+                                                       spot_periods_to_sim, 12, rng='sobol').simulate(num_sims)
+        self.assertEqual((2, num_sims), sim_spot_prices.shape)
+        np.testing.assert_array_equal(sim_spot_prices.values, sim_spot_prices_same_seed.values)
+        for period, fwd_price in fwd_curve.items():
+            self.assertAlmostEqual(fwd_price, sim_spot_prices.loc[pd.Period(period, freq='D')].mean(),
+                                   delta=fwd_price * 0.005)
+
+    def test_simulate_rng_sobol_antithetic_log_prices_of_sim_pairs_symmetric(self):
+        factors = [(0.0, {date(2020, 8, 1): 0.35, date(2021, 7, 30): 0.32}),
+                   (2.5, {date(2020, 8, 1): 0.15, date(2021, 7, 30): 0.21})]
+        factor_corrs = 0.6
+        fwd_curve = {date(2020, 8, 1): 56.85, date(2021, 7, 30): 62.453}
+        current_date = date(2020, 7, 27)
+        spot_periods_to_sim = list(fwd_curve.keys())
+        sim_spot_prices = MultiFactorSpotSim('D', factors, factor_corrs, current_date, fwd_curve,
+                                             spot_periods_to_sim, 12, antithetic=True, rng='sobol').simulate(8)
+        log_spot_sims = np.log(sim_spot_prices.values)
+        sum_log_spot_pairs = log_spot_sims[:, 0::2] + log_spot_sims[:, 1::2]
+        for period_sums in sum_log_spot_pairs:
+            np.testing.assert_allclose(period_sums, period_sums[0])
+
+    def test_init_rng_invalid_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            MultiFactorSpotSim('D', [(0.0, {date(2020, 8, 1): 0.35})], None, date(2020, 7, 27),
+                               {date(2020, 8, 1): 56.85}, [date(2020, 8, 1)], 12, rng='halton')
+
 
 if __name__ == '__main__':
     unittest.main()
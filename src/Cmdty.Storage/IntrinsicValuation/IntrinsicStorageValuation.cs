@@ -146,8 +146,9 @@ IntrinsicStorageValuationResults<T> IIntrinsicCalculate<T>.Calculate()
                 if (startingInventory > terminalMaxInventory)
                     throw new InventoryConstraintsCannotBeFulfilledException("Current inventory is greater than the maximum allowed in the end period.");
 
-                double cmdtyPrice = forwardCurve[storage.EndPeriod];
-                double npv = storage.TerminalStorageNpv(cmdtyPrice, startingInventory);
+                var terminalNpv = new double[1];
+                storage.TerminalStorageNpvs(new[] {forwardCurve[storage.EndPeriod]}, new[] {startingInventory}, terminalNpv);
+                double npv = terminalNpv[0];
                 return new IntrinsicStorageValuationResults<T>(npv, TimeSeries<T, StorageProfile>.Empty);
             }
 
@@ -196,12 +197,15 @@ IntrinsicStorageValuationResults<T> IIntrinsicCalculate<T>.Calculate()
                 var storageValuesGrid = new double[inventorySpaceGrid.Length];
 
                 double cmdtyPrice = forwardCurve[periodLoop];
-                Func<double, double> continuationValueByInventory = storageValueByInventory[backCounter + 1];
+                (double nextStepInventorySpaceMin, double nextStepInventorySpaceMax) = inventorySpace[periodLoop.Offset(1)];
+                Func<double, double> continuationValueByInventory = backCounter == inventorySpace.Count - 2
+                    ? TerminalNpvByInventory(storage, periodLoop, inventorySpaceGrid, nextStepInventorySpaceMin,
+                                                nextStepInventorySpaceMax, cmdtyPriceAtEnd, numericalTolerance)
+                    : storageValueByInventory[backCounter + 1];
 
                 Day cmdtySettlementDate = settleDateRule(periodLoop);
                 double discountFactorFromCmdtySettlement = DiscountToCurrentDay(cmdtySettlementDate);
 
-                (double nextStepInventorySpaceMin, double nextStepInventorySpaceMax) = inventorySpace[periodLoop.Offset(1)];
                 for (int i = 0; i < inventorySpaceGrid.Length; i++)
                 {
                     double inventory = inventorySpaceGrid[i];
@@ -221,6 +225,7 @@ IntrinsicStorageValuationResults<T> IIntrinsicCalculate<T>.Calculate()
             var periods = new T[numStorageProfiles];
 
             double inventoryLoop = startingInventory;
+            Func<double, double> terminalNpvByInventory = storageValueByInventory[inventorySpace.Count - 1];
             T startActiveStorage = inventorySpace.Start.Offset(-1);
             for (int i = 0; i < numStorageProfiles; i++)
             {
@@ -229,7 +234,7 @@ IntrinsicStorageValuationResults<T> IIntrinsicCalculate<T>.Calculate()
                 StorageProfile storageProfile;
                 if (periodLoop.Equals(storage.EndPeriod))
                 {
-                    double endPeriodNpv = storage.MustBeEmptyAtEnd ? 0.0 : storage.TerminalStorageNpv(spotPrice, inventoryLoop);
+                    double endPeriodNpv = storage.MustBeEmptyAtEnd ? 0.0 : terminalNpvByInventory(inventoryLoop);
                     storageProfile = new StorageProfile(inventoryLoop, 0.0, 0.0, 0.0, endPeriodNpv);
                 }
                 else
@@ -237,8 +242,14 @@ IntrinsicStorageValuationResults<T> IIntrinsicCalculate<T>.Calculate()
                     Day cmdtySettlementDate = settleDateRule(periodLoop);
                     double discountFactorFromCmdtySettlement = DiscountToCurrentDay(cmdtySettlementDate);
 
-                    Func<double, double> continuationValueByInventory = storageValueByInventory[i];
                     (double nextStepInventorySpaceMin, double nextStepInventorySpaceMax) = inventorySpace[periodLoop.Offset(1)];
+                    Func<double, double> continuationValueByInventory = storageValueByInventory[i];
+                    if (i == numStorageProfiles - 2)
+                    {
+                        terminalNpvByInventory = TerminalNpvByInventory(storage, periodLoop, new[] {inventoryLoop}, nextStepInventorySpaceMin,
+                                                    nextStepInventorySpaceMax, cmdtyPriceAtEnd, numericalTolerance);
+                        continuationValueByInventory = terminalNpvByInventory;
+                    }
                     (double _, double optimalInjectWithdraw, double cmdtyConsumedOnAction, double inventoryLoss, double optimalPeriodPv) =
                         OptimalDecisionAndValue(storage, periodLoop, inventoryLoop, nextStepInventorySpaceMin,
                             nextStepInventorySpaceMax, spotPrice, continuationValueByInventory, discountFactorFromCmdtySettlement,
@@ -259,6 +270,36 @@ IntrinsicStorageValuationResults<T> IIntrinsicCalculate<T>.Calculate()
             return new IntrinsicStorageValuationResults<T>(storageNpv, new TimeSeries<T, StorageProfile>(periods, storageProfiles));
         }
 
+        // Evaluates the terminal NPV at every inventory reachable from inventories in the period before the end with one call
+        // to TerminalStorageNpvs, rather than a call per decision. Inventories not reached are evaluated individually.
+        private static Func<double, double> TerminalNpvByInventory(ICmdtyStorage<T> storage, T period, IReadOnlyList<double> inventories,
+            double nextStepInventorySpaceMin, double nextStepInventorySpaceMax, double cmdtyPriceAtEnd, double numericalTolerance)
+        {
+            var inventoriesAfterDecision = new HashSet<double>();
+            foreach (double inventory in inventories)
+            {
+                InjectWithdrawRange injectWithdrawRange = storage.GetInjectWithdrawRange(period, inventory);
+                double inventoryLoss = storage.CmdtyInventoryPercentLoss(period) * inventory;
+                double[] decisionSet = StorageHelper.CalculateBangBangDecisionSet(injectWithdrawRange, inventory, inventoryLoss,
+                                                        nextStepInventorySpaceMin, nextStepInventorySpaceMax, numericalTolerance);
+                foreach (double decisionInjectWithdraw in decisionSet)
+                    inventoriesAfterDecision.Add(inventory + decisionInjectWithdraw - inventoryLoss); // Same as in StorageValueForDecision
+            }
+
+            double[] finalInventories = inventoriesAfterDecision.ToArray();
+            double[] cmdtyPrices = Enumerable.Repeat(cmdtyPriceAtEnd, finalInventories.Length).ToArray();
+            var terminalNpvs = new double[finalInventories.Length];
+            storage.TerminalStorageNpvs(cmdtyPrices, finalInventories, terminalNpvs);
+
+            var terminalNpvLookup = new Dictionary<double, double>(finalInventories.Length);
+            for (int i = 0; i < finalInventories.Length; i++)
+                terminalNpvLookup[finalInventories[i]] = terminalNpvs[i];
+
+            return finalInventory => terminalNpvLookup.TryGetValue(finalInventory, out double terminalNpv)
+                                        ? terminalNpv
+                                        : storage.TerminalStorageNpv(cmdtyPriceAtEnd, finalInventory);
+        }
+
         private static (double StorageNpv, double OptimalInjectWithdraw, double CmdtyConsumedOnAction, double InventoryLoss, double PeriodPv) 
             OptimalDecisionAndValue(ICmdtyStorage<T> storage, T period, double inventory,
             double nextStepInventorySpaceMin, double nextStepInventorySpaceMax, double cmdtyPrice,
@@ -0,0 +1,57 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+namespace Cmdty.Storage
+{
+    /// <summary>
+    /// Working arrays used by one thread of the forward simulation to find the optimal decisions for a shard of simulations. Held
+    /// per thread and reused across periods and batches, so that no arrays are allocated per simulation.
+    /// </summary>
+    internal sealed class ForwardSimulationBuffers
+    {
+        public int[] SimIndices { get; private set; } = new int[0];
+        public double[] Inventories { get; private set; } = new double[0];
+        public double[] SpotPrices { get; private set; } = new double[0];
+        public int[] IndicesOfOptimalDecision { get; private set; } = new int[0];
+        public double[] RegressContinuationValues { get; private set; } = new double[0];
+
+        public void EnsureCapacity(int numSims)
+        {
+            if (SimIndices.Length >= numSims)
+                return;
+            SimIndices = new int[numSims];
+            Inventories = new double[numSims];
+            SpotPrices = new double[numSims];
+            IndicesOfOptimalDecision = new int[numSims];
+        }
+
+        public void EnsureRegressContinuationValuesCapacity(int length)
+        {
+            if (RegressContinuationValues.Length < length)
+                RegressContinuationValues = new double[length];
+        }
+
+    }
+}
@@ -0,0 +1,87 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+
+namespace Cmdty.Storage
+{
+    internal static class InventoryGridInterpolation
+    {
+        /// <summary>
+        /// Finds the inventory grid points either side of an inventory, and the weights used to linearly interpolate between them.
+        /// If the inventory is within numericalTolerance of a grid point, both indices are those of this grid point with
+        /// lower weight of 1.0.
+        /// </summary>
+        /// <param name="inventoryGrid">Inventory grid points, in ascending order.</param>
+        /// <param name="inventory">Inventory to interpolate at.</param>
+        /// <param name="numericalTolerance">Tolerance within which the inventory is considered to equal a grid point.</param>
+        /// <param name="gridSpacing">Spacing between the grid points, if the grid was created by
+        /// <see cref="FixedSpacingStateSpaceGridCalc"/>, in which case the indices are calculated in closed form rather than
+        /// bisection. NaN if the spacing is not fixed.</param>
+        public static (int LowerIndex, int UpperIndex, double LowerWeight, double UpperWeight) Interpolate(double[] inventoryGrid, 
+            double inventory, double numericalTolerance, double gridSpacing)
+        {
+            int lowerIndex, upperIndex;
+            if (double.IsNaN(gridSpacing) || inventoryGrid.Length < 2)
+                (lowerIndex, upperIndex) = StorageHelper.BisectInventorySpace(inventoryGrid, inventory, numericalTolerance);
+            else
+                (lowerIndex, upperIndex) = FixedSpacingGridIndices(inventoryGrid, inventory, numericalTolerance, gridSpacing);
+
+            if (lowerIndex == upperIndex)
+                return (lowerIndex, upperIndex, 1.0, 0.0);
+            if (StorageHelper.EqualsWithinTol(inventory, inventoryGrid[upperIndex], numericalTolerance))
+                return (upperIndex, upperIndex, 1.0, 0.0);
+
+            double lowerInventory = inventoryGrid[lowerIndex];
+            double upperInventory = inventoryGrid[upperIndex];
+            double inventoryGridSpace = upperInventory - lowerInventory;
+            double lowerWeight = (upperInventory - inventory) / inventoryGridSpace;
+            double upperWeight = 1.0 - lowerWeight;
+            return (lowerIndex, upperIndex, lowerWeight, upperWeight);
+        }
+
+        private static (int LowerIndex, int UpperIndex) FixedSpacingGridIndices(double[] inventoryGrid, double inventory, 
+            double numericalTolerance, double gridSpacing)
+        {
+            int topIndex = inventoryGrid.Length - 1;
+            if (inventory < inventoryGrid[0] - numericalTolerance || inventory > inventoryGrid[topIndex] + numericalTolerance)
+                throw new ArgumentException("Inventory is outside of inventoryGrid bounds.");
+
+            int lowerIndex = (int)Math.Floor((inventory - inventoryGrid[0]) / gridSpacing);
+            lowerIndex = Math.Max(0, Math.Min(lowerIndex, topIndex - 1));
+            // Grid points are calculated by repeated addition of the spacing, so floating-point error can
+            // result in the closed form index being one out
+            while (lowerIndex > 0 && inventoryGrid[lowerIndex] > inventory)
+                lowerIndex--;
+            while (lowerIndex < topIndex - 1 && inventoryGrid[lowerIndex + 1] < inventory)
+                lowerIndex++;
+
+            if (StorageHelper.EqualsWithinTol(inventory, inventoryGrid[lowerIndex], numericalTolerance))
+                return (lowerIndex, lowerIndex);
+            return (lowerIndex, lowerIndex + 1);
+        }
+
+    }
+}
@@ -0,0 +1,105 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Linq;
+using Cmdty.Core.Common;
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+
+namespace Cmdty.Storage
+{
+    /// <summary>
+    /// Exercise policy calculated by the LSMC backward induction, consisting of the inventory grid for each period, and
+    /// the regression coefficients which approximate the continuation value at each next period inventory grid point as a
+    /// function of the simulated factors. Setting <see cref="LsmcValuationParameters{T}.Builder.ExercisePolicy"/> values
+    /// new simulations, or an updated forward curve, using only the forward simulation.
+    /// </summary>
+    public sealed class LsmcExercisePolicy<T>
+        where T : ITimePeriod<T>
+    {
+        public T CurrentPeriod { get; }
+        public double Inventory { get; }
+        public int NumBasisFunctions { get; }
+        /// <summary>
+        /// Spacing of the inventory grids if fixed, otherwise NaN. Used when interpolating between grid points.
+        /// </summary>
+        public double InventoryGridSpacing { get; }
+        /// <summary>
+        /// Inventory grid points by period, starting with the period before storage is active, for which the grid only
+        /// contains the current inventory.
+        /// </summary>
+        public TimeSeries<T, double[]> InventorySpaceGrids { get; }
+        /// <summary>
+        /// Regression coefficients keyed by the period of the regressors, i.e. the period before that of the continuation value
+        /// approximated. Rows correspond to the next period inventory grid points, and columns to basis functions.
+        /// </summary>
+        public TimeSeries<T, Panel<int, double>> RegressionCoefficients { get; }
+        /// <summary>
+        /// Expected next period storage values by inventory grid point, used as continuation values for the current period,
+        /// for which the spot price is known. Empty if the current period is before the storage active period.
+        /// </summary>
+        public double[] CurrentPeriodContinuationValues { get; }
+
+        public LsmcExercisePolicy(T currentPeriod, double inventory, int numBasisFunctions, double inventoryGridSpacing,
+            TimeSeries<T, double[]> inventorySpaceGrids, TimeSeries<T, Panel<int, double>> regressionCoefficients,
+            double[] currentPeriodContinuationValues)
+        {
+            if (inventorySpaceGrids == null) throw new ArgumentNullException(nameof(inventorySpaceGrids));
+            if (regressionCoefficients == null) throw new ArgumentNullException(nameof(regressionCoefficients));
+            if (currentPeriodContinuationValues == null) throw new ArgumentNullException(nameof(currentPeriodContinuationValues));
+            if (numBasisFunctions <= 0)
+                throw new ArgumentOutOfRangeException(nameof(numBasisFunctions), "Number of basis functions must be positive.");
+
+            foreach (T regressionPeriod in regressionCoefficients.Indices)
+            {
+                T nextPeriod = regressionPeriod.Offset(1);
+                if (!inventorySpaceGrids.ContainsKey(nextPeriod))
+                    throw new ArgumentException($"Inventory space grids do not contain period {nextPeriod}.", nameof(inventorySpaceGrids));
+                Panel<int, double> periodCoefficients = regressionCoefficients[regressionPeriod];
+                if (periodCoefficients.NumRows != inventorySpaceGrids[nextPeriod].Length || periodCoefficients.NumCols != numBasisFunctions)
+                    throw new ArgumentException($"Regression coefficients for period {regressionPeriod} must have one row per next period inventory " +
+                                                "grid point and one column per basis function.", nameof(regressionCoefficients));
+            }
+            if (currentPeriodContinuationValues.Length > 0 && 
+                currentPeriodContinuationValues.Length != inventorySpaceGrids[currentPeriod.Offset(1)].Length)
+                throw new ArgumentException("Current period continuation values must have one element per next period inventory grid point.", 
+                    nameof(currentPeriodContinuationValues));
+
+            CurrentPeriod = currentPeriod;
+            Inventory = inventory;
+            NumBasisFunctions = numBasisFunctions;
+            InventoryGridSpacing = inventoryGridSpacing;
+            InventorySpaceGrids = inventorySpaceGrids;
+            RegressionCoefficients = regressionCoefficients;
+            CurrentPeriodContinuationValues = currentPeriodContinuationValues.ToArray();
+        }
+
+        public override string ToString()
+        {
+            return $"{nameof(CurrentPeriod)}: {CurrentPeriod}, {nameof(Inventory)}: {Inventory}, {nameof(NumBasisFunctions)}: {NumBasisFunctions}";
+        }
+    }
+}
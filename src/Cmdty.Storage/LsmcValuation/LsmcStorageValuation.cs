@@ -24,9 +24,12 @@
 #endregion
 
 using System;
+using System.Collections.Concurrent;
 using System.Collections.Generic;
 using System.Globalization;
 using System.Linq;
+using System.Threading;
+using System.Threading.Tasks;
 using Cmdty.Core.Common;
 using Cmdty.Core.Simulation;
 using Cmdty.Storage.PythonHelpers;
@@ -34,7 +37,6 @@
 using Cmdty.TimeSeries;
 using MathNet.Numerics.LinearAlgebra;
 using MathNet.Numerics.LinearAlgebra.Double;
-using MathNet.Numerics.LinearAlgebra.Factorization;
 using MathNet.Numerics.Statistics;
 using Microsoft.Extensions.Logging;
 
@@ -46,6 +48,8 @@ public class LsmcStorageValuation
 
         // This has been very roughly estimated. Probably there is a better way of splitting up progress by estimating the order of the backward and forward components.
         private const double BackwardPcntTime = 0.66;
+        // Tolerance within which an inventory after decision is considered to be on a next period inventory grid point
+        private const double InventoryGridPointTolerance = 1E-8;
 
         public LsmcStorageValuation(ILogger<LsmcStorageValuation> logger = null)
         {
@@ -56,6 +60,15 @@ public LsmcStorageValuation(ILogger<LsmcStorageValuation> logger = null)
         
         public LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> lsmcParams)
             where T : ITimePeriod<T>
+            => Calculate(lsmcParams, null, null);
+
+        // If backwardInductionInventories is not null the backward induction is performed over the union of the inventory spaces
+        // reachable from each of its inventories, so the resulting exercise policy can be used for any of these starting inventories.
+        // If exercisePolicyOverride is not null it is used in place of lsmcParams.ExercisePolicy, without the checks performed by the
+        // parameters builder, which require the policy to have been calculated for lsmcParams.Inventory.
+        private LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> lsmcParams, 
+            IReadOnlyList<double> backwardInductionInventories, LsmcExercisePolicy<T> exercisePolicyOverride)
+            where T : ITimePeriod<T>
         {
             // TODO split this very long method up into several called sub-methods
             var stopwatches = new Stopwatches();
@@ -88,7 +101,9 @@ public LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> ls
 
             var basisFunctionList = lsmcParams.BasisFunctions.ToList();
 
-            TimeSeries<T, InventoryRange> inventorySpace = StorageHelper.CalculateInventorySpace(lsmcParams.Storage, lsmcParams.Inventory, lsmcParams.CurrentPeriod);
+            TimeSeries<T, InventoryRange> inventorySpace = backwardInductionInventories == null ? 
+                StorageHelper.CalculateInventorySpace(lsmcParams.Storage, lsmcParams.Inventory, lsmcParams.CurrentPeriod) :
+                InventorySpaceUnion(lsmcParams.Storage, backwardInductionInventories, lsmcParams.CurrentPeriod);
             T startActiveStorage = inventorySpace.Start.Offset(-1);
 
             if (lsmcParams.ForwardCurve.Start.CompareTo(startActiveStorage) > 0)
@@ -97,79 +112,160 @@ public LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> ls
             if (lsmcParams.ForwardCurve.End.CompareTo(inventorySpace.End) < 0)
                 throw new ArgumentException("Forward curve does not extend until storage end period.", nameof(lsmcParams.ForwardCurve));
 
-            // Perform backward induction
-            _logger?.LogInformation("Starting regression spot price simulation.");
-            stopwatches.RegressionPriceSimulation.Start();
-            ISpotSimResults<T> regressionSpotSims = lsmcParams.RegressionSpotSimsGenerator();
-            stopwatches.RegressionPriceSimulation.Stop();
-            _logger?.LogInformation("Spot regression price simulation complete.");
+            LsmcExercisePolicy<T> exercisePolicy = exercisePolicyOverride ?? lsmcParams.ExercisePolicy;
+            if (exercisePolicy != null)
+            {
+                if (!exercisePolicy.InventorySpaceGrids.Start.Equals(startActiveStorage) || !exercisePolicy.InventorySpaceGrids.End.Equals(inventorySpace.End))
+                    throw new ArgumentException("Exercise policy inventory space grids do not cover the storage active periods.", nameof(lsmcParams.ExercisePolicy));
+                if (exercisePolicy.NumBasisFunctions != basisFunctionList.Count)
+                    throw new ArgumentException("Exercise policy number of basis functions does not equal the number of basis functions.", nameof(lsmcParams.ExercisePolicy));
+            }
+
+            // Perform backward induction, unless an exercise policy is provided, in which case only the valuation simulation is needed
+            ISpotSimResults<T> regressionSpotSims = null;
+            ISpotSimResults<T> policyValuationSpotSims = null;
+            if (exercisePolicy == null)
+            {
+                _logger?.LogInformation("Starting regression spot price simulation.");
+                stopwatches.RegressionPriceSimulation.Start();
+                regressionSpotSims = lsmcParams.RegressionSpotSimsGenerator();
+                stopwatches.RegressionPriceSimulation.Stop();
+                _logger?.LogInformation("Spot regression price simulation complete.");
+                if (regressionSpotSims is IStreamedSpotSimResults streamedRegressionSpotSims)
+                {
+                    // Streamed simulations are generated during the backward induction, so all periods are never held in memory
+                    if ((lsmcParams.SimulationDataReturned & (SimulationDataReturned.SpotPricesForRegression | SimulationDataReturned.FactorsForRegression)) != 0)
+                        throw new ArgumentException("Simulated spot prices and factors cannot be returned for a streamed regression simulation.",
+                            nameof(lsmcParams.SimulationDataReturned));
+                    // Design matrices are populated up to PseudoInverseLookAhead periods ahead of the backward induction, which reads the
+                    // spot prices of its period after the pseudo-inverse pipeline has scheduled one further period
+                    streamedRegressionSpotSims.NumPeriodsRetained = lsmcParams.PseudoInverseLookAhead + 2;
+                }
+            }
+            else
+            {
+                _logger?.LogInformation("Starting valuation spot price simulation.");
+                stopwatches.ValuationPriceSimulation.Start();
+                policyValuationSpotSims = lsmcParams.ValuationSpotSimsGenerator();
+                stopwatches.ValuationPriceSimulation.Stop();
+                _logger?.LogInformation("Valuation spot price simulation complete.");
+            }
 
             int numPeriods = inventorySpace.Count + 1; // +1 as inventorySpaceGrid doesn't contain first period
             var inventorySpaceGrids = new double[numPeriods][];
 
             // Calculate NPVs at end period
             (double endMinInventory, double endMaxInventory) = inventorySpace[lsmcParams.Storage.EndPeriod];
-            double[] endInventorySpaceGrid = lsmcParams.GridCalc.GetGridPoints(endMinInventory, endMaxInventory)
-                                            .ToArray();
+            double[] endInventorySpaceGrid = exercisePolicy?.InventorySpaceGrids[lsmcParams.Storage.EndPeriod] ?? 
+                                            lsmcParams.GridCalc.GetGridPoints(endMinInventory, endMaxInventory).ToArray();
             inventorySpaceGrids[numPeriods - 1] = endInventorySpaceGrid;
 
-            var storageActualValuesNextPeriod = new Vector<double>[endInventorySpaceGrid.Length];
-            ReadOnlySpan<double> endPeriodSimSpotPrices = regressionSpotSims.SpotPricesForPeriod(lsmcParams.Storage.EndPeriod).Span;
-
-            int numSims = regressionSpotSims.NumSims;
-
-            for (int i = 0; i < endInventorySpaceGrid.Length; i++)
+            int numSims = (regressionSpotSims ?? policyValuationSpotSims).NumSims;
+            // Grid points for a fixed spacing grid can be found in closed form, otherwise bisection is used
+            double inventoryGridSpacing;
+            if (exercisePolicy != null)
+                inventoryGridSpacing = exercisePolicy.InventoryGridSpacing;
+            else
+                inventoryGridSpacing = lsmcParams.GridCalc is FixedSpacingStateSpaceGridCalc fixedSpacingGridCalc ? 
+                                                fixedSpacingGridCalc.Spacing : double.NaN;
+
+            // Storage values by simulation and inventory grid point are held in numSims x numGridPoints matrices, with the 
+            // values for each grid point contiguous. The memory of these is reused across time periods by renting from matrixPool.
+            var matrixPool = new MatrixPool();
+            Matrix<double> storageActualValuesNextPeriod = matrixPool.Rent(numSims, endInventorySpaceGrid.Length);
+
+            // Terminal NPVs calculated in batches of simulations, so a terminal NPV function implemented outside of .NET
+            // is called once per grid point, rather than once per grid point per simulation. The backward induction uses the regression
+            // simulation end period spot prices, whereas the forward simulation always uses the valuation simulation end period spot prices.
+            if (exercisePolicy == null)
             {
-                double inventory = endInventorySpaceGrid[i];
-                var storageValueBySim = new DenseVector(numSims);
-                for (int simIndex = 0; simIndex < numSims; simIndex++)
+                double[] endPeriodSimSpotPricesArray = regressionSpotSims.SpotPricesForPeriod(lsmcParams.Storage.EndPeriod).ToArray();
+                var endInventories = new double[numSims];
+                var storageValueBySim = new double[numSims];
+                for (int i = 0; i < endInventorySpaceGrid.Length; i++)
                 {
-                    double simSpotPrice = endPeriodSimSpotPrices[simIndex];
-                    storageValueBySim[simIndex] = lsmcParams.Storage.TerminalStorageNpv(simSpotPrice, inventory);
+                    double inventory = endInventorySpaceGrid[i];
+                    for (int simIndex = 0; simIndex < numSims; simIndex++)
+                        endInventories[simIndex] = inventory;
+                    lsmcParams.Storage.TerminalStorageNpvs(endPeriodSimSpotPricesArray, endInventories, storageValueBySim);
+                    storageValueBySim.CopyTo(ColumnSpan(storageActualValuesNextPeriod, i));
                 }
-                storageActualValuesNextPeriod[i] = storageValueBySim;
             }
-            
-            // Calculate discount factor function
-            Day dayToDiscountTo = lsmcParams.CurrentPeriod.First<Day>(); // TODO add valuation date to LsmcValuationParameters?
 
-            // Memoize the discount factor
-            var discountFactorCache = new Dictionary<Day, double>(); // TODO do this in more elegant way and share with intrinsic calc
-            double DiscountToCurrentDay(Day cashFlowDate)
+            // Spot price is known for the current period, so the same price is used for all simulations
+            double[] currentPeriodSpotPrices = null;
+            double[] CurrentPeriodSpotPrices()
             {
-                if (!discountFactorCache.TryGetValue(cashFlowDate, out double discountFactor))
+                if (currentPeriodSpotPrices == null)
                 {
-                    discountFactor = lsmcParams.DiscountFactors(dayToDiscountTo, cashFlowDate);
-                    discountFactorCache[cashFlowDate] = discountFactor;
+                    currentPeriodSpotPrices = new double[numSims];
+                    currentPeriodSpotPrices.AsSpan().Fill(lsmcParams.ForwardCurve[lsmcParams.CurrentPeriod]);
                 }
-                return discountFactor;
+                return currentPeriodSpotPrices;
             }
+            
+            // Calculate discount factor function
+            Day dayToDiscountTo = lsmcParams.CurrentPeriod.First<Day>(); // TODO add valuation date to LsmcValuationParameters?
 
-            Matrix<double> designMatrix = Matrix<double>.Build.Dense(numSims, basisFunctionList.Count);
-            for (int i = 0; i < numSims; i++)
-                designMatrix[i, 0] = 1.0;
+            // Memoize the discount factor. Concurrent dictionary used as cache can be accessed from multiple threads.
+            var discountFactorCache = new ConcurrentDictionary<Day, double>(); // TODO do this in more elegant way and share with intrinsic calc
+            Func<Day, double> calcDiscountFactor = cashFlowDate => lsmcParams.DiscountFactors(dayToDiscountTo, cashFlowDate);
+            double DiscountToCurrentDay(Day cashFlowDate) => discountFactorCache.GetOrAdd(cashFlowDate, calcDiscountFactor);
 
-            // Reuse heap memory
-            Matrix<double> qTranspose = Matrix<double>.Build.Dense(basisFunctionList.Count, numSims);
-            Matrix<double> pseudoInverse = Matrix<double>.Build.Dense(basisFunctionList.Count, numSims);
+            var parallelOptions = new ParallelOptions
+            {
+                MaxDegreeOfParallelism = lsmcParams.MaxDegreeOfParallelism,
+                CancellationToken = lsmcParams.CancellationToken
+            };
 
             // Loop back through other periods
             T[] periodsForResultsTimeSeries = startActiveStorage.EnumerateTo(inventorySpace.End).ToArray();
 
+            // There are no backward induction periods if an exercise policy is provided
+            T[] backwardInductionPeriods = exercisePolicy == null ? periodsForResultsTimeSeries.Reverse().Skip(1).ToArray() : new T[0];
+
+            // Regression pseudo-inverses only depend on the simulated regressors, so can be calculated ahead of the backward induction.
+            // When this happens the PseudoInverse stopwatch measures the time the backward induction waits for them.
+            T[] regressionPeriods = backwardInductionPeriods
+                                    .Where(regressionPeriod => !regressionPeriod.Equals(lsmcParams.CurrentPeriod)).ToArray();
+            var pseudoInversePipeline = new PseudoInversePipeline<T>(regressionPeriods, 
+                (matrix, regressionPeriod) => PopulateDesignMatrix(matrix, regressionPeriod, regressionSpotSims, basisFunctionList), numSims, 
+                basisFunctionList.Count, lsmcParams.PseudoInverseLookAhead, lsmcParams.CancellationToken);
+
             var regressCoeffsBuilder = new TimeSeries<T, Panel<int, double>>.Builder(periodsForResultsTimeSeries.Length - 1);
 
             int backCounter = numPeriods - 2;
-            Vector<double> numSimsMemoryBuffer = Vector<double>.Build.Dense(numSims); // Heap memory that will be reused
             double progress = 0.0;
             double backStepProgressPcnt = BackwardPcntTime / (periodsForResultsTimeSeries.Length - 1);
 
             double[] currentPeriodContinuationValues = null;
             _logger?.LogInformation("Starting backward induction.");
             stopwatches.BackwardInduction.Start();
-            foreach (T period in periodsForResultsTimeSeries.Reverse().Skip(1))
+            foreach (T period in backwardInductionPeriods)
             {
                 double[] nextPeriodInventorySpaceGrid = inventorySpaceGrids[backCounter + 1];
-                Vector<double>[] storageRegressValuesNextPeriod = new Vector<double>[nextPeriodInventorySpaceGrid.Length];
+                double[] inventorySpaceGrid;
+                if (period.Equals(startActiveStorage))
+                    inventorySpaceGrid = new[] { lsmcParams.Inventory };
+                else
+                {
+                    (double inventorySpaceMin, double inventorySpaceMax) = inventorySpace[period];
+                    inventorySpaceGrid = lsmcParams.GridCalc.GetGridPoints(inventorySpaceMin, inventorySpaceMax)
+                                                .ToArray();
+                }
+                (double nextStepInventorySpaceMin, double nextStepInventorySpaceMax) = inventorySpace[period.Offset(1)];
+
+                double[][] decisionSets = new double[inventorySpaceGrid.Length][];
+                for (int inventoryIndex = 0; inventoryIndex < inventorySpaceGrid.Length; inventoryIndex++)
+                {
+                    double inventory = inventorySpaceGrid[inventoryIndex];
+                    InjectWithdrawRange injectWithdrawRange = lsmcParams.Storage.GetInjectWithdrawRange(period, inventory);
+                    double inventoryLoss = lsmcParams.Storage.CmdtyInventoryPercentLoss(period) * inventory;
+                    decisionSets[inventoryIndex] = StorageHelper.CalculateBangBangDecisionSet(injectWithdrawRange, inventory, inventoryLoss,
+                        nextStepInventorySpaceMin, nextStepInventorySpaceMax, lsmcParams.NumericalTolerance, lsmcParams.ExtraDecisions);
+                }
+
+                Matrix<double> storageRegressValuesNextPeriod = matrixPool.Rent(numSims, nextPeriodInventorySpaceGrid.Length);
 
                 if (period.Equals(lsmcParams.CurrentPeriod))
                 {
@@ -177,81 +273,86 @@ public LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> ls
                     // Current period, for which the price isn't random so expected storage values are just the average of the values for all sims
                     for (int i = 0; i < nextPeriodInventorySpaceGrid.Length; i++)
                     {
-                        Vector<double> storageValuesBySimNextPeriod = storageActualValuesNextPeriod[i];
-                        double expectedStorageValueNextPeriod = storageValuesBySimNextPeriod.Average();
-                        storageRegressValuesNextPeriod[i] = Vector<double>.Build.Dense(numSims, expectedStorageValueNextPeriod); // TODO this is a bit inefficent, review
+                        double expectedStorageValueNextPeriod = Average(ColumnSpan(storageActualValuesNextPeriod, i));
+                        ColumnSpan(storageRegressValuesNextPeriod, i).Fill(expectedStorageValueNextPeriod);
                         currentPeriodContinuationValues[i] = expectedStorageValueNextPeriod;
                     }
                 }
                 else
                 {
-                    // TODO option to use SVD rather than QR for regression. Will be slower, but will function with design matrix collinearity.
-                    // TODO normalise mean and standard deviation of regressors for better stability
-                    // TODO perform regression by direct call to Intel MKL dgels/dgelss, 
-                    PopulateDesignMatrix(designMatrix, period, regressionSpotSims, basisFunctionList);
                     stopwatches.PseudoInverse.Start();
-                    QR<double> designMatrixQr = designMatrix.QR(QRMethod.Thin);
-                    Matrix<double> rInverse = designMatrixQr.R.Inverse();
-                    designMatrixQr.Q.Transpose(qTranspose);
-                    rInverse.Multiply(qTranspose, pseudoInverse);
+                    (Matrix<double> regressionDesignMatrix, Matrix<double> pseudoInverse) = pseudoInversePipeline.Take(period);
                     stopwatches.PseudoInverse.Stop();
 
                     var thisPeriodRegressCoeffs = new Panel<int, double>(Enumerable.Range(0, nextPeriodInventorySpaceGrid.Length), basisFunctionList.Count);
-                    // TODO doing the regressions for all next inventory could be inefficient as they might not all be needed
-                    for (int i = 0; i < nextPeriodInventorySpaceGrid.Length; i++)
+                    // Regressions for all inventory grid points performed together as two matrix-matrix multiplications, which are
+                    // level-3 BLAS calls when the MKL provider is used
+                    stopwatches.Regression.Start();
+                    Matrix<double> regressResults = matrixPool.Rent(basisFunctionList.Count, nextPeriodInventorySpaceGrid.Length); // Column for each inventory grid point
+                    pseudoInverse.Multiply(storageActualValuesNextPeriod, regressResults);
+                    // Coefficients are used by the forward simulation for all grid points, but the regression continuation values are
+                    // only needed for the grid points which bracket the inventories reachable from this period's inventory grid.
+                    // Columns of storageRegressValuesNextPeriod outside of this range are not populated.
+                    (int lowerReachableIndex, int upperReachableIndex) = ReachableGridIndices(inventorySpaceGrid, decisionSets,
+                        nextPeriodInventorySpaceGrid, lsmcParams.Storage.CmdtyInventoryPercentLoss(period), inventoryGridSpacing);
+                    int numReachableGridPoints = upperReachableIndex - lowerReachableIndex + 1;
+                    if (numReachableGridPoints == nextPeriodInventorySpaceGrid.Length)
+                        regressionDesignMatrix.Multiply(regressResults, storageRegressValuesNextPeriod);
+                    else
                     {
-                        Vector<double> storageValuesBySimNextPeriod = storageActualValuesNextPeriod[i];
-                        Vector<double> regressResults = pseudoInverse.Multiply(storageValuesBySimNextPeriod);
-                        Vector<double> estimatedContinuationValues = designMatrix.Multiply(regressResults);
-                        storageRegressValuesNextPeriod[i] = estimatedContinuationValues;
-                        // Save regression coeffs for later use
-                        Span<double> regressCoeffsSpan = thisPeriodRegressCoeffs[i];
-                        for (int j = 0; j < regressCoeffsSpan.Length; j++)
-                            regressCoeffsSpan[j] = regressResults[j];
+                        int numBasisFunctions = basisFunctionList.Count;
+                        Matrix<double> reachableRegressResults = matrixPool.Rent(numBasisFunctions, numReachableGridPoints);
+                        Array.Copy(regressResults.AsColumnMajorArray(), lowerReachableIndex * numBasisFunctions, 
+                            reachableRegressResults.AsColumnMajorArray(), 0, numReachableGridPoints * numBasisFunctions);
+                        Matrix<double> reachableRegressValues = matrixPool.Rent(numSims, numReachableGridPoints);
+                        regressionDesignMatrix.Multiply(reachableRegressResults, reachableRegressValues);
+                        Array.Copy(reachableRegressValues.AsColumnMajorArray(), 0, storageRegressValuesNextPeriod.AsColumnMajorArray(), 
+                            lowerReachableIndex * numSims, numReachableGridPoints * numSims);
+                        matrixPool.Return(reachableRegressResults);
+                        matrixPool.Return(reachableRegressValues);
                     }
+                    stopwatches.Regression.Stop();
+                    stopwatches.NumRegressionGridPoints += nextPeriodInventorySpaceGrid.Length;
+                    stopwatches.NumRegressionGridPointsSkipped += nextPeriodInventorySpaceGrid.Length - numReachableGridPoints;
+                    pseudoInversePipeline.Release();
+                    // Save regression coeffs for later use
+                    for (int i = 0; i < nextPeriodInventorySpaceGrid.Length; i++)
+                        ColumnSpan(regressResults, i).CopyTo(thisPeriodRegressCoeffs[i]);
+                    matrixPool.Return(regressResults);
                     regressCoeffsBuilder.Add(period, thisPeriodRegressCoeffs); // Key for regressCoeffs is period of simulated prices/factors, i.e. the regressor, which is the period before the period of continuation value being approximated
                 }
                 
-                double[] inventorySpaceGrid;
-                if (period.Equals(startActiveStorage))
-                    inventorySpaceGrid = new[] { lsmcParams.Inventory };
-                else
-                {
-                    (double inventorySpaceMin, double inventorySpaceMax) = inventorySpace[period];
-                    inventorySpaceGrid = lsmcParams.GridCalc.GetGridPoints(inventorySpaceMin, inventorySpaceMax)
-                                                .ToArray();
-                }
-                (double nextStepInventorySpaceMin, double nextStepInventorySpaceMax) = inventorySpace[period.Offset(1)];
-
-                var storageActualValuesThisPeriod = new Vector<double>[inventorySpaceGrid.Length]; // TODO change type to DenseVector?
+                Matrix<double> storageActualValuesThisPeriod = matrixPool.Rent(numSims, inventorySpaceGrid.Length);
+                double[] storageActualValuesNextPeriodArray = storageActualValuesNextPeriod.AsColumnMajorArray();
+                double[] storageRegressValuesNextPeriodArray = storageRegressValuesNextPeriod.AsColumnMajorArray();
+                double[] storageActualValuesThisPeriodArray = storageActualValuesThisPeriod.AsColumnMajorArray();
 
                 Day cmdtySettlementDate = lsmcParams.SettleDateRule(period);
                 double discountFactorFromCmdtySettlement = DiscountToCurrentDay(cmdtySettlementDate);
 
-                ReadOnlySpan<double> simulatedPrices;
-                if (period.Equals(lsmcParams.CurrentPeriod))
-                {
-                    double spotPrice = lsmcParams.ForwardCurve[period];
-                    simulatedPrices = Enumerable.Repeat(spotPrice, numSims).ToArray(); // TODO inefficient - review.
-                }                
-                else
-                    simulatedPrices = regressionSpotSims.SpotPricesForPeriod(period).Span;
+                ReadOnlyMemory<double> simulatedPricesMemory = period.Equals(lsmcParams.CurrentPeriod) ? CurrentPeriodSpotPrices() 
+                                                                    : regressionSpotSims.SpotPricesForPeriod(period);
 
-                for (int inventoryIndex = 0; inventoryIndex < inventorySpaceGrid.Length; inventoryIndex++)
+                // Storage values for each inventory grid point only depend on the next period values, so can be calculated concurrently.
+                // Each call writes to its own column of storageActualValuesThisPeriod.
+                void CalcStorageValuesForInventory(int inventoryIndex)
                 {
+                    ReadOnlySpan<double> simulatedPrices = simulatedPricesMemory.Span;
                     double inventory = inventorySpaceGrid[inventoryIndex];
-                    InjectWithdrawRange injectWithdrawRange = lsmcParams.Storage.GetInjectWithdrawRange(period, inventory);
                     double inventoryLoss = lsmcParams.Storage.CmdtyInventoryPercentLoss(period) * inventory;
-                    double[] decisionSet = StorageHelper.CalculateBangBangDecisionSet(injectWithdrawRange, inventory, inventoryLoss,
-                        nextStepInventorySpaceMin, nextStepInventorySpaceMax, lsmcParams.NumericalTolerance, lsmcParams.ExtraDecisions);
+                    double[] decisionSet = decisionSets[inventoryIndex];
                     IReadOnlyList<DomesticCashFlow> inventoryCostCashFlows = lsmcParams.Storage.CmdtyInventoryCost(period, inventory);
                     double inventoryCostNpv = inventoryCostCashFlows.Sum(cashFlow => cashFlow.Amount * DiscountToCurrentDay(cashFlow.Date));
 
                     double[] injectWithdrawCostNpvs = new double[decisionSet.Length];
                     double[] cmdtyUsedForInjectWithdrawVolume = new double[decisionSet.Length];
                     
-                    var regressionContinuationValueByDecisionSet = new Vector<double>[decisionSet.Length];
-                    var actualContinuationValueByDecisionSet = new Vector<double>[decisionSet.Length];
+                    // Continuation values for each decision are linearly interpolated between the values of two adjacent next period inventory grid points.
+                    // The offsets are the start of the values for the grid points in the column-major storage value arrays.
+                    var lowerGridOffsets = new int[decisionSet.Length];
+                    var upperGridOffsets = new int[decisionSet.Length];
+                    var lowerWeights = new double[decisionSet.Length];
+                    var upperWeights = new double[decisionSet.Length];
                     for (int decisionIndex = 0; decisionIndex < decisionSet.Length; decisionIndex++)
                     {
                         double decisionVolume = decisionSet[decisionIndex];
@@ -264,80 +365,31 @@ public LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> ls
 
                         // Calculate continuation values
                         double inventoryAfterDecision = inventory + decisionVolume - inventoryLoss;
-                        for (int inventoryGridIndex = 0; inventoryGridIndex < nextPeriodInventorySpaceGrid.Length; inventoryGridIndex++) // TODO use binary search?
-                        {
-                            double nextPeriodInventory = nextPeriodInventorySpaceGrid[inventoryGridIndex];
-                            if (Math.Abs(nextPeriodInventory - inventoryAfterDecision) < 1E-8) // TODO get rid of hard coded constant
-                            {
-                                regressionContinuationValueByDecisionSet[decisionIndex] = storageRegressValuesNextPeriod[inventoryGridIndex];
-                                actualContinuationValueByDecisionSet[decisionIndex] = storageActualValuesNextPeriod[inventoryGridIndex];
-                                break;
-                            }
-                            if (nextPeriodInventory > inventoryAfterDecision)
-                            {
-                                // Linearly interpolate inventory space
-                                double lowerInventory = nextPeriodInventorySpaceGrid[inventoryGridIndex - 1];
-                                double upperInventory = nextPeriodInventory;
-                                double inventoryGridSpace = upperInventory - lowerInventory;
-                                double lowerWeight = (upperInventory - inventoryAfterDecision) / inventoryGridSpace;
-                                double upperWeight = 1.0 - lowerWeight;
-                                
-                                // Regression storage values
-                                Vector<double> lowerRegressStorageValues = storageRegressValuesNextPeriod[inventoryGridIndex - 1];
-                                Vector<double> upperRegressStorageValues = storageRegressValuesNextPeriod[inventoryGridIndex];
-
-                                var interpolatedRegressContinuationValue = 
-                                    WeightedAverage<T>(lowerRegressStorageValues, 
-                                        lowerWeight, upperRegressStorageValues, upperWeight, numSimsMemoryBuffer);
-
-                                regressionContinuationValueByDecisionSet[decisionIndex] = interpolatedRegressContinuationValue;
-
-                                // Actual (simulated) storage values
-                                Vector<double> lowerActualStorageValues = storageActualValuesNextPeriod[inventoryGridIndex - 1];
-                                Vector<double> upperActualStorageValues = storageActualValuesNextPeriod[inventoryGridIndex];
-
-                                Vector<double> interpolatedActualContinuationValue =
-                                        WeightedAverage<T>(lowerActualStorageValues, lowerWeight, 
-                                            upperActualStorageValues, upperWeight, numSimsMemoryBuffer);
-                                actualContinuationValueByDecisionSet[decisionIndex] = interpolatedActualContinuationValue;
-                                break;
-                            }
-                        }
+                        (int lowerIndex, int upperIndex, double lowerWeight, double upperWeight) = InventoryGridInterpolation.Interpolate(
+                            nextPeriodInventorySpaceGrid, inventoryAfterDecision, InventoryGridPointTolerance, inventoryGridSpacing);
+                        lowerGridOffsets[decisionIndex] = lowerIndex * numSims;
+                        upperGridOffsets[decisionIndex] = upperIndex * numSims;
+                        lowerWeights[decisionIndex] = lowerWeight;
+                        upperWeights[decisionIndex] = upperWeight;
                     }
 
-                    var storageValuesBySim = new DenseVector(numSims);
-                    var decisionNpvsRegress = new double[decisionSet.Length];
-                    for (int simIndex = 0; simIndex < numSims; simIndex++)
-                    {
-                        double simulatedSpotPrice = simulatedPrices[simIndex];
-                        for (var decisionIndex = 0; decisionIndex < decisionSet.Length; decisionIndex++)
-                        {
-                            double decisionVolume = decisionSet[decisionIndex];
-
-                            double injectWithdrawNpv = -decisionVolume * simulatedSpotPrice * discountFactorFromCmdtySettlement;
-                            double cmdtyUsedForInjectWithdrawNpv = -cmdtyUsedForInjectWithdrawVolume[decisionIndex] * simulatedSpotPrice * 
-                                                                   discountFactorFromCmdtySettlement;
-                            double immediateNpv = injectWithdrawNpv - injectWithdrawCostNpvs[decisionIndex] + cmdtyUsedForInjectWithdrawNpv;
-
-                            double continuationValue = regressionContinuationValueByDecisionSet[decisionIndex][simIndex];
+                    Span<double> storageValuesBySim = new Span<double>(storageActualValuesThisPeriodArray, inventoryIndex * numSims, numSims);
+                    OptimalDecisionKernel.CalcStorageValues(simulatedPrices, discountFactorFromCmdtySettlement, inventoryCostNpv, decisionSet,
+                        cmdtyUsedForInjectWithdrawVolume, injectWithdrawCostNpvs, lowerGridOffsets, upperGridOffsets, lowerWeights, upperWeights,
+                        storageRegressValuesNextPeriodArray, storageActualValuesNextPeriodArray, storageValuesBySim);
+                }
 
-                            double totalNpv = immediateNpv + continuationValue - inventoryCostNpv;
-                            decisionNpvsRegress[decisionIndex] = totalNpv;
-                        }
-                        (double optimalRegressDecisionNpv, int indexOfOptimalDecision) = StorageHelper.MaxValueAndIndex(decisionNpvsRegress);
-                        
-                        // TODO do this tidier an potentially more efficiently
-                        double adjustFromRegressToActualContinuation =  
-                                                - regressionContinuationValueByDecisionSet[indexOfOptimalDecision][simIndex]
-                                                + actualContinuationValueByDecisionSet[indexOfOptimalDecision][simIndex];
-                        double optimalActualDecisionNpv = optimalRegressDecisionNpv + adjustFromRegressToActualContinuation;
-
-                        storageValuesBySim[simIndex] = optimalActualDecisionNpv;
-                    }
-                    storageActualValuesThisPeriod[inventoryIndex] = storageValuesBySim;
+                if (lsmcParams.MaxDegreeOfParallelism == 1)
+                {
+                    for (int inventoryIndex = 0; inventoryIndex < inventorySpaceGrid.Length; inventoryIndex++)
+                        CalcStorageValuesForInventory(inventoryIndex);
                 }
+                else
+                    Parallel.For(0, inventorySpaceGrid.Length, parallelOptions, CalcStorageValuesForInventory);
 
                 inventorySpaceGrids[backCounter] = inventorySpaceGrid;
+                matrixPool.Return(storageActualValuesNextPeriod);
+                matrixPool.Return(storageRegressValuesNextPeriod);
                 storageActualValuesNextPeriod = storageActualValuesThisPeriod;
                 backCounter--;
                 progress += backStepProgressPcnt;
@@ -347,17 +399,27 @@ public LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> ls
             stopwatches.BackwardInduction.Stop();
             _logger?.LogInformation("Completed backward induction.");
 
-            _logger?.LogInformation("Starting valuation spot price simulation.");
-            stopwatches.ValuationPriceSimulation.Start();
-            ISpotSimResults<T> valuationSpotSims = lsmcParams.ValuationSpotSimsGenerator();
-            stopwatches.ValuationPriceSimulation.Stop();
-            _logger?.LogInformation("Valuation spot price simulation complete.");
+            if (exercisePolicy != null)
+            {
+                for (int i = 0; i < numPeriods; i++)
+                    inventorySpaceGrids[i] = exercisePolicy.InventorySpaceGrids.Data[i];
+                currentPeriodContinuationValues = exercisePolicy.CurrentPeriodContinuationValues;
+            }
 
             (bool returnSimSpotPriceForRegress, bool returnSimSpotPriceForValuation, bool returnSimFactorsForRegression, bool returnSimFactorsForValuation, 
                     bool returnSimInventory, bool returnSimInjectWithdrawVolume, bool returnSimCmdtyConsumed,
                     bool returnSimInventoryLoss, bool returnSimNetVolume, bool returnSimPv) = ParseSimulationDataReturned(lsmcParams.SimulationDataReturned);
 
-            TimeSeries<T, Panel<int, double>> regressCoeffs = regressCoeffsBuilder.Build();
+            // The regression simulation is no longer needed, so unless it is returned, it is released before the valuation simulation to reduce
+            // peak memory.
+            Panel<T, double> regressionSpotPricePanel = returnSimSpotPriceForRegress && regressionSpotSims != null ? 
+                                                            ExtractSpotSims(regressionSpotSims) : Panel<T, double>.CreateEmpty();
+            // TODO in future refactor ISpotSimResults should make use of Panel type, making this code not necessary
+            Panel<T, double>[] regressionMarkovFactors = returnSimFactorsForRegression && regressionSpotSims != null ? ExtractMarkovFactorsToPanel(regressionSpotSims) 
+                : Enumerable.Range(0, (regressionSpotSims ?? policyValuationSpotSims).NumFactors).Select(i => Panel<T, double>.CreateEmpty()).ToArray();
+            regressionSpotSims = null;
+
+            TimeSeries<T, Panel<int, double>> regressCoeffs = exercisePolicy?.RegressionCoefficients ?? regressCoeffsBuilder.Build();
             var inventoryBySim = returnSimInventory ? new Panel<T, double>(periodsForResultsTimeSeries, numSims) : Panel<T, double>.CreateEmpty();
             var injectWithdrawVolumeBySim = returnSimInjectWithdrawVolume ? new Panel<T, double>(periodsForResultsTimeSeries, numSims) : Panel<T, double>.CreateEmpty();
             var cmdtyConsumedBySim = returnSimCmdtyConsumed ? new Panel<T, double>(periodsForResultsTimeSeries, numSims) : Panel<T, double>.CreateEmpty();
@@ -369,159 +431,372 @@ public LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> ls
 
             var deltas = new double[periodsForResultsTimeSeries.Length];
 
-            Span<double> inventoryBuffer1 = returnSimInventory ? Span<double>.Empty : new double[numSims];
-            Span<double> inventoryBuffer2 = returnSimInventory ? Span<double>.Empty : new double[numSims];
+            // If ValuationSimBatchSize is set the valuation simulation is generated and valued in batches of simulations, otherwise as a single batch.
+            // Sums over simulations are accumulated across batches in simulation index order.
+            int valuationSimBatchSize = lsmcParams.ValuationSimBatchSize ?? numSims;
+            int numBatches = (numSims + valuationSimBatchSize - 1) / valuationSimBatchSize;
+            int numDecisionPeriods = periodsForResultsTimeSeries.Length - 1;
+            var sumsSpotPriceTimesVolume = new double[numDecisionPeriods];
+            var sumsInjectWithdrawVolume = new double[numDecisionPeriods];
+            var sumsCmdtyConsumed = new double[numDecisionPeriods];
+            var sumsInventoryLoss = new double[numDecisionPeriods];
+            var sumsPv = new double[numDecisionPeriods];
+            var sumsInventory = new double[periodsForResultsTimeSeries.Length];
+            // Sums of regression continuation values by next period inventory grid point, used to calculate trigger prices
+            var sumsRegressContinuationValues = new double[numDecisionPeriods][];
+            for (int i = 0; i < numDecisionPeriods; i++)
+                sumsRegressContinuationValues[i] = new double[inventorySpaceGrids[i + 1].Length];
+            double terminalPv = 0.0;
+
+            // Pathwise PV of the intrinsic profile, less its expected value, used as a control variate for the NPV estimate
+            double[] controlVariateCoefficients = null;
+            double[] controlVariateBySim = null;
+            if (lsmcParams.IntrinsicControlVariate)
+            {
+                controlVariateCoefficients = IntrinsicControlVariateCoefficients(lsmcParams, periodsForResultsTimeSeries, numDecisionPeriods,
+                                                    DiscountToCurrentDay);
+                controlVariateBySim = new double[numSims];
+            }
 
+            Panel<T, double> valuationSpotPricePanel = Panel<T, double>.CreateEmpty();
+            Panel<T, double>[] valuationMarkovFactors = null;
 
-            Span<double> thisPeriodInventories = returnSimInventory ? inventoryBySim[0] : inventoryBuffer1;
-            Span<double> nextPeriodInventories = returnSimInventory ? inventoryBySim[1] : inventoryBuffer2;
+            // Inventory buffers alternate between periods if simulated inventories aren't returned
+            double[] inventoryBuffer1 = returnSimInventory ? null : new double[valuationSimBatchSize];
+            double[] inventoryBuffer2 = returnSimInventory ? null : new double[valuationSimBatchSize];
 
-            for (int i = 0; i < thisPeriodInventories.Length; i++)
-                thisPeriodInventories[i] = lsmcParams.Inventory;
+            // Results of the optimal decision for each simulation of a batch, which are summed over simulations in a single thread in simulation index order,
+            // so that results do not depend on the number of threads used
+            var optimalDecisionVolumes = new double[valuationSimBatchSize];
+            var optimalCmdtyConsumed = new double[valuationSimBatchSize];
+            var inventoryLosses = new double[valuationSimBatchSize];
+            var optimalImmediatePvs = new double[valuationSimBatchSize];
+            // Working arrays for finding the optimal decisions, one set per thread, reused across periods and batches
+            var forwardSimulationBuffers = new ThreadLocal<ForwardSimulationBuffers>(() => new ForwardSimulationBuffers());
 
-            // Trigger price variables
-            int numTriggerPriceVolumes = 10; // TODO move to parameters
-            var triggerVolumeProfilesArray = new TriggerPriceVolumeProfiles[periodsForResultsTimeSeries.Length - 1];
-            var triggerPricesArray = new TriggerPrices[periodsForResultsTimeSeries.Length - 1];
+            // If TargetValuationSimStandardError is set, the simulations valued can be fewer than numSims
+            int numValuationSims = numSims;
+            var valuationSimConvergence = new List<ValuationSimConvergencePoint>(numBatches);
 
-            double forwardStepProgressPcnt = (1.0 - BackwardPcntTime) / periodsForResultsTimeSeries.Length;
-            _logger?.LogInformation("Starting calculations of optimal decisions by simulation forward in time.");
-            stopwatches.ForwardSimulation.Start();
-            for (int periodIndex = 0; periodIndex < periodsForResultsTimeSeries.Length - 1; periodIndex++) // TODO more clearly handle this -1
+            double forwardStepProgressPcnt = (exercisePolicy == null ? 1.0 - BackwardPcntTime : 1.0) / periodsForResultsTimeSeries.Length / numBatches;
+            for (int batchIndex = 0; batchIndex < numBatches; batchIndex++)
             {
-                T period = periodsForResultsTimeSeries[periodIndex];
-                
-                double[] nextPeriodInventorySpaceGrid = inventorySpaceGrids[periodIndex + 1];
-                //Vector<double>[] regressContinuationValues = storageRegressValuesByPeriod[periodIndex + 1];
-                Vector<double>[] regressContinuationValues = new Vector<double>[nextPeriodInventorySpaceGrid.Length];
-                if (period.Equals(lsmcParams.CurrentPeriod))
+                int batchStartSimIndex = batchIndex * valuationSimBatchSize;
+                int batchNumSims = Math.Min(valuationSimBatchSize, numSims - batchStartSimIndex);
+
+                ISpotSimResults<T> valuationSpotSims = policyValuationSpotSims;
+                if (valuationSpotSims == null)
                 {
-                    // Current period, for which the price isn't random so expected storage values are just the average of the values for all sims
-                    for (int i = 0; i < nextPeriodInventorySpaceGrid.Length; i++)
-                    {
-                        double expectedStorageValueNextPeriod = currentPeriodContinuationValues[i];
-                        regressContinuationValues[i] = Vector<double>.Build.Dense(numSims, expectedStorageValueNextPeriod); // TODO this is a bit inefficent, review
-                    }
+                    _logger?.LogInformation(numBatches == 1 ? "Starting valuation spot price simulation." :
+                                                $"Starting valuation spot price simulation batch {batchIndex + 1} of {numBatches}.");
+                    stopwatches.ValuationPriceSimulation.Start();
+                    valuationSpotSims = lsmcParams.ValuationSimBatchSize == null ? lsmcParams.ValuationSpotSimsGenerator() 
+                                                                : lsmcParams.ValuationSpotSimsBatchGenerator(batchNumSims);
+                    stopwatches.ValuationPriceSimulation.Stop();
+                    _logger?.LogInformation("Valuation spot price simulation complete.");
+                }
+                if (valuationSpotSims is IStreamedSpotSimResults && (returnSimSpotPriceForValuation || returnSimFactorsForValuation))
+                    throw new ArgumentException("Simulated spot prices and factors cannot be returned for a streamed valuation simulation.",
+                        nameof(lsmcParams.SimulationDataReturned));
+
+                if (numBatches == 1)
+                {
+                    if (returnSimSpotPriceForValuation)
+                        valuationSpotPricePanel = ExtractSpotSims(valuationSpotSims);
+                    valuationMarkovFactors = returnSimFactorsForValuation ? ExtractMarkovFactorsToPanel(valuationSpotSims)
+                        : Enumerable.Range(0, valuationSpotSims.NumFactors).Select(i => Panel<T, double>.CreateEmpty()).ToArray();
                 }
                 else
                 {
-                    PopulateDesignMatrix(designMatrix, period, valuationSpotSims, basisFunctionList);
-                    Panel<int, double> regressCoeffsThisPeriod = regressCoeffs[period];
-                    for (int i = 0; i < nextPeriodInventorySpaceGrid.Length; i++)
+                    if (batchIndex == 0)
                     {
-                        Span<double> regressCoeffsSpan = regressCoeffsThisPeriod[i];
-                        var regressCoeffsVector = Vector<double>.Build.DenseOfArray(regressCoeffsSpan.ToArray());
-                        regressContinuationValues[i] = designMatrix * regressCoeffsVector;
+                        if (returnSimSpotPriceForValuation)
+                            valuationSpotPricePanel = new Panel<T, double>(valuationSpotSims.SimulatedPeriods, numSims);
+                        valuationMarkovFactors = Enumerable.Range(0, valuationSpotSims.NumFactors).Select(i => returnSimFactorsForValuation ? 
+                            new Panel<T, double>(valuationSpotSims.SimulatedPeriods, numSims) : Panel<T, double>.CreateEmpty()).ToArray();
                     }
+                    CopySimBatchToPanels(valuationSpotSims, batchStartSimIndex, returnSimSpotPriceForValuation ? valuationSpotPricePanel : null,
+                        returnSimFactorsForValuation ? valuationMarkovFactors : null);
                 }
 
-                Day cmdtySettlementDate = lsmcParams.SettleDateRule(period);
-                double discountFactorFromCmdtySettlement = DiscountToCurrentDay(cmdtySettlementDate);
-                double discountForDeltas = lsmcParams.DiscountDeltas ? discountFactorFromCmdtySettlement : 1.0;
-                double sumSpotPriceTimesVolume = 0.0;
+                Span<double> InventoriesForPeriod(int resultsPeriodIndex) => returnSimInventory ? 
+                                    inventoryBySim[resultsPeriodIndex].Slice(batchStartSimIndex, batchNumSims)
+                                    : (resultsPeriodIndex % 2 == 0 ? inventoryBuffer1 : inventoryBuffer2).AsSpan(0, batchNumSims);
 
-                ReadOnlySpan<double> simulatedPrices;
-                if (period.Equals(lsmcParams.CurrentPeriod))
-                {
-                    double spotPrice = lsmcParams.ForwardCurve[period];
-                    simulatedPrices = Enumerable.Repeat(spotPrice, numSims).ToArray(); // TODO inefficient - review, and share code with backward induction
-                }
-                else
-                    simulatedPrices = valuationSpotSims.SpotPricesForPeriod(period).Span;
-                
-                (double nextStepInventorySpaceMin, double nextStepInventorySpaceMax) = inventorySpace[period.Offset(1)];
-                thisPeriodInventories = returnSimInventory ? inventoryBySim[periodIndex] 
-                                            : (periodIndex == 0 ? thisPeriodInventories : nextPeriodInventories);
-                Span<double> thisPeriodInjectWithdrawVolumes = returnSimInjectWithdrawVolume ? injectWithdrawVolumeBySim[periodIndex] : Span<double>.Empty;
-                Span<double> thisPeriodCmdtyConsumed = returnSimCmdtyConsumed ? cmdtyConsumedBySim[periodIndex] : Span<double>.Empty;
-                Span<double> thisPeriodInventoryLoss = returnSimInventoryLoss ? inventoryLossBySim[periodIndex] : Span<double>.Empty;
-                Span<double> thisPeriodNetVolume = returnSimNetVolume ? netVolumeBySim[periodIndex] : Span<double>.Empty;
-                Span<double> thisPeriodPv = returnSimPv ? pvByPeriodAndSim[periodIndex] : Span<double>.Empty;
-                nextPeriodInventories = returnSimInventory ? inventoryBySim[periodIndex + 1] : 
-                    thisPeriodInventories == inventoryBuffer1 ? inventoryBuffer2 : inventoryBuffer1;
-
-                double sumOverSimsInjectWithdrawVolumes, sumOverSimsCmdtyConsumed, sumOverSimsInventoryLoss, sumOverSimsPv;
-                sumOverSimsInjectWithdrawVolumes = sumOverSimsCmdtyConsumed = sumOverSimsInventoryLoss = sumOverSimsPv = 0.0;
-                for (int simIndex = 0; simIndex < numSims; simIndex++)
+                InventoriesForPeriod(0).Fill(lsmcParams.Inventory);
+
+                Matrix<double> designMatrix = matrixPool.Rent(batchNumSims, basisFunctionList.Count);
+                _logger?.LogInformation("Starting calculations of optimal decisions by simulation forward in time.");
+                stopwatches.ForwardSimulation.Start();
+                for (int periodIndex = 0; periodIndex < numDecisionPeriods; periodIndex++)
                 {
-                    double simulatedSpotPrice = simulatedPrices[simIndex];
-                    double inventory = thisPeriodInventories[simIndex];
+                    T period = periodsForResultsTimeSeries[periodIndex];
 
-                    InjectWithdrawRange injectWithdrawRange = lsmcParams.Storage.GetInjectWithdrawRange(period, inventory);
-                    double inventoryLoss = lsmcParams.Storage.CmdtyInventoryPercentLoss(period) * inventory;
-                    double[] decisionSet = StorageHelper.CalculateBangBangDecisionSet(injectWithdrawRange, inventory,
-                        inventoryLoss, nextStepInventorySpaceMin, nextStepInventorySpaceMax, lsmcParams.NumericalTolerance, lsmcParams.ExtraDecisions);
-                    IReadOnlyList<DomesticCashFlow> inventoryCostCashFlows = lsmcParams.Storage.CmdtyInventoryCost(period, inventory);
-                    double inventoryCostNpv = inventoryCostCashFlows.Sum(cashFlow => cashFlow.Amount * DiscountToCurrentDay(cashFlow.Date));
+                    double[] nextPeriodInventorySpaceGrid = inventorySpaceGrids[periodIndex + 1];
+                    Matrix<double> regressContinuationValues = matrixPool.Rent(batchNumSims, nextPeriodInventorySpaceGrid.Length);
+                    if (period.Equals(lsmcParams.CurrentPeriod))
+                    {
+                        // Current period, for which the price isn't random so expected storage values are just the average of the values for all sims
+                        for (int i = 0; i < nextPeriodInventorySpaceGrid.Length; i++)
+                            ColumnSpan(regressContinuationValues, i).Fill(currentPeriodContinuationValues[i]);
+                    }
+                    else
+                    {
+                        PopulateDesignMatrix(designMatrix, period, valuationSpotSims, basisFunctionList);
+                        Panel<int, double> regressCoeffsThisPeriod = regressCoeffs[period];
+                        Matrix<double> regressCoeffsMatrix = matrixPool.Rent(basisFunctionList.Count, nextPeriodInventorySpaceGrid.Length);
+                        for (int i = 0; i < nextPeriodInventorySpaceGrid.Length; i++)
+                            regressCoeffsThisPeriod[i].CopyTo(ColumnSpan(regressCoeffsMatrix, i));
+                        designMatrix.Multiply(regressCoeffsMatrix, regressContinuationValues);
+                        matrixPool.Return(regressCoeffsMatrix);
+                    }
+                    double[] regressContinuationValuesArray = regressContinuationValues.AsColumnMajorArray();
+                    double[] sumRegressContinuationValues = sumsRegressContinuationValues[periodIndex];
+                    for (int i = 0; i < nextPeriodInventorySpaceGrid.Length; i++)
+                        sumRegressContinuationValues[i] += Sum(ColumnSpan(regressContinuationValues, i));
+
+                    Day cmdtySettlementDate = lsmcParams.SettleDateRule(period);
+                    double discountFactorFromCmdtySettlement = DiscountToCurrentDay(cmdtySettlementDate);
 
-                    var decisionNpvsRegress = new double[decisionSet.Length];
-                    var cmdtyUsedForInjectWithdrawVolumes = new double[decisionSet.Length];
-                    var immediatePv = new double[decisionSet.Length];
+                    ReadOnlyMemory<double> simulatedPricesMemory = period.Equals(lsmcParams.CurrentPeriod) ? 
+                                                        new ReadOnlyMemory<double>(CurrentPeriodSpotPrices(), 0, batchNumSims)
+                                                        : valuationSpotSims.SpotPricesForPeriod(period);
 
-                    for (var decisionIndex = 0; decisionIndex < decisionSet.Length; decisionIndex++)
+                    (double nextStepInventorySpaceMin, double nextStepInventorySpaceMax) = inventorySpace[period.Offset(1)];
+
+                    // Simulations are independent given the regression coefficients, so can be calculated in shards of simulation indices
+                    // on different threads, with each simulation index only written to by one thread. Indices are relative to the start of the batch.
+                    void CalcOptimalDecisionsForSims(int fromSimIndex, int toSimIndex, ForwardSimulationBuffers buffers)
                     {
-                        double decisionVolume = decisionSet[decisionIndex];
-                        double inventoryAfterDecision = inventory + decisionVolume - inventoryLoss;
+                        ReadOnlySpan<double> simulatedPrices = simulatedPricesMemory.Span;
+                        Span<double> thisPeriodInventories = InventoriesForPeriod(periodIndex);
+                        Span<double> nextPeriodInventories = InventoriesForPeriod(periodIndex + 1);
+                        Span<double> thisPeriodInjectWithdrawVolumes = returnSimInjectWithdrawVolume ? injectWithdrawVolumeBySim[periodIndex].Slice(batchStartSimIndex, batchNumSims) : Span<double>.Empty;
+                        Span<double> thisPeriodCmdtyConsumed = returnSimCmdtyConsumed ? cmdtyConsumedBySim[periodIndex].Slice(batchStartSimIndex, batchNumSims) : Span<double>.Empty;
+                        Span<double> thisPeriodInventoryLoss = returnSimInventoryLoss ? inventoryLossBySim[periodIndex].Slice(batchStartSimIndex, batchNumSims) : Span<double>.Empty;
+                        Span<double> thisPeriodNetVolume = returnSimNetVolume ? netVolumeBySim[periodIndex].Slice(batchStartSimIndex, batchNumSims) : Span<double>.Empty;
+                        Span<double> thisPeriodPv = returnSimPv ? pvByPeriodAndSim[periodIndex].Slice(batchStartSimIndex, batchNumSims) : Span<double>.Empty;
+
+                        // Simulations with the same inventory share a decision set, so are grouped by inventory and the optimal decisions for each
+                        // group found by OptimalDecisionKernel, which evaluates blocks of simulations at once using SIMD instructions where supported.
+                        // The prices and regression continuation values of a group are gathered into contiguous per-thread buffers for the kernel.
+                        int numShardSims = toSimIndex - fromSimIndex;
+                        buffers.EnsureCapacity(numShardSims);
+                        int[] simIndices = buffers.SimIndices;
+                        double[] sortedInventories = buffers.Inventories;
+                        for (int i = 0; i < numShardSims; i++)
+                        {
+                            simIndices[i] = fromSimIndex + i;
+                            sortedInventories[i] = thisPeriodInventories[fromSimIndex + i];
+                        }
+                        Array.Sort(sortedInventories, simIndices, 0, numShardSims);
 
-                        double cmdtyUsedForInjectWithdrawVolume = CmdtyVolumeConsumedOnDecision(lsmcParams.Storage, decisionVolume, period, inventory);
+                        int groupStart = 0;
+                        while (groupStart < numShardSims)
+                        {
+                            double inventory = sortedInventories[groupStart];
+                            int groupEnd = groupStart + 1;
+                            while (groupEnd < numShardSims && sortedInventories[groupEnd] == inventory)
+                                groupEnd++;
+                            int groupNumSims = groupEnd - groupStart;
+
+                            InjectWithdrawRange injectWithdrawRange = lsmcParams.Storage.GetInjectWithdrawRange(period, inventory);
+                            double inventoryLoss = lsmcParams.Storage.CmdtyInventoryPercentLoss(period) * inventory;
+                            double[] decisionSet = StorageHelper.CalculateBangBangDecisionSet(injectWithdrawRange, inventory,
+                                inventoryLoss, nextStepInventorySpaceMin, nextStepInventorySpaceMax, lsmcParams.NumericalTolerance, lsmcParams.ExtraDecisions);
+                            IReadOnlyList<DomesticCashFlow> inventoryCostCashFlows = lsmcParams.Storage.CmdtyInventoryCost(period, inventory);
+                            double inventoryCostNpv = inventoryCostCashFlows.Sum(cashFlow => cashFlow.Amount * DiscountToCurrentDay(cashFlow.Date));
+
+                            var cmdtyUsedForInjectWithdrawVolumes = new double[decisionSet.Length];
+                            var injectWithdrawCostNpvs = new double[decisionSet.Length];
+                            var lowerGridIndices = new int[decisionSet.Length];
+                            var upperGridIndices = new int[decisionSet.Length];
+                            var lowerGridOffsets = new int[decisionSet.Length];
+                            var upperGridOffsets = new int[decisionSet.Length];
+                            var lowerWeights = new double[decisionSet.Length];
+                            var upperWeights = new double[decisionSet.Length];
+                            for (var decisionIndex = 0; decisionIndex < decisionSet.Length; decisionIndex++)
+                            {
+                                double decisionVolume = decisionSet[decisionIndex];
+                                double inventoryAfterDecision = inventory + decisionVolume - inventoryLoss;
+                                cmdtyUsedForInjectWithdrawVolumes[decisionIndex] = CmdtyVolumeConsumedOnDecision(lsmcParams.Storage, decisionVolume, period, inventory);
+                                injectWithdrawCostNpvs[decisionIndex] = InjectWithdrawCostNpv(lsmcParams.Storage, decisionVolume, period, inventory, DiscountToCurrentDay);
+                                (int lowerIndex, int upperIndex, double lowerWeight, double upperWeight) = InventoryGridInterpolation.Interpolate(
+                                    nextPeriodInventorySpaceGrid, inventoryAfterDecision, lsmcParams.NumericalTolerance, inventoryGridSpacing);
+                                lowerGridIndices[decisionIndex] = lowerIndex;
+                                upperGridIndices[decisionIndex] = upperIndex;
+                                // Gathered continuation values hold the lower then upper grid point values for each decision, groupNumSims values each
+                                lowerGridOffsets[decisionIndex] = 2 * decisionIndex * groupNumSims;
+                                upperGridOffsets[decisionIndex] = (2 * decisionIndex + 1) * groupNumSims;
+                                lowerWeights[decisionIndex] = lowerWeight;
+                                upperWeights[decisionIndex] = upperWeight;
+                            }
 
-                        double injectWithdrawNpv = -decisionVolume * simulatedSpotPrice * discountFactorFromCmdtySettlement;
-                        double cmdtyUsedForInjectWithdrawNpv = -cmdtyUsedForInjectWithdrawVolume * simulatedSpotPrice * discountFactorFromCmdtySettlement;
+                            buffers.EnsureRegressContinuationValuesCapacity(2 * decisionSet.Length * groupNumSims);
+                            double[] groupSpotPrices = buffers.SpotPrices;
+                            double[] groupRegressContinuationValues = buffers.RegressContinuationValues;
+                            for (int i = 0; i < groupNumSims; i++)
+                            {
+                                int simIndex = simIndices[groupStart + i];
+                                groupSpotPrices[i] = simulatedPrices[simIndex];
+                                for (var decisionIndex = 0; decisionIndex < decisionSet.Length; decisionIndex++)
+                                {
+                                    groupRegressContinuationValues[lowerGridOffsets[decisionIndex] + i] = 
+                                        regressContinuationValuesArray[lowerGridIndices[decisionIndex] * batchNumSims + simIndex];
+                                    groupRegressContinuationValues[upperGridOffsets[decisionIndex] + i] =
+                                        regressContinuationValuesArray[upperGridIndices[decisionIndex] * batchNumSims + simIndex];
+                                }
+                            }
 
-                        double injectWithdrawCostNpv = InjectWithdrawCostNpv(lsmcParams.Storage, decisionVolume, period, inventory, DiscountToCurrentDay);
+                            Span<int> indicesOfOptimalDecision = buffers.IndicesOfOptimalDecision.AsSpan(0, groupNumSims);
+                            OptimalDecisionKernel.CalcOptimalDecisionIndices(new ReadOnlySpan<double>(groupSpotPrices, 0, groupNumSims), 
+                                discountFactorFromCmdtySettlement, inventoryCostNpv, decisionSet, cmdtyUsedForInjectWithdrawVolumes, injectWithdrawCostNpvs,
+                                lowerGridOffsets, upperGridOffsets, lowerWeights, upperWeights, groupRegressContinuationValues, indicesOfOptimalDecision);
 
-                        double immediateNpv = injectWithdrawNpv - injectWithdrawCostNpv + cmdtyUsedForInjectWithdrawNpv - inventoryCostNpv;
+                            for (int i = 0; i < groupNumSims; i++)
+                            {
+                                int simIndex = simIndices[groupStart + i];
+                                int indexOfOptimalDecision = indicesOfOptimalDecision[i];
+                                double simulatedSpotPrice = groupSpotPrices[i];
+                                double optimalDecisionVolume = decisionSet[indexOfOptimalDecision];
+                                double optimalNextStepInventory = inventory + optimalDecisionVolume - inventoryLoss;
+                                nextPeriodInventories[simIndex] = optimalNextStepInventory;
+
+                                double optimalCmdtyUsedForInjectWithdrawVolume = cmdtyUsedForInjectWithdrawVolumes[indexOfOptimalDecision];
+                                double injectWithdrawNpv = -optimalDecisionVolume * simulatedSpotPrice * discountFactorFromCmdtySettlement;
+                                double cmdtyUsedForInjectWithdrawNpv = -optimalCmdtyUsedForInjectWithdrawVolume * simulatedSpotPrice * discountFactorFromCmdtySettlement;
+                                double optimalImmediatePv = injectWithdrawNpv - injectWithdrawCostNpvs[indexOfOptimalDecision] + 
+                                                            cmdtyUsedForInjectWithdrawNpv - inventoryCostNpv;
+
+                                optimalDecisionVolumes[simIndex] = optimalDecisionVolume;
+                                optimalCmdtyConsumed[simIndex] = optimalCmdtyUsedForInjectWithdrawVolume;
+                                inventoryLosses[simIndex] = inventoryLoss;
+                                optimalImmediatePvs[simIndex] = optimalImmediatePv;
+                                pvBySim[batchStartSimIndex + simIndex] += optimalImmediatePv;
+
+                                if (returnSimInjectWithdrawVolume)
+                                    thisPeriodInjectWithdrawVolumes[simIndex] = optimalDecisionVolume;
+                                if (returnSimCmdtyConsumed)
+                                    thisPeriodCmdtyConsumed[simIndex] = optimalCmdtyUsedForInjectWithdrawVolume;
+                                if (returnSimInventoryLoss)
+                                    thisPeriodInventoryLoss[simIndex] = inventoryLoss;
+                                if (returnSimNetVolume)
+                                    thisPeriodNetVolume[simIndex] = -optimalDecisionVolume - optimalCmdtyUsedForInjectWithdrawVolume;
+                                if (returnSimPv)
+                                    thisPeriodPv[simIndex] = optimalImmediatePv;
+                            }
+                            groupStart = groupEnd;
+                        }
+                    }
 
-                        double continuationValue =
-                            InterpolateContinuationValue(inventoryAfterDecision, nextPeriodInventorySpaceGrid, regressContinuationValues, simIndex, lsmcParams.NumericalTolerance);
+                    if (lsmcParams.MaxDegreeOfParallelism == 1)
+                        CalcOptimalDecisionsForSims(0, batchNumSims, forwardSimulationBuffers.Value);
+                    else
+                        Parallel.ForEach(Partitioner.Create(0, batchNumSims), parallelOptions, 
+                            simIndexRange => CalcOptimalDecisionsForSims(simIndexRange.Item1, simIndexRange.Item2, forwardSimulationBuffers.Value));
 
-                        double totalNpv = immediateNpv + continuationValue; 
-                        decisionNpvsRegress[decisionIndex] = totalNpv;
-                        cmdtyUsedForInjectWithdrawVolumes[decisionIndex] = cmdtyUsedForInjectWithdrawVolume;
-                        immediatePv[decisionIndex] = immediateNpv;
+                    ReadOnlySpan<double> simulatedPricesForDeltas = simulatedPricesMemory.Span;
+                    for (int simIndex = 0; simIndex < batchNumSims; simIndex++)
+                    {
+                        sumsSpotPriceTimesVolume[periodIndex] += -(optimalDecisionVolumes[simIndex] + optimalCmdtyConsumed[simIndex]) * simulatedPricesForDeltas[simIndex];
+                        sumsInjectWithdrawVolume[periodIndex] += optimalDecisionVolumes[simIndex];
+                        sumsCmdtyConsumed[periodIndex] += optimalCmdtyConsumed[simIndex];
+                        sumsInventoryLoss[periodIndex] += inventoryLosses[simIndex];
+                        sumsPv[periodIndex] += optimalImmediatePvs[simIndex];
+                    }
+                    sumsInventory[periodIndex] += Sum(InventoriesForPeriod(periodIndex));
+                    if (controlVariateBySim != null)
+                    {
+                        double controlVariateCoefficient = controlVariateCoefficients[periodIndex];
+                        double forwardPrice = lsmcParams.ForwardCurve[period];
+                        for (int simIndex = 0; simIndex < batchNumSims; simIndex++)
+                            controlVariateBySim[batchStartSimIndex + simIndex] += controlVariateCoefficient * 
+                                                                                  (simulatedPricesForDeltas[simIndex] - forwardPrice);
                     }
-                    (double _, int indexOfOptimalDecision) = StorageHelper.MaxValueAndIndex(decisionNpvsRegress);
-                    double optimalDecisionVolume = decisionSet[indexOfOptimalDecision];
-                    double optimalNextStepInventory = inventory + optimalDecisionVolume - inventoryLoss;
-                    nextPeriodInventories[simIndex] = optimalNextStepInventory;
-
-                    double optimalCmdtyUsedForInjectWithdrawVolume = cmdtyUsedForInjectWithdrawVolumes[indexOfOptimalDecision];
-
-                    sumSpotPriceTimesVolume += -(optimalDecisionVolume + optimalCmdtyUsedForInjectWithdrawVolume) * simulatedSpotPrice;
-
-                    if (returnSimInjectWithdrawVolume)
-                        thisPeriodInjectWithdrawVolumes[simIndex] = optimalDecisionVolume;
-                    sumOverSimsInjectWithdrawVolumes += optimalDecisionVolume;
-                    if (returnSimCmdtyConsumed)
-                        thisPeriodCmdtyConsumed[simIndex] = optimalCmdtyUsedForInjectWithdrawVolume;
-                    sumOverSimsCmdtyConsumed += optimalCmdtyUsedForInjectWithdrawVolume;
-                    if (returnSimInventoryLoss)
-                        thisPeriodInventoryLoss[simIndex] = inventoryLoss;
-                    sumOverSimsInventoryLoss += inventoryLoss;
-                    if (returnSimNetVolume)
-                        thisPeriodNetVolume[simIndex] = -optimalDecisionVolume - optimalCmdtyUsedForInjectWithdrawVolume;
-                    double optimalImmediatePv = immediatePv[indexOfOptimalDecision];
-                    if (returnSimPv)
-                        thisPeriodPv[simIndex] = optimalImmediatePv;
-                    sumOverSimsPv += optimalImmediatePv;
-                    pvBySim[simIndex] += optimalImmediatePv;
+
+                    matrixPool.Return(regressContinuationValues);
+                    progress += forwardStepProgressPcnt;
+                    lsmcParams.OnProgressUpdate?.Invoke(progress);
+                    lsmcParams.CancellationToken.ThrowIfCancellationRequested();
                 }
+                matrixPool.Return(designMatrix);
 
-                double expectedInventory = Average(thisPeriodInventories);
-                storageProfiles[periodIndex] = new StorageProfile(expectedInventory, sumOverSimsInjectWithdrawVolumes/numSims,
-                    sumOverSimsCmdtyConsumed/numSims, sumOverSimsInventoryLoss/numSims, sumOverSimsPv/numSims);
+                Span<double> storageEndInventory = InventoriesForPeriod(periodsForResultsTimeSeries.Length - 1);
+                sumsInventory[periodsForResultsTimeSeries.Length - 1] += Sum(storageEndInventory);
+                // Pv on final period
+                if (!lsmcParams.Storage.MustBeEmptyAtEnd)
+                {
+                    Span<double> storageEndPv = returnSimPv ? pvByPeriodAndSim[periodsForResultsTimeSeries.Length-1].Slice(batchStartSimIndex, batchNumSims) 
+                                                    : Span<double>.Empty;
+                    double[] storageEndPeriodSpotPrices = valuationSpotSims.SpotPricesForPeriod(lsmcParams.Storage.EndPeriod).ToArray();
+                    var terminalNpvs = new double[batchNumSims];
+                    lsmcParams.Storage.TerminalStorageNpvs(storageEndPeriodSpotPrices, storageEndInventory.ToArray(), terminalNpvs);
+                    for (int simIndex = 0; simIndex < batchNumSims; simIndex++)
+                    {
+                        terminalPv += terminalNpvs[simIndex];
+                        if (returnSimPv)
+                            storageEndPv[simIndex] = terminalNpvs[simIndex];
+                        pvBySim[batchStartSimIndex + simIndex] += terminalNpvs[simIndex];
+                    }
+                }
+
+                int numSimsValued = batchStartSimIndex + batchNumSims;
+                (double batchNpv, double batchStandardError) = ValuationSimEstimate(pvBySim, controlVariateBySim, numSimsValued,
+                                                                    lsmcParams.AntitheticValuationSims);
+                valuationSimConvergence.Add(new ValuationSimConvergencePoint(numSimsValued, batchNpv, batchStandardError));
+                stopwatches.ForwardSimulation.Stop();
+                if (numSimsValued < numSims && batchStandardError <= lsmcParams.TargetValuationSimStandardError)
+                {
+                    _logger?.LogInformation($"Target valuation simulation standard error reached after {numSimsValued} simulations.");
+                    numValuationSims = numSimsValued;
+                    break;
+                }
+            }
+
+            forwardSimulationBuffers.Dispose();
+
+            if (numValuationSims < numSims)
+            {
+                Array.Resize(ref pvBySim, numValuationSims);
+                inventoryBySim = TruncateSims(inventoryBySim, numValuationSims);
+                injectWithdrawVolumeBySim = TruncateSims(injectWithdrawVolumeBySim, numValuationSims);
+                cmdtyConsumedBySim = TruncateSims(cmdtyConsumedBySim, numValuationSims);
+                inventoryLossBySim = TruncateSims(inventoryLossBySim, numValuationSims);
+                netVolumeBySim = TruncateSims(netVolumeBySim, numValuationSims);
+                pvByPeriodAndSim = TruncateSims(pvByPeriodAndSim, numValuationSims);
+                valuationSpotPricePanel = TruncateSims(valuationSpotPricePanel, numValuationSims);
+                valuationMarkovFactors = valuationMarkovFactors.Select(panel => TruncateSims(panel, numValuationSims)).ToArray();
+            }
+            double endPeriodPv = lsmcParams.Storage.MustBeEmptyAtEnd ? 0.0 : terminalPv/numValuationSims;
+            _logger?.LogInformation("Starting calculations of optimal decisions by simulation forward in time.");
+
+            stopwatches.ForwardSimulation.Start();
+            // Trigger price variables
+            int numTriggerPriceVolumes = 10; // TODO move to parameters
+            var triggerVolumeProfilesArray = new TriggerPriceVolumeProfiles[numDecisionPeriods];
+            var triggerPricesArray = new TriggerPrices[numDecisionPeriods];
+
+            for (int periodIndex = 0; periodIndex < numDecisionPeriods; periodIndex++)
+            {
+                T period = periodsForResultsTimeSeries[periodIndex];
+                double expectedInventory = sumsInventory[periodIndex] / numValuationSims;
+                storageProfiles[periodIndex] = new StorageProfile(expectedInventory, sumsInjectWithdrawVolume[periodIndex]/numValuationSims,
+                    sumsCmdtyConsumed[periodIndex]/numValuationSims, sumsInventoryLoss[periodIndex]/numValuationSims, sumsPv[periodIndex]/numValuationSims);
+
+                Day cmdtySettlementDate = lsmcParams.SettleDateRule(period);
+                double discountFactorFromCmdtySettlement = DiscountToCurrentDay(cmdtySettlementDate);
+                double discountForDeltas = lsmcParams.DiscountDeltas ? discountFactorFromCmdtySettlement : 1.0;
                 double forwardPrice = lsmcParams.ForwardCurve[period];
                 // Pathwise differentiation calculation makes assumption that simulated spot price is calculated as forward prices times some stochastic term.
                 // This is fine for the multifactor model in Cmdty.Core, but will not be the case for all models, e.g. a shifted lognormal model to account for 
                 // negative prices. TODO figure out best way to handle this, and/or document, or just abandon pathwise differentiation as delta calculation method
-                double periodDelta = (sumSpotPriceTimesVolume / forwardPrice / numSims) * discountForDeltas;
+                double periodDelta = (sumsSpotPriceTimesVolume[periodIndex] / forwardPrice / numValuationSims) * discountForDeltas;
                 deltas[periodIndex] = periodDelta;
-                progress += forwardStepProgressPcnt;
-                lsmcParams.OnProgressUpdate?.Invoke(progress);
-                lsmcParams.CancellationToken.ThrowIfCancellationRequested();
 
                 #region Trigger Price Calculation
 
+                (double nextStepInventorySpaceMin, double nextStepInventorySpaceMax) = inventorySpace[period.Offset(1)];
+                double[] expectedRegressContinuationValues = sumsRegressContinuationValues[periodIndex].Select(sum => sum / numValuationSims).ToArray();
                 double expectedInventoryInventoryLoss = lsmcParams.Storage.CmdtyInventoryPercentLoss(period) * expectedInventory;
                 InjectWithdrawRange expectedInventoryInjectWithdrawRange = lsmcParams.Storage.GetInjectWithdrawRange(period, expectedInventory);
                 double[] triggerPriceDecisionSet = StorageHelper.CalculateBangBangDecisionSet(expectedInventoryInjectWithdrawRange, expectedInventory,
@@ -542,14 +817,14 @@ public LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> ls
                     {
                         (double alternativeContinuationValue, double alternativeDecisionCost, double alternativeCmdtyConsumed) =
                             CalcAlternatives(lsmcParams.Storage, expectedInventory, alternativeVolume, expectedInventoryInventoryLoss, inventoryGridNexPeriod, 
-                                regressContinuationValues, period, DiscountToCurrentDay, lsmcParams.NumericalTolerance);
+                                expectedRegressContinuationValues, period, DiscountToCurrentDay, lsmcParams.NumericalTolerance, inventoryGridSpacing);
                         double[] triggerPriceVolumes = CalcInjectTriggerPriceVolumes<T>(triggerPriceMaxInjectVolume, alternativeVolume, numTriggerPriceVolumes);
 
                         foreach (double triggerVolume in triggerPriceVolumes)
                         {
                             double injectTriggerPrice = CalcTriggerPrice(lsmcParams.Storage, expectedInventory, triggerVolume, expectedInventoryInventoryLoss, inventoryGridNexPeriod,
-                                regressContinuationValues, alternativeContinuationValue, alternativeVolume, period, alternativeDecisionCost,
-                                alternativeCmdtyConsumed, discountFactorFromCmdtySettlement, DiscountToCurrentDay, lsmcParams.NumericalTolerance);
+                                expectedRegressContinuationValues, alternativeContinuationValue, alternativeVolume, period, alternativeDecisionCost,
+                                alternativeCmdtyConsumed, discountFactorFromCmdtySettlement, DiscountToCurrentDay, lsmcParams.NumericalTolerance, inventoryGridSpacing);
                             injectTriggerPrices.Add(new TriggerPricePoint(triggerVolume, injectTriggerPrice));
                         }
 
@@ -570,14 +845,14 @@ public LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> ls
                     {
                         (double alternativeContinuationValue, double alternativeDecisionCost, double alternativeCmdtyConsumed) =
                             CalcAlternatives(lsmcParams.Storage, expectedInventory, alternativeVolume, expectedInventoryInventoryLoss, inventoryGridNexPeriod, 
-                                regressContinuationValues, period, DiscountToCurrentDay, lsmcParams.NumericalTolerance);
+                                expectedRegressContinuationValues, period, DiscountToCurrentDay, lsmcParams.NumericalTolerance, inventoryGridSpacing);
                         double[] triggerPriceVolumes = CalcWithdrawTriggerPriceVolumes<T>(maxWithdrawVolume, alternativeVolume, numTriggerPriceVolumes);
 
                         foreach (double triggerVolume in triggerPriceVolumes.Reverse())
                         {
                             double withdrawTriggerPrice = CalcTriggerPrice(lsmcParams.Storage, expectedInventory, triggerVolume, expectedInventoryInventoryLoss, inventoryGridNexPeriod,
-                                regressContinuationValues, alternativeContinuationValue, alternativeVolume, period, alternativeDecisionCost,
-                                alternativeCmdtyConsumed, discountFactorFromCmdtySettlement, DiscountToCurrentDay, lsmcParams.NumericalTolerance);
+                                expectedRegressContinuationValues, alternativeContinuationValue, alternativeVolume, period, alternativeDecisionCost,
+                                alternativeCmdtyConsumed, discountFactorFromCmdtySettlement, DiscountToCurrentDay, lsmcParams.NumericalTolerance, inventoryGridSpacing);
                             withdrawTriggerPrices.Add(new TriggerPricePoint(triggerVolume, withdrawTriggerPrice));
                         }
 
@@ -591,40 +866,23 @@ public LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> ls
 
                 #endregion Trigger Price Calculation
             }
-            // Pv on final period
-            double endPeriodPv = 0.0;
-            if (!lsmcParams.Storage.MustBeEmptyAtEnd)
-            {
-                ReadOnlySpan<double> storageEndPeriodSpotPrices = regressionSpotSims.SpotPricesForPeriod(lsmcParams.Storage.EndPeriod).Span;
-                Span<double> storageEndInventory = nextPeriodInventories;
-                Span<double> storageEndPv = returnSimPv ? pvByPeriodAndSim[periodsForResultsTimeSeries.Length-1] : Array.Empty<double>();
-                double terminalPv = 0.0;
-                for (int simIndex = 0; simIndex < numSims; simIndex++)
-                {
-                    double inventory = storageEndInventory[simIndex];
-                    double spotPrice = storageEndPeriodSpotPrices[simIndex];
-                    terminalPv += lsmcParams.Storage.TerminalStorageNpv(spotPrice, inventory);
-                    if (returnSimPv)
-                        storageEndPv[simIndex] = terminalPv;
-                    pvBySim[simIndex] += terminalPv;
-                }
-                endPeriodPv = terminalPv/numSims;
-            }
-
             stopwatches.ForwardSimulation.Stop();
-            _logger?.LogInformation("Starting calculations of optimal decisions by simulation forward in time.");
 
-            double forwardNpv = pvBySim.Average();
-            double standardError = pvBySim.StandardDeviation() / Math.Sqrt(numSims);
+            ValuationSimConvergencePoint finalEstimate = valuationSimConvergence[valuationSimConvergence.Count - 1];
+            double forwardNpv = finalEstimate.Npv;
+            double standardError = finalEstimate.StandardError;
             _logger?.LogInformation("Forward Pv: " + forwardNpv.ToString("N", CultureInfo.InvariantCulture));
 
-            // Calculate NPVs for first active period using current inventory
-            // TODO this is unnecessarily introducing floating point error if the val date is during the storage active period and there should not be a Vector of simulated spot prices
-            double backwardNpv = storageActualValuesNextPeriod[0].Average();
+            if (exercisePolicy == null)
+            {
+                // Calculate NPVs for first active period using current inventory
+                // TODO this is unnecessarily introducing floating point error if the val date is during the storage active period and there should not be a Vector of simulated spot prices
+                double backwardNpv = Average(ColumnSpan(storageActualValuesNextPeriod, 0));
 
-            _logger?.LogInformation("Backward Pv: " + backwardNpv.ToString("N", CultureInfo.InvariantCulture));
+                _logger?.LogInformation("Backward Pv: " + backwardNpv.ToString("N", CultureInfo.InvariantCulture));
+            }
 
-            double expectedFinalInventory = Average(nextPeriodInventories);
+            double expectedFinalInventory = sumsInventory[periodsForResultsTimeSeries.Length - 1] / numValuationSims;
             // Profile at storage end when no decisions can happen
             storageProfiles[storageProfiles.Length - 1] = new StorageProfile(expectedFinalInventory, 0.0, 0.0, 0.0, endPeriodPv);
 
@@ -632,28 +890,361 @@ public LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> ls
             var storageProfileSeries = new TimeSeries<T, StorageProfile>(periodsForResultsTimeSeries[0], storageProfiles);
             var triggerPriceVolumeProfiles = new TimeSeries<T, TriggerPriceVolumeProfiles>(periodsForResultsTimeSeries.First(), triggerVolumeProfilesArray);
             var triggerPrices = new TimeSeries<T, TriggerPrices>(periodsForResultsTimeSeries.First(), triggerPricesArray);
+            LsmcExercisePolicy<T> resultsExercisePolicy = exercisePolicy ?? new LsmcExercisePolicy<T>(lsmcParams.CurrentPeriod, lsmcParams.Inventory, 
+                basisFunctionList.Count, inventoryGridSpacing, new TimeSeries<T, double[]>(periodsForResultsTimeSeries[0], inventorySpaceGrids), 
+                regressCoeffs, currentPeriodContinuationValues ?? new double[0]);
 
-            Panel<T, double> regressionSpotPricePanel = returnSimSpotPriceForRegress ? ExtractSpotSims(regressionSpotSims) : Panel<T, double>.CreateEmpty();
-            Panel<T, double> valuationSpotPricePanel = returnSimSpotPriceForValuation ? ExtractSpotSims(valuationSpotSims) : Panel<T, double>.CreateEmpty();
-
-            // TODO in future refactor ISpotSimResults should make use of Panel type, making this code not necessary
-            Panel<T, double>[] regressionMarkovFactors = returnSimFactorsForRegression ? ExtractMarkovFactorsToPanel(regressionSpotSims) 
-                : Enumerable.Range(0, regressionSpotSims.NumFactors).Select(i => Panel<T, double>.CreateEmpty()).ToArray();
-            Panel<T, double>[] valuationMarkovFactors = returnSimFactorsForValuation ? ExtractMarkovFactorsToPanel(valuationSpotSims)
-                : Enumerable.Range(0, valuationSpotSims.NumFactors).Select(i => Panel<T, double>.CreateEmpty()).ToArray();
             lsmcParams.OnProgressUpdate?.Invoke(1.0); // Progress with approximately 1.0 should have occurred already, but might have been a bit off because of floating-point error.
 
             stopwatches.All.Stop();
             if (_logger != null)
             {
-                string profilingReport = stopwatches.GenerateProfileReport();
+                string profilingReport = stopwatches.GenerateProfileReport() + matrixPool.GenerateAllocationReport();
                 _logger.LogInformation("Profiling Report:");
                 _logger.LogInformation(Environment.NewLine + profilingReport);
             }
 
             return new LsmcStorageValuationResults<T>(forwardNpv, standardError, deltasSeries, storageProfileSeries, regressionSpotPricePanel,
                 valuationSpotPricePanel, inventoryBySim, injectWithdrawVolumeBySim, cmdtyConsumedBySim, inventoryLossBySim, netVolumeBySim, 
-                triggerPrices, triggerPriceVolumeProfiles, pvByPeriodAndSim, pvBySim, regressionMarkovFactors, valuationMarkovFactors);
+                triggerPrices, triggerPriceVolumeProfiles, pvByPeriodAndSim, pvBySim, regressionMarkovFactors, valuationMarkovFactors,
+                valuationSimConvergence, stopwatches.ToTimings(), resultsExercisePolicy);
+        }
+
+        /// <summary>
+        /// Values the storage under a number of forward curve scenarios, re-using one set of simulations for all scenarios.
+        /// The regression and valuation simulations are generated once using the forward curve of <paramref name="paramsBuilder"/>,
+        /// then for each scenario the simulated spot prices are rescaled by the ratio of scenario to base forward price. This is exact
+        /// for models such as the multi-factor model, where the simulated spot price equals the forward price multiplied by a
+        /// stochastic term which doesn't depend on the forward curve. Scenarios are valued concurrently on up to
+        /// <paramref name="maxDegreeOfParallelism"/> threads, with results returned in the same order as <paramref name="scenarioForwardCurves"/>.
+        /// </summary>
+        public IReadOnlyList<LsmcStorageValuationResults<T>> CalculateForwardCurveScenarios<T>(LsmcValuationParameters<T>.Builder paramsBuilder,
+            IEnumerable<TimeSeries<T, double>> scenarioForwardCurves, int maxDegreeOfParallelism = 1)
+            where T : ITimePeriod<T>
+        {
+            if (paramsBuilder == null) throw new ArgumentNullException(nameof(paramsBuilder));
+            if (scenarioForwardCurves == null) throw new ArgumentNullException(nameof(scenarioForwardCurves));
+            if (maxDegreeOfParallelism < 1)
+                throw new ArgumentOutOfRangeException(nameof(maxDegreeOfParallelism), "Maximum degree of parallelism must be positive.");
+            if (paramsBuilder.ExercisePolicy != null)
+                throw new ArgumentException("Forward curve scenarios cannot be valued using an exercise policy.", nameof(paramsBuilder));
+
+            TimeSeries<T, double>[] forwardCurves = scenarioForwardCurves.ToArray();
+            if (forwardCurves.Any(forwardCurve => forwardCurve == null))
+                throw new ArgumentException("Scenario forward curves cannot contain null.", nameof(scenarioForwardCurves));
+
+            LsmcValuationParameters<T> baseParams = paramsBuilder.Build();
+            Func<int, LsmcValuationParameters<T>.Builder> createScenarioBuilder;
+            if (baseParams.CurrentPeriod.CompareTo(baseParams.Storage.EndPeriod) >= 0)
+                createScenarioBuilder = scenarioIndex => paramsBuilder.Clone(); // No simulations needed at or after storage end
+            else
+            {
+                _logger?.LogInformation("Starting forward curve scenario spot price simulations.");
+                ISpotSimResults<T> regressionSpotSims = baseParams.RegressionSpotSimsGenerator();
+                ISpotSimResults<T> valuationSpotSims = baseParams.ValuationSpotSimsGenerator();
+                _logger?.LogInformation("Forward curve scenario spot price simulations complete.");
+                ThrowIfStreamed(regressionSpotSims, valuationSpotSims, nameof(paramsBuilder));
+
+                // Markov factors don't depend on the forward curve so are shared by all scenarios, with the spot prices of each scenario rescaled
+                // from the shared simulations one period at a time as they are read, so concurrent scenarios don't each hold a copy of the spot prices
+                createScenarioBuilder = scenarioIndex =>
+                {
+                    TimeSeries<T, double> scenarioForwardCurve = forwardCurves[scenarioIndex];
+                    return paramsBuilder.Clone().UseSpotSimResults(
+                        new RescaledSpotSimResults<T>(regressionSpotSims, baseParams.ForwardCurve, scenarioForwardCurve),
+                        new RescaledSpotSimResults<T>(valuationSpotSims, baseParams.ForwardCurve, scenarioForwardCurve));
+                };
+            }
+
+            return CalculateConcurrently(forwardCurves.Length, scenarioIndex =>
+            {
+                LsmcValuationParameters<T>.Builder scenarioParamsBuilder = createScenarioBuilder(scenarioIndex);
+                scenarioParamsBuilder.ForwardCurve = forwardCurves[scenarioIndex];
+                return scenarioParamsBuilder;
+            }, maxDegreeOfParallelism, baseParams.OnProgressUpdate, baseParams.CancellationToken);
+        }
+
+        /// <summary>
+        /// Values a portfolio of storage facilities, sharing one set of simulations between all facilities. Each item of
+        /// <paramref name="facilityParamsBuilders"/> specifies the valuation of one facility, and all must have the same current period
+        /// and forward curve. The regression and valuation simulations are generated once, by the simulation generators of the first
+        /// builder, over the periods spanned by all facilities. Facilities are valued concurrently on up to
+        /// <paramref name="maxDegreeOfParallelism"/> threads, with results returned in the same order as <paramref name="facilityParamsBuilders"/>.
+        /// </summary>
+        public IReadOnlyList<LsmcStorageValuationResults<T>> CalculatePortfolio<T>(
+            IEnumerable<LsmcValuationParameters<T>.Builder> facilityParamsBuilders, int maxDegreeOfParallelism = 1)
+            where T : ITimePeriod<T>
+        {
+            if (facilityParamsBuilders == null) throw new ArgumentNullException(nameof(facilityParamsBuilders));
+            if (maxDegreeOfParallelism < 1)
+                throw new ArgumentOutOfRangeException(nameof(maxDegreeOfParallelism), "Maximum degree of parallelism must be positive.");
+            LsmcValuationParameters<T>.Builder[] builders = facilityParamsBuilders.ToArray();
+            if (builders.Length == 0)
+                throw new ArgumentException("Portfolio must contain at least one facility.", nameof(facilityParamsBuilders));
+
+            LsmcValuationParameters<T>.Builder firstBuilder = builders[0];
+            if (builders.Any(builder => builder == null))
+                throw new ArgumentException("Facility parameters builders cannot contain null.", nameof(facilityParamsBuilders));
+            if (builders.Any(builder => builder.Storage == null))
+                throw new ArgumentException("Storage must be set for all facilities.", nameof(facilityParamsBuilders));
+            if (builders.Any(builder => builder.ExercisePolicy != null))
+                throw new ArgumentException("Portfolio facilities cannot be valued using an exercise policy.", nameof(facilityParamsBuilders));
+            T currentPeriod = firstBuilder.CurrentPeriod;
+            TimeSeries<T, double> forwardCurve = firstBuilder.ForwardCurve;
+            foreach (LsmcValuationParameters<T>.Builder builder in builders)
+            {
+                if (!builder.CurrentPeriod.Equals(currentPeriod))
+                    throw new ArgumentException("All facilities must have the same current period.", nameof(facilityParamsBuilders));
+                if (!SameForwardCurve(builder.ForwardCurve, forwardCurve))
+                    throw new ArgumentException("All facilities must have the same forward curve.", nameof(facilityParamsBuilders));
+            }
+
+            Func<int, LsmcValuationParameters<T>.Builder> createFacilityBuilder;
+            T latestStorageEnd = builders.Select(builder => builder.Storage.EndPeriod).Max();
+            if (currentPeriod.CompareTo(latestStorageEnd) >= 0)
+                createFacilityBuilder = facilityIndex => builders[facilityIndex].Clone(); // No simulations needed at or after storage end
+            else
+            {
+                if (firstBuilder.RegressionSpotSimsGenerator == null)
+                    throw new ArgumentException("RegressionSpotSimsGenerator of first facility must be set.", nameof(facilityParamsBuilders));
+                if (firstBuilder.ValuationSpotSimsGenerator == null)
+                    throw new ArgumentException("ValuationSpotSimsGenerator of first facility must be set.", nameof(facilityParamsBuilders));
+                T earliestStorageStart = builders.Select(builder => builder.Storage.StartPeriod).Min();
+                _logger?.LogInformation("Starting portfolio spot price simulations.");
+                ISpotSimResults<T> regressionSpotSims = firstBuilder.RegressionSpotSimsGenerator(currentPeriod, earliestStorageStart, 
+                                                                latestStorageEnd, forwardCurve);
+                ISpotSimResults<T> valuationSpotSims = firstBuilder.ValuationSpotSimsGenerator(currentPeriod, earliestStorageStart,
+                                                                latestStorageEnd, forwardCurve);
+                _logger?.LogInformation("Portfolio spot price simulations complete.");
+                ThrowIfStreamed(regressionSpotSims, valuationSpotSims, nameof(facilityParamsBuilders));
+                createFacilityBuilder = facilityIndex => builders[facilityIndex].Clone().UseSpotSimResults(regressionSpotSims, valuationSpotSims);
+            }
+
+            return CalculateConcurrently(builders.Length, createFacilityBuilder, maxDegreeOfParallelism, 
+                firstBuilder.OnProgressUpdate, firstBuilder.CancellationToken);
+        }
+
+        /// <summary>
+        /// Values the storage for each of a number of starting inventories using a single backward induction. The backward induction
+        /// is performed over the union of the inventory spaces reachable from all of <paramref name="startingInventories"/>, with the
+        /// resulting exercise policy then used for a forward simulation from each starting inventory. The same regression and valuation
+        /// simulations are used for all starting inventories, so differences in NPV between starting inventories are not affected by
+        /// simulation noise in the valuation simulations. The Inventory of <paramref name="paramsBuilder"/> is ignored, and results are
+        /// returned in the same order as <paramref name="startingInventories"/>.
+        /// </summary>
+        public IReadOnlyList<LsmcStorageValuationResults<T>> CalculateInventoryValueCurve<T>(LsmcValuationParameters<T>.Builder paramsBuilder,
+            IEnumerable<double> startingInventories)
+            where T : ITimePeriod<T>
+        {
+            if (paramsBuilder == null) throw new ArgumentNullException(nameof(paramsBuilder));
+            if (startingInventories == null) throw new ArgumentNullException(nameof(startingInventories));
+            if (paramsBuilder.ExercisePolicy != null)
+                throw new ArgumentException("Inventory value curve cannot be calculated using an exercise policy.", nameof(paramsBuilder));
+            double[] inventories = startingInventories.ToArray();
+            if (inventories.Length == 0)
+                throw new ArgumentException("Starting inventories cannot be empty.", nameof(startingInventories));
+            if (inventories.Any(inventory => inventory < 0))
+                throw new ArgumentException("Starting inventories cannot be negative.", nameof(startingInventories));
+
+            var curveParamsBuilder = paramsBuilder.Clone();
+            curveParamsBuilder.Inventory = inventories[0];
+            LsmcValuationParameters<T> firstParams = curveParamsBuilder.Build();
+            var results = new LsmcStorageValuationResults<T>[inventories.Length];
+            if (firstParams.CurrentPeriod.CompareTo(firstParams.Storage.EndPeriod) >= 0)
+            {
+                // No simulations needed at or after storage end
+                for (int inventoryIndex = 0; inventoryIndex < inventories.Length; inventoryIndex++)
+                {
+                    curveParamsBuilder.Inventory = inventories[inventoryIndex];
+                    results[inventoryIndex] = Calculate(curveParamsBuilder.Build());
+                }
+                return results;
+            }
+
+            _logger?.LogInformation("Starting inventory value curve spot price simulations.");
+            ISpotSimResults<T> regressionSpotSims = firstParams.RegressionSpotSimsGenerator();
+            ISpotSimResults<T> valuationSpotSims = firstParams.ValuationSpotSimsGenerator();
+            _logger?.LogInformation("Inventory value curve spot price simulations complete.");
+            ThrowIfStreamed(regressionSpotSims, valuationSpotSims, nameof(paramsBuilder));
+            curveParamsBuilder.UseSpotSimResults(regressionSpotSims, valuationSpotSims);
+
+            // Progress of 1.0 only reported once the forward simulations from all starting inventories are complete
+            Action<double> onProgressUpdate = paramsBuilder.OnProgressUpdate;
+            if (onProgressUpdate != null)
+                curveParamsBuilder.OnProgressUpdate = progress => onProgressUpdate(Math.Min(progress, 0.99));
+            // The results of the backward induction valuation are only used for the exercise policy, so no simulation data is returned. All
+            // starting inventories, including the first, are then valued by the same forward simulation using the policy, so every point of
+            // the curve is calculated identically from the same valuation simulations.
+            SimulationDataReturned simulationDataReturned = curveParamsBuilder.SimulationDataReturned;
+            curveParamsBuilder.SimulationDataReturned = SimulationDataReturned.None;
+            LsmcExercisePolicy<T> exercisePolicy = Calculate(curveParamsBuilder.Build(), inventories, null).ExercisePolicy;
+
+            curveParamsBuilder.SimulationDataReturned = simulationDataReturned;
+            curveParamsBuilder.OnProgressUpdate = null;
+            for (int inventoryIndex = 0; inventoryIndex < inventories.Length; inventoryIndex++)
+            {
+                firstParams.CancellationToken.ThrowIfCancellationRequested();
+                curveParamsBuilder.Inventory = inventories[inventoryIndex];
+                results[inventoryIndex] = Calculate(curveParamsBuilder.Build(), null, exercisePolicy);
+            }
+            onProgressUpdate?.Invoke(1.0);
+            return results;
+        }
+
+        private static TimeSeries<T, InventoryRange> InventorySpaceUnion<T>(ICmdtyStorage<T> storage, IReadOnlyList<double> startingInventories,
+            T currentPeriod) where T : ITimePeriod<T>
+        {
+            TimeSeries<T, InventoryRange>[] inventorySpaces = startingInventories
+                .Select(startingInventory => StorageHelper.CalculateInventorySpace(storage, startingInventory, currentPeriod)).ToArray();
+            TimeSeries<T, InventoryRange> firstInventorySpace = inventorySpaces[0];
+            var inventoryRanges = new InventoryRange[firstInventorySpace.Count];
+            for (int periodIndex = 0; periodIndex < inventoryRanges.Length; periodIndex++)
+            {
+                T period = firstInventorySpace.Start.Offset(periodIndex);
+                inventoryRanges[periodIndex] = new InventoryRange(inventorySpaces.Min(inventorySpace => inventorySpace[period].MinInventory),
+                    inventorySpaces.Max(inventorySpace => inventorySpace[period].MaxInventory));
+            }
+            return new TimeSeries<T, InventoryRange>(firstInventorySpace.Start, inventoryRanges);
+        }
+
+        private static bool SameForwardCurve<T>(TimeSeries<T, double> forwardCurve1, TimeSeries<T, double> forwardCurve2)
+            where T : ITimePeriod<T>
+        {
+            if (ReferenceEquals(forwardCurve1, forwardCurve2))
+                return true;
+            if (forwardCurve1 == null || forwardCurve2 == null || forwardCurve1.Count != forwardCurve2.Count)
+                return false;
+            return forwardCurve1.IsEmpty || (forwardCurve1.Start.Equals(forwardCurve2.Start) && forwardCurve1.Data.SequenceEqual(forwardCurve2.Data));
+        }
+
+        // Values the storage for each builder created by createParamsBuilder, with progress reported as the fraction of valuations complete
+        private IReadOnlyList<LsmcStorageValuationResults<T>> CalculateConcurrently<T>(int numValuations, 
+            Func<int, LsmcValuationParameters<T>.Builder> createParamsBuilder, int maxDegreeOfParallelism, Action<double> onProgressUpdate, 
+            CancellationToken cancellationToken)
+            where T : ITimePeriod<T>
+        {
+            var results = new LsmcStorageValuationResults<T>[numValuations];
+            int numValuationsComplete = 0;
+            object progressLock = new object();
+            void CalculateValuation(int valuationIndex)
+            {
+                LsmcValuationParameters<T>.Builder paramsBuilder = createParamsBuilder(valuationIndex);
+                paramsBuilder.OnProgressUpdate = null;
+                results[valuationIndex] = Calculate(paramsBuilder.Build());
+                lock (progressLock)
+                {
+                    numValuationsComplete++;
+                    onProgressUpdate?.Invoke((double)numValuationsComplete / numValuations);
+                }
+            }
+
+            if (maxDegreeOfParallelism == 1)
+            {
+                for (int valuationIndex = 0; valuationIndex < numValuations; valuationIndex++)
+                {
+                    cancellationToken.ThrowIfCancellationRequested();
+                    CalculateValuation(valuationIndex);
+                }
+            }
+            else
+            {
+                var parallelOptions = new ParallelOptions
+                {
+                    MaxDegreeOfParallelism = maxDegreeOfParallelism,
+                    CancellationToken = cancellationToken
+                };
+                Parallel.For(0, numValuations, parallelOptions, CalculateValuation);
+            }
+            return results;
+        }
+
+        private static double[] IntrinsicControlVariateCoefficients<T>(LsmcValuationParameters<T> lsmcParams, T[] periodsForResultsTimeSeries,
+            int numDecisionPeriods, Func<Day, double> discountToCurrentDay)
+            where T : ITimePeriod<T>
+        {
+            IntrinsicStorageValuationResults<T> intrinsicResults = IntrinsicStorageValuation<T>.ForStorage(lsmcParams.Storage)
+                .WithStartingInventory(lsmcParams.Inventory)
+                .ForCurrentPeriod(lsmcParams.CurrentPeriod)
+                .WithForwardCurve(lsmcParams.ForwardCurve)
+                .WithCmdtySettlementRule(lsmcParams.SettleDateRule)
+                .WithDiscountFactorFunc(lsmcParams.DiscountFactors)
+                .WithStateSpaceGridCalculation(storage => lsmcParams.GridCalc)
+                .WithLinearInventorySpaceInterpolation()
+                .WithNumericalTolerance(lsmcParams.NumericalTolerance)
+                .Calculate();
+
+            var coefficients = new double[numDecisionPeriods];
+            for (int periodIndex = 0; periodIndex < numDecisionPeriods; periodIndex++)
+            {
+                T period = periodsForResultsTimeSeries[periodIndex];
+                if (intrinsicResults.StorageProfile.ContainsKey(period))
+                    coefficients[periodIndex] = intrinsicResults.StorageProfile[period].NetVolume * 
+                                                discountToCurrentDay(lsmcParams.SettleDateRule(period));
+            }
+            return coefficients;
+        }
+
+        // Estimate of NPV and its standard error from the PVs of the first numSims simulations
+        // If the valuation simulations are antithetic, each pair of simulations 2k and 2k + 1 are reflections of each other so are
+        // not independent, but the pair averages are. The standard error and control variate coefficient are then calculated over
+        // the pair averages, with the unpaired final simulation of an odd number of simulations treated as independent of the pairs.
+        private static (double Estimate, double StandardError) ValuationSimEstimate(double[] pvBySim, double[] controlVariateBySim, 
+            int numSims, bool antithetic)
+        {
+            double[] values = pvBySim;
+            if (controlVariateBySim != null)
+            {
+                double coefficient = antithetic ? 
+                    ControlVariateCoefficient(PairAverages(pvBySim, numSims), PairAverages(controlVariateBySim, numSims), numSims / 2) :
+                    ControlVariateCoefficient(pvBySim, controlVariateBySim, numSims);
+                values = new double[numSims];
+                for (int i = 0; i < numSims; i++)
+                    values[i] = pvBySim[i] - coefficient * controlVariateBySim[i];
+            }
+            var valuesSegment = new ArraySegment<double>(values, 0, numSims);
+            double estimate = valuesSegment.Average();
+            if (!antithetic)
+                return (estimate, valuesSegment.StandardDeviation() / Math.Sqrt(numSims));
+
+            int numPairs = numSims / 2;
+            double pairAveragesVariance = PairAverages(values, numSims).Variance();
+            if (numSims % 2 == 0)
+                return (estimate, Math.Sqrt(pairAveragesVariance / numPairs));
+            // Estimate is the sum of the pair sums and the unpaired simulation, divided by numSims
+            return (estimate, Math.Sqrt(4.0 * numPairs * pairAveragesVariance + valuesSegment.Variance()) / numSims);
+        }
+
+        private static double ControlVariateCoefficient(double[] values, double[] controls, int count)
+        {
+            double valuesMean = new ArraySegment<double>(values, 0, count).Average();
+            double controlsMean = new ArraySegment<double>(controls, 0, count).Average();
+            double covariance = 0.0;
+            double controlsVariance = 0.0;
+            for (int i = 0; i < count; i++)
+            {
+                double controlDeviation = controls[i] - controlsMean;
+                covariance += (values[i] - valuesMean) * controlDeviation;
+                controlsVariance += controlDeviation * controlDeviation;
+            }
+            return controlsVariance > 0.0 ? covariance / controlsVariance : 0.0;
+        }
+
+        private static double[] PairAverages(double[] values, int count)
+        {
+            var pairAverages = new double[count / 2];
+            for (int i = 0; i < pairAverages.Length; i++)
+                pairAverages[i] = (values[2 * i] + values[2 * i + 1]) / 2.0;
+            return pairAverages;
+        }
+
+        private static Panel<T, double> TruncateSims<T>(Panel<T, double> panel, int numSims) where T : ITimePeriod<T>
+        {
+            if (panel.NumCols <= numSims)
+                return panel;
+            var truncatedPanel = new Panel<T, double>(panel.RowKeys, numSims);
+            for (int rowIndex = 0; rowIndex < panel.NumRows; rowIndex++)
+                panel[rowIndex].Slice(0, numSims).CopyTo(truncatedPanel[rowIndex]);
+            return truncatedPanel;
         }
 
         private static (bool ReturnSimSpotPriceForRegress, bool ReturnSimSpotPriceForValuation, bool ReturnSimFactorsForRegression, bool
@@ -668,6 +1259,14 @@ public LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> ls
                 simulationDataReturned.HasFlag(SimulationDataReturned.NetVolume), simulationDataReturned.HasFlag(SimulationDataReturned.Pv));
         }
 
+        // Streamed simulations only hold the most recently generated periods, so cannot be read again by a later valuation
+        private static void ThrowIfStreamed<T>(ISpotSimResults<T> regressionSpotSims, ISpotSimResults<T> valuationSpotSims, string paramName)
+            where T : ITimePeriod<T>
+        {
+            if (regressionSpotSims is IStreamedSpotSimResults || valuationSpotSims is IStreamedSpotSimResults)
+                throw new ArgumentException("Streamed simulations cannot be shared between valuations.", paramName);
+        }
+
         private Panel<T, double> ExtractSpotSims<T>(ISpotSimResults<T> spotSimResults)
             where T : ITimePeriod<T>
         {
@@ -701,14 +1300,31 @@ public LsmcStorageValuationResults<T> Calculate<T>(LsmcValuationParameters<T> ls
             return markovFactorPanelArray;
         }
 
+        private static void CopySimBatchToPanels<T>(ISpotSimResults<T> spotSimsBatch, int startSimIndex, Panel<T, double> spotPricePanel,
+            Panel<T, double>[] markovFactorPanels) where T : ITimePeriod<T>
+        {
+            // Null panels indicate that the simulated data isn't returned, so doesn't need copying
+            for (int simulatedPeriodIndex = 0; simulatedPeriodIndex < spotSimsBatch.SimulatedPeriods.Count; simulatedPeriodIndex++)
+            {
+                if (spotPricePanel != null)
+                    spotSimsBatch.SpotPricesForStepIndex(simulatedPeriodIndex).Span
+                        .CopyTo(spotPricePanel[simulatedPeriodIndex].Slice(startSimIndex));
+                if (markovFactorPanels != null)
+                    for (int factorIndex = 0; factorIndex < markovFactorPanels.Length; factorIndex++)
+                        spotSimsBatch.MarkovFactorsForStepIndex(simulatedPeriodIndex, factorIndex).Span
+                            .CopyTo(markovFactorPanels[factorIndex][simulatedPeriodIndex].Slice(startSimIndex));
+            }
+        }
+
         private static double CalcTriggerPrice<T>(ICmdtyStorage<T> storage, double expectedInventory, double triggerVolume, double inventoryLoss,
-                double[] inventoryGridNexPeriod, Vector<double>[] regressContinuationValues, double alternativeContinuationValue, double alternativeVolume, T period,
+                double[] inventoryGridNexPeriod, double[] expectedRegressContinuationValues, double alternativeContinuationValue, double alternativeVolume, T period,
                 double alternativeDecisionCost, double alternativeCmdtyConsumed, double discountFactorFromCmdtySettlement, Func<Day, double> discountToCurrentDay,
-                double numericalTolerance) 
+                double numericalTolerance, double inventoryGridSpacing) 
             where T : ITimePeriod<T>
         {
             double inventoryAfterTriggerVolume = expectedInventory + triggerVolume - inventoryLoss;
-            double triggerVolumeContinuationValue = AverageContinuationValue(inventoryAfterTriggerVolume, inventoryGridNexPeriod, regressContinuationValues, numericalTolerance);
+            double triggerVolumeContinuationValue = AverageContinuationValue(inventoryAfterTriggerVolume, inventoryGridNexPeriod, expectedRegressContinuationValues, 
+                numericalTolerance, inventoryGridSpacing);
             double triggerVolumeContinuationValueChange = triggerVolumeContinuationValue - alternativeContinuationValue;
 
             double triggerVolumeExcessVolume = triggerVolume - alternativeVolume;
@@ -745,10 +1361,12 @@ private static double[] CalcWithdrawTriggerPriceVolumes<T>(double maxWithdrawVol
 
         private static (double alternativeContinuationValue, double alternativeDecisionCost, double alternativeCmdtyConsumed) CalcAlternatives<T>(
             ICmdtyStorage<T> storage, double expectedInventory, double alternativeVolume, double inventoryLoss, double[] inventoryGridNexPeriod,
-            Vector<double>[] regressContinuationValues, T period, Func<Day, double> discountToPresent, double numericalTolerance) where T : ITimePeriod<T>
+            double[] expectedRegressContinuationValues, T period, Func<Day, double> discountToPresent, double numericalTolerance, 
+            double inventoryGridSpacing) where T : ITimePeriod<T>
         {
             double inventoryAfterAlternative = expectedInventory + alternativeVolume - inventoryLoss;
-            double alternativeContinuationValue = AverageContinuationValue(inventoryAfterAlternative, inventoryGridNexPeriod, regressContinuationValues, numericalTolerance);
+            double alternativeContinuationValue = AverageContinuationValue(inventoryAfterAlternative, inventoryGridNexPeriod, expectedRegressContinuationValues, 
+                numericalTolerance, inventoryGridSpacing);
             double alternativeDecisionCost = InjectWithdrawCostNpv(storage, alternativeVolume, period, expectedInventory, discountToPresent);
             double alternativeCmdtyConsumed = CmdtyVolumeConsumedOnDecision(storage, alternativeVolume, period, expectedInventory);
             return (alternativeContinuationValue, alternativeDecisionCost, alternativeCmdtyConsumed);
@@ -774,65 +1392,57 @@ private static double CmdtyVolumeConsumedOnDecision<T>(ICmdtyStorage<T> storage,
         }
 
         private static double Average(Span<double> span)
+        {
+            return Sum(span)/span.Length;
+        }
+
+        private static double Sum(Span<double> span)
         {
             double sum = 0.0;
             // ReSharper disable once ForCanBeConvertedToForeach
             for (int i = 0; i < span.Length; i++)
                 sum += span[i];
-            return sum/span.Length;
+            return sum;
         }
 
-        private static double AverageContinuationValue(double inventoryAfterDecision, double[] inventoryGrid,
-                Vector<double>[] storageRegressValuesNextPeriod, double numericalTolerance)
+        internal static (int LowerIndex, int UpperIndex) ReachableGridIndices(double[] inventorySpaceGrid, double[][] decisionSets,
+            double[] nextPeriodInventorySpaceGrid, double inventoryPercentLoss, double inventoryGridSpacing)
         {
-            (int lowerInventoryIndex, int upperInventoryIndex) = StorageHelper.BisectInventorySpace(inventoryGrid, inventoryAfterDecision, numericalTolerance);
-
-            if (lowerInventoryIndex == upperInventoryIndex)
-                return storageRegressValuesNextPeriod[lowerInventoryIndex].Average();
-
-            double lowerInventory = inventoryGrid[lowerInventoryIndex];
-            double upperInventory = inventoryGrid[upperInventoryIndex];
-            double inventoryGridSpace = upperInventory - lowerInventory;
-            double lowerWeight = (upperInventory - inventoryAfterDecision) / inventoryGridSpace;
-            double upperWeight = 1.0 - lowerWeight;
-
-            Vector<double> lowerStorageRegressValues = storageRegressValuesNextPeriod[lowerInventoryIndex];
-            Vector<double> upperStorageRegressValues = storageRegressValuesNextPeriod[upperInventoryIndex];
-            Vector<double> weightedAverageStorageRegressValues =
-                lowerStorageRegressValues * lowerWeight + upperStorageRegressValues * upperWeight;
-
-            return weightedAverageStorageRegressValues.Average();
+            double minInventoryAfterDecision = double.PositiveInfinity;
+            double maxInventoryAfterDecision = double.NegativeInfinity;
+            for (int inventoryIndex = 0; inventoryIndex < inventorySpaceGrid.Length; inventoryIndex++)
+            {
+                double inventory = inventorySpaceGrid[inventoryIndex];
+                double inventoryLoss = inventoryPercentLoss * inventory;
+                foreach (double decisionVolume in decisionSets[inventoryIndex])
+                {
+                    double inventoryAfterDecision = inventory + decisionVolume - inventoryLoss;
+                    minInventoryAfterDecision = Math.Min(minInventoryAfterDecision, inventoryAfterDecision);
+                    maxInventoryAfterDecision = Math.Max(maxInventoryAfterDecision, inventoryAfterDecision);
+                }
+            }
+            int lowerIndex = InventoryGridInterpolation.Interpolate(nextPeriodInventorySpaceGrid, minInventoryAfterDecision, 
+                                InventoryGridPointTolerance, inventoryGridSpacing).LowerIndex;
+            int upperIndex = InventoryGridInterpolation.Interpolate(nextPeriodInventorySpaceGrid, maxInventoryAfterDecision, 
+                                InventoryGridPointTolerance, inventoryGridSpacing).UpperIndex;
+            return (lowerIndex, upperIndex);
         }
 
-        private static double InterpolateContinuationValue(double inventoryAfterDecision, double[] inventoryGrid, 
-                            Vector<double>[] storageRegressValuesNextPeriod, int simIndex, double numericalTolerance)
+        private static double AverageContinuationValue(double inventoryAfterDecision, double[] inventoryGrid,
+                double[] expectedRegressContinuationValues, double numericalTolerance, double inventoryGridSpacing)
         {
-            // TODO look into the efficiency of memory access in this method and think about reordering dimension of arrays
-            (int lowerInventoryIndex, int upperInventoryIndex) = StorageHelper.BisectInventorySpace(inventoryGrid, inventoryAfterDecision, numericalTolerance);
+            (int lowerInventoryIndex, int upperInventoryIndex, double lowerWeight, double upperWeight) = 
+                InventoryGridInterpolation.Interpolate(inventoryGrid, inventoryAfterDecision, numericalTolerance, inventoryGridSpacing);
 
             if (lowerInventoryIndex == upperInventoryIndex)
-                return storageRegressValuesNextPeriod[lowerInventoryIndex][simIndex];
-
-            double lowerInventory = inventoryGrid[lowerInventoryIndex];
-            double upperInventory = inventoryGrid[upperInventoryIndex];
-            double inventoryGridSpace = upperInventory - lowerInventory;
-            double lowerWeight = (upperInventory - inventoryAfterDecision) / inventoryGridSpace;
-            double upperWeight = 1.0 - lowerWeight;
-
-            double lowerStorageRegressValue = storageRegressValuesNextPeriod[lowerInventoryIndex][simIndex];
-            double upperStorageRegressValue = storageRegressValuesNextPeriod[upperInventoryIndex][simIndex];
-
-            return lowerStorageRegressValue * lowerWeight + upperStorageRegressValue * upperWeight;
+                return expectedRegressContinuationValues[lowerInventoryIndex];
+            // Interpolation is linear so the average of interpolated values equals the interpolation of the average values
+            return expectedRegressContinuationValues[lowerInventoryIndex] * lowerWeight + expectedRegressContinuationValues[upperInventoryIndex] * upperWeight;
         }
 
-        private static Vector<double> WeightedAverage<T>(Vector<double> vector1,
-            double weight1, Vector<double> vector2, double weight2, Vector<double> upperWeightedBuffer) where T : ITimePeriod<T>
+        private static Span<double> ColumnSpan(Matrix<double> matrix, int columnIndex)
         {
-            Vector<double> interpolatedRegressContinuationValue = Vector<double>.Build.Dense(vector1.Count);
-            vector1.Multiply(weight1, interpolatedRegressContinuationValue);
-            vector2.Multiply(weight2, upperWeightedBuffer);
-            upperWeightedBuffer.Add(interpolatedRegressContinuationValue, interpolatedRegressContinuationValue);
-            return interpolatedRegressContinuationValue;
+            return new Span<double>(matrix.AsColumnMajorArray(), columnIndex * matrix.RowCount, matrix.RowCount);
         }
 
         public static void PopulateDesignMatrix<T>(Matrix<double> designMatrix, T period, ISpotSimResults<T> spotSims,
@@ -51,6 +51,17 @@ public sealed class LsmcStorageValuationResults<T>
         public TimeSeries<T, TriggerPrices> TriggerPrices { get; }
         public IReadOnlyList<Panel<T, double>> RegressionMarkovFactors { get; }
         public IReadOnlyList<Panel<T, double>> ValuationMarkovFactors { get; }
+        /// <summary>
+        /// NPV estimate and standard error after each batch of valuation simulations.
+        /// </summary>
+        public IReadOnlyList<ValuationSimConvergencePoint> ValuationSimConvergence { get; }
+        public int NumValuationSims => PvBySim.Count;
+        public LsmcValuationTimings Timings { get; }
+        /// <summary>
+        /// Exercise policy used by the forward simulation, which can be used to value other simulations by setting
+        /// <see cref="LsmcValuationParameters{T}.Builder.ExercisePolicy"/>. Null for expired and end period results.
+        /// </summary>
+        public LsmcExercisePolicy<T> ExercisePolicy { get; }
         
         public LsmcStorageValuationResults(double npv, double valuationSimStandardError, DoubleTimeSeries<T> deltas, TimeSeries<T, StorageProfile> expectedStorageProfile, 
             Panel<T, double> regressionSpotPriceSim, Panel<T, double> valuationSpotPriceSim,
@@ -58,7 +69,8 @@ public sealed class LsmcStorageValuationResults<T>
             Panel<T, double> inventoryLossBySim, Panel<T, double> netVolumeBySim, TimeSeries<T, TriggerPrices> triggerPrices,
             TimeSeries<T, TriggerPriceVolumeProfiles> triggerPriceVolumeProfiles, Panel<T, double> pvByPeriodAndSim, 
             IEnumerable<double> pvBySim, IEnumerable<Panel<T, double>> regressionMarkovFactors, 
-            IEnumerable<Panel<T, double>> valuationMarkovFactors)
+            IEnumerable<Panel<T, double>> valuationMarkovFactors, IEnumerable<ValuationSimConvergencePoint> valuationSimConvergence = null,
+            LsmcValuationTimings timings = null, LsmcExercisePolicy<T> exercisePolicy = null)
         {
             Npv = npv;
             ValuationSimStandardError = valuationSimStandardError;
@@ -77,6 +89,9 @@ public sealed class LsmcStorageValuationResults<T>
             PvBySim = pvBySim.ToArray();
             RegressionMarkovFactors = regressionMarkovFactors.ToArray();
             ValuationMarkovFactors = valuationMarkovFactors.ToArray();
+            ValuationSimConvergence = valuationSimConvergence?.ToArray() ?? new ValuationSimConvergencePoint[0];
+            Timings = timings ?? LsmcValuationTimings.Zero;
+            ExercisePolicy = exercisePolicy;
         }
 
         public static LsmcStorageValuationResults<T> CreateExpiredResults()
@@ -49,17 +49,28 @@ public sealed class LsmcValuationParameters<T>
         public double NumericalTolerance { get; }
         public Func<ISpotSimResults<T>> RegressionSpotSimsGenerator { get; }
         public Func<ISpotSimResults<T>> ValuationSpotSimsGenerator { get; }
+        public Func<int, ISpotSimResults<T>> ValuationSpotSimsBatchGenerator { get; }
         public IEnumerable<BasisFunction> BasisFunctions { get; }
         public CancellationToken CancellationToken { get; }
         public Action<double> OnProgressUpdate { get; }
         public bool DiscountDeltas { get; }
         public int ExtraDecisions { get; }
         public SimulationDataReturned SimulationDataReturned { get; }
+        public int MaxDegreeOfParallelism { get; }
+        public int PseudoInverseLookAhead { get; }
+        public int? ValuationSimBatchSize { get; }
+        public bool IntrinsicControlVariate { get; }
+        public double? TargetValuationSimStandardError { get; }
+        public LsmcExercisePolicy<T> ExercisePolicy { get; }
+        public bool AntitheticValuationSims { get; }
 
         private LsmcValuationParameters(T currentPeriod, double inventory, TimeSeries<T, double> forwardCurve, 
             ICmdtyStorage<T> storage, Func<T, Day> settleDateRule, Func<Day, Day, double> discountFactors, IDoubleStateSpaceGridCalc gridCalc, 
             double numericalTolerance, SimulateSpotPrice regressionSpotSims, SimulateSpotPrice valuationSpotSims, IEnumerable<BasisFunction> basisFunctions, 
-            CancellationToken cancellationToken, bool discountDeltas, int extraDecisions, SimulationDataReturned simulationDataReturned, Action<double> onProgressUpdate = null)
+            CancellationToken cancellationToken, bool discountDeltas, int extraDecisions, SimulationDataReturned simulationDataReturned, int maxDegreeOfParallelism, 
+            int pseudoInverseLookAhead, SimulateSpotPriceBatch valuationSpotSimsBatch, int? valuationSimBatchSize, 
+            bool intrinsicControlVariate, double? targetValuationSimStandardError, LsmcExercisePolicy<T> exercisePolicy, 
+            bool antitheticValuationSims, Action<double> onProgressUpdate = null)
         {
             CurrentPeriod = currentPeriod;
             Inventory = inventory;
@@ -69,19 +80,32 @@ public sealed class LsmcValuationParameters<T>
             DiscountFactors = discountFactors;
             GridCalc = gridCalc;
             NumericalTolerance = numericalTolerance;
-            RegressionSpotSimsGenerator = () => regressionSpotSims(CurrentPeriod, storage.StartPeriod, storage.EndPeriod, forwardCurve);
+            if (regressionSpotSims != null)
+                RegressionSpotSimsGenerator = () => regressionSpotSims(CurrentPeriod, storage.StartPeriod, storage.EndPeriod, forwardCurve);
             ValuationSpotSimsGenerator = () => valuationSpotSims(CurrentPeriod, storage.StartPeriod, storage.EndPeriod, forwardCurve);
+            if (valuationSpotSimsBatch != null)
+                ValuationSpotSimsBatchGenerator = numSims => valuationSpotSimsBatch(CurrentPeriod, storage.StartPeriod, storage.EndPeriod, forwardCurve, numSims);
             BasisFunctions = basisFunctions.ToArray();
             CancellationToken = cancellationToken;
             DiscountDeltas = discountDeltas;
             ExtraDecisions = extraDecisions;
             OnProgressUpdate = onProgressUpdate;
             SimulationDataReturned = simulationDataReturned;
+            MaxDegreeOfParallelism = maxDegreeOfParallelism;
+            PseudoInverseLookAhead = pseudoInverseLookAhead;
+            ValuationSimBatchSize = valuationSimBatchSize;
+            IntrinsicControlVariate = intrinsicControlVariate;
+            TargetValuationSimStandardError = targetValuationSimStandardError;
+            ExercisePolicy = exercisePolicy;
+            AntitheticValuationSims = antitheticValuationSims;
         }
 
         public delegate ISpotSimResults<T> SimulateSpotPrice(T currentPeriod, T storageStart, T storageEnd, 
             TimeSeries<T, double> forwardCurve);
 
+        public delegate ISpotSimResults<T> SimulateSpotPriceBatch(T currentPeriod, T storageStart, T storageEnd, 
+            TimeSeries<T, double> forwardCurve, int numSims);
+
         public sealed class Builder
         {
             // ReSharper disable once StaticMemberInGenericType
@@ -95,11 +119,70 @@ public sealed class Builder
             public double NumericalTolerance { get; set; }
             public SimulateSpotPrice RegressionSpotSimsGenerator { get; set; }
             public SimulateSpotPrice ValuationSpotSimsGenerator { get; set; }
+            /// <summary>
+            /// Generates a batch of valuation simulations of the specified size, with successive calls continuing the random number
+            /// sequence. Only used if <see cref="ValuationSimBatchSize"/> is set. Set by <see cref="SimulateWithMultiFactorModel"/>.
+            /// </summary>
+            public SimulateSpotPriceBatch ValuationSpotSimsBatchGenerator { get; set; }
             public IEnumerable<BasisFunction> BasisFunctions { get; set; }
             public CancellationToken CancellationToken { get; set; }
             public Action<double> OnProgressUpdate { get; set; }
             public int ExtraDecisions { get; set; }
             public SimulationDataReturned SimulationDataReturned { get; set; }
+            /// <summary>
+            /// Maximum number of threads used by the valuation. Defaults to 1, i.e. single-threaded calculation.
+            /// </summary>
+            public int MaxDegreeOfParallelism { get; set; }
+
+            /// <summary>
+            /// Number of periods ahead of the backward induction for which the regression pseudo-inverses are calculated
+            /// concurrently on the thread pool. Defaults to 0, i.e. each pseudo-inverse is calculated when needed by the
+            /// backward induction. Memory used by the pseudo-inverses increases linearly with this value.
+            /// </summary>
+            public int PseudoInverseLookAhead { get; set; }
+
+            /// <summary>
+            /// If set, the valuation simulation is generated and valued in batches of this number of simulations, rather than all
+            /// simulations at once, with the regression simulation released beforehand unless it is returned. This reduces peak memory
+            /// to that of the regression simulation, the valuation simulation batch, and any simulation data returned. To reduce the
+            /// memory of the regression simulation as well use <see cref="SimulateWithMultiFactorModelStreamed"/>.
+            /// Requires <see cref="ValuationSpotSimsBatchGenerator"/> to be set. Defaults to null, i.e. no batching.
+            /// </summary>
+            public int? ValuationSimBatchSize { get; set; }
+
+            /// <summary>
+            /// If true, the NPV is estimated using the pathwise PV of the intrinsic profile as a control variate. The control is
+            /// the intrinsic net volume times the discounted difference between simulated spot and forward price, which has an
+            /// expected value of zero, with the coefficient estimated by regression over the valuation simulations. This reduces
+            /// <see cref="LsmcStorageValuationResults{T}.ValuationSimStandardError"/> for a fixed number of simulations. Defaults to false.
+            /// </summary>
+            public bool IntrinsicControlVariate { get; set; }
+
+            /// <summary>
+            /// If set, the valuation simulation stops after the first batch for which the valuation simulation standard error is less
+            /// than or equal to this value, rather than always valuing all simulations, which are then a maximum budget. The regression
+            /// policy calculated by the backward induction is used for all batches. Requires <see cref="ValuationSimBatchSize"/> to be
+            /// set. Defaults to null, i.e. all simulations valued.
+            /// </summary>
+            public double? TargetValuationSimStandardError { get; set; }
+
+            /// <summary>
+            /// If set, the regression simulation and backward induction are not performed, with the valuation simulation valued
+            /// using this exercise policy, as returned in <see cref="LsmcStorageValuationResults{T}.ExercisePolicy"/> by an earlier
+            /// valuation. Must have been calculated for the same current period, inventory, storage and basis functions.
+            /// <see cref="RegressionSpotSimsGenerator"/> is not required and <see cref="ValuationSimBatchSize"/> cannot be set.
+            /// Defaults to null, i.e. the exercise policy is calculated.
+            /// </summary>
+            public LsmcExercisePolicy<T> ExercisePolicy { get; set; }
+
+            /// <summary>
+            /// If true, the valuation simulations are antithetic, with each pair of simulations 2k and 2k + 1 reflections of each
+            /// other, so are not independent. The valuation simulation standard error, and control variate coefficient, are then
+            /// calculated over the averages of the pairs, which are independent. Set by <see cref="SimulateWithMultiFactorModelAndMersenneTwister"/>,
+            /// <see cref="SimulateWithMultiFactorModelAndSobol"/> and <see cref="SimulateWithMultiFactorModelStreamed"/> from their
+            /// antithetic parameter, and reset to false by <see cref="SimulateWithMultiFactorModel"/>. Defaults to false.
+            /// </summary>
+            public bool AntitheticValuationSims { get; set; }
 
             public bool DiscountDeltas { get; set; }
             private T _currentPeriod;
@@ -119,6 +202,7 @@ public Builder()
             {
                 CancellationToken = CancellationToken.None; // TODO see if this can be removed
                 NumericalTolerance = DefaultNumericalTolerance;
+                MaxDegreeOfParallelism = 1;
             }
 
             public LsmcValuationParameters<T> Build()
@@ -131,16 +215,47 @@ public LsmcValuationParameters<T> Build()
                 ThrowIfNotSet(SettleDateRule, nameof(SettleDateRule));
                 ThrowIfNotSet(DiscountFactors, nameof(DiscountFactors));
                 ThrowIfNotSet(GridCalc, nameof(GridCalc));
-                ThrowIfNotSet(RegressionSpotSimsGenerator, nameof(RegressionSpotSimsGenerator));
+                if (ExercisePolicy == null)
+                    ThrowIfNotSet(RegressionSpotSimsGenerator, nameof(RegressionSpotSimsGenerator));
                 ThrowIfNotSet(ValuationSpotSimsGenerator, nameof(ValuationSpotSimsGenerator));
                 ThrowIfNotSet(BasisFunctions, nameof(BasisFunctions));
                 if (ExtraDecisions < 0)
                     throw new InvalidOperationException(nameof(ExtraDecisions) + " must be non-negative.");
+                if (MaxDegreeOfParallelism < 1)
+                    throw new InvalidOperationException(nameof(MaxDegreeOfParallelism) + " must be positive.");
+                if (PseudoInverseLookAhead < 0)
+                    throw new InvalidOperationException(nameof(PseudoInverseLookAhead) + " must be non-negative.");
+                if (ValuationSimBatchSize != null)
+                {
+                    if (ValuationSimBatchSize <= 0)
+                        throw new InvalidOperationException(nameof(ValuationSimBatchSize) + " must be positive.");
+                    ThrowIfNotSet(ValuationSpotSimsBatchGenerator, nameof(ValuationSpotSimsBatchGenerator));
+                }
+                if (TargetValuationSimStandardError != null)
+                {
+                    if (TargetValuationSimStandardError <= 0.0)
+                        throw new InvalidOperationException(nameof(TargetValuationSimStandardError) + " must be positive.");
+                    if (ValuationSimBatchSize == null)
+                        throw new InvalidOperationException(nameof(ValuationSimBatchSize) + " must be set if " + 
+                                                            nameof(TargetValuationSimStandardError) + " is set.");
+                }
+                if (ExercisePolicy != null)
+                {
+                    if (!ExercisePolicy.CurrentPeriod.Equals(CurrentPeriod))
+                        throw new InvalidOperationException(nameof(ExercisePolicy) + " must be for the same current period.");
+                    if (ExercisePolicy.Inventory != Inventory)
+                        throw new InvalidOperationException(nameof(ExercisePolicy) + " must be for the same inventory.");
+                    if (ValuationSimBatchSize != null)
+                        throw new InvalidOperationException(nameof(ValuationSimBatchSize) + " cannot be set if " + 
+                                                            nameof(ExercisePolicy) + " is set.");
+                }
 
                 // ReSharper disable once PossibleInvalidOperationException
                 return new LsmcValuationParameters<T>(CurrentPeriod, Inventory.Value, ForwardCurve, Storage, SettleDateRule, 
                     DiscountFactors, GridCalc, NumericalTolerance, RegressionSpotSimsGenerator, ValuationSpotSimsGenerator, 
-                    BasisFunctions, CancellationToken, DiscountDeltas, ExtraDecisions, SimulationDataReturned, OnProgressUpdate);
+                    BasisFunctions, CancellationToken, DiscountDeltas, ExtraDecisions, SimulationDataReturned, 
+                    MaxDegreeOfParallelism, PseudoInverseLookAhead, ValuationSpotSimsBatchGenerator, ValuationSimBatchSize, 
+                    IntrinsicControlVariate, TargetValuationSimStandardError, ExercisePolicy, AntitheticValuationSims, OnProgressUpdate);
             }
 
             // ReSharper disable once ParameterOnlyUsedForPreconditionCheck.Local
@@ -158,13 +273,23 @@ private static void ThrowIfNotSet<TField>(TField field, string fieldName)
                 if (numSims <= 0) throw new ArgumentOutOfRangeException(nameof(numSims), "Number of simulations must be positive.");
                 RegressionSpotSimsGenerator = CreateSimulationSpotPrice(regressionSimNormalGenerator, modelParameters, numSims);
                 ValuationSpotSimsGenerator = CreateSimulationSpotPrice(valuationSimNormalGenerator, modelParameters, numSims);
+                ValuationSpotSimsBatchGenerator = CreateSimulationSpotPriceBatch(valuationSimNormalGenerator, modelParameters);
+                AntitheticValuationSims = false;
                 return this;
             }
 
             private static SimulateSpotPrice CreateSimulationSpotPrice(IStandardNormalGenerator randomNumberGenerator, 
                 [NotNull] MultiFactorParameters<T> modelParameters, int numSims)
             {
-                return (currentPeriod, storageStart, storageEnd, forwardCurve) =>
+                SimulateSpotPriceBatch simulateSpotPriceBatch = CreateSimulationSpotPriceBatch(randomNumberGenerator, modelParameters);
+                return (currentPeriod, storageStart, storageEnd, forwardCurve) => 
+                    simulateSpotPriceBatch(currentPeriod, storageStart, storageEnd, forwardCurve, numSims);
+            }
+
+            private static SimulateSpotPriceBatch CreateSimulationSpotPriceBatch(IStandardNormalGenerator randomNumberGenerator, 
+                [NotNull] MultiFactorParameters<T> modelParameters)
+            {
+                return (currentPeriod, storageStart, storageEnd, forwardCurve, numSims) =>
                 {
                     if (currentPeriod.Equals(storageEnd))
                     {
@@ -184,15 +309,146 @@ private static void ThrowIfNotSet<TField>(TField field, string fieldName)
 
             public Builder SimulateWithMultiFactorModelAndMersenneTwister(
                                         MultiFactorParameters<T> modelParameters, int numSims, int? simSeed = null, 
-                                        int? valuationSimSeed = null)
+                                        int? valuationSimSeed = null, bool antithetic = true)
             {
-                MersenneTwisterGenerator regressionSimNormalGenerator = simSeed == null ? new MersenneTwisterGenerator(true) :
-                            new MersenneTwisterGenerator(simSeed.Value, true);
+                MersenneTwisterGenerator regressionSimNormalGenerator = simSeed == null ? new MersenneTwisterGenerator(antithetic) :
+                            new MersenneTwisterGenerator(simSeed.Value, antithetic);
                 // If valuationSimSeed is null then use the same random number generator as regression, which will continue the sequence
                 MersenneTwisterGenerator valuationSimNormalGenerator = valuationSimSeed == null ? regressionSimNormalGenerator : 
-                    new MersenneTwisterGenerator(valuationSimSeed.Value, true);
+                    new MersenneTwisterGenerator(valuationSimSeed.Value, antithetic);
+
+                SimulateWithMultiFactorModel(regressionSimNormalGenerator, valuationSimNormalGenerator, modelParameters, numSims);
+                AntitheticValuationSims = antithetic;
+                return this;
+            }
+
+            /// <summary>
+            /// Simulate using the multi-factor model with randomised quasi-Monte Carlo: scrambled Sobol points and a
+            /// Brownian bridge path construction. See <see cref="SobolMultiFactorSpotSimulator{T}"/>.
+            /// </summary>
+            public Builder SimulateWithMultiFactorModelAndSobol(
+                                        [NotNull] IReadOnlyList<double> meanReversions,
+                                        [NotNull] IEnumerable<IReadOnlyDictionary<T, double>> factorVols,
+                                        [NotNull] double[,] factorCorrelations, int numSims, int? simSeed = null,
+                                        int? valuationSimSeed = null, bool antithetic = false)
+            {
+                if (meanReversions == null) throw new ArgumentNullException(nameof(meanReversions));
+                if (factorVols == null) throw new ArgumentNullException(nameof(factorVols));
+                if (factorCorrelations == null) throw new ArgumentNullException(nameof(factorCorrelations));
+                if (numSims <= 0) throw new ArgumentOutOfRangeException(nameof(numSims), "Number of simulations must be positive.");
+                IReadOnlyDictionary<T, double>[] factorVolsArray = factorVols.ToArray();
+
+                // Regression and valuation use independently scrambled sequences
+                Random seedGenerator = simSeed == null ? new MathNet.Numerics.Random.MersenneTwister() :
+                                            new MathNet.Numerics.Random.MersenneTwister(simSeed.Value);
+                int regressionSeed = seedGenerator.Next();
+                int valuationSeed = valuationSimSeed ?? seedGenerator.Next();
+
+                SimulateSpotPriceBatch regressionSimulateBatch = CreateSobolSimulationSpotPriceBatch(meanReversions,
+                                            factorVolsArray, factorCorrelations, regressionSeed, antithetic);
+                SimulateSpotPriceBatch valuationSimulateBatch = CreateSobolSimulationSpotPriceBatch(meanReversions,
+                                            factorVolsArray, factorCorrelations, valuationSeed, antithetic);
+                RegressionSpotSimsGenerator = (currentPeriod, storageStart, storageEnd, forwardCurve) =>
+                    regressionSimulateBatch(currentPeriod, storageStart, storageEnd, forwardCurve, numSims);
+                ValuationSpotSimsGenerator = (currentPeriod, storageStart, storageEnd, forwardCurve) =>
+                    valuationSimulateBatch(currentPeriod, storageStart, storageEnd, forwardCurve, numSims);
+                ValuationSpotSimsBatchGenerator = valuationSimulateBatch;
+                AntitheticValuationSims = antithetic;
+                return this;
+            }
+
+            private static SimulateSpotPriceBatch CreateSobolSimulationSpotPriceBatch(IReadOnlyList<double> meanReversions,
+                IReadOnlyDictionary<T, double>[] factorVols, double[,] factorCorrelations, int seed, bool antithetic)
+            {
+                // The simulator is retained between calls with the same inputs so that the sequence is continued, as
+                // happens with a pseudo-random generator, rather than the same points being generated again
+                SobolMultiFactorSpotSimulator<T> simulator = null;
+                (T CurrentPeriod, T StorageStart, T StorageEnd, TimeSeries<T, double> ForwardCurve) simulatorInputs = default;
+                return (currentPeriod, storageStart, storageEnd, forwardCurve, numSims) =>
+                {
+                    if (currentPeriod.Equals(storageEnd))
+                    {
+                        return new MultiFactorSpotSimResults<T>(new double[0],
+                            new double[0], new T[0], 0, numSims, meanReversions.Count);
+                    }
+
+                    if (simulator == null || !currentPeriod.Equals(simulatorInputs.CurrentPeriod) ||
+                        !storageStart.Equals(simulatorInputs.StorageStart) || !storageEnd.Equals(simulatorInputs.StorageEnd) ||
+                        !ReferenceEquals(forwardCurve, simulatorInputs.ForwardCurve))
+                    {
+                        DateTime currentDate = currentPeriod.Start;
+                        T simStart = new[] { currentPeriod.Offset(1), storageStart }.Max();
+                        simulator = new SobolMultiFactorSpotSimulator<T>(meanReversions, factorVols, factorCorrelations,
+                            currentDate, forwardCurve, simStart.EnumerateTo(storageEnd), TimeFunctions.Act365, seed, antithetic);
+                        simulatorInputs = (currentPeriod, storageStart, storageEnd, forwardCurve);
+                    }
+                    return simulator.Simulate(numSims);
+                };
+            }
+
+            /// <summary>
+            /// Simulate using the multi-factor model one period at a time, rather than as panels of all periods, so that simulation
+            /// memory is proportional to the number of simulations, not the number of periods times simulations. The regression
+            /// simulation is generated backward in time during the backward induction, and the valuation simulation forward in time
+            /// during the valuation. See <see cref="StreamedMultiFactorSpotSimulator{T}"/>. <see cref="SimulationDataReturned"/>
+            /// cannot include simulated spot prices or factors, and the simulations cannot be shared between valuations.
+            /// </summary>
+            public Builder SimulateWithMultiFactorModelStreamed(
+                                        [NotNull] IReadOnlyList<double> meanReversions,
+                                        [NotNull] IEnumerable<IReadOnlyDictionary<T, double>> factorVols,
+                                        [NotNull] double[,] factorCorrelations, int numSims, int? simSeed = null,
+                                        int? valuationSimSeed = null, bool antithetic = true)
+            {
+                if (meanReversions == null) throw new ArgumentNullException(nameof(meanReversions));
+                if (factorVols == null) throw new ArgumentNullException(nameof(factorVols));
+                if (factorCorrelations == null) throw new ArgumentNullException(nameof(factorCorrelations));
+                if (numSims <= 0) throw new ArgumentOutOfRangeException(nameof(numSims), "Number of simulations must be positive.");
+                IReadOnlyDictionary<T, double>[] factorVolsArray = factorVols.ToArray();
 
-                return SimulateWithMultiFactorModel(regressionSimNormalGenerator, valuationSimNormalGenerator, modelParameters, numSims);
+                Random seedGenerator = simSeed == null ? new MathNet.Numerics.Random.MersenneTwister() :
+                                            new MathNet.Numerics.Random.MersenneTwister(simSeed.Value);
+                int regressionSeed = seedGenerator.Next();
+                int valuationSeed = valuationSimSeed ?? seedGenerator.Next();
+
+                SimulateSpotPriceBatch regressionSimulateBatch = CreateStreamedSimulationSpotPriceBatch(meanReversions,
+                                            factorVolsArray, factorCorrelations, regressionSeed, antithetic, true);
+                SimulateSpotPriceBatch valuationSimulateBatch = CreateStreamedSimulationSpotPriceBatch(meanReversions,
+                                            factorVolsArray, factorCorrelations, valuationSeed, antithetic, false);
+                RegressionSpotSimsGenerator = (currentPeriod, storageStart, storageEnd, forwardCurve) =>
+                    regressionSimulateBatch(currentPeriod, storageStart, storageEnd, forwardCurve, numSims);
+                ValuationSpotSimsGenerator = (currentPeriod, storageStart, storageEnd, forwardCurve) =>
+                    valuationSimulateBatch(currentPeriod, storageStart, storageEnd, forwardCurve, numSims);
+                ValuationSpotSimsBatchGenerator = valuationSimulateBatch;
+                AntitheticValuationSims = antithetic;
+                return this;
+            }
+
+            private static SimulateSpotPriceBatch CreateStreamedSimulationSpotPriceBatch(IReadOnlyList<double> meanReversions,
+                IReadOnlyDictionary<T, double>[] factorVols, double[,] factorCorrelations, int seed, bool antithetic, bool backward)
+            {
+                // The simulator is retained between calls with the same inputs so that each batch uses a new seed from its sequence
+                StreamedMultiFactorSpotSimulator<T> simulator = null;
+                (T CurrentPeriod, T StorageStart, T StorageEnd, TimeSeries<T, double> ForwardCurve) simulatorInputs = default;
+                return (currentPeriod, storageStart, storageEnd, forwardCurve, numSims) =>
+                {
+                    if (currentPeriod.Equals(storageEnd))
+                    {
+                        return new MultiFactorSpotSimResults<T>(new double[0],
+                            new double[0], new T[0], 0, numSims, meanReversions.Count);
+                    }
+
+                    if (simulator == null || !currentPeriod.Equals(simulatorInputs.CurrentPeriod) ||
+                        !storageStart.Equals(simulatorInputs.StorageStart) || !storageEnd.Equals(simulatorInputs.StorageEnd) ||
+                        !ReferenceEquals(forwardCurve, simulatorInputs.ForwardCurve))
+                    {
+                        DateTime currentDate = currentPeriod.Start;
+                        T simStart = new[] { currentPeriod.Offset(1), storageStart }.Max();
+                        simulator = new StreamedMultiFactorSpotSimulator<T>(meanReversions, factorVols, factorCorrelations,
+                            currentDate, forwardCurve, simStart.EnumerateTo(storageEnd), TimeFunctions.Act365, seed, antithetic);
+                        simulatorInputs = (currentPeriod, storageStart, storageEnd, forwardCurve);
+                    }
+                    return backward ? simulator.SimulateBackward(numSims) : simulator.SimulateForward(numSims);
+                };
             }
 
             public Builder UseSpotSimResults(ISpotSimResults<T> regressionSpotSim, ISpotSimResults<T> valuationSpotSim)
@@ -207,6 +463,7 @@ public Builder UseSpotSimResults(ISpotSimResults<T> regressionSpotSim, ISpotSimR
                     CheckSpotSim(regressionSpotSim, currentPeriod, storageStart, storageEnd, nameof(regressionSpotSim));
                     return regressionSpotSim;
                 };
+                ValuationSpotSimsBatchGenerator = null; // Provided simulations cannot be generated in batches
                 ValuationSpotSimsGenerator = (T currentPeriod, T storageStart, T storageEnd, TimeSeries<T, double> forwardCurve) =>
                 {
                     CheckSpotSim(valuationSpotSim, currentPeriod, storageStart, storageEnd, nameof(valuationSpotSim));
@@ -248,7 +505,17 @@ public Builder Clone()
                     RegressionSpotSimsGenerator = this.RegressionSpotSimsGenerator,
                     ValuationSpotSimsGenerator = this.ValuationSpotSimsGenerator,
                     Storage = this.Storage,
-                    ExtraDecisions = this.ExtraDecisions
+                    ExtraDecisions = this.ExtraDecisions,
+                    DiscountDeltas = this.DiscountDeltas,
+                    SimulationDataReturned = this.SimulationDataReturned,
+                    MaxDegreeOfParallelism = this.MaxDegreeOfParallelism,
+                    PseudoInverseLookAhead = this.PseudoInverseLookAhead,
+                    ValuationSpotSimsBatchGenerator = this.ValuationSpotSimsBatchGenerator,
+                    ValuationSimBatchSize = this.ValuationSimBatchSize,
+                    IntrinsicControlVariate = this.IntrinsicControlVariate,
+                    TargetValuationSimStandardError = this.TargetValuationSimStandardError,
+                    ExercisePolicy = this.ExercisePolicy,
+                    AntitheticValuationSims = this.AntitheticValuationSims
                 };
             }
 
@@ -0,0 +1,83 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System.Collections.Generic;
+using System.Globalization;
+using System.Text;
+using MathNet.Numerics.LinearAlgebra;
+
+namespace Cmdty.Storage
+{
+    /// <summary>
+    /// Pool of dense matrices, used to reuse the contiguous heap memory of matrices between time periods, rather than allocating
+    /// new matrices for each period. Matrices returned by Rent are not cleared so contain values written before being returned
+    /// to the pool. Not thread-safe.
+    /// </summary>
+    internal sealed class MatrixPool
+    {
+        private readonly Dictionary<(int NumRows, int NumCols), Stack<Matrix<double>>> _pooledMatrices;
+
+        public int NumAllocations { get; private set; }
+        public int NumRentals { get; private set; }
+        public long NumElementsAllocated { get; private set; }
+
+        public MatrixPool()
+        {
+            _pooledMatrices = new Dictionary<(int NumRows, int NumCols), Stack<Matrix<double>>>();
+        }
+
+        public Matrix<double> Rent(int numRows, int numCols)
+        {
+            NumRentals++;
+            if (_pooledMatrices.TryGetValue((numRows, numCols), out Stack<Matrix<double>> matrices) && matrices.Count > 0)
+                return matrices.Pop();
+            NumAllocations++;
+            NumElementsAllocated += (long)numRows * numCols;
+            return Matrix<double>.Build.Dense(numRows, numCols);
+        }
+
+        public void Return(Matrix<double> matrix)
+        {
+            (int NumRows, int NumCols) key = (matrix.RowCount, matrix.ColumnCount);
+            if (!_pooledMatrices.TryGetValue(key, out Stack<Matrix<double>> matrices))
+            {
+                matrices = new Stack<Matrix<double>>();
+                _pooledMatrices[key] = matrices;
+            }
+            matrices.Push(matrix);
+        }
+
+        public string GenerateAllocationReport()
+        {
+            var stringBuilder = new StringBuilder();
+            stringBuilder.AppendLine("Buffer rentals:\t\t" + NumRentals.ToString("N0", CultureInfo.InvariantCulture));
+            stringBuilder.AppendLine("Buffer allocations:\t" + NumAllocations.ToString("N0", CultureInfo.InvariantCulture));
+            stringBuilder.AppendLine("Buffer MB allocated:\t" + (NumElementsAllocated * sizeof(double) / (1024.0 * 1024.0))
+                                        .ToString("N2", CultureInfo.InvariantCulture));
+            return stringBuilder.ToString();
+        }
+
+    }
+}
@@ -0,0 +1,79 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Collections.Generic;
+
+namespace Cmdty.Storage
+{
+    /// <summary>
+    /// Covariances of the unit volatility mean-reverting Markov factors of the multi-factor model, shared by its simulators.
+    /// </summary>
+    internal static class MultiFactorCovariances
+    {
+        // Integral of exp(-meanReversionSum * (time - u)) du from 0 to time
+        public static double ReversionIntegral(double meanReversionSum, double time)
+        {
+            if (meanReversionSum == 0.0)
+                return time;
+            return (1.0 - Math.Exp(-meanReversionSum * time)) / meanReversionSum;
+        }
+
+        /// <summary>
+        /// Covariances of the Markov factors at the specified time, or of their innovations over a time step of this length.
+        /// </summary>
+        public static double[,] FactorCovariances(IReadOnlyList<double> meanReversions, double[,] factorCorrelations, double time)
+        {
+            int numFactors = meanReversions.Count;
+            var covariances = new double[numFactors, numFactors];
+            for (int i = 0; i < numFactors; i++)
+            for (int j = 0; j < numFactors; j++)
+                covariances[i, j] = factorCorrelations[i, j] * ReversionIntegral(meanReversions[i] + meanReversions[j], time);
+            return covariances;
+        }
+
+        // Cholesky decomposition tolerant of positive semi-definite matrices, e.g. from perfectly correlated factors
+        public static double[,] CholeskyLower(double[,] matrix)
+        {
+            int size = matrix.GetLength(0);
+            var lower = new double[size, size];
+            for (int i = 0; i < size; i++)
+            {
+                for (int j = 0; j <= i; j++)
+                {
+                    double sum = matrix[i, j];
+                    for (int k = 0; k < j; k++)
+                        sum -= lower[i, k] * lower[j, k];
+                    if (i == j)
+                        lower[i, i] = sum > 0.0 ? Math.Sqrt(sum) : 0.0;
+                    else
+                        lower[i, j] = lower[j, j] > 0.0 ? sum / lower[j, j] : 0.0;
+                }
+            }
+            return lower;
+        }
+
+    }
+}
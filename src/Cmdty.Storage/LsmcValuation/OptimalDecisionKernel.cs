@@ -0,0 +1,231 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Numerics;
+using System.Runtime.InteropServices;
+
+namespace Cmdty.Storage
+{
+    /// <summary>
+    /// Finds for each simulation the decision which maximises the NPV estimated using regression continuation values, for all simulations
+    /// sharing one inventory and so one decision set. Used by backward induction, for each inventory grid point, to calculate storage values,
+    /// and by the forward simulation, for each group of simulations with the same inventory, to find the optimal decision. Where the hardware
+    /// supports it, blocks of simulations are evaluated at once using SIMD instructions, with the running max and index of max decision held
+    /// in vectors.
+    /// </summary>
+    internal static class OptimalDecisionKernel
+    {
+        public static void CalcStorageValues(ReadOnlySpan<double> simulatedPrices, double discountFactorFromCmdtySettlement,
+            double inventoryCostNpv, double[] decisionVolumes, double[] cmdtyUsedForDecisions, double[] injectWithdrawCostNpvs,
+            int[] lowerGridOffsets, int[] upperGridOffsets, double[] lowerWeights, double[] upperWeights,
+            double[] storageRegressValuesNextPeriod, double[] storageActualValuesNextPeriod, Span<double> storageValuesBySim)
+        {
+            int numVectorisedSims = 0;
+            if (Vector.IsHardwareAccelerated)
+            {
+                numVectorisedSims = simulatedPrices.Length - simulatedPrices.Length % Vector<double>.Count;
+                CalcStorageValuesVectorised(simulatedPrices.Slice(0, numVectorisedSims), discountFactorFromCmdtySettlement, inventoryCostNpv,
+                    decisionVolumes, cmdtyUsedForDecisions, injectWithdrawCostNpvs, lowerGridOffsets, upperGridOffsets, lowerWeights, upperWeights,
+                    storageRegressValuesNextPeriod, storageActualValuesNextPeriod, storageValuesBySim);
+            }
+            CalcStorageValuesScalar(numVectorisedSims, simulatedPrices.Length, simulatedPrices, discountFactorFromCmdtySettlement, inventoryCostNpv,
+                decisionVolumes, cmdtyUsedForDecisions, injectWithdrawCostNpvs, lowerGridOffsets, upperGridOffsets, lowerWeights, upperWeights,
+                storageRegressValuesNextPeriod, storageActualValuesNextPeriod, storageValuesBySim);
+        }
+
+        public static void CalcOptimalDecisionIndices(ReadOnlySpan<double> simulatedPrices, double discountFactorFromCmdtySettlement,
+            double inventoryCostNpv, double[] decisionVolumes, double[] cmdtyUsedForDecisions, double[] injectWithdrawCostNpvs,
+            int[] lowerGridOffsets, int[] upperGridOffsets, double[] lowerWeights, double[] upperWeights,
+            double[] storageRegressValuesNextPeriod, Span<int> indicesOfOptimalDecision)
+        {
+            int numVectorisedSims = 0;
+            if (Vector.IsHardwareAccelerated)
+            {
+                numVectorisedSims = simulatedPrices.Length - simulatedPrices.Length % Vector<double>.Count;
+                CalcOptimalDecisionIndicesVectorised(simulatedPrices.Slice(0, numVectorisedSims), discountFactorFromCmdtySettlement, 
+                    inventoryCostNpv, decisionVolumes, cmdtyUsedForDecisions, injectWithdrawCostNpvs, lowerGridOffsets, upperGridOffsets, 
+                    lowerWeights, upperWeights, storageRegressValuesNextPeriod, indicesOfOptimalDecision);
+            }
+            CalcOptimalDecisionIndicesScalar(numVectorisedSims, simulatedPrices.Length, simulatedPrices, discountFactorFromCmdtySettlement, 
+                inventoryCostNpv, decisionVolumes, cmdtyUsedForDecisions, injectWithdrawCostNpvs, lowerGridOffsets, upperGridOffsets, 
+                lowerWeights, upperWeights, storageRegressValuesNextPeriod, indicesOfOptimalDecision);
+        }
+
+        private static void CalcStorageValuesVectorised(ReadOnlySpan<double> simulatedPrices, double discountFactorFromCmdtySettlement,
+            double inventoryCostNpv, double[] decisionVolumes, double[] cmdtyUsedForDecisions, double[] injectWithdrawCostNpvs,
+            int[] lowerGridOffsets, int[] upperGridOffsets, double[] lowerWeights, double[] upperWeights,
+            double[] storageRegressValuesNextPeriod, double[] storageActualValuesNextPeriod, Span<double> storageValuesBySim)
+        {
+            int vectorWidth = Vector<double>.Count;
+            ReadOnlySpan<Vector<double>> simulatedPriceVectors = MemoryMarshal.Cast<double, Vector<double>>(simulatedPrices);
+
+            for (int vectorIndex = 0; vectorIndex < simulatedPriceVectors.Length; vectorIndex++)
+            {
+                int firstSimIndex = vectorIndex * vectorWidth;
+                (Vector<double> maxDecisionNpvs, Vector<long> indicesOfMax) = MaxDecisionNpvsVectorised(simulatedPriceVectors[vectorIndex], 
+                    firstSimIndex, discountFactorFromCmdtySettlement, inventoryCostNpv, decisionVolumes, cmdtyUsedForDecisions, injectWithdrawCostNpvs,
+                    lowerGridOffsets, upperGridOffsets, lowerWeights, upperWeights, storageRegressValuesNextPeriod);
+
+                for (int lane = 0; lane < vectorWidth; lane++)
+                {
+                    int simIndex = firstSimIndex + lane;
+                    storageValuesBySim[simIndex] = OptimalActualDecisionNpv(maxDecisionNpvs[lane], (int)indicesOfMax[lane], simIndex,
+                        lowerGridOffsets, upperGridOffsets, lowerWeights, upperWeights, storageRegressValuesNextPeriod, storageActualValuesNextPeriod);
+                }
+            }
+        }
+
+        private static void CalcOptimalDecisionIndicesVectorised(ReadOnlySpan<double> simulatedPrices, double discountFactorFromCmdtySettlement,
+            double inventoryCostNpv, double[] decisionVolumes, double[] cmdtyUsedForDecisions, double[] injectWithdrawCostNpvs,
+            int[] lowerGridOffsets, int[] upperGridOffsets, double[] lowerWeights, double[] upperWeights,
+            double[] storageRegressValuesNextPeriod, Span<int> indicesOfOptimalDecision)
+        {
+            int vectorWidth = Vector<double>.Count;
+            ReadOnlySpan<Vector<double>> simulatedPriceVectors = MemoryMarshal.Cast<double, Vector<double>>(simulatedPrices);
+
+            for (int vectorIndex = 0; vectorIndex < simulatedPriceVectors.Length; vectorIndex++)
+            {
+                int firstSimIndex = vectorIndex * vectorWidth;
+                (Vector<double> _, Vector<long> indicesOfMax) = MaxDecisionNpvsVectorised(simulatedPriceVectors[vectorIndex], firstSimIndex,
+                    discountFactorFromCmdtySettlement, inventoryCostNpv, decisionVolumes, cmdtyUsedForDecisions, injectWithdrawCostNpvs,
+                    lowerGridOffsets, upperGridOffsets, lowerWeights, upperWeights, storageRegressValuesNextPeriod);
+
+                for (int lane = 0; lane < vectorWidth; lane++)
+                    indicesOfOptimalDecision[firstSimIndex + lane] = (int)indicesOfMax[lane];
+            }
+        }
+
+        private static (Vector<double> MaxDecisionNpvs, Vector<long> IndicesOfMax) MaxDecisionNpvsVectorised(Vector<double> spotPrices, 
+            int firstSimIndex, double discountFactorFromCmdtySettlement, double inventoryCostNpv, double[] decisionVolumes, 
+            double[] cmdtyUsedForDecisions, double[] injectWithdrawCostNpvs, int[] lowerGridOffsets, int[] upperGridOffsets, 
+            double[] lowerWeights, double[] upperWeights, double[] storageRegressValuesNextPeriod)
+        {
+            var inventoryCostNpvVector = new Vector<double>(inventoryCostNpv);
+            Vector<double> maxDecisionNpvs = Vector<double>.Zero;
+            Vector<long> indicesOfMax = Vector<long>.Zero;
+            for (int decisionIndex = 0; decisionIndex < decisionVolumes.Length; decisionIndex++)
+            {
+                // Same order of floating-point operations as MaxDecisionNpvScalar, so results are identical
+                Vector<double> injectWithdrawNpvs = -decisionVolumes[decisionIndex] * spotPrices * discountFactorFromCmdtySettlement;
+                Vector<double> cmdtyUsedForInjectWithdrawNpvs = -cmdtyUsedForDecisions[decisionIndex] * spotPrices * 
+                                                                discountFactorFromCmdtySettlement;
+                Vector<double> immediateNpvs = injectWithdrawNpvs - new Vector<double>(injectWithdrawCostNpvs[decisionIndex]) + 
+                                               cmdtyUsedForInjectWithdrawNpvs;
+                Vector<double> continuationValues =
+                    new Vector<double>(storageRegressValuesNextPeriod, lowerGridOffsets[decisionIndex] + firstSimIndex) * lowerWeights[decisionIndex] +
+                    new Vector<double>(storageRegressValuesNextPeriod, upperGridOffsets[decisionIndex] + firstSimIndex) * upperWeights[decisionIndex];
+                Vector<double> decisionNpvs = immediateNpvs + continuationValues - inventoryCostNpvVector;
+
+                if (decisionIndex == 0)
+                {
+                    maxDecisionNpvs = decisionNpvs;
+                    continue;
+                }
+                // Strictly greater than, so ties resolve to the first decision, as with StorageHelper.MaxValueAndIndex
+                Vector<long> isGreater = Vector.GreaterThan(decisionNpvs, maxDecisionNpvs);
+                maxDecisionNpvs = Vector.ConditionalSelect(isGreater, decisionNpvs, maxDecisionNpvs);
+                indicesOfMax = Vector.ConditionalSelect(isGreater, new Vector<long>(decisionIndex), indicesOfMax);
+            }
+            return (maxDecisionNpvs, indicesOfMax);
+        }
+
+        internal static void CalcStorageValuesScalar(int fromSimIndex, int toSimIndex, ReadOnlySpan<double> simulatedPrices, 
+            double discountFactorFromCmdtySettlement, double inventoryCostNpv, double[] decisionVolumes, double[] cmdtyUsedForDecisions, 
+            double[] injectWithdrawCostNpvs, int[] lowerGridOffsets, int[] upperGridOffsets, double[] lowerWeights, double[] upperWeights,
+            double[] storageRegressValuesNextPeriod, double[] storageActualValuesNextPeriod, Span<double> storageValuesBySim)
+        {
+            for (int simIndex = fromSimIndex; simIndex < toSimIndex; simIndex++)
+            {
+                (double optimalRegressDecisionNpv, int indexOfOptimalDecision) = MaxDecisionNpvScalar(simIndex, simulatedPrices[simIndex], 
+                    discountFactorFromCmdtySettlement, inventoryCostNpv, decisionVolumes, cmdtyUsedForDecisions, injectWithdrawCostNpvs, 
+                    lowerGridOffsets, upperGridOffsets, lowerWeights, upperWeights, storageRegressValuesNextPeriod);
+                storageValuesBySim[simIndex] = OptimalActualDecisionNpv(optimalRegressDecisionNpv, indexOfOptimalDecision, simIndex,
+                    lowerGridOffsets, upperGridOffsets, lowerWeights, upperWeights, storageRegressValuesNextPeriod, storageActualValuesNextPeriod);
+            }
+        }
+
+        internal static void CalcOptimalDecisionIndicesScalar(int fromSimIndex, int toSimIndex, ReadOnlySpan<double> simulatedPrices,
+            double discountFactorFromCmdtySettlement, double inventoryCostNpv, double[] decisionVolumes, double[] cmdtyUsedForDecisions,
+            double[] injectWithdrawCostNpvs, int[] lowerGridOffsets, int[] upperGridOffsets, double[] lowerWeights, double[] upperWeights,
+            double[] storageRegressValuesNextPeriod, Span<int> indicesOfOptimalDecision)
+        {
+            for (int simIndex = fromSimIndex; simIndex < toSimIndex; simIndex++)
+            {
+                (double _, int indexOfOptimalDecision) = MaxDecisionNpvScalar(simIndex, simulatedPrices[simIndex], discountFactorFromCmdtySettlement,
+                    inventoryCostNpv, decisionVolumes, cmdtyUsedForDecisions, injectWithdrawCostNpvs, lowerGridOffsets, upperGridOffsets,
+                    lowerWeights, upperWeights, storageRegressValuesNextPeriod);
+                indicesOfOptimalDecision[simIndex] = indexOfOptimalDecision;
+            }
+        }
+
+        private static (double MaxDecisionNpv, int IndexOfMax) MaxDecisionNpvScalar(int simIndex, double simulatedSpotPrice,
+            double discountFactorFromCmdtySettlement, double inventoryCostNpv, double[] decisionVolumes, double[] cmdtyUsedForDecisions,
+            double[] injectWithdrawCostNpvs, int[] lowerGridOffsets, int[] upperGridOffsets, double[] lowerWeights, double[] upperWeights,
+            double[] storageRegressValuesNextPeriod)
+        {
+            double maxDecisionNpv = 0.0;
+            int indexOfMax = 0;
+            for (var decisionIndex = 0; decisionIndex < decisionVolumes.Length; decisionIndex++)
+            {
+                double injectWithdrawNpv = -decisionVolumes[decisionIndex] * simulatedSpotPrice * discountFactorFromCmdtySettlement;
+                double cmdtyUsedForInjectWithdrawNpv = -cmdtyUsedForDecisions[decisionIndex] * simulatedSpotPrice * 
+                                                       discountFactorFromCmdtySettlement;
+                double immediateNpv = injectWithdrawNpv - injectWithdrawCostNpvs[decisionIndex] + cmdtyUsedForInjectWithdrawNpv;
+
+                double continuationValue = 
+                    storageRegressValuesNextPeriod[lowerGridOffsets[decisionIndex] + simIndex] * lowerWeights[decisionIndex] + 
+                    storageRegressValuesNextPeriod[upperGridOffsets[decisionIndex] + simIndex] * upperWeights[decisionIndex];
+
+                double decisionNpv = immediateNpv + continuationValue - inventoryCostNpv;
+                // Strictly greater than, so ties resolve to the first decision, as with StorageHelper.MaxValueAndIndex
+                if (decisionIndex == 0 || decisionNpv > maxDecisionNpv)
+                {
+                    maxDecisionNpv = decisionNpv;
+                    indexOfMax = decisionIndex;
+                }
+            }
+            return (maxDecisionNpv, indexOfMax);
+        }
+
+        private static double OptimalActualDecisionNpv(double optimalRegressDecisionNpv, int indexOfOptimalDecision, int simIndex,
+            int[] lowerGridOffsets, int[] upperGridOffsets, double[] lowerWeights, double[] upperWeights,
+            double[] storageRegressValuesNextPeriod, double[] storageActualValuesNextPeriod)
+        {
+            int lowerIndex = lowerGridOffsets[indexOfOptimalDecision] + simIndex;
+            int upperIndex = upperGridOffsets[indexOfOptimalDecision] + simIndex;
+            double lowerWeight = lowerWeights[indexOfOptimalDecision];
+            double upperWeight = upperWeights[indexOfOptimalDecision];
+
+            double regressionContinuationValue = storageRegressValuesNextPeriod[lowerIndex] * lowerWeight + 
+                                                 storageRegressValuesNextPeriod[upperIndex] * upperWeight;
+            double actualContinuationValue = storageActualValuesNextPeriod[lowerIndex] * lowerWeight + 
+                                             storageActualValuesNextPeriod[upperIndex] * upperWeight;
+            double adjustFromRegressToActualContinuation = -regressionContinuationValue + actualContinuationValue;
+            return optimalRegressDecisionNpv + adjustFromRegressToActualContinuation;
+        }
+
+    }
+}
@@ -0,0 +1,164 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Collections.Generic;
+using System.Threading;
+using System.Threading.Tasks;
+using Cmdty.TimePeriodValueTypes;
+using MathNet.Numerics.LinearAlgebra;
+using MathNet.Numerics.LinearAlgebra.Factorization;
+
+namespace Cmdty.Storage
+{
+    /// <summary>
+    /// Supplies the LSMC regression design matrices and their pseudo-inverses to the backward induction. These only depend on the
+    /// simulated regressors, not continuation values, so with a positive look-ahead they are calculated on the thread pool for the
+    /// periods ahead of the backward induction, while the induction is calculating earlier periods. The number of design and
+    /// pseudo-inverse matrices held in memory is one more than the look-ahead.
+    /// </summary>
+    internal sealed class PseudoInversePipeline<T>
+        where T : ITimePeriod<T>
+    {
+        private readonly IReadOnlyList<T> _periods;
+        private readonly Action<Matrix<double>, T> _populateDesignMatrix;
+        private readonly int _lookAhead;
+        private readonly CancellationToken _cancellationToken;
+        private readonly Task<RegressionMatrices>[] _factorisations;
+        private readonly Stack<RegressionMatrices> _freeMatrices;
+        private RegressionMatrices _takenMatrices;
+        private int _nextPeriodIndexToSchedule;
+        private int _nextPeriodIndexToTake;
+
+        /// <param name="periods">Periods for which pseudo-inverses are required, in the order they will be taken.</param>
+        /// <param name="populateDesignMatrix">Populates the design matrix for a period. Called from thread pool threads if
+        /// lookAhead is positive.</param>
+        /// <param name="numSims">Number of simulations, i.e. rows of the design matrix.</param>
+        /// <param name="numBasisFunctions">Number of basis functions, i.e. columns of the design matrix.</param>
+        /// <param name="lookAhead">Maximum number of periods for which pseudo-inverses are calculated ahead of the
+        /// period most recently taken.</param>
+        /// <param name="cancellationToken">Cancellation token for the thread pool calculations.</param>
+        public PseudoInversePipeline(IReadOnlyList<T> periods, Action<Matrix<double>, T> populateDesignMatrix, int numSims, 
+            int numBasisFunctions, int lookAhead, CancellationToken cancellationToken)
+        {
+            if (lookAhead < 0)
+                throw new ArgumentOutOfRangeException(nameof(lookAhead), lookAhead, "Look-ahead must be non-negative.");
+            _periods = periods;
+            _populateDesignMatrix = populateDesignMatrix;
+            _lookAhead = lookAhead;
+            _cancellationToken = cancellationToken;
+            _factorisations = new Task<RegressionMatrices>[periods.Count];
+            int numMatrices = Math.Min(lookAhead + 1, periods.Count);
+            _freeMatrices = new Stack<RegressionMatrices>(numMatrices);
+            for (int i = 0; i < numMatrices; i++)
+                _freeMatrices.Push(new RegressionMatrices(numSims, numBasisFunctions));
+            if (lookAhead > 0)
+                ScheduleFactorisations();
+        }
+
+        /// <summary>
+        /// Gets the design matrix and pseudo-inverse for the next period, waiting for the calculation to complete if
+        /// necessary. The matrices can be used until <see cref="Release"/> is called.
+        /// </summary>
+        public (Matrix<double> DesignMatrix, Matrix<double> PseudoInverse) Take(T period)
+        {
+            if (_takenMatrices != null)
+                throw new InvalidOperationException("Matrices for the previous period have not been released.");
+            if (_nextPeriodIndexToTake >= _periods.Count || !period.Equals(_periods[_nextPeriodIndexToTake]))
+                throw new InvalidOperationException($"Period {period} is not the next period of the pipeline.");
+
+            RegressionMatrices matrices;
+            if (_lookAhead == 0)
+            {
+                matrices = _freeMatrices.Pop();
+                Factorise(matrices, period);
+            }
+            else
+            {
+                matrices = _factorisations[_nextPeriodIndexToTake].GetAwaiter().GetResult(); // Rethrows exception without wrapping in AggregateException
+                _factorisations[_nextPeriodIndexToTake] = null;
+            }
+            _nextPeriodIndexToTake++;
+            _takenMatrices = matrices;
+            return (matrices.DesignMatrix, matrices.PseudoInverse);
+        }
+
+        /// <summary>
+        /// Releases the matrices returned by the most recent call to <see cref="Take"/>, so their memory can be reused for
+        /// the calculation of a later period.
+        /// </summary>
+        public void Release()
+        {
+            if (_takenMatrices == null)
+                throw new InvalidOperationException("No matrices have been taken.");
+            _freeMatrices.Push(_takenMatrices);
+            _takenMatrices = null;
+            if (_lookAhead > 0)
+                ScheduleFactorisations();
+        }
+
+        private void ScheduleFactorisations()
+        {
+            while (_freeMatrices.Count > 0 && _nextPeriodIndexToSchedule < _periods.Count)
+            {
+                RegressionMatrices matrices = _freeMatrices.Pop();
+                T period = _periods[_nextPeriodIndexToSchedule];
+                _factorisations[_nextPeriodIndexToSchedule] = Task.Run(() =>
+                {
+                    Factorise(matrices, period);
+                    return matrices;
+                }, _cancellationToken);
+                _nextPeriodIndexToSchedule++;
+            }
+        }
+
+        private void Factorise(RegressionMatrices matrices, T period)
+        {
+            // TODO option to use SVD rather than QR for regression. Will be slower, but will function with design matrix collinearity.
+            // TODO normalise mean and standard deviation of regressors for better stability
+            // TODO perform regression by direct call to Intel MKL dgels/dgelss, 
+            _populateDesignMatrix(matrices.DesignMatrix, period);
+            QR<double> designMatrixQr = matrices.DesignMatrix.QR(QRMethod.Thin);
+            Matrix<double> rInverse = designMatrixQr.R.Inverse();
+            designMatrixQr.Q.Transpose(matrices.QTranspose);
+            rInverse.Multiply(matrices.QTranspose, matrices.PseudoInverse);
+        }
+
+        private sealed class RegressionMatrices
+        {
+            public Matrix<double> DesignMatrix { get; }
+            public Matrix<double> QTranspose { get; }
+            public Matrix<double> PseudoInverse { get; }
+
+            public RegressionMatrices(int numSims, int numBasisFunctions)
+            {
+                DesignMatrix = Matrix<double>.Build.Dense(numSims, numBasisFunctions);
+                QTranspose = Matrix<double>.Build.Dense(numBasisFunctions, numSims);
+                PseudoInverse = Matrix<double>.Build.Dense(numBasisFunctions, numSims);
+            }
+        }
+
+    }
+}
@@ -0,0 +1,141 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+
+namespace Cmdty.Storage
+{
+    /// <summary>
+    /// Brownian bridge construction of a Brownian motion path on a set of times. The first standard normal
+    /// determines the terminal value of the path, with subsequent normals filling in midpoints breadth first. When
+    /// used with low-discrepancy points this concentrates the path variance in the leading dimensions.
+    /// </summary>
+    internal sealed class BrownianBridge
+    {
+        private readonly double[] _times;
+        private readonly int[] _bridgeIndex;
+        private readonly int[] _leftIndex;
+        private readonly int[] _rightIndex;
+        private readonly double[] _leftWeight;
+        private readonly double[] _rightWeight;
+        private readonly double[] _stdDev;
+        private readonly double[] _sqrtTimeSteps;
+
+        public int NumSteps { get; }
+
+        /// <summary>
+        /// Creates the bridge for path times, which must be positive and strictly increasing. The Brownian motion
+        /// is taken to equal zero at time zero.
+        /// </summary>
+        public BrownianBridge(IEnumerable<double> times)
+        {
+            if (times == null) throw new ArgumentNullException(nameof(times));
+            _times = times.ToArray();
+            NumSteps = _times.Length;
+            if (NumSteps == 0)
+                throw new ArgumentException("Times cannot be empty.", nameof(times));
+            if (_times[0] <= 0.0)
+                throw new ArgumentException("Times must be positive.", nameof(times));
+            for (int i = 1; i < NumSteps; i++)
+                if (_times[i] <= _times[i - 1])
+                    throw new ArgumentException("Times must be strictly increasing.", nameof(times));
+
+            _bridgeIndex = new int[NumSteps];
+            _leftIndex = new int[NumSteps];
+            _rightIndex = new int[NumSteps];
+            _leftWeight = new double[NumSteps];
+            _rightWeight = new double[NumSteps];
+            _stdDev = new double[NumSteps];
+            _sqrtTimeSteps = new double[NumSteps];
+
+            for (int i = 0; i < NumSteps; i++)
+                _sqrtTimeSteps[i] = Math.Sqrt(i == 0 ? _times[0] : _times[i] - _times[i - 1]);
+
+            // map[i] is one plus the order in which point i is constructed, or zero if not yet constructed
+            var map = new int[NumSteps];
+            map[NumSteps - 1] = 1;
+            _bridgeIndex[0] = NumSteps - 1;
+            _stdDev[0] = Math.Sqrt(_times[NumSteps - 1]);
+
+            int left = 0;
+            for (int i = 1; i < NumSteps; i++)
+            {
+                // Find the next unpopulated segment [left, right - 1], bounded to the right by populated point right
+                while (map[left] != 0)
+                    left++;
+                int right = left;
+                while (map[right] == 0)
+                    right++;
+                int bridgePoint = left + ((right - 1 - left) >> 1);
+                map[bridgePoint] = i + 1;
+                _bridgeIndex[i] = bridgePoint;
+                _leftIndex[i] = left;
+                _rightIndex[i] = right;
+
+                double leftTime = left == 0 ? 0.0 : _times[left - 1];
+                double rightTime = _times[right];
+                double bridgeTime = _times[bridgePoint];
+                _leftWeight[i] = (rightTime - bridgeTime) / (rightTime - leftTime);
+                _rightWeight[i] = (bridgeTime - leftTime) / (rightTime - leftTime);
+                _stdDev[i] = Math.Sqrt((bridgeTime - leftTime) * (rightTime - bridgeTime) / (rightTime - leftTime));
+
+                left = right + 1;
+                if (left >= NumSteps)
+                    left = 0;
+            }
+        }
+
+        /// <summary>
+        /// Transforms independent standard normals, in order of importance, into the independent standard normal
+        /// increments of the path, i.e. the Brownian increment over each step divided by the square root of the
+        /// step length.
+        /// </summary>
+        public void Transform(ReadOnlySpan<double> standardNormals, Span<double> normalisedIncrements)
+        {
+            if (standardNormals.Length != NumSteps)
+                throw new ArgumentException($"Length must equal number of steps {NumSteps}.", nameof(standardNormals));
+            if (normalisedIncrements.Length != NumSteps)
+                throw new ArgumentException($"Length must equal number of steps {NumSteps}.", nameof(normalisedIncrements));
+
+            // First construct the path in normalisedIncrements, then difference in place
+            Span<double> path = normalisedIncrements;
+            path[NumSteps - 1] = _stdDev[0] * standardNormals[0];
+            for (int i = 1; i < NumSteps; i++)
+            {
+                int left = _leftIndex[i];
+                double leftValue = left == 0 ? 0.0 : path[left - 1];
+                path[_bridgeIndex[i]] = _leftWeight[i] * leftValue + _rightWeight[i] * path[_rightIndex[i]] +
+                                        _stdDev[i] * standardNormals[i];
+            }
+
+            for (int i = NumSteps - 1; i > 0; i--)
+                normalisedIncrements[i] = (path[i] - path[i - 1]) / _sqrtTimeSteps[i];
+            normalisedIncrements[0] = path[0] / _sqrtTimeSteps[0];
+        }
+
+    }
+}
@@ -0,0 +1,227 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Cmdty.Core.Common;
+using Cmdty.Storage.PythonHelpers;
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+using MathNet.Numerics.Distributions;
+using MathNet.Numerics.Random;
+
+namespace Cmdty.Storage
+{
+    /// <summary>
+    /// Simulates spot prices and Markov factors of the multi-factor model using randomised quasi-Monte Carlo:
+    /// scrambled Sobol points with a Brownian bridge construction of each factor's driving Brownian motion.
+    /// Dimensions are ordered by bridge construction order, then factor, so the Sobol points are used where most of
+    /// the path variance lies. Dimensions beyond <see cref="SobolSequence.MaxDimensions"/> use pseudo-random normals.
+    /// Consecutive calls to <see cref="Simulate"/> continue the sequence. If antithetic, each Sobol point is followed by
+    /// its reflection.
+    /// </summary>
+    public sealed class SobolMultiFactorSpotSimulator<T>
+        where T : ITimePeriod<T>
+    {
+        private readonly T[] _simulatedPeriods;
+        private readonly int _numFactors;
+        private readonly int _numSteps;
+        private readonly double[] _forwardPrices;
+        private readonly double[][] _spotVols; // Indexed by step, factor
+        private readonly double[][] _reversionMultipliers; // Indexed by step, factor
+        private readonly double[][,] _incrementCholesky; // Indexed by step
+        private readonly double[] _spotVarianceAdjustments;
+        private readonly BrownianBridge _brownianBridge;
+        private readonly SobolSequence _sobolSequence;
+        private readonly Random _pseudoRandom;
+        private readonly bool _antithetic;
+        private bool _nextSimIsAntithetic;
+        private readonly double[] _standardNormals;
+
+        public SobolMultiFactorSpotSimulator(IReadOnlyList<double> meanReversions,
+            IEnumerable<IReadOnlyDictionary<T, double>> factorVols, double[,] factorCorrelations,
+            DateTime currentDate, TimeSeries<T, double> forwardCurve, IEnumerable<T> simulatedPeriods,
+            Func<DateTime, DateTime, double> timeFunc, int? seed = null, bool antithetic = false)
+            : this(meanReversions, factorVols, factorCorrelations, currentDate, 
+                forwardCurve == null ? null : new Func<T, double>(period => forwardCurve[period]), 
+                simulatedPeriods, timeFunc, seed, antithetic)
+        {
+        }
+
+        public SobolMultiFactorSpotSimulator(IReadOnlyList<double> meanReversions,
+            IEnumerable<IReadOnlyDictionary<T, double>> factorVols, double[,] factorCorrelations,
+            DateTime currentDate, IReadOnlyDictionary<T, double> forwardCurve, IEnumerable<T> simulatedPeriods,
+            Func<DateTime, DateTime, double> timeFunc, int? seed = null, bool antithetic = false)
+            : this(meanReversions, factorVols, factorCorrelations, currentDate,
+                forwardCurve == null ? null : new Func<T, double>(period => forwardCurve[period]),
+                simulatedPeriods, timeFunc, seed, antithetic)
+        {
+        }
+
+        private SobolMultiFactorSpotSimulator(IReadOnlyList<double> meanReversions,
+            IEnumerable<IReadOnlyDictionary<T, double>> factorVols, double[,] factorCorrelations,
+            DateTime currentDate, Func<T, double> forwardCurve, IEnumerable<T> simulatedPeriods,
+            Func<DateTime, DateTime, double> timeFunc, int? seed, bool antithetic)
+        {
+            if (meanReversions == null) throw new ArgumentNullException(nameof(meanReversions));
+            if (factorVols == null) throw new ArgumentNullException(nameof(factorVols));
+            if (factorCorrelations == null) throw new ArgumentNullException(nameof(factorCorrelations));
+            if (forwardCurve == null) throw new ArgumentNullException(nameof(forwardCurve));
+            if (simulatedPeriods == null) throw new ArgumentNullException(nameof(simulatedPeriods));
+            if (timeFunc == null) throw new ArgumentNullException(nameof(timeFunc));
+
+            IReadOnlyDictionary<T, double>[] factorVolsArray = factorVols.ToArray();
+            _numFactors = meanReversions.Count;
+            if (_numFactors == 0)
+                throw new ArgumentException("Number of factors must be positive.", nameof(meanReversions));
+            if (factorVolsArray.Length != _numFactors)
+                throw new ArgumentException($"Number of factor volatility curves must equal the number of mean reversions {_numFactors}.",
+                    nameof(factorVols));
+            if (factorCorrelations.GetLength(0) != _numFactors || factorCorrelations.GetLength(1) != _numFactors)
+                throw new ArgumentException($"Factor correlations must be a square matrix of size {_numFactors}.",
+                    nameof(factorCorrelations));
+
+            _simulatedPeriods = simulatedPeriods.ToArray();
+            _numSteps = _simulatedPeriods.Length;
+            if (_numSteps == 0)
+                throw new ArgumentException("Simulated periods cannot be empty.", nameof(simulatedPeriods));
+
+            double[] times = _simulatedPeriods.Select(period => timeFunc(currentDate, period.Start)).ToArray();
+            _brownianBridge = new BrownianBridge(times);
+
+            _forwardPrices = new double[_numSteps];
+            _spotVols = new double[_numSteps][];
+            _reversionMultipliers = new double[_numSteps][];
+            _incrementCholesky = new double[_numSteps][,];
+            _spotVarianceAdjustments = new double[_numSteps];
+            for (int stepIndex = 0; stepIndex < _numSteps; stepIndex++)
+            {
+                T period = _simulatedPeriods[stepIndex];
+                _forwardPrices[stepIndex] = forwardCurve(period);
+                double timeToPeriod = times[stepIndex];
+                double timeStep = stepIndex == 0 ? timeToPeriod : timeToPeriod - times[stepIndex - 1];
+
+                var spotVols = new double[_numFactors];
+                var reversionMultipliers = new double[_numFactors];
+                for (int factorIndex = 0; factorIndex < _numFactors; factorIndex++)
+                {
+                    if (!factorVolsArray[factorIndex].TryGetValue(period, out double spotVol))
+                        throw new ArgumentException($"Volatility curve for factor {factorIndex} does not contain a value for period {period}.",
+                            nameof(factorVols));
+                    spotVols[factorIndex] = spotVol;
+                    reversionMultipliers[factorIndex] = Math.Exp(-meanReversions[factorIndex] * timeStep);
+                }
+                _spotVols[stepIndex] = spotVols;
+                _reversionMultipliers[stepIndex] = reversionMultipliers;
+
+                double[,] incrementCovariances = MultiFactorCovariances.FactorCovariances(meanReversions, factorCorrelations, timeStep);
+                double[,] factorCovariances = MultiFactorCovariances.FactorCovariances(meanReversions, factorCorrelations, timeToPeriod);
+                double spotVariance = 0.0;
+                for (int i = 0; i < _numFactors; i++)
+                for (int j = 0; j < _numFactors; j++)
+                    spotVariance += spotVols[i] * spotVols[j] * factorCovariances[i, j];
+                _incrementCholesky[stepIndex] = MultiFactorCovariances.CholeskyLower(incrementCovariances);
+                _spotVarianceAdjustments[stepIndex] = -0.5 * spotVariance;
+            }
+
+            int numDimensions = _numSteps * _numFactors;
+            Random scrambleRandom = seed == null ? new MersenneTwister() : new MersenneTwister(seed.Value);
+            _sobolSequence = new SobolSequence(Math.Min(numDimensions, SobolSequence.MaxDimensions), scrambleRandom);
+            _pseudoRandom = scrambleRandom;
+            _antithetic = antithetic;
+            _standardNormals = new double[numDimensions];
+        }
+
+        public SpotSimResultsFromPanels<T> Simulate(int numSims)
+        {
+            if (numSims <= 0) throw new ArgumentOutOfRangeException(nameof(numSims), "Number of simulations must be positive.");
+
+            var spotPrices = new Panel<T, double>(_simulatedPeriods, numSims);
+            Panel<T, double>[] markovFactors = Enumerable.Range(0, _numFactors)
+                .Select(i => new Panel<T, double>(_simulatedPeriods, numSims)).ToArray();
+
+            int numDimensions = _numSteps * _numFactors;
+            int numSobolDimensions = _sobolSequence.NumDimensions;
+            var uniforms = new double[numSobolDimensions];
+            // Held as a field, so that an antithetic pair of simulations can span consecutive calls
+            double[] standardNormals = _standardNormals;
+            var factorNormals = new double[_numSteps];
+            var increments = new double[_numFactors][];
+            for (int factorIndex = 0; factorIndex < _numFactors; factorIndex++)
+                increments[factorIndex] = new double[_numSteps];
+            var factorValues = new double[_numFactors];
+
+            for (int simIndex = 0; simIndex < numSims; simIndex++)
+            {
+                if (_nextSimIsAntithetic)
+                {
+                    // Reflect the normals of the previous simulation, equivalent to reflecting the uniforms u -> 1 - u
+                    for (int dimIndex = 0; dimIndex < numDimensions; dimIndex++)
+                        standardNormals[dimIndex] = -standardNormals[dimIndex];
+                }
+                else
+                {
+                    _sobolSequence.NextPoint(uniforms);
+                    for (int dimIndex = 0; dimIndex < numSobolDimensions; dimIndex++)
+                        standardNormals[dimIndex] = Normal.InvCDF(0.0, 1.0, uniforms[dimIndex]);
+                    for (int dimIndex = numSobolDimensions; dimIndex < numDimensions; dimIndex++)
+                        standardNormals[dimIndex] = Normal.Sample(_pseudoRandom, 0.0, 1.0);
+                }
+                if (_antithetic)
+                    _nextSimIsAntithetic = !_nextSimIsAntithetic;
+
+                for (int factorIndex = 0; factorIndex < _numFactors; factorIndex++)
+                {
+                    for (int bridgeIndex = 0; bridgeIndex < _numSteps; bridgeIndex++)
+                        factorNormals[bridgeIndex] = standardNormals[bridgeIndex * _numFactors + factorIndex];
+                    _brownianBridge.Transform(factorNormals, increments[factorIndex]);
+                }
+
+                Array.Clear(factorValues, 0, _numFactors);
+                for (int stepIndex = 0; stepIndex < _numSteps; stepIndex++)
+                {
+                    double[] reversionMultipliers = _reversionMultipliers[stepIndex];
+                    double[,] cholesky = _incrementCholesky[stepIndex];
+                    double[] spotVols = _spotVols[stepIndex];
+                    double logSpotDeviation = _spotVarianceAdjustments[stepIndex];
+                    for (int factorIndex = 0; factorIndex < _numFactors; factorIndex++)
+                    {
+                        double correlatedIncrement = 0.0;
+                        for (int k = 0; k <= factorIndex; k++)
+                            correlatedIncrement += cholesky[factorIndex, k] * increments[k][stepIndex];
+                        factorValues[factorIndex] = reversionMultipliers[factorIndex] * factorValues[factorIndex] + correlatedIncrement;
+                        markovFactors[factorIndex][stepIndex][simIndex] = factorValues[factorIndex];
+                        logSpotDeviation += spotVols[factorIndex] * factorValues[factorIndex];
+                    }
+                    spotPrices[stepIndex][simIndex] = _forwardPrices[stepIndex] * Math.Exp(logSpotDeviation);
+                }
+            }
+
+            return new SpotSimResultsFromPanels<T>(spotPrices, markovFactors);
+        }
+
+    }
+}
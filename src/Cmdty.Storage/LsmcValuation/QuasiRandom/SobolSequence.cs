@@ -0,0 +1,219 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Collections.Generic;
+using System.Globalization;
+using System.IO;
+
+namespace Cmdty.Storage
+{
+    /// <summary>
+    /// Sobol low-discrepancy sequence generated in Gray code order, using the Joe and Kuo direction numbers.
+    /// Optionally scrambled with a random linear matrix scramble plus digital shift, which preserves the net
+    /// properties of the sequence whilst allowing independent randomised replications.
+    /// </summary>
+    internal sealed class SobolSequence
+    {
+        private const int NumBits = 32;
+        private const double PointScale = 1.0 / 4294967296.0; // 2^-32
+
+        // Joe and Kuo (2008) new-joe-kuo-6.21201 initialisation for dimensions 2 to 21201, held in an embedded resource
+        // and loaded on first use. Each line of the resource is: dimension, degree of primitive polynomial, polynomial
+        // coefficients, initial direction numbers m_1..m_s. Each row of the loaded array omits the dimension.
+        private const string DirectionNumbersResourceName = "Cmdty.Storage.new-joe-kuo-6.21201.txt";
+        private static readonly Lazy<int[][]> DirectionNumberInitialisation = new Lazy<int[][]>(LoadDirectionNumberInitialisation);
+
+        public static int MaxDimensions => DirectionNumberInitialisation.Value.Length + 1;
+
+        private readonly uint[][] _directionNumbers;
+        private readonly uint[] _currentPoint;
+        private uint _pointIndex;
+        private bool _exhausted;
+
+        public int NumDimensions { get; }
+
+        /// <summary>
+        /// Creates the sequence. If <paramref name="scrambleRandom"/> is null the sequence is not scrambled.
+        /// </summary>
+        public SobolSequence(int numDimensions, Random scrambleRandom)
+        {
+            if (numDimensions < 1 || numDimensions > MaxDimensions)
+                throw new ArgumentOutOfRangeException(nameof(numDimensions),
+                    $"Number of dimensions must be in the interval [1, {MaxDimensions}].");
+            NumDimensions = numDimensions;
+            _directionNumbers = new uint[numDimensions][];
+            _currentPoint = new uint[numDimensions];
+
+            for (int dimIndex = 0; dimIndex < numDimensions; dimIndex++)
+            {
+                uint[] directionNumbers = dimIndex == 0 ? VanDerCorputDirectionNumbers() :
+                                            DirectionNumbers(DirectionNumberInitialisation.Value[dimIndex - 1]);
+                if (scrambleRandom != null)
+                {
+                    ApplyLinearMatrixScramble(directionNumbers, scrambleRandom);
+                    _currentPoint[dimIndex] = NextUInt(scrambleRandom); // Digital shift
+                }
+                _directionNumbers[dimIndex] = directionNumbers;
+            }
+        }
+
+        /// <summary>
+        /// Populates <paramref name="point"/> with the next point in the sequence. All values lie in the open
+        /// interval (0, 1).
+        /// </summary>
+        public void NextPoint(Span<double> point)
+        {
+            if (point.Length != NumDimensions)
+                throw new ArgumentException($"Length of point must equal number of dimensions {NumDimensions}.", nameof(point));
+            if (_exhausted)
+                throw new InvalidOperationException("Maximum number of points in Sobol sequence has been generated.");
+
+            // Point at index 0 is the (shifted) origin, subsequent points generated by Gray code recursion
+            if (_pointIndex > 0)
+            {
+                int directionIndex = LowestZeroBit(_pointIndex - 1);
+                for (int dimIndex = 0; dimIndex < NumDimensions; dimIndex++)
+                    _currentPoint[dimIndex] ^= _directionNumbers[dimIndex][directionIndex];
+            }
+
+            for (int dimIndex = 0; dimIndex < NumDimensions; dimIndex++)
+                point[dimIndex] = (_currentPoint[dimIndex] + 0.5) * PointScale;
+
+            _pointIndex++;
+            if (_pointIndex == 0) // Overflow, so 2^32 points generated
+                _exhausted = true;
+        }
+
+        private static int[][] LoadDirectionNumberInitialisation()
+        {
+            using (Stream stream = typeof(SobolSequence).Assembly.GetManifestResourceStream(DirectionNumbersResourceName))
+            {
+                if (stream == null)
+                    throw new InvalidOperationException($"Embedded resource {DirectionNumbersResourceName} not found.");
+                using (var reader = new StreamReader(stream))
+                {
+                    reader.ReadLine(); // Header
+                    var initialisation = new List<int[]>();
+                    string line;
+                    while ((line = reader.ReadLine()) != null)
+                    {
+                        if (line.Length == 0)
+                            continue;
+                        string[] fields = line.Split(new[] {' '}, StringSplitOptions.RemoveEmptyEntries);
+                        var row = new int[fields.Length - 1];
+                        for (int i = 1; i < fields.Length; i++)
+                            row[i - 1] = int.Parse(fields[i], CultureInfo.InvariantCulture);
+                        initialisation.Add(row);
+                    }
+                    return initialisation.ToArray();
+                }
+            }
+        }
+
+        private static uint[] VanDerCorputDirectionNumbers()
+        {
+            var directionNumbers = new uint[NumBits];
+            for (int i = 0; i < NumBits; i++)
+                directionNumbers[i] = 1u << (NumBits - 1 - i);
+            return directionNumbers;
+        }
+
+        private static uint[] DirectionNumbers(int[] initialisation)
+        {
+            int degree = initialisation[0];
+            int polynomialCoefficients = initialisation[1];
+            var directionNumbers = new uint[NumBits];
+            for (int i = 0; i < degree; i++)
+                directionNumbers[i] = (uint)initialisation[i + 2] << (NumBits - 1 - i);
+
+            for (int i = degree; i < NumBits; i++)
+            {
+                uint directionNumber = directionNumbers[i - degree] ^ (directionNumbers[i - degree] >> degree);
+                for (int k = 1; k < degree; k++)
+                {
+                    if (((polynomialCoefficients >> (degree - 1 - k)) & 1) == 1)
+                        directionNumber ^= directionNumbers[i - k];
+                }
+                directionNumbers[i] = directionNumber;
+            }
+            return directionNumbers;
+        }
+
+        // Left multiplies each direction number, viewed as a vector of binary digits most significant first, by a
+        // random lower triangular binary matrix with unit diagonal. As the matrix is non-singular the scrambled
+        // sequence retains the (t, s) net properties.
+        private static void ApplyLinearMatrixScramble(uint[] directionNumbers, Random random)
+        {
+            var matrixRows = new uint[NumBits];
+            for (int digitIndex = 0; digitIndex < NumBits; digitIndex++)
+            {
+                uint diagonalBit = 1u << (NumBits - 1 - digitIndex);
+                uint higherDigitsMask = ~(diagonalBit | (diagonalBit - 1));
+                matrixRows[digitIndex] = diagonalBit | (NextUInt(random) & higherDigitsMask);
+            }
+
+            for (int i = 0; i < directionNumbers.Length; i++)
+            {
+                uint scrambled = 0;
+                for (int digitIndex = 0; digitIndex < NumBits; digitIndex++)
+                {
+                    if (Parity(matrixRows[digitIndex] & directionNumbers[i]) == 1)
+                        scrambled |= 1u << (NumBits - 1 - digitIndex);
+                }
+                directionNumbers[i] = scrambled;
+            }
+        }
+
+        private static uint NextUInt(Random random)
+        {
+            var bytes = new byte[4];
+            random.NextBytes(bytes);
+            return BitConverter.ToUInt32(bytes, 0);
+        }
+
+        private static uint Parity(uint value)
+        {
+            value ^= value >> 16;
+            value ^= value >> 8;
+            value ^= value >> 4;
+            value ^= value >> 2;
+            value ^= value >> 1;
+            return value & 1;
+        }
+
+        private static int LowestZeroBit(uint value)
+        {
+            int bitIndex = 0;
+            while ((value & 1) == 1)
+            {
+                value >>= 1;
+                bitIndex++;
+            }
+            return bitIndex;
+        }
+
+    }
+}
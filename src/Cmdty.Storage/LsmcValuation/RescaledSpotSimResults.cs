@@ -0,0 +1,118 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Collections.Generic;
+using Cmdty.Core.Simulation;
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+
+namespace Cmdty.Storage
+{
+    /// <summary>
+    /// Spot price simulation results of another simulation rescaled by the ratio of a scenario forward price to the forward
+    /// price of the simulation, with the Markov factors unchanged. Spot prices are rescaled one period at a time as they are
+    /// accessed, so many scenarios can share one simulation without each holding a copy of all simulated spot prices.
+    /// </summary>
+    internal sealed class RescaledSpotSimResults<T> : ISpotSimResults<T>
+        where T : ITimePeriod<T>
+    {
+        private readonly ISpotSimResults<T> _baseSpotSims;
+        private readonly double[] _scales;
+        private readonly Dictionary<T, int> _stepIndices;
+
+        public RescaledSpotSimResults(ISpotSimResults<T> baseSpotSims, TimeSeries<T, double> baseForwardCurve,
+            TimeSeries<T, double> scenarioForwardCurve)
+        {
+            _baseSpotSims = baseSpotSims ?? throw new ArgumentNullException(nameof(baseSpotSims));
+            IReadOnlyList<T> simulatedPeriods = baseSpotSims.SimulatedPeriods;
+            _scales = new double[simulatedPeriods.Count];
+            _stepIndices = new Dictionary<T, int>(simulatedPeriods.Count);
+            for (int stepIndex = 0; stepIndex < simulatedPeriods.Count; stepIndex++)
+            {
+                T period = simulatedPeriods[stepIndex];
+                double baseForwardPrice = baseForwardCurve[period];
+                if (baseForwardPrice == 0.0)
+                    throw new ArgumentException($"Forward price for period {period} cannot be zero when valuing forward curve scenarios.",
+                        nameof(baseForwardCurve));
+                _scales[stepIndex] = scenarioForwardCurve[period] / baseForwardPrice;
+                _stepIndices[period] = stepIndex;
+            }
+        }
+
+        /// <summary>
+        /// All rescaled spot prices, allocated on each access. Only used if the simulated spot prices are returned.
+        /// </summary>
+        public double[] SpotPrices
+        {
+            get
+            {
+                int numSims = NumSims;
+                var spotPrices = new double[NumSteps * numSims];
+                for (int stepIndex = 0; stepIndex < NumSteps; stepIndex++)
+                    Rescale(stepIndex, spotPrices.AsSpan(stepIndex * numSims, numSims));
+                return spotPrices;
+            }
+        }
+
+        public double[] MarkovFactors => _baseSpotSims.MarkovFactors;
+
+        public int NumSteps => _scales.Length;
+
+        public int NumSims => _baseSpotSims.NumSims;
+
+        public int NumFactors => _baseSpotSims.NumFactors;
+
+        public IReadOnlyList<T> SimulatedPeriods => _baseSpotSims.SimulatedPeriods;
+
+        public ReadOnlyMemory<double> MarkovFactorsForPeriod(T period, int factorIndex) => 
+            _baseSpotSims.MarkovFactorsForPeriod(period, factorIndex);
+
+        public ReadOnlyMemory<double> MarkovFactorsForStepIndex(int stepIndex, int factorIndex) =>
+            _baseSpotSims.MarkovFactorsForStepIndex(stepIndex, factorIndex);
+
+        public ReadOnlyMemory<double> SpotPricesForPeriod(T period)
+        {
+            if (!_stepIndices.TryGetValue(period, out int stepIndex))
+                throw new ArgumentException($"Period {period} is not simulated.", nameof(period));
+            return SpotPricesForStepIndex(stepIndex);
+        }
+
+        public ReadOnlyMemory<double> SpotPricesForStepIndex(int stepIndex)
+        {
+            var spotPrices = new double[NumSims];
+            Rescale(stepIndex, spotPrices);
+            return spotPrices;
+        }
+
+        private void Rescale(int stepIndex, Span<double> rescaledSpotPrices)
+        {
+            ReadOnlySpan<double> baseSpotPrices = _baseSpotSims.SpotPricesForStepIndex(stepIndex).Span;
+            double scale = _scales[stepIndex];
+            for (int simIndex = 0; simIndex < rescaledSpotPrices.Length; simIndex++)
+                rescaledSpotPrices[simIndex] = baseSpotPrices[simIndex] * scale;
+        }
+    }
+}
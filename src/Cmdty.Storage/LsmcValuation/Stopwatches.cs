@@ -37,7 +37,10 @@ internal sealed class Stopwatches
         public Stopwatch ValuationPriceSimulation { get; }
         public Stopwatch BackwardInduction { get; }
         public Stopwatch PseudoInverse { get; }
+        public Stopwatch Regression { get; }
         public Stopwatch ForwardSimulation { get; }
+        public int NumRegressionGridPoints { get; set; }
+        public int NumRegressionGridPointsSkipped { get; set; }
 
         public Stopwatches()
         {
@@ -46,15 +49,22 @@ public Stopwatches()
             ValuationPriceSimulation = new Stopwatch();
             BackwardInduction = new Stopwatch();
             PseudoInverse = new Stopwatch();
+            Regression = new Stopwatch();
             ForwardSimulation = new Stopwatch();
         }
 
+        public LsmcValuationTimings ToTimings()
+        {
+            return new LsmcValuationTimings(All.Elapsed, RegressionPriceSimulation.Elapsed, ValuationPriceSimulation.Elapsed, 
+                BackwardInduction.Elapsed, PseudoInverse.Elapsed, Regression.Elapsed, ForwardSimulation.Elapsed);
+        }
+
         public string GenerateProfileReport()
         {
             var stringBuilder = new StringBuilder();
             TimeSpan otherAll = All.Elapsed - RegressionPriceSimulation.Elapsed - BackwardInduction.Elapsed - ValuationPriceSimulation.Elapsed -
                                 ForwardSimulation.Elapsed;
-            TimeSpan otherBackwardInduction = BackwardInduction.Elapsed - PseudoInverse.Elapsed;
+            TimeSpan otherBackwardInduction = BackwardInduction.Elapsed - PseudoInverse.Elapsed - Regression.Elapsed;
 
             string regressPriceSimPercent =
                 (RegressionPriceSimulation.Elapsed.Ticks / (double)All.Elapsed.Ticks).ToString("P2", CultureInfo.InvariantCulture);
@@ -62,6 +72,10 @@ public string GenerateProfileReport()
                 (ValuationPriceSimulation.Elapsed.Ticks / (double)All.Elapsed.Ticks).ToString("P2", CultureInfo.InvariantCulture);
             string pseudoInversePercent =
                 (PseudoInverse.Elapsed.Ticks / (double)All.Elapsed.Ticks).ToString("P2", CultureInfo.InvariantCulture);
+            string regressionPercent =
+                (Regression.Elapsed.Ticks / (double)All.Elapsed.Ticks).ToString("P2", CultureInfo.InvariantCulture);
+            string regressionSkipPercent = NumRegressionGridPoints == 0 ? "N/A" :
+                (NumRegressionGridPointsSkipped / (double)NumRegressionGridPoints).ToString("P2", CultureInfo.InvariantCulture);
             string otherBackInductionPercent =
                 (otherBackwardInduction.Ticks / (double)All.Elapsed.Ticks).ToString("P2", CultureInfo.InvariantCulture);
             string forwardSimPercent =
@@ -72,6 +86,9 @@ public string GenerateProfileReport()
             stringBuilder.AppendLine($"Regress price sim:\t{RegressionPriceSimulation.Elapsed.ToString("g", CultureInfo.InvariantCulture)}\t({regressPriceSimPercent})");
             stringBuilder.AppendLine($"Val price sim:\t\t{ValuationPriceSimulation.Elapsed.ToString("g", CultureInfo.InvariantCulture)}\t({valuationPriceSimPercent})");
             stringBuilder.AppendLine($"Pseudo-inverse:\t\t{PseudoInverse.Elapsed.ToString("g", CultureInfo.InvariantCulture)}\t({pseudoInversePercent})");
+            stringBuilder.AppendLine($"Regression:\t\t{Regression.Elapsed.ToString("g", CultureInfo.InvariantCulture)}\t({regressionPercent})");
+            stringBuilder.AppendLine($"Regress skip ratio:\t{regressionSkipPercent}\t({NumRegressionGridPointsSkipped.ToString("N0", CultureInfo.InvariantCulture)} of " +
+                                     $"{NumRegressionGridPoints.ToString("N0", CultureInfo.InvariantCulture)} grid points)");
             stringBuilder.AppendLine($"Other back ind:\t\t{otherBackwardInduction.ToString("g", CultureInfo.InvariantCulture)}\t({otherBackInductionPercent})");
             stringBuilder.AppendLine($"Fwd sim:\t\t{ForwardSimulation.Elapsed.ToString("g", CultureInfo.InvariantCulture)}\t({forwardSimPercent})");
             stringBuilder.AppendLine($"Other:\t\t\t{otherAll.ToString("g", CultureInfo.InvariantCulture)}\t({otherPercent})");
@@ -0,0 +1,418 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Cmdty.Core.Simulation;
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+using MathNet.Numerics.Distributions;
+using MathNet.Numerics.LinearAlgebra;
+using MathNet.Numerics.Random;
+
+namespace Cmdty.Storage
+{
+    /// <summary>
+    /// Simulates spot prices and Markov factors of the multi-factor model one period at a time as they are accessed, rather than
+    /// as a panel of all periods, so the memory used is proportional to the number of simulations times the number of periods retained.
+    /// <see cref="SimulateForward"/> generates periods in increasing order, as accessed by the LSMC valuation simulation.
+    /// <see cref="SimulateBackward"/> generates periods in decreasing order, as accessed by the backward induction, by sampling
+    /// the last period factors from their marginal distribution, then each earlier period from its Gaussian distribution
+    /// conditional on the period after. This is a Brownian bridge for mean-reverting factors, with paths having the same
+    /// distribution as if simulated forward, so no checkpoints of the random number sequence are needed.
+    /// Each call to <see cref="SimulateForward"/> or <see cref="SimulateBackward"/> uses a new seed from this simulator's
+    /// random number generator. If antithetic, each simulation is followed by its reflection.
+    /// The arrays of a period which is no longer retained are reused for later periods, so memory returned for a period
+    /// must not be read once more than the number of periods retained have been generated after it.
+    /// </summary>
+    public sealed class StreamedMultiFactorSpotSimulator<T>
+        where T : ITimePeriod<T>
+    {
+        private readonly T[] _simulatedPeriods;
+        private readonly Dictionary<T, int> _stepIndices;
+        private readonly int _numFactors;
+        private readonly int _numSteps;
+        private readonly double[] _forwardPrices;
+        private readonly double[][] _spotVols; // Indexed by step, factor
+        private readonly double[] _spotVarianceAdjustments;
+        private readonly double[][] _reversionMultipliers; // Indexed by step, factor
+        private readonly double[][,] _incrementCholesky; // Indexed by step
+        private readonly double[,] _lastStepCholesky;
+        private readonly double[][,] _bridgeMeanMultipliers; // Indexed by step, for all steps except the last
+        private readonly double[][,] _bridgeCholesky; // Indexed by step, for all steps except the last
+        private readonly Random _seedGenerator;
+        private readonly bool _antithetic;
+
+        public StreamedMultiFactorSpotSimulator(IReadOnlyList<double> meanReversions,
+            IEnumerable<IReadOnlyDictionary<T, double>> factorVols, double[,] factorCorrelations,
+            DateTime currentDate, TimeSeries<T, double> forwardCurve, IEnumerable<T> simulatedPeriods,
+            Func<DateTime, DateTime, double> timeFunc, int? seed = null, bool antithetic = false)
+        {
+            if (meanReversions == null) throw new ArgumentNullException(nameof(meanReversions));
+            if (factorVols == null) throw new ArgumentNullException(nameof(factorVols));
+            if (factorCorrelations == null) throw new ArgumentNullException(nameof(factorCorrelations));
+            if (forwardCurve == null) throw new ArgumentNullException(nameof(forwardCurve));
+            if (simulatedPeriods == null) throw new ArgumentNullException(nameof(simulatedPeriods));
+            if (timeFunc == null) throw new ArgumentNullException(nameof(timeFunc));
+
+            IReadOnlyDictionary<T, double>[] factorVolsArray = factorVols.ToArray();
+            _numFactors = meanReversions.Count;
+            if (_numFactors == 0)
+                throw new ArgumentException("Number of factors must be positive.", nameof(meanReversions));
+            if (factorVolsArray.Length != _numFactors)
+                throw new ArgumentException($"Number of factor volatility curves must equal the number of mean reversions {_numFactors}.",
+                    nameof(factorVols));
+            if (factorCorrelations.GetLength(0) != _numFactors || factorCorrelations.GetLength(1) != _numFactors)
+                throw new ArgumentException($"Factor correlations must be a square matrix of size {_numFactors}.",
+                    nameof(factorCorrelations));
+
+            _simulatedPeriods = simulatedPeriods.ToArray();
+            _numSteps = _simulatedPeriods.Length;
+            if (_numSteps == 0)
+                throw new ArgumentException("Simulated periods cannot be empty.", nameof(simulatedPeriods));
+            _stepIndices = new Dictionary<T, int>(_numSteps);
+            for (int stepIndex = 0; stepIndex < _numSteps; stepIndex++)
+                _stepIndices.Add(_simulatedPeriods[stepIndex], stepIndex);
+
+            double[] times = _simulatedPeriods.Select(period => timeFunc(currentDate, period.Start)).ToArray();
+
+            _forwardPrices = new double[_numSteps];
+            _spotVols = new double[_numSteps][];
+            _spotVarianceAdjustments = new double[_numSteps];
+            _reversionMultipliers = new double[_numSteps][];
+            _incrementCholesky = new double[_numSteps][,];
+            var factorCovariances = new double[_numSteps][,];
+            for (int stepIndex = 0; stepIndex < _numSteps; stepIndex++)
+            {
+                T period = _simulatedPeriods[stepIndex];
+                _forwardPrices[stepIndex] = forwardCurve[period];
+                double timeToPeriod = times[stepIndex];
+                double timeStep = stepIndex == 0 ? timeToPeriod : timeToPeriod - times[stepIndex - 1];
+
+                var spotVols = new double[_numFactors];
+                var reversionMultipliers = new double[_numFactors];
+                for (int factorIndex = 0; factorIndex < _numFactors; factorIndex++)
+                {
+                    if (!factorVolsArray[factorIndex].TryGetValue(period, out double spotVol))
+                        throw new ArgumentException($"Volatility curve for factor {factorIndex} does not contain a value for period {period}.",
+                            nameof(factorVols));
+                    spotVols[factorIndex] = spotVol;
+                    reversionMultipliers[factorIndex] = Math.Exp(-meanReversions[factorIndex] * timeStep);
+                }
+                _spotVols[stepIndex] = spotVols;
+                _reversionMultipliers[stepIndex] = reversionMultipliers;
+                _incrementCholesky[stepIndex] = MultiFactorCovariances.CholeskyLower(
+                    MultiFactorCovariances.FactorCovariances(meanReversions, factorCorrelations, timeStep));
+
+                double[,] covariances = MultiFactorCovariances.FactorCovariances(meanReversions, factorCorrelations, timeToPeriod);
+                double spotVariance = 0.0;
+                for (int i = 0; i < _numFactors; i++)
+                for (int j = 0; j < _numFactors; j++)
+                    spotVariance += spotVols[i] * spotVols[j] * covariances[i, j];
+                _spotVarianceAdjustments[stepIndex] = -0.5 * spotVariance;
+                factorCovariances[stepIndex] = covariances;
+            }
+
+            // The factors at a step, conditional on those at the next step, are Gaussian with mean of the bridge mean multipliers
+            // times the next step factors. With A the diagonal matrix of reversion multipliers to the next step, the covariance
+            // between the factors at the two steps is cov(step) * A, from which the conditional distribution follows.
+            _lastStepCholesky = MultiFactorCovariances.CholeskyLower(factorCovariances[_numSteps - 1]);
+            _bridgeMeanMultipliers = new double[_numSteps - 1][,];
+            _bridgeCholesky = new double[_numSteps - 1][,];
+            for (int stepIndex = 0; stepIndex < _numSteps - 1; stepIndex++)
+            {
+                Matrix<double> covariance = Matrix<double>.Build.DenseOfArray(factorCovariances[stepIndex]);
+                Matrix<double> nextStepCovariance = Matrix<double>.Build.DenseOfArray(factorCovariances[stepIndex + 1]);
+                Matrix<double> crossCovariance = covariance * Matrix<double>.Build.DenseOfDiagonalArray(_reversionMultipliers[stepIndex + 1]);
+                // Pseudo-inverse as the covariance is singular if factors are perfectly correlated
+                Matrix<double> meanMultipliers = crossCovariance * nextStepCovariance.PseudoInverse();
+                Matrix<double> conditionalCovariance = covariance - meanMultipliers * crossCovariance.Transpose();
+                conditionalCovariance = 0.5 * (conditionalCovariance + conditionalCovariance.Transpose());
+                _bridgeMeanMultipliers[stepIndex] = meanMultipliers.ToArray();
+                _bridgeCholesky[stepIndex] = MultiFactorCovariances.CholeskyLower(conditionalCovariance.ToArray());
+            }
+
+            _seedGenerator = seed == null ? new MersenneTwister() : new MersenneTwister(seed.Value);
+            _antithetic = antithetic;
+        }
+
+        /// <summary>
+        /// Simulates periods in increasing order, each generated when first accessed.
+        /// </summary>
+        /// <param name="numSims">Number of simulations.</param>
+        /// <param name="numPeriodsRetained">Number of the most recently generated periods which can be accessed.
+        /// Accessing an earlier period throws an <see cref="InvalidOperationException"/>.</param>
+        public ISpotSimResults<T> SimulateForward(int numSims, int numPeriodsRetained = 1)
+        {
+            if (numSims <= 0) throw new ArgumentOutOfRangeException(nameof(numSims), "Number of simulations must be positive.");
+            return new ForwardSpotSimResults(this, numSims, new MersenneTwister(_seedGenerator.Next()))
+            {
+                NumPeriodsRetained = numPeriodsRetained
+            };
+        }
+
+        /// <summary>
+        /// Simulates periods in decreasing order, each generated when first accessed.
+        /// </summary>
+        /// <param name="numSims">Number of simulations.</param>
+        /// <param name="numPeriodsRetained">Number of the most recently generated periods which can be accessed.
+        /// Accessing a later period throws an <see cref="InvalidOperationException"/>.</param>
+        public ISpotSimResults<T> SimulateBackward(int numSims, int numPeriodsRetained = 1)
+        {
+            if (numSims <= 0) throw new ArgumentOutOfRangeException(nameof(numSims), "Number of simulations must be positive.");
+            return new BackwardSpotSimResults(this, numSims, new MersenneTwister(_seedGenerator.Next()))
+            {
+                NumPeriodsRetained = numPeriodsRetained
+            };
+        }
+
+        private abstract class StreamedSpotSimResults : ISpotSimResults<T>, IStreamedSpotSimResults
+        {
+            protected readonly StreamedMultiFactorSpotSimulator<T> Simulator;
+            private readonly Random _random;
+            private readonly bool _backward;
+            private readonly double[][] _spotPrices; // Indexed by step, sim. Null if not generated or no longer retained
+            private readonly double[][][] _markovFactors; // Indexed by step, factor, sim. Null if not generated or no longer retained
+            private readonly Stack<double[]> _releasedArrays = new Stack<double[]>(); // Arrays of periods no longer retained, for reuse
+            private readonly object _lock = new object();
+            private int _nextStepIndex;
+            private int _numPeriodsRetained = 1;
+
+            protected StreamedSpotSimResults(StreamedMultiFactorSpotSimulator<T> simulator, int numSims, Random random, bool backward)
+            {
+                Simulator = simulator;
+                NumSims = numSims;
+                _random = random;
+                _backward = backward;
+                _spotPrices = new double[simulator._numSteps][];
+                _markovFactors = new double[simulator._numSteps][][];
+                _nextStepIndex = backward ? simulator._numSteps - 1 : 0;
+            }
+
+            public int NumPeriodsRetained
+            {
+                get => _numPeriodsRetained;
+                set
+                {
+                    if (value <= 0)
+                        throw new ArgumentOutOfRangeException("numPeriodsRetained", value, "Number of periods retained must be positive.");
+                    lock (_lock)
+                        _numPeriodsRetained = value;
+                }
+            }
+
+            // Streamed results don't hold all periods in arrays
+            public double[] SpotPrices => throw new NotSupportedException("Streamed simulation results do not hold all spot prices.");
+
+            public double[] MarkovFactors => throw new NotSupportedException("Streamed simulation results do not hold all Markov factors.");
+
+            public int NumSteps => Simulator._numSteps;
+
+            public int NumSims { get; }
+
+            public int NumFactors => Simulator._numFactors;
+
+            public IReadOnlyList<T> SimulatedPeriods => Simulator._simulatedPeriods;
+
+            public ReadOnlyMemory<double> MarkovFactorsForPeriod(T period, int factorIndex)
+            {
+                return MarkovFactorsForStepIndex(StepIndex(period), factorIndex);
+            }
+
+            public ReadOnlyMemory<double> MarkovFactorsForStepIndex(int stepIndex, int factorIndex)
+            {
+                if (factorIndex < 0 || factorIndex >= NumFactors)
+                    throw new IndexOutOfRangeException($"Factor index should be in interval [0, " + (NumFactors - 1) + "].");
+                lock (_lock)
+                {
+                    SimulateToStep(stepIndex);
+                    return _markovFactors[stepIndex][factorIndex];
+                }
+            }
+
+            public ReadOnlyMemory<double> SpotPricesForPeriod(T period)
+            {
+                return SpotPricesForStepIndex(StepIndex(period));
+            }
+
+            public ReadOnlyMemory<double> SpotPricesForStepIndex(int stepIndex)
+            {
+                lock (_lock)
+                {
+                    SimulateToStep(stepIndex);
+                    return _spotPrices[stepIndex];
+                }
+            }
+
+            /// <summary>
+            /// Simulates the Markov factors for the step, which is the step after the one previously simulated, in the
+            /// direction of simulation. Arrays returned must be rented with <see cref="RentArray"/> and not modified subsequently.
+            /// </summary>
+            protected abstract double[][] SimulateFactors(int stepIndex);
+
+            // Arrays of length NumSims, reusing those of released periods, so only the retained periods are ever allocated
+            protected double[] RentArray() => _releasedArrays.Count > 0 ? _releasedArrays.Pop() : new double[NumSims];
+
+            protected void FillStandardNormals(double[] standardNormals)
+            {
+                for (int simIndex = 0; simIndex < standardNormals.Length; simIndex++)
+                    standardNormals[simIndex] = Simulator._antithetic && simIndex % 2 == 1 ? -standardNormals[simIndex - 1] 
+                                                    : Normal.Sample(_random, 0.0, 1.0);
+            }
+
+            private int StepIndex(T period)
+            {
+                if (!Simulator._stepIndices.TryGetValue(period, out int stepIndex))
+                    throw new ArgumentException($"Period {period} is not simulated.", nameof(period));
+                return stepIndex;
+            }
+
+            private void SimulateToStep(int stepIndex)
+            {
+                if (stepIndex < 0 || stepIndex >= NumSteps)
+                    throw new ArgumentOutOfRangeException(nameof(stepIndex), stepIndex, $"Step index should be in interval [0, {NumSteps - 1}].");
+                if (_spotPrices[stepIndex] != null)
+                    return;
+                if (_backward ? stepIndex > _nextStepIndex : stepIndex < _nextStepIndex)
+                    throw new InvalidOperationException($"Simulation for period {Simulator._simulatedPeriods[stepIndex]} is no longer held in memory. " +
+                        $"Streamed simulations are generated {(_backward ? "backward" : "forward")} in time, " + 
+                        $"retaining only the {_numPeriodsRetained} most recently generated periods.");
+
+                int stepIncrement = _backward ? -1 : 1;
+                while (_spotPrices[stepIndex] == null)
+                {
+                    double[][] factors = SimulateFactors(_nextStepIndex);
+                    _markovFactors[_nextStepIndex] = factors;
+                    _spotPrices[_nextStepIndex] = CalculateSpotPrices(_nextStepIndex, factors);
+
+                    int releasedStepIndex = _nextStepIndex - stepIncrement * _numPeriodsRetained;
+                    for (; releasedStepIndex >= 0 && releasedStepIndex < NumSteps && _spotPrices[releasedStepIndex] != null;
+                                                                                        releasedStepIndex -= stepIncrement)
+                    {
+                        _releasedArrays.Push(_spotPrices[releasedStepIndex]);
+                        foreach (double[] factorValues in _markovFactors[releasedStepIndex])
+                            _releasedArrays.Push(factorValues);
+                        _spotPrices[releasedStepIndex] = null;
+                        _markovFactors[releasedStepIndex] = null;
+                    }
+                    _nextStepIndex += stepIncrement;
+                }
+            }
+
+            private double[] CalculateSpotPrices(int stepIndex, double[][] factors)
+            {
+                double[] spotVols = Simulator._spotVols[stepIndex];
+                double forwardPrice = Simulator._forwardPrices[stepIndex];
+                double spotVarianceAdjustment = Simulator._spotVarianceAdjustments[stepIndex];
+                double[] spotPrices = RentArray();
+                for (int simIndex = 0; simIndex < NumSims; simIndex++)
+                {
+                    double logSpotDeviation = spotVarianceAdjustment;
+                    for (int factorIndex = 0; factorIndex < factors.Length; factorIndex++)
+                        logSpotDeviation += spotVols[factorIndex] * factors[factorIndex][simIndex];
+                    spotPrices[simIndex] = forwardPrice * Math.Exp(logSpotDeviation);
+                }
+                return spotPrices;
+            }
+        }
+
+        private sealed class ForwardSpotSimResults : StreamedSpotSimResults
+        {
+            private readonly double[][] _standardNormals; // Indexed by factor, sim
+            private double[][] _previousStepFactors;
+
+            public ForwardSpotSimResults(StreamedMultiFactorSpotSimulator<T> simulator, int numSims, Random random) 
+                : base(simulator, numSims, random, false)
+            {
+                _standardNormals = Enumerable.Range(0, simulator._numFactors).Select(i => new double[numSims]).ToArray();
+            }
+
+            protected override double[][] SimulateFactors(int stepIndex)
+            {
+                double[] reversionMultipliers = Simulator._reversionMultipliers[stepIndex];
+                double[,] cholesky = Simulator._incrementCholesky[stepIndex];
+                var factors = new double[NumFactors][];
+                foreach (double[] standardNormals in _standardNormals)
+                    FillStandardNormals(standardNormals);
+                for (int factorIndex = 0; factorIndex < NumFactors; factorIndex++)
+                {
+                    double[] factorValues = RentArray();
+                    for (int simIndex = 0; simIndex < NumSims; simIndex++)
+                    {
+                        double factorValue = _previousStepFactors == null ? 0.0 : 
+                                                reversionMultipliers[factorIndex] * _previousStepFactors[factorIndex][simIndex];
+                        for (int k = 0; k <= factorIndex; k++)
+                            factorValue += cholesky[factorIndex, k] * _standardNormals[k][simIndex];
+                        factorValues[simIndex] = factorValue;
+                    }
+                    factors[factorIndex] = factorValues;
+                }
+                _previousStepFactors = factors;
+                return factors;
+            }
+        }
+
+        private sealed class BackwardSpotSimResults : StreamedSpotSimResults
+        {
+            private readonly double[][] _standardNormals; // Indexed by factor, sim
+            private double[][] _nextStepFactors;
+
+            public BackwardSpotSimResults(StreamedMultiFactorSpotSimulator<T> simulator, int numSims, Random random)
+                : base(simulator, numSims, random, true)
+            {
+                _standardNormals = Enumerable.Range(0, simulator._numFactors).Select(i => new double[numSims]).ToArray();
+            }
+
+            protected override double[][] SimulateFactors(int stepIndex)
+            {
+                bool isLastStep = stepIndex == NumSteps - 1;
+                double[,] meanMultipliers = isLastStep ? null : Simulator._bridgeMeanMultipliers[stepIndex];
+                double[,] cholesky = isLastStep ? Simulator._lastStepCholesky : Simulator._bridgeCholesky[stepIndex];
+                var factors = new double[NumFactors][];
+                foreach (double[] standardNormals in _standardNormals)
+                    FillStandardNormals(standardNormals);
+                for (int factorIndex = 0; factorIndex < NumFactors; factorIndex++)
+                {
+                    double[] factorValues = RentArray();
+                    for (int simIndex = 0; simIndex < NumSims; simIndex++)
+                    {
+                        double factorValue = 0.0;
+                        if (!isLastStep)
+                            for (int k = 0; k < NumFactors; k++)
+                                factorValue += meanMultipliers[factorIndex, k] * _nextStepFactors[k][simIndex];
+                        for (int k = 0; k <= factorIndex; k++)
+                            factorValue += cholesky[factorIndex, k] * _standardNormals[k][simIndex];
+                        factorValues[simIndex] = factorValue;
+                    }
+                    factors[factorIndex] = factorValues;
+                }
+                _nextStepFactors = factors;
+                return factors;
+            }
+        }
+
+    }
+}
@@ -0,0 +1,142 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Linq;
+using Cmdty.Core.Common;
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+
+namespace Cmdty.Storage.PythonHelpers
+{
+    /// <summary>
+    /// <see cref="LsmcExercisePolicy{T}"/> inventory grids and regression coefficients flattened into contiguous arrays, so they
+    /// can be copied to and from Python with one bulk copy per array.
+    /// </summary>
+    public sealed class ExercisePolicyColumns
+    {
+        /// <summary>
+        /// Number of inventory grid points for each period, starting with the first period of the inventory grids.
+        /// </summary>
+        public int[] GridLengths { get; }
+        /// <summary>
+        /// Inventory grid points of all periods concatenated.
+        /// </summary>
+        public double[] GridPoints { get; }
+        /// <summary>
+        /// Offset of the first regression coefficients period from the first period of the inventory grids.
+        /// </summary>
+        public int RegressionPeriodOffset { get; }
+        public int NumRegressionPeriods { get; }
+        /// <summary>
+        /// Regression coefficients of all periods concatenated, with the coefficients of each period ordered by next period
+        /// inventory grid point then basis function.
+        /// </summary>
+        public double[] RegressionCoefficients { get; }
+        public double[] CurrentPeriodContinuationValues { get; }
+
+        private ExercisePolicyColumns(int[] gridLengths, double[] gridPoints, int regressionPeriodOffset, int numRegressionPeriods,
+            double[] regressionCoefficients, double[] currentPeriodContinuationValues)
+        {
+            GridLengths = gridLengths;
+            GridPoints = gridPoints;
+            RegressionPeriodOffset = regressionPeriodOffset;
+            NumRegressionPeriods = numRegressionPeriods;
+            RegressionCoefficients = regressionCoefficients;
+            CurrentPeriodContinuationValues = currentPeriodContinuationValues;
+        }
+
+        public static ExercisePolicyColumns FromExercisePolicy<T>(LsmcExercisePolicy<T> exercisePolicy)
+            where T : ITimePeriod<T>
+        {
+            TimeSeries<T, double[]> grids = exercisePolicy.InventorySpaceGrids;
+            int[] gridLengths = grids.Data.Select(grid => grid.Length).ToArray();
+            var gridPoints = new double[gridLengths.Sum()];
+            int gridPointIndex = 0;
+            foreach (double[] grid in grids.Data)
+            {
+                grid.CopyTo(gridPoints, gridPointIndex);
+                gridPointIndex += grid.Length;
+            }
+
+            TimeSeries<T, Panel<int, double>> regressionCoefficients = exercisePolicy.RegressionCoefficients;
+            int regressionPeriodOffset = regressionCoefficients.IsEmpty ? 0 : regressionCoefficients.Start.OffsetFrom(grids.Start);
+            var flatCoefficients = new double[regressionCoefficients.Data.Sum(panel => panel.NumRows * panel.NumCols)];
+            int coefficientIndex = 0;
+            foreach (Panel<int, double> periodCoefficients in regressionCoefficients.Data)
+            {
+                for (int i = 0; i < periodCoefficients.NumRows; i++)
+                {
+                    periodCoefficients[i].CopyTo(flatCoefficients.AsSpan(coefficientIndex, periodCoefficients.NumCols));
+                    coefficientIndex += periodCoefficients.NumCols;
+                }
+            }
+
+            return new ExercisePolicyColumns(gridLengths, gridPoints, regressionPeriodOffset, regressionCoefficients.Count,
+                flatCoefficients, exercisePolicy.CurrentPeriodContinuationValues.ToArray());
+        }
+
+        public static LsmcExercisePolicy<T> ToExercisePolicy<T>(T currentPeriod, double inventory, int numBasisFunctions,
+            double inventoryGridSpacing, T gridsStart, int[] gridLengths, double[] gridPoints, int regressionPeriodOffset,
+            int numRegressionPeriods, double[] regressionCoefficients, double[] currentPeriodContinuationValues)
+            where T : ITimePeriod<T>
+        {
+            if (gridPoints.Length != gridLengths.Sum())
+                throw new ArgumentException("Number of grid points must equal the sum of grid lengths.", nameof(gridPoints));
+            var grids = new double[gridLengths.Length][];
+            int gridPointIndex = 0;
+            for (int i = 0; i < gridLengths.Length; i++)
+            {
+                grids[i] = gridPoints.AsSpan(gridPointIndex, gridLengths[i]).ToArray();
+                gridPointIndex += gridLengths[i];
+            }
+
+            // Regression coefficients for a period have one row per inventory grid point of the next period
+            if (regressionPeriodOffset + numRegressionPeriods >= gridLengths.Length && numRegressionPeriods > 0)
+                throw new ArgumentException("Regression coefficient periods must be before the last inventory grid period.", nameof(numRegressionPeriods));
+            var coefficientsBuilder = new TimeSeries<T, Panel<int, double>>.Builder(numRegressionPeriods);
+            int coefficientIndex = 0;
+            for (int i = 0; i < numRegressionPeriods; i++)
+            {
+                int numRows = gridLengths[regressionPeriodOffset + i + 1];
+                if (coefficientIndex + numRows * numBasisFunctions > regressionCoefficients.Length)
+                    throw new ArgumentException("Too few regression coefficients.", nameof(regressionCoefficients));
+                var periodCoefficients = new Panel<int, double>(Enumerable.Range(0, numRows), numBasisFunctions);
+                for (int rowIndex = 0; rowIndex < numRows; rowIndex++)
+                {
+                    regressionCoefficients.AsSpan(coefficientIndex, numBasisFunctions).CopyTo(periodCoefficients[rowIndex]);
+                    coefficientIndex += numBasisFunctions;
+                }
+                coefficientsBuilder.Add(gridsStart.Offset(regressionPeriodOffset + i), periodCoefficients);
+            }
+            if (coefficientIndex != regressionCoefficients.Length)
+                throw new ArgumentException("Too many regression coefficients.", nameof(regressionCoefficients));
+
+            return new LsmcExercisePolicy<T>(currentPeriod, inventory, numBasisFunctions, inventoryGridSpacing,
+                new TimeSeries<T, double[]>(gridsStart, grids), coefficientsBuilder.Build(), currentPeriodContinuationValues);
+        }
+
+    }
+}
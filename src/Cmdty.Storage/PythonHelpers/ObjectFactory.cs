@@ -23,6 +23,7 @@
 // OTHER DEALINGS IN THE SOFTWARE.
 #endregion
 
+using System.Collections.Generic;
 using Cmdty.TimePeriodValueTypes;
 
 namespace Cmdty.Storage.PythonHelpers
@@ -32,5 +33,8 @@ public static class ObjectFactory
         // Necessary as pythonnet doesn't seem to allow creation of types nested inside other types
         public static LsmcValuationParameters<T>.Builder CreateLsmcValuationParamsBuilder<T>() where T : ITimePeriod<T> 
             => new LsmcValuationParameters<T>.Builder();
+
+        public static List<LsmcValuationParameters<T>.Builder> CreateLsmcValuationParamsBuilderList<T>() where T : ITimePeriod<T>
+            => new List<LsmcValuationParameters<T>.Builder>();
     }
 }
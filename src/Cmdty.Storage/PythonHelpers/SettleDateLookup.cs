@@ -0,0 +1,75 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using Cmdty.TimePeriodValueTypes;
+using JetBrains.Annotations;
+
+namespace Cmdty.Storage.PythonHelpers
+{
+    /// <summary>
+    /// Settlement date rule backed by a precomputed table of settlement days for a contiguous range of periods. Used
+    /// to avoid the valuation engines calling back into Python to evaluate the settlement rule for each period.
+    /// </summary>
+    public sealed class SettleDateLookup<T> where T : ITimePeriod<T>
+    {
+        private readonly T _start;
+        private readonly Day[] _settleDays;
+        private readonly Func<T, Day> _fallbackSettleDateRule;
+
+        /// <summary>
+        /// Creates an instance of <see cref="SettleDateLookup{T}"/>.
+        /// </summary>
+        /// <param name="start">The first period in the table.</param>
+        /// <param name="referenceDay">Day from which <paramref name="settleDayOffsets"/> are measured.</param>
+        /// <param name="settleDayOffsets">Settlement days, expressed as offset in days from <paramref name="referenceDay"/>,
+        /// of the contiguous periods starting at <paramref name="start"/>.</param>
+        /// <param name="fallbackSettleDateRule">Optional settlement rule used for periods outside of the table.</param>
+        public SettleDateLookup(T start, Day referenceDay, [NotNull] int[] settleDayOffsets,
+                                    [CanBeNull] Func<T, Day> fallbackSettleDateRule = null)
+        {
+            if (settleDayOffsets == null) throw new ArgumentNullException(nameof(settleDayOffsets));
+            _start = start;
+            _fallbackSettleDateRule = fallbackSettleDateRule;
+            _settleDays = new Day[settleDayOffsets.Length];
+            for (int i = 0; i < settleDayOffsets.Length; i++)
+                _settleDays[i] = referenceDay.Offset(settleDayOffsets[i]);
+        }
+
+        public Day SettleDate(T period)
+        {
+            int index = period.OffsetFrom(_start);
+            if (index >= 0 && index < _settleDays.Length)
+                return _settleDays[index];
+            if (_fallbackSettleDateRule == null)
+                throw new ArgumentException($"Period {period} is outside of the range of the settlement date table " +
+                                            "and no fallback settlement rule has been specified.", nameof(period));
+            return _fallbackSettleDateRule(period);
+        }
+
+        public Func<T, Day> SettleDateRule => SettleDate;
+
+    }
+}
@@ -0,0 +1,72 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+
+namespace Cmdty.Storage.PythonHelpers
+{
+    /// <summary>
+    /// Storage profile stored as contiguous arrays, one per <see cref="StorageProfile"/> property, so it can
+    /// be copied into Python with one bulk copy per column.
+    /// </summary>
+    public sealed class StorageProfileColumns
+    {
+        public double[] Inventory { get; }
+        public double[] InjectWithdrawVolume { get; }
+        public double[] CmdtyConsumed { get; }
+        public double[] InventoryLoss { get; }
+        public double[] NetVolume { get; }
+        public double[] PeriodPv { get; }
+
+        private StorageProfileColumns(int count)
+        {
+            Inventory = new double[count];
+            InjectWithdrawVolume = new double[count];
+            CmdtyConsumed = new double[count];
+            InventoryLoss = new double[count];
+            NetVolume = new double[count];
+            PeriodPv = new double[count];
+        }
+
+        public static StorageProfileColumns FromProfile<T>(TimeSeries<T, StorageProfile> storageProfile) 
+            where T : ITimePeriod<T>
+        {
+            var columns = new StorageProfileColumns(storageProfile.Count);
+            for (int i = 0; i < storageProfile.Count; i++)
+            {
+                StorageProfile profile = storageProfile.Data[i];
+                columns.Inventory[i] = profile.Inventory;
+                columns.InjectWithdrawVolume[i] = profile.InjectWithdrawVolume;
+                columns.CmdtyConsumed[i] = profile.CmdtyConsumed;
+                columns.InventoryLoss[i] = profile.InventoryLoss;
+                columns.NetVolume[i] = profile.NetVolume;
+                columns.PeriodPv[i] = profile.PeriodPv;
+            }
+            return columns;
+        }
+
+    }
+}
@@ -0,0 +1,77 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+
+namespace Cmdty.Storage.PythonHelpers
+{
+    /// <summary>
+    /// Helpers for bulk conversion of time series data between Python and .NET, avoiding crossing the
+    /// interop boundary once per element.
+    /// </summary>
+    public static class TimeSeriesHelper
+    {
+        /// <summary>
+        /// Creates an array of contiguous time periods, starting at <paramref name="start"/>.
+        /// </summary>
+        public static T[] ContiguousPeriods<T>(T start, int count) where T : ITimePeriod<T>
+        {
+            if (count < 0)
+                throw new ArgumentException("Count cannot be negative.", nameof(count));
+            var periods = new T[count];
+            for (int i = 0; i < count; i++)
+                periods[i] = start.Offset(i);
+            return periods;
+        }
+
+        /// <summary>
+        /// Returns true if each period in <paramref name="periods"/> immediately follows the previous one.
+        /// </summary>
+        public static bool IsContiguous<T>(IEnumerable<T> periods) where T : ITimePeriod<T>
+        {
+            bool isFirst = true;
+            T previousPeriod = default;
+            foreach (T period in periods)
+            {
+                if (!isFirst && !period.Equals(previousPeriod.Offset(1)))
+                    return false;
+                previousPeriod = period;
+                isFirst = false;
+            }
+            return true;
+        }
+
+        /// <summary>
+        /// Copies the data of a time series into a new array, so it can be transferred to Python in one copy.
+        /// </summary>
+        public static double[] DataToArray<T>(TimeSeries<T, double> timeSeries) where T : ITimePeriod<T>
+            => timeSeries.Data.ToArray();
+
+    }
+}
@@ -0,0 +1,66 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+
+namespace Cmdty.Storage.PythonHelpers
+{
+    /// <summary>
+    /// Trigger prices stored as contiguous arrays, one per <see cref="TriggerPrices"/> property, so they can
+    /// be copied into Python with one bulk copy per column. Missing values are represented by NaN.
+    /// </summary>
+    public sealed class TriggerPriceColumns
+    {
+        public double[] MaxInjectVolume { get; }
+        public double[] MaxInjectTriggerPrice { get; }
+        public double[] MaxWithdrawVolume { get; }
+        public double[] MaxWithdrawTriggerPrice { get; }
+
+        private TriggerPriceColumns(int count)
+        {
+            MaxInjectVolume = new double[count];
+            MaxInjectTriggerPrice = new double[count];
+            MaxWithdrawVolume = new double[count];
+            MaxWithdrawTriggerPrice = new double[count];
+        }
+
+        public static TriggerPriceColumns FromTriggerPrices<T>(TimeSeries<T, TriggerPrices> triggerPrices)
+            where T : ITimePeriod<T>
+        {
+            var columns = new TriggerPriceColumns(triggerPrices.Count);
+            for (int i = 0; i < triggerPrices.Count; i++)
+            {
+                TriggerPrices periodTriggerPrices = triggerPrices.Data[i];
+                columns.MaxInjectVolume[i] = periodTriggerPrices.MaxInjectVolume ?? double.NaN;
+                columns.MaxInjectTriggerPrice[i] = periodTriggerPrices.MaxInjectTriggerPrice ?? double.NaN;
+                columns.MaxWithdrawVolume[i] = periodTriggerPrices.MaxWithdrawVolume ?? double.NaN;
+                columns.MaxWithdrawTriggerPrice[i] = periodTriggerPrices.MaxWithdrawTriggerPrice ?? double.NaN;
+            }
+            return columns;
+        }
+
+    }
+}
@@ -0,0 +1,89 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System.Collections.Generic;
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+
+namespace Cmdty.Storage.PythonHelpers
+{
+    /// <summary>
+    /// Trigger price volume profiles flattened into long-form columns, with one row per trigger price point, so they can
+    /// be copied into Python with one bulk copy per column. For each period, inject points are followed by withdraw points.
+    /// </summary>
+    public sealed class TriggerPriceProfileColumns
+    {
+        /// <summary>
+        /// Offset of the point's period from the first period of the trigger price profiles time series.
+        /// </summary>
+        public int[] PeriodOffset { get; }
+        /// <summary>
+        /// True for injection trigger price points, false for withdrawal points.
+        /// </summary>
+        public bool[] IsInject { get; }
+        public double[] Volume { get; }
+        public double[] Price { get; }
+
+        private TriggerPriceProfileColumns(int count)
+        {
+            PeriodOffset = new int[count];
+            IsInject = new bool[count];
+            Volume = new double[count];
+            Price = new double[count];
+        }
+
+        public static TriggerPriceProfileColumns FromProfiles<T>(TimeSeries<T, TriggerPriceVolumeProfiles> triggerProfiles)
+            where T : ITimePeriod<T>
+        {
+            int count = 0;
+            foreach (TriggerPriceVolumeProfiles profiles in triggerProfiles.Data)
+                count += profiles.InjectTriggerPrices.Count + profiles.WithdrawTriggerPrices.Count;
+
+            var columns = new TriggerPriceProfileColumns(count);
+            int pointIndex = 0;
+            for (int i = 0; i < triggerProfiles.Count; i++)
+            {
+                TriggerPriceVolumeProfiles profiles = triggerProfiles.Data[i];
+                pointIndex = columns.AddPoints(profiles.InjectTriggerPrices, i, true, pointIndex);
+                pointIndex = columns.AddPoints(profiles.WithdrawTriggerPrices, i, false, pointIndex);
+            }
+            return columns;
+        }
+
+        private int AddPoints(IReadOnlyList<TriggerPricePoint> points, int periodOffset, bool isInject, int pointIndex)
+        {
+            foreach (TriggerPricePoint point in points)
+            {
+                PeriodOffset[pointIndex] = periodOffset;
+                IsInject[pointIndex] = isInject;
+                Volume[pointIndex] = point.Volume;
+                Price[pointIndex] = point.Price;
+                pointIndex++;
+            }
+            return pointIndex;
+        }
+
+    }
+}
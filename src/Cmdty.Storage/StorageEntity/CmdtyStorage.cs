@@ -48,6 +48,7 @@ public sealed class CmdtyStorage<T> : ICmdtyStorage<T> where T : ITimePeriod<T>
         private readonly Func<T, double> _cmdtyInventoryLoss;
         private readonly Func<T, double, IReadOnlyList<DomesticCashFlow>> _cmdtyInventoryCost;
         private readonly Func<double, double, double> _terminalStorageValue;
+        private readonly Func<double[], double[], double[]> _terminalStorageValues;
 
         public bool MustBeEmptyAtEnd { get; }
 
@@ -59,6 +60,7 @@ public sealed class CmdtyStorage<T> : ICmdtyStorage<T> where T : ITimePeriod<T>
                             Func<T, double, double, IReadOnlyList<DomesticCashFlow>> injectionCashFlows,
                             Func<T, double, double, IReadOnlyList<DomesticCashFlow>> withdrawalCashFlows,
                             Func<double, double, double> terminalStorageValue,
+                            Func<double[], double[], double[]> terminalStorageValues,
                             bool mustBeEmptyAtEnd,
                             Func<T, double, double, double> injectCmdtyConsumed,
                             Func<T, double, double, double> withdrawCmdtyConsumed,
@@ -73,6 +75,7 @@ public sealed class CmdtyStorage<T> : ICmdtyStorage<T> where T : ITimePeriod<T>
             _injectionCashFlows = injectionCashFlows;
             _withdrawalCashFlows = withdrawalCashFlows;
             _terminalStorageValue = terminalStorageValue;
+            _terminalStorageValues = terminalStorageValues;
             MustBeEmptyAtEnd = mustBeEmptyAtEnd;
             _injectCmdtyConsumed = injectCmdtyConsumed;
             _withdrawCmdtyConsumed = withdrawCmdtyConsumed;
@@ -156,6 +159,31 @@ public double TerminalStorageNpv(double cmdtyPrice, double finalInventory)
             return _terminalStorageValue(cmdtyPrice, finalInventory);
         }
 
+        /// <summary>
+        /// Calculates the terminal storage NPV for arrays of cmdty prices and final inventories, populating
+        /// <paramref name="terminalNpvs"/>. Avoids calling a terminal NPV function implemented outside of .NET once per element.
+        /// </summary>
+        public void TerminalStorageNpvs([NotNull] double[] cmdtyPrices, [NotNull] double[] finalInventories, 
+                                        [NotNull] double[] terminalNpvs)
+        {
+            if (cmdtyPrices == null) throw new ArgumentNullException(nameof(cmdtyPrices));
+            if (finalInventories == null) throw new ArgumentNullException(nameof(finalInventories));
+            if (terminalNpvs == null) throw new ArgumentNullException(nameof(terminalNpvs));
+            if (cmdtyPrices.Length != finalInventories.Length || cmdtyPrices.Length != terminalNpvs.Length)
+                throw new ArgumentException($"Arrays {nameof(cmdtyPrices)}, {nameof(finalInventories)} and {nameof(terminalNpvs)} " +
+                                            "must all have the same length.");
+            if (_terminalStorageValues == null)
+            {
+                for (int i = 0; i < cmdtyPrices.Length; i++)
+                    terminalNpvs[i] = _terminalStorageValue(cmdtyPrices[i], finalInventories[i]);
+                return;
+            }
+            double[] npvs = _terminalStorageValues(cmdtyPrices, finalInventories);
+            if (npvs == null || npvs.Length != terminalNpvs.Length)
+                throw new InvalidOperationException("Vectorized terminal storage NPV function returned an array of unexpected length.");
+            Array.Copy(npvs, terminalNpvs, npvs.Length);
+        }
+
         public double CmdtyInventoryPercentLoss([NotNull] T period)
         {
             if (period == null) throw new ArgumentNullException(nameof(period));
@@ -172,7 +200,7 @@ public IReadOnlyList<DomesticCashFlow> CmdtyInventoryCost([NotNull] T period, do
 
         private sealed class StorageBuilder : IBuilder<T>, IAddInjectWithdrawConstraints<T>, IAddMaxInventory<T>, IAddMinInventory<T>, IAddInjectionCost<T>, 
                     IAddWithdrawalCost<T>, IAddTerminalStorageState<T>, IBuildCmdtyStorage<T>, IAddCmdtyConsumedOnInject<T>, IAddCmdtyConsumedOnWithdraw<T>,
-                    IAddCmdtyInventoryLoss<T>, IAddCmdtyInventoryCost<T>
+                    IAddCmdtyInventoryLoss<T>, IAddCmdtyInventoryCost<T>, IAddVectorizedTerminalStorageState<T>
         {
             private T _startPeriod;
             private T _endPeriod;
@@ -182,6 +210,7 @@ private sealed class StorageBuilder : IBuilder<T>, IAddInjectWithdrawConstraints
             private Func<T, double, double, IReadOnlyList<DomesticCashFlow>> _injectionCashFlows;
             private Func<T, double, double, IReadOnlyList<DomesticCashFlow>> _withdrawalCashFlows;
             private Func<double, double, double> _terminalStorageValue;
+            private Func<double[], double[], double[]> _terminalStorageValues;
             private bool _mustBeEmptyAtEnd;
             private Func<T, double, double, double> _injectCmdtyConsumed;
             private Func<T, double, double, double> _withdrawCmdtyConsumed;
@@ -418,6 +447,16 @@ public IAddCmdtyConsumedOnWithdraw<T> WithPerUnitWithdrawalCost(double perVolume
             IBuildCmdtyStorage<T> IAddTerminalStorageState<T>.WithTerminalInventoryNpv([NotNull] Func<double, double, double> terminalStorageValueFunc)
             {
                 _terminalStorageValue = terminalStorageValueFunc ?? throw new ArgumentNullException(nameof(terminalStorageValueFunc));
+                _terminalStorageValues = null;
+                return this;
+            }
+
+            IBuildCmdtyStorage<T> IAddVectorizedTerminalStorageState<T>.WithVectorizedTerminalInventoryNpv(
+                                    [NotNull] Func<double[], double[], double[]> terminalStorageValuesFunc)
+            {
+                _terminalStorageValues = terminalStorageValuesFunc ?? throw new ArgumentNullException(nameof(terminalStorageValuesFunc));
+                _terminalStorageValue = (cmdtyPrice, finalInventory) => 
+                                        terminalStorageValuesFunc(new[] {cmdtyPrice}, new[] {finalInventory})[0];
                 return this;
             }
 
@@ -442,7 +481,7 @@ CmdtyStorage<T> IBuildCmdtyStorage<T>.Build()
                 }
 
                 return new CmdtyStorage<T>(_startPeriod, _endPeriod, _injectWithdrawConstraints, maxInventory, 
-                        _minInventory, _injectionCashFlows, _withdrawalCashFlows, terminalStorageValue, _mustBeEmptyAtEnd, 
+                        _minInventory, _injectionCashFlows, _withdrawalCashFlows, terminalStorageValue, _terminalStorageValues, _mustBeEmptyAtEnd, 
                         _injectCmdtyConsumed, _withdrawCmdtyConsumed, _cmdtyInventoryLoss,
                         _cmdtyInventoryCost);
             }
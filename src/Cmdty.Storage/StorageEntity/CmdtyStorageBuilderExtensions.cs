@@ -139,6 +139,69 @@ IInjectWithdrawConstraint ConstraintFactory(InjectWithdrawRangeByInventory[] inj
             return addInjectionCost;
         }
 
+        /// <summary>
+        /// Terminal inventory NPV equal to the final inventory multiplied by the cmdty price times <paramref name="spotMultiple"/>,
+        /// minus <paramref name="perUnitCost"/>. Evaluated entirely in .NET.
+        /// </summary>
+        public static IBuildCmdtyStorage<T> WithTerminalInventoryValuedAtSpot<T>([NotNull] this IAddTerminalStorageState<T> builder,
+                            double spotMultiple = 1.0, double perUnitCost = 0.0)
+            where T : ITimePeriod<T>
+        {
+            if (builder == null) throw new ArgumentNullException(nameof(builder));
+            return builder.WithTerminalInventoryNpv((cmdtyPrice, finalInventory) 
+                                    => (cmdtyPrice * spotMultiple - perUnitCost) * finalInventory);
+        }
+
+        /// <summary>
+        /// Terminal inventory NPV equal to the final inventory multiplied by a fixed price. Evaluated entirely in .NET.
+        /// </summary>
+        public static IBuildCmdtyStorage<T> WithTerminalInventoryValuedAtFixedPrice<T>([NotNull] this IAddTerminalStorageState<T> builder,
+                            double pricePerUnit)
+            where T : ITimePeriod<T>
+        {
+            if (builder == null) throw new ArgumentNullException(nameof(builder));
+            return builder.WithTerminalInventoryNpv((cmdtyPrice, finalInventory) => pricePerUnit * finalInventory);
+        }
+
+        /// <summary>
+        /// Terminal inventory NPV equal to a penalty for the final inventory being away from a target level. The penalty is
+        /// linear in the shortfall below, or excess above, the target. Evaluated entirely in .NET.
+        /// </summary>
+        public static IBuildCmdtyStorage<T> WithTerminalInventoryTargetPenalty<T>([NotNull] this IAddTerminalStorageState<T> builder,
+                            double targetInventory, double penaltyPerUnitBelow, double penaltyPerUnitAbove)
+            where T : ITimePeriod<T>
+        {
+            if (builder == null) throw new ArgumentNullException(nameof(builder));
+            if (penaltyPerUnitBelow < 0)
+                throw new ArgumentException("Penalty per unit below target must be non-negative.", nameof(penaltyPerUnitBelow));
+            if (penaltyPerUnitAbove < 0)
+                throw new ArgumentException("Penalty per unit above target must be non-negative.", nameof(penaltyPerUnitAbove));
+            return builder.WithTerminalInventoryNpv((cmdtyPrice, finalInventory) =>
+                    -penaltyPerUnitBelow * Math.Max(targetInventory - finalInventory, 0.0)
+                    - penaltyPerUnitAbove * Math.Max(finalInventory - targetInventory, 0.0));
+        }
+
+        /// <summary>
+        /// Adds vectorized rule of NPV for any inventory left in storage at the end, should this be allowed. Use in preference
+        /// to <see cref="IAddTerminalStorageState{T}.WithTerminalInventoryNpv"/> when the rule is implemented outside of .NET,
+        /// e.g. in Python, to reduce the number of calls into the function. Builders other than the one created by
+        /// <see cref="CmdtyStorage{T}.Builder"/> are given a scalar rule which calls the function with arrays of length one.
+        /// </summary>
+        /// <param name="builder">Storage builder.</param>
+        /// <param name="terminalStorageValuesFunc">Function mapping arrays of cmdty prices and final inventories on the end period
+        /// to an array of NPVs of the same length.</param>
+        public static IBuildCmdtyStorage<T> WithVectorizedTerminalInventoryNpv<T>([NotNull] this IAddTerminalStorageState<T> builder,
+                            [NotNull] Func<double[], double[], double[]> terminalStorageValuesFunc)
+            where T : ITimePeriod<T>
+        {
+            if (builder == null) throw new ArgumentNullException(nameof(builder));
+            if (terminalStorageValuesFunc == null) throw new ArgumentNullException(nameof(terminalStorageValuesFunc));
+            if (builder is IAddVectorizedTerminalStorageState<T> vectorizedBuilder)
+                return vectorizedBuilder.WithVectorizedTerminalInventoryNpv(terminalStorageValuesFunc);
+            return builder.WithTerminalInventoryNpv((cmdtyPrice, finalInventory) =>
+                                    terminalStorageValuesFunc(new[] {cmdtyPrice}, new[] {finalInventory})[0]);
+        }
+
         private static IAddInjectionCost<T> AddInjectWithdrawRanges<T>(
             IAddInjectWithdrawConstraints<T> builder,
             IEnumerable<InjectWithdrawRangeByInventoryAndPeriod<T>> injectWithdrawRanges, 
@@ -0,0 +1,60 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using Cmdty.TimePeriodValueTypes;
+using JetBrains.Annotations;
+
+namespace Cmdty.Storage
+{
+    public static class CmdtyStorageExtensions
+    {
+        /// <summary>
+        /// Calculates the terminal storage NPV for arrays of cmdty prices and final inventories, populating
+        /// <paramref name="terminalNpvs"/>. For instances of <see cref="CmdtyStorage{T}"/> this makes a single call into any
+        /// vectorized terminal NPV rule. Other implementations of <see cref="ICmdtyStorage{T}"/> are evaluated element by element
+        /// using <see cref="ICmdtyStorage{T}.TerminalStorageNpv"/>.
+        /// </summary>
+        public static void TerminalStorageNpvs<T>([NotNull] this ICmdtyStorage<T> storage, [NotNull] double[] cmdtyPrices, 
+                                [NotNull] double[] finalInventories, [NotNull] double[] terminalNpvs)
+            where T : ITimePeriod<T>
+        {
+            if (storage == null) throw new ArgumentNullException(nameof(storage));
+            if (storage is CmdtyStorage<T> cmdtyStorage)
+            {
+                cmdtyStorage.TerminalStorageNpvs(cmdtyPrices, finalInventories, terminalNpvs);
+                return;
+            }
+            if (cmdtyPrices == null) throw new ArgumentNullException(nameof(cmdtyPrices));
+            if (finalInventories == null) throw new ArgumentNullException(nameof(finalInventories));
+            if (terminalNpvs == null) throw new ArgumentNullException(nameof(terminalNpvs));
+            if (cmdtyPrices.Length != finalInventories.Length || cmdtyPrices.Length != terminalNpvs.Length)
+                throw new ArgumentException($"Arrays {nameof(cmdtyPrices)}, {nameof(finalInventories)} and {nameof(terminalNpvs)} " +
+                                            "must all have the same length.");
+            for (int i = 0; i < cmdtyPrices.Length; i++)
+                terminalNpvs[i] = storage.TerminalStorageNpv(cmdtyPrices[i], finalInventories[i]);
+        }
+    }
+}
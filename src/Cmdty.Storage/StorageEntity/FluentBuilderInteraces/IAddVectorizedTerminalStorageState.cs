@@ -0,0 +1,40 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using Cmdty.TimePeriodValueTypes;
+
+namespace Cmdty.Storage
+{
+    /// <summary>
+    /// Implemented by builders which can store a vectorized terminal NPV rule. Kept internal, rather than added to
+    /// <see cref="IAddTerminalStorageState{T}"/>, so that external implementations of the public builder interfaces are not broken.
+    /// Use via <see cref="CmdtyStorageBuilderExtensions.WithVectorizedTerminalInventoryNpv{T}"/>.
+    /// </summary>
+    internal interface IAddVectorizedTerminalStorageState<T> where T : ITimePeriod<T>
+    {
+        IBuildCmdtyStorage<T> WithVectorizedTerminalInventoryNpv(Func<double[], double[], double[]> terminalStorageValuesFunc);
+    }
+}
@@ -25,6 +25,7 @@
 
 using System;
 using System.Diagnostics;
+using System.Globalization;
 using System.Reflection;
 using BenchmarkDotNet.Running;
 
@@ -40,6 +41,12 @@ static void Main(string[] args)
             //stopwatch.Stop();
             //Console.WriteLine(results + " " + stopwatch.Elapsed);
             //Console.ReadKey();
+            if (args.Length > 0 && args[0] == "convergence")
+            {
+                double? targetStandardError = args.Length > 1 ? double.Parse(args[1], CultureInfo.InvariantCulture) : (double?)null;
+                ValuationSimConvergenceReport.Run(targetStandardError);
+                return;
+            }
             new BenchmarkSwitcher(typeof(Program).GetTypeInfo().Assembly).Run(args);
         }
     }
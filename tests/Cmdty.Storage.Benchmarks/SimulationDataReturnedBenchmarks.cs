@@ -0,0 +1,135 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using BenchmarkDotNet.Attributes;
+using Cmdty.Core.Simulation.MultiFactor;
+using Cmdty.TimePeriodValueTypes;
+using TimeSeriesFactory = Cmdty.TimeSeries.TimeSeries;
+
+namespace Cmdty.Storage.Benchmarks
+{
+    // Compares memory allocated valuing a three year daily storage contract when returning all simulated data, and when
+    // returning none. All needs the simulated spot prices and factors of every period, so is simulated as panels. None
+    // allocates no per simulation result panels and uses the streamed simulation, as the Python API does by default when no
+    // simulated spot prices or factors are returned, so only the retained periods of the simulations are allocated
+    [MemoryDiagnoser]
+    public class SimulationDataReturnedBenchmarks
+    {
+        private const int NumSims = 2_000;
+        private const int RandomSeed = 11;
+        private const int RegressMaxDegree = 2;
+        private const int NumInventorySpacePoints = 50;
+        private LsmcValuationParameters<Day>.Builder _valuationParametersBuilder;
+        private MultiFactorParameters<Day> _twoFactorParams;
+        private double[] _meanReversions;
+        private IReadOnlyDictionary<Day, double>[] _factorVols;
+        private double[,] _factorCorrelations;
+
+        [Params(SimulationDataReturned.All, SimulationDataReturned.None)]
+        public SimulationDataReturned SimulationDataReturned { get; set; }
+
+        [GlobalSetup]
+        public void Setup()
+        {
+            var valDate = new Day(2020, 3, 31);
+            var storageStart = new Day(2020, 4, 1);
+            var storageEnd = new Day(2023, 4, 1);
+            const double maxWithdrawalRate = 850.0;
+            const double maxInjectionRate = 625.0;
+            const double maxInventory = 52_500.0;
+            const double constantInjectionCost = 1.25;
+            const double constantWithdrawalCost = 0.93;
+
+            var storage = CmdtyStorage<Day>.Builder
+                .WithActiveTimePeriod(storageStart, storageEnd)
+                .WithConstantInjectWithdrawRange(-maxWithdrawalRate, maxInjectionRate)
+                .WithZeroMinInventory()
+                .WithConstantMaxInventory(maxInventory)
+                .WithPerUnitInjectionCost(constantInjectionCost, injectionDate => injectionDate)
+                .WithNoCmdtyConsumedOnInject()
+                .WithPerUnitWithdrawalCost(constantWithdrawalCost, withdrawalDate => withdrawalDate)
+                .WithNoCmdtyConsumedOnWithdraw()
+                .WithNoCmdtyInventoryLoss()
+                .WithNoInventoryCost()
+                .MustBeEmptyAtEnd()
+                .Build();
+
+            const double longTermVol = 0.2;
+            const double spotMeanReversion = 12.5;
+            const double spotVol = 0.95;
+            const double factorCorrelation = 0.6;
+            _twoFactorParams = MultiFactorParameters.For2Factors(factorCorrelation,
+                new Factor<Day>(0.0, TimeSeriesFactory.ForConstantData(valDate, storageEnd, longTermVol)),
+                new Factor<Day>(spotMeanReversion, TimeSeriesFactory.ForConstantData(valDate, storageEnd, spotVol)));
+            _meanReversions = new[] {0.0, spotMeanReversion};
+            Day[] volDays = valDate.EnumerateTo(storageEnd).ToArray();
+            _factorVols = new IReadOnlyDictionary<Day, double>[]
+            {
+                volDays.ToDictionary(day => day, day => longTermVol),
+                volDays.ToDictionary(day => day, day => spotVol)
+            };
+            _factorCorrelations = new[,] {{1.0, factorCorrelation}, {factorCorrelation, 1.0}};
+
+            const double baseForwardPrice = 53.5;
+            const double forwardSeasonalFactor = 24.6;
+            var forwardCurve = TimeSeriesFactory.FromMap(valDate, storageEnd, day =>
+            {
+                int daysForward = day.OffsetFrom(valDate);
+                return baseForwardPrice + Math.Sin(2.0 * Math.PI / 365.0 * daysForward) * forwardSeasonalFactor;
+            });
+            const double flatInterestRate = 0.055;
+
+            _valuationParametersBuilder = new LsmcValuationParameters<Day>.Builder
+                {
+                    BasisFunctions = BasisFunctionsBuilder.Ones +
+                                     BasisFunctionsBuilder.AllMarkovFactorAllPositiveIntegerPowersUpTo(RegressMaxDegree, 2),
+                    CurrentPeriod = valDate,
+                    DiscountFactors = StorageHelper.CreateAct65ContCompDiscounter(flatInterestRate),
+                    ForwardCurve = forwardCurve,
+                    GridCalc = FixedSpacingStateSpaceGridCalc.CreateForFixedNumberOfPointsOnGlobalInventoryRange(storage, NumInventorySpacePoints),
+                    Inventory = 0.0,
+                    Storage = storage,
+                    SettleDateRule = deliveryDate => Month.FromDateTime(deliveryDate.Start).Offset(1).First<Day>() + 19, // Settlement on 20th of following month
+                    SimulationDataReturned = SimulationDataReturned
+                };
+        }
+
+        [Benchmark]
+        public double ValueThreeYearDailyStorageTwoFactor()
+        {
+            // Simulation set on each call so that all iterations use the same random numbers
+            if (SimulationDataReturned == SimulationDataReturned.None)
+                _valuationParametersBuilder.SimulateWithMultiFactorModelStreamed(_meanReversions, _factorVols, _factorCorrelations, 
+                    NumSims, RandomSeed);
+            else
+                _valuationParametersBuilder.SimulateWithMultiFactorModelAndMersenneTwister(_twoFactorParams, NumSims, RandomSeed);
+            return LsmcStorageValuation.WithNoLogger.Calculate(_valuationParametersBuilder.Build()).Npv;
+        }
+
+    }
+}
@@ -0,0 +1,177 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Collections.Generic;
+using System.Globalization;
+using System.Linq;
+using Cmdty.Core.Simulation.MultiFactor;
+using Cmdty.TimePeriodValueTypes;
+using MathNet.Numerics.Statistics;
+using TimeSeriesFactory = Cmdty.TimeSeries.TimeSeries;
+
+namespace Cmdty.Storage.Benchmarks
+{
+    // Reports the number of simulations needed for the LSMC NPV to reach a target standard error, using Mersenne Twister
+    // pseudo-random numbers and scrambled Sobol quasi-random numbers. The ValuationSimStandardError of the results assumes
+    // independent simulations, which does not hold for Sobol points, so the standard error is also measured as the standard
+    // deviation of the NPV over independently seeded replications. This includes the error from the regression simulations.
+    // Run with: dotnet run -c Release -- convergence [target standard error]
+    public static class ValuationSimConvergenceReport
+    {
+        private static readonly int[] NumSimsToTest = {256, 512, 1_024, 2_048, 4_096, 8_192};
+        private const int NumReplications = 10;
+        private const int RegressMaxDegree = 2;
+        private const int NumInventorySpacePoints = 50;
+        // Used if no target is specified, as a proportion of the Mersenne Twister NPV with the most simulations
+        private const double DefaultTargetRelativeStandardError = 0.002;
+
+        private sealed class ConvergenceRow
+        {
+            public string RandomNumbers { get; set; }
+            public int NumSims { get; set; }
+            public double MeanNpv { get; set; }
+            public double MeanValuationSimStandardError { get; set; }
+            public double ReplicationStandardError { get; set; }
+        }
+
+        public static void Run(double? targetStandardError = null)
+        {
+            var valDate = new Day(2019, 8, 29);
+            var storageStart = new Day(2019, 12, 1);
+            var storageEnd = new Day(2020, 4, 1);
+            const double maxWithdrawalRate = 850.0;
+            const double maxInjectionRate = 625.0;
+            const double maxInventory = 52_500.0;
+            const double constantInjectionCost = 1.25;
+            const double constantWithdrawalCost = 0.93;
+
+            var storage = CmdtyStorage<Day>.Builder
+                .WithActiveTimePeriod(storageStart, storageEnd)
+                .WithConstantInjectWithdrawRange(-maxWithdrawalRate, maxInjectionRate)
+                .WithZeroMinInventory()
+                .WithConstantMaxInventory(maxInventory)
+                .WithPerUnitInjectionCost(constantInjectionCost, injectionDate => injectionDate)
+                .WithNoCmdtyConsumedOnInject()
+                .WithPerUnitWithdrawalCost(constantWithdrawalCost, withdrawalDate => withdrawalDate)
+                .WithNoCmdtyConsumedOnWithdraw()
+                .WithNoCmdtyInventoryLoss()
+                .WithNoInventoryCost()
+                .MustBeEmptyAtEnd()
+                .Build();
+
+            const double meanReversion = 12.5;
+            const double spotVol = 0.95;
+            var multiFactorParams = MultiFactorParameters.For1Factor(meanReversion,
+                    TimeSeriesFactory.ForConstantData(valDate, storageEnd, spotVol));
+            Dictionary<Day, double> spotVols = valDate.EnumerateTo(storageEnd).ToDictionary(day => day, day => spotVol);
+            const double flatInterestRate = 0.055;
+
+            const double baseForwardPrice = 53.5;
+            const double forwardSeasonalFactor = 24.6;
+            var forwardCurve = TimeSeriesFactory.FromMap(valDate, storageEnd, day =>
+            {
+                int daysForward = day.OffsetFrom(valDate);
+                return baseForwardPrice + Math.Sin(2.0 * Math.PI / 365.0 * daysForward) * forwardSeasonalFactor;
+            });
+
+            LsmcValuationParameters<Day>.Builder CreateParamsBuilder() => new LsmcValuationParameters<Day>.Builder
+                {
+                    BasisFunctions = BasisFunctionsBuilder.Ones +
+                                     BasisFunctionsBuilder.AllMarkovFactorAllPositiveIntegerPowersUpTo(RegressMaxDegree, 1),
+                    CurrentPeriod = valDate,
+                    DiscountFactors = StorageHelper.CreateAct65ContCompDiscounter(flatInterestRate),
+                    ForwardCurve = forwardCurve,
+                    GridCalc = FixedSpacingStateSpaceGridCalc.CreateForFixedNumberOfPointsOnGlobalInventoryRange(storage, NumInventorySpacePoints),
+                    Inventory = 5_685,
+                    Storage = storage,
+                    SettleDateRule = deliveryDate => Month.FromDateTime(deliveryDate.Start).Offset(1).First<Day>() + 19, // Settlement on 20th of following month
+                    SimulationDataReturned = SimulationDataReturned.None
+                };
+
+            var rows = new List<ConvergenceRow>();
+            foreach (int numSims in NumSimsToTest)
+            {
+                rows.Add(ValueReplications("Mersenne Twister", numSims, seed => CreateParamsBuilder()
+                    .SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, seed)));
+                rows.Add(ValueReplications("Sobol", numSims, seed => CreateParamsBuilder()
+                    .SimulateWithMultiFactorModelAndSobol(new[] {meanReversion}, new[] {spotVols}, new[,] {{1.0}}, numSims, seed)));
+            }
+
+            double target = targetStandardError ?? DefaultTargetRelativeStandardError *
+                            Math.Abs(rows.Last(row => row.RandomNumbers == "Mersenne Twister").MeanNpv);
+            WriteReport(rows, target);
+        }
+
+        private static ConvergenceRow ValueReplications(string randomNumbers, int numSims, 
+                                        Func<int, LsmcValuationParameters<Day>.Builder> createParamsBuilderForSeed)
+        {
+            var npvs = new double[NumReplications];
+            var valuationSimStandardErrors = new double[NumReplications];
+            for (int replicationIndex = 0; replicationIndex < NumReplications; replicationIndex++)
+            {
+                LsmcValuationParameters<Day> valuationParameters = createParamsBuilderForSeed(1 + replicationIndex).Build();
+                LsmcStorageValuationResults<Day> results = LsmcStorageValuation.WithNoLogger.Calculate(valuationParameters);
+                npvs[replicationIndex] = results.Npv;
+                valuationSimStandardErrors[replicationIndex] = results.ValuationSimStandardError;
+            }
+            return new ConvergenceRow
+            {
+                RandomNumbers = randomNumbers,
+                NumSims = numSims,
+                MeanNpv = npvs.Mean(),
+                MeanValuationSimStandardError = valuationSimStandardErrors.Mean(),
+                ReplicationStandardError = npvs.StandardDeviation()
+            };
+        }
+
+        private static void WriteReport(IReadOnlyList<ConvergenceRow> rows, double targetStandardError)
+        {
+            CultureInfo culture = CultureInfo.InvariantCulture;
+            Console.WriteLine(string.Format(culture, "{0,-18}{1,10}{2,16}{3,24}{4,24}", "Random Numbers", "Num Sims", 
+                                "Mean NPV", "Val Sim Standard Error", "Replication Std Error"));
+            foreach (ConvergenceRow row in rows)
+                Console.WriteLine(string.Format(culture, "{0,-18}{1,10}{2,16:N2}{3,24:N2}{4,24:N2}", row.RandomNumbers, row.NumSims,
+                                    row.MeanNpv, row.MeanValuationSimStandardError, row.ReplicationStandardError));
+
+            Console.WriteLine();
+            Console.WriteLine(string.Format(culture, "Simulations needed to reach target standard error of {0:N2}:", targetStandardError));
+            foreach (IGrouping<string, ConvergenceRow> rowsForRandomNumbers in rows.GroupBy(row => row.RandomNumbers))
+            {
+                ConvergenceRow byValuationSimStandardError = rowsForRandomNumbers
+                    .FirstOrDefault(row => row.MeanValuationSimStandardError <= targetStandardError);
+                ConvergenceRow byReplicationStandardError = rowsForRandomNumbers
+                    .FirstOrDefault(row => row.ReplicationStandardError <= targetStandardError);
+                Console.WriteLine(string.Format(culture, "{0,-18}val sim standard error: {1}, replication standard error: {2}",
+                                    rowsForRandomNumbers.Key, NumSimsDescription(byValuationSimStandardError), 
+                                    NumSimsDescription(byReplicationStandardError)));
+            }
+        }
+
+        private static string NumSimsDescription(ConvergenceRow row) => 
+            row == null ? $"not reached with {NumSimsToTest.Last()}" : row.NumSims.ToString(CultureInfo.InvariantCulture);
+
+    }
+}
@@ -1,4 +1,4 @@
-#region License
+﻿#region License
 // Copyright (c) 2019 Jake Fowler
 //
 // Permission is hereby granted, free of charge, to any person 
@@ -23,6 +23,7 @@
 // OTHER DEALINGS IN THE SOFTWARE.
 #endregion
 
+using System;
 using System.Collections.Generic;
 using Cmdty.TimePeriodValueTypes;
 using Xunit;
@@ -195,6 +196,77 @@ public void Build_WithTimeAndInventoryVaryingInjectWithdrawRates_MinAndMaxInvent
 
         }
 
+        [Fact]
+        public void TerminalStorageNpvs_WithTerminalInventoryValuedAtSpot_EqualsScalarCalculation()
+        {
+            CmdtyStorage<Day> storage = BuildCmdtyStorageWithTerminalValue(builder => 
+                                builder.WithTerminalInventoryValuedAtSpot(spotMultiple: 0.95, perUnitCost: 0.5));
+            var cmdtyPrices = new[] {10.0, 25.5, 40.1};
+            var finalInventories = new[] {0.0, 100.0, 250.0};
+            var terminalNpvs = new double[3];
+
+            storage.TerminalStorageNpvs(cmdtyPrices, finalInventories, terminalNpvs);
+
+            for (int i = 0; i < cmdtyPrices.Length; i++)
+            {
+                double expectedNpv = (cmdtyPrices[i] * 0.95 - 0.5) * finalInventories[i];
+                Assert.Equal(expectedNpv, terminalNpvs[i]);
+                Assert.Equal(expectedNpv, storage.TerminalStorageNpv(cmdtyPrices[i], finalInventories[i]));
+            }
+        }
+
+        [Fact]
+        public void TerminalStorageNpv_WithTerminalInventoryTargetPenalty_AsExpected()
+        {
+            CmdtyStorage<Day> storage = BuildCmdtyStorageWithTerminalValue(builder =>
+                                builder.WithTerminalInventoryTargetPenalty(500.0, 2.0, 0.5));
+
+            Assert.Equal(-200.0, storage.TerminalStorageNpv(45.0, 400.0));
+            Assert.Equal(0.0, storage.TerminalStorageNpv(45.0, 500.0));
+            Assert.Equal(-50.0, storage.TerminalStorageNpv(45.0, 600.0));
+        }
+
+        [Fact]
+        public void TerminalStorageNpvs_WithVectorizedTerminalInventoryNpv_CallsFunctionOnce()
+        {
+            int numCalls = 0;
+            double[] VectorizedNpv(double[] cmdtyPrices, double[] finalInventories)
+            {
+                numCalls++;
+                var npvs = new double[cmdtyPrices.Length];
+                for (int i = 0; i < npvs.Length; i++)
+                    npvs[i] = cmdtyPrices[i] * finalInventories[i] - 1.0;
+                return npvs;
+            }
+            CmdtyStorage<Day> storage = BuildCmdtyStorageWithTerminalValue(builder =>
+                                builder.WithVectorizedTerminalInventoryNpv(VectorizedNpv));
+            var terminalNpvs = new double[3];
+
+            storage.TerminalStorageNpvs(new[] {10.0, 20.0, 30.0}, new[] {1.0, 2.0, 3.0}, terminalNpvs);
+
+            Assert.Equal(new[] {9.0, 39.0, 89.0}, terminalNpvs);
+            Assert.Equal(1, numCalls);
+            Assert.Equal(89.0, storage.TerminalStorageNpv(30.0, 3.0));
+        }
+
+        private static CmdtyStorage<Day> BuildCmdtyStorageWithTerminalValue(
+                        Func<IAddTerminalStorageState<Day>, IBuildCmdtyStorage<Day>> addTerminalValue)
+        {
+            IAddTerminalStorageState<Day> addTerminalStorageState = CmdtyStorage<Day>.Builder
+                                .WithActiveTimePeriod(new Day(2019, 10, 1), new Day(2019, 11, 1))
+                                .WithConstantInjectWithdrawRange(-ConstantMaxWithdrawRate, ConstantMaxInjectRate)
+                                .WithConstantMinInventory(ConstantMinInventory)
+                                .WithConstantMaxInventory(ConstantMaxInventory)
+                                .WithPerUnitInjectionCost(ConstantInjectionCost, injectionDate => injectionDate)
+                                .WithNoCmdtyConsumedOnInject()
+                                .WithPerUnitWithdrawalCost(ConstantWithdrawalCost, withdrawalDate => withdrawalDate)
+                                .WithNoCmdtyConsumedOnWithdraw()
+                                .WithNoCmdtyInventoryLoss()
+                                .WithNoInventoryCost();
+            return addTerminalValue(addTerminalStorageState).Build();
+        }
+
+
 
 
     }
@@ -23,6 +23,7 @@
 // OTHER DEALINGS IN THE SOFTWARE.
 #endregion
 
+using System;
 using System.Linq;
 using Cmdty.TimePeriodValueTypes;
 using Cmdty.TimeSeries;
@@ -299,6 +300,66 @@ public void Calculate_CurrentPeriodEqualToStorageEndStorageInventoryHasTerminalV
         }
 
 
+        private static IntrinsicStorageValuationResults<Day> GenerateValuationResultsWithTerminalValue(
+                                    Func<IAddTerminalStorageState<Day>, IBuildCmdtyStorage<Day>> addTerminalValue)
+        {
+            var storageStart = new Day(2019, 9, 1);
+            var storageEnd = new Day(2019, 9, 30);
+
+            TimeSeries<Month, Day> settlementDates = new TimeSeries<Month, Day>.Builder
+                {
+                    {new Month(2019, 9),  new Day(2019, 10, 5)}
+                }.Build();
+
+            IAddTerminalStorageState<Day> builder = CmdtyStorage<Day>.Builder
+                .WithActiveTimePeriod(storageStart, storageEnd)
+                .WithConstantInjectWithdrawRange(-45.5, 56.6)
+                .WithConstantMinInventory(0.0)
+                .WithConstantMaxInventory(1000.0)
+                .WithPerUnitInjectionCost(0.8, injectionDate => injectionDate)
+                .WithNoCmdtyConsumedOnInject()
+                .WithPerUnitWithdrawalCost(1.2, withdrawalDate => withdrawalDate)
+                .WithNoCmdtyConsumedOnWithdraw()
+                .WithNoCmdtyInventoryLoss()
+                .WithNoInventoryCost();
+            CmdtyStorage<Day> storage = addTerminalValue(builder).Build();
+
+            return IntrinsicStorageValuation<Day>
+                .ForStorage(storage)
+                .WithStartingInventory(250.0)
+                .ForCurrentPeriod(storageStart)
+                .WithForwardCurve(GenerateBackwardatedCurve(storageStart, storageEnd))
+                .WithMonthlySettlement(settlementDates)
+                .WithDiscountFactorFunc((valuationDate, cashFlowDate) => 1.0) // No discounting
+                .WithFixedGridSpacing(10.0)
+                .WithLinearInventorySpaceInterpolation()
+                .WithNumericalTolerance(1E-10)
+                .Calculate();
+        }
+
+        [Fact]
+        public void Calculate_VectorizedTerminalValue_NpvEqualsScalarTerminalValueAndFewCallsToVectorizedFunction()
+        {
+            double TerminalNpv(double cmdtyPrice, double terminalInventory) 
+                => cmdtyPrice * 0.9 * terminalInventory - 0.001 * terminalInventory * terminalInventory;
+
+            int numCalls = 0;
+            double[] VectorizedTerminalNpv(double[] cmdtyPrices, double[] terminalInventories)
+            {
+                numCalls++;
+                return cmdtyPrices.Zip(terminalInventories, TerminalNpv).ToArray();
+            }
+
+            IntrinsicStorageValuationResults<Day> scalarResults = 
+                GenerateValuationResultsWithTerminalValue(builder => builder.WithTerminalInventoryNpv(TerminalNpv));
+            IntrinsicStorageValuationResults<Day> vectorizedResults =
+                GenerateValuationResultsWithTerminalValue(builder => builder.WithVectorizedTerminalInventoryNpv(VectorizedTerminalNpv));
+
+            Assert.Equal(scalarResults.Npv, vectorizedResults.Npv, 10);
+            // One call in each of the backward and forward passes, plus possibly one for the end period profile
+            Assert.InRange(numCalls, 2, 3);
+        }
+
         // TODO test cases:
         // Empty + spread more than inject + withdraw cost = value is spread minus costs, profile has inject withdraw
         // Inventory + curve backwardated: value is highest part of curve * volume - withdraw cost, profile is in highest part of curve
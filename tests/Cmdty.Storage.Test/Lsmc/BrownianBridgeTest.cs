@@ -0,0 +1,83 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using Xunit;
+
+namespace Cmdty.Storage.Test
+{
+    public sealed class BrownianBridgeTest
+    {
+        [Fact]
+        [Trait("Category", "Lsmc.QuasiRandom")]
+        public void Transform_UnevenlySpacedTimes_IsOrthogonalTransformation()
+        {
+            // Increments are iid standard normal if and only if the linear map from the input normals is orthogonal
+            var times = new[] {0.1, 0.15, 0.4, 0.45, 0.5, 0.9, 1.3};
+            int numSteps = times.Length;
+            var bridge = new BrownianBridge(times);
+            var transform = new double[numSteps, numSteps];
+            var unitVector = new double[numSteps];
+            var increments = new double[numSteps];
+            for (int j = 0; j < numSteps; j++)
+            {
+                Array.Clear(unitVector, 0, numSteps);
+                unitVector[j] = 1.0;
+                bridge.Transform(unitVector, increments);
+                for (int i = 0; i < numSteps; i++)
+                    transform[i, j] = increments[i];
+            }
+
+            for (int i = 0; i < numSteps; i++)
+            for (int k = 0; k < numSteps; k++)
+            {
+                double dotProduct = 0.0;
+                for (int j = 0; j < numSteps; j++)
+                    dotProduct += transform[i, j] * transform[k, j];
+                Assert.Equal(i == k ? 1.0 : 0.0, dotProduct, 12);
+            }
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.QuasiRandom")]
+        public void Transform_FirstNormalOnly_PathEndsAtScaledNormalWithLinearInterpolation()
+        {
+            var times = new[] {0.25, 0.5, 0.75, 1.0};
+            var bridge = new BrownianBridge(times);
+            var increments = new double[4];
+            bridge.Transform(new[] {2.0, 0.0, 0.0, 0.0}, increments);
+            // Path is 2.0 * t, so Brownian increments are 0.5, normalised by sqrt(0.25)
+            Assert.All(increments, increment => Assert.Equal(1.0, increment, 12));
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.QuasiRandom")]
+        public void Constructor_TimesNotIncreasing_ThrowsArgumentException()
+        {
+            Assert.Throws<ArgumentException>(() => new BrownianBridge(new[] {0.1, 0.3, 0.3}));
+        }
+
+    }
+}
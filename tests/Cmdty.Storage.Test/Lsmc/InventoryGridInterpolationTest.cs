@@ -0,0 +1,85 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System.Linq;
+using Xunit;
+
+namespace Cmdty.Storage.Test
+{
+    public sealed class InventoryGridInterpolationTest
+    {
+        private const double NumericalTolerance = 1E-10;
+
+        [Fact]
+        [Trait("Category", "Lsmc.InventoryGridInterpolation")]
+        public void Interpolate_InventoryBetweenGridPoints_ReturnsAdjacentIndicesAndLinearWeights()
+        {
+            double[] grid = { 0.0, 10.0, 25.0, 40.0 };
+            (int lowerIndex, int upperIndex, double lowerWeight, double upperWeight) = 
+                InventoryGridInterpolation.Interpolate(grid, 16.0, NumericalTolerance, double.NaN);
+            Assert.Equal(1, lowerIndex);
+            Assert.Equal(2, upperIndex);
+            Assert.Equal(0.6, lowerWeight, 12);
+            Assert.Equal(0.4, upperWeight, 12);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.InventoryGridInterpolation")]
+        public void Interpolate_InventoryOnGridPoint_ReturnsGridPointIndexWithLowerWeightOfOne()
+        {
+            double[] grid = { 0.0, 10.0, 25.0, 40.0 };
+            foreach (int gridIndex in Enumerable.Range(0, grid.Length))
+            {
+                (int lowerIndex, int upperIndex, double lowerWeight, double upperWeight) =
+                    InventoryGridInterpolation.Interpolate(grid, grid[gridIndex], NumericalTolerance, double.NaN);
+                Assert.Equal(gridIndex, lowerIndex);
+                Assert.Equal(gridIndex, upperIndex);
+                Assert.Equal(1.0, lowerWeight);
+                Assert.Equal(0.0, upperWeight);
+            }
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.InventoryGridInterpolation")]
+        public void Interpolate_FixedSpacingGrid_ResultsSameAsBisection()
+        {
+            const double spacing = 1.3;
+            double[] grid = new FixedSpacingStateSpaceGridCalc(spacing).GetGridPoints(2.7, 55.0).ToArray();
+            for (double inventory = 2.7; inventory <= 55.0; inventory += 0.1)
+            {
+                var fixedSpacingResult = InventoryGridInterpolation.Interpolate(grid, inventory, NumericalTolerance, spacing);
+                var bisectionResult = InventoryGridInterpolation.Interpolate(grid, inventory, NumericalTolerance, double.NaN);
+                Assert.Equal(bisectionResult, fixedSpacingResult);
+            }
+            foreach (double gridPoint in grid)
+            {
+                var fixedSpacingResult = InventoryGridInterpolation.Interpolate(grid, gridPoint, NumericalTolerance, spacing);
+                var bisectionResult = InventoryGridInterpolation.Interpolate(grid, gridPoint, NumericalTolerance, double.NaN);
+                Assert.Equal(bisectionResult, fixedSpacingResult);
+            }
+        }
+
+    }
+}
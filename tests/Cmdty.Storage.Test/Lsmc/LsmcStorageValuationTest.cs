@@ -971,6 +971,34 @@ public void Calculate_OnProgressCalledWithArgumentsInAscendingOrderBetweenZeroAn
             }
         }
 
+        [Fact]
+        [Trait("Category", "Lsmc.Ancillary")]
+        public void Calculate_Timings_PhasesPositiveAndNotGreaterThanTotal()
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            LsmcStorageValuationResults<Day> lsmcResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            LsmcValuationTimings timings = lsmcResults.Timings;
+
+            Assert.True(timings.RegressionPriceSimulation > TimeSpan.Zero);
+            Assert.True(timings.ValuationPriceSimulation > TimeSpan.Zero);
+            Assert.True(timings.BackwardInduction > TimeSpan.Zero);
+            Assert.True(timings.ForwardSimulation > TimeSpan.Zero);
+            Assert.True(timings.Other >= TimeSpan.Zero);
+            Assert.True(timings.PseudoInverse + timings.Regression <= timings.BackwardInduction);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Ancillary")]
+        public void Calculate_CurrentPeriodAfterStorageEnd_TimingsZero()
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.CurrentPeriod = _simpleDailyStorage.EndPeriod + 1;
+            LsmcStorageValuationResults<Day> lsmcResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            Assert.Equal(TimeSpan.Zero, lsmcResults.Timings.Total);
+        }
+
         [Fact]
         [Trait("Category", "Lsmc.Ancillary")]
         public void Calculate_CancelCalls_ThrowsOperationCanceledException()
@@ -1128,6 +1156,734 @@ private static void AssertTriggerPricePricePointsEqual(IReadOnlyList<TriggerPric
             }
         }
 
+        [Fact]
+        [Trait("Category", "Lsmc.Parallel")]
+        public void Calculate_MaxDegreeOfParallelismGreaterThanOneSimpleStorage_ResultsIdenticalToSingleThreaded()
+        {
+            RunAndAssertMaxDegreeOfParallelismDoesNotChangeValuationResults(_simpleDailyStorage, 4);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Parallel")]
+        public void Calculate_MaxDegreeOfParallelismGreaterThanOneStorageWithRatchets_ResultsIdenticalToSingleThreaded()
+        {
+            RunAndAssertMaxDegreeOfParallelismDoesNotChangeValuationResults(_dailyStorageWithRatchets, 3);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Parallel")]
+        public void Calculate_MaxDegreeOfParallelismGreaterThanOneSimulationDataReturnedAll_SimulationDataIdenticalToSingleThreaded()
+        {
+            const int numSims = 200;
+            LsmcStorageValuationResults<Day> singleThreadedResults = RunWithMaxDegreeOfParallelism(_simpleDailyStorage, 1, numSims, SimulationDataReturned.All);
+            LsmcStorageValuationResults<Day> multiThreadedResults = RunWithMaxDegreeOfParallelism(_simpleDailyStorage, 4, numSims, SimulationDataReturned.All);
+            AssertPanelsEqual(singleThreadedResults.InventoryBySim, multiThreadedResults.InventoryBySim);
+            AssertPanelsEqual(singleThreadedResults.InjectWithdrawVolumeBySim, multiThreadedResults.InjectWithdrawVolumeBySim);
+            AssertPanelsEqual(singleThreadedResults.CmdtyConsumedBySim, multiThreadedResults.CmdtyConsumedBySim);
+            AssertPanelsEqual(singleThreadedResults.InventoryLossBySim, multiThreadedResults.InventoryLossBySim);
+            AssertPanelsEqual(singleThreadedResults.NetVolumeBySim, multiThreadedResults.NetVolumeBySim);
+            AssertPanelsEqual(singleThreadedResults.PvByPeriodAndSim, multiThreadedResults.PvByPeriodAndSim);
+            Assert.Equal(singleThreadedResults.ValuationSimStandardError, multiThreadedResults.ValuationSimStandardError);
+        }
+
+        private static void AssertPanelsEqual<T>(Panel<T, double> panel1, Panel<T, double> panel2)
+            where T : ITimePeriod<T>
+        {
+            Assert.Equal(panel1.NumRows, panel2.NumRows);
+            Assert.Equal(panel1.NumCols, panel2.NumCols);
+            for (int i = 0; i < panel1.NumRows; i++)
+                Assert.Equal(panel1[i].ToArray(), panel2[i].ToArray());
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Parallel")]
+        public void Build_MaxDegreeOfParallelismZero_ThrowsInvalidOperationException()
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.MaxDegreeOfParallelism = 0;
+            Assert.Throws<InvalidOperationException>(() => paramsBuilder.Build());
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Parallel")]
+        public void Calculate_PseudoInverseLookAheadPositive_ResultsIdenticalToNoLookAhead()
+        {
+            const int numSims = 200;
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _dailyStorageWithRatchets;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            LsmcStorageValuationResults<Day> noLookAheadResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            paramsBuilder.PseudoInverseLookAhead = 4;
+            LsmcStorageValuationResults<Day> lookAheadResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            AssertLsmcStorageValuationResultsEqual(noLookAheadResults, lookAheadResults);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Parallel")]
+        public void Build_PseudoInverseLookAheadNegative_ThrowsInvalidOperationException()
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.PseudoInverseLookAhead = -1;
+            Assert.Throws<InvalidOperationException>(() => paramsBuilder.Build());
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ValuationBatches")]
+        public void Calculate_ValuationSimBatchSizeNotLessThanNumSims_ResultsIdenticalToNoBatching()
+        {
+            const int numSims = 200;
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _dailyStorageWithRatchets;
+            paramsBuilder.SimulationDataReturned = SimulationDataReturned.All;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            LsmcStorageValuationResults<Day> noBatchingResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            paramsBuilder.ValuationSimBatchSize = numSims;
+            LsmcStorageValuationResults<Day> batchedResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            AssertLsmcStorageValuationResultsEqual(noBatchingResults, batchedResults);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ValuationBatches")]
+        public void Calculate_ValuationSimBatchSizeLessThanNumSims_NpvWithinStandardErrorsOfNoBatching()
+        {
+            const int numSims = 1_000;
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _dailyStorageWithRatchets;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            LsmcStorageValuationResults<Day> noBatchingResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            paramsBuilder.ValuationSimBatchSize = 300; // Final batch smaller than the others
+            paramsBuilder.SimulationDataReturned = SimulationDataReturned.All;
+            LsmcStorageValuationResults<Day> batchedResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            double maxDifference = 4.0 * (noBatchingResults.ValuationSimStandardError + batchedResults.ValuationSimStandardError);
+            Assert.InRange(batchedResults.Npv, noBatchingResults.Npv - maxDifference, noBatchingResults.Npv + maxDifference);
+            Assert.Equal(numSims, batchedResults.PvBySim.Count);
+            Assert.Equal(numSims, batchedResults.ValuationSpotPriceSim.NumCols);
+            Assert.Equal(numSims, batchedResults.InventoryBySim.NumCols);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ValuationBatches")]
+        public void Build_ValuationSimBatchSizeSetWithSpotSimResults_ThrowsInvalidOperationException()
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            LsmcStorageValuationResults<Day> simResults = RunWithSimulationDataReturns(SimulationDataReturned.SpotPricesForRegression | 
+                                                        SimulationDataReturned.FactorsForRegression, 10);
+            paramsBuilder.UseSpotSimResults(new SpotSimResultsFromPanels<Day>(simResults.RegressionSpotPriceSim, simResults.RegressionMarkovFactors),
+                new SpotSimResultsFromPanels<Day>(simResults.RegressionSpotPriceSim, simResults.RegressionMarkovFactors));
+            paramsBuilder.ValuationSimBatchSize = 5;
+            Assert.Throws<InvalidOperationException>(() => paramsBuilder.Build());
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ValuationBatches")]
+        public void Build_ValuationSimBatchSizeZero_ThrowsInvalidOperationException()
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.ValuationSimBatchSize = 0;
+            Assert.Throws<InvalidOperationException>(() => paramsBuilder.Build());
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ValuationBatches")]
+        public void Build_TargetValuationSimStandardErrorSetWithoutValuationSimBatchSize_ThrowsInvalidOperationException()
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.TargetValuationSimStandardError = 1_000.0;
+            Assert.Throws<InvalidOperationException>(() => paramsBuilder.Build());
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ValuationBatches")]
+        public void Calculate_TargetValuationSimStandardErrorReached_StopsAfterBatchWithStandardErrorNotGreaterThanTarget()
+        {
+            const int numSims = 2_000;
+            const int batchSize = 200;
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulationDataReturned = SimulationDataReturned.All;
+            paramsBuilder.ValuationSimBatchSize = batchSize;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            LsmcStorageValuationResults<Day> allSimsResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            // Standard error is approximately proportional to one over the square root of the number of simulations, so a quarter of the simulations should suffice
+            double targetStandardError = 2.0 * allSimsResults.ValuationSimStandardError;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            paramsBuilder.TargetValuationSimStandardError = targetStandardError;
+            LsmcStorageValuationResults<Day> targetResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            Assert.True(targetResults.NumValuationSims < numSims);
+            Assert.Equal(0, targetResults.NumValuationSims % batchSize);
+            Assert.True(targetResults.ValuationSimStandardError <= targetStandardError);
+            Assert.Equal(targetResults.NumValuationSims / batchSize, targetResults.ValuationSimConvergence.Count);
+            Assert.All(targetResults.ValuationSimConvergence.Take(targetResults.ValuationSimConvergence.Count - 1),
+                point => Assert.True(point.StandardError > targetStandardError));
+            ValuationSimConvergencePoint lastPoint = targetResults.ValuationSimConvergence.Last();
+            Assert.Equal(targetResults.NumValuationSims, lastPoint.NumSims);
+            Assert.Equal(targetResults.Npv, lastPoint.Npv);
+            Assert.Equal(targetResults.NumValuationSims, targetResults.InventoryBySim.NumCols);
+            Assert.Equal(targetResults.NumValuationSims, targetResults.ValuationSpotPriceSim.NumCols);
+            Assert.Equal(numSims, targetResults.RegressionSpotPriceSim.NumCols);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ValuationBatches")]
+        public void Calculate_TargetValuationSimStandardErrorNotReached_ResultsIdenticalToNoTarget()
+        {
+            const int numSims = 600;
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulationDataReturned = SimulationDataReturned.All;
+            paramsBuilder.ValuationSimBatchSize = 200;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            LsmcStorageValuationResults<Day> noTargetResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            paramsBuilder.TargetValuationSimStandardError = 1E-10;
+            LsmcStorageValuationResults<Day> targetResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            AssertLsmcStorageValuationResultsEqual(noTargetResults, targetResults);
+            Assert.Equal(numSims, targetResults.NumValuationSims);
+            Assert.Equal(3, targetResults.ValuationSimConvergence.Count);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ValuationBatches")]
+        public void Calculate_StorageWithTerminalValueBatched_PvBySimEqualsSumOfPvByPeriodAndMeanEqualsNpv()
+        {
+            const int numSims = 600;
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorageTerminalInventoryValue;
+            paramsBuilder.SimulationDataReturned = SimulationDataReturned.All;
+            paramsBuilder.ValuationSimBatchSize = 200;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            LsmcStorageValuationResults<Day> lsmcResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            Panel<Day, double> pvByPeriodAndSim = lsmcResults.PvByPeriodAndSim;
+            for (int simIndex = 0; simIndex < numSims; simIndex++)
+            {
+                double sumPvByPeriod = 0.0;
+                for (int periodIndex = 0; periodIndex < pvByPeriodAndSim.NumRows; periodIndex++)
+                    sumPvByPeriod += pvByPeriodAndSim[periodIndex][simIndex];
+                Assert.Equal(sumPvByPeriod, lsmcResults.PvBySim[simIndex], 6);
+            }
+
+            double meanPv = lsmcResults.PvBySim.Average();
+            Assert.Equal(meanPv, lsmcResults.Npv, 6);
+            // Antithetic sims, so standard error calculated from the independent pair averages
+            const int numPairs = numSims / 2;
+            double[] pairAveragePvs = Enumerable.Range(0, numPairs)
+                .Select(pairIndex => (lsmcResults.PvBySim[2 * pairIndex] + lsmcResults.PvBySim[2 * pairIndex + 1]) / 2.0).ToArray();
+            double expectedStandardError = Math.Sqrt(pairAveragePvs.Sum(pv => (pv - meanPv) * (pv - meanPv)) / (numPairs - 1)) 
+                                           / Math.Sqrt(numPairs);
+            Assert.Equal(expectedStandardError, lsmcResults.ValuationSimStandardError, 6);
+            double meanTerminalPv = pvByPeriodAndSim[pvByPeriodAndSim.NumRows - 1].ToArray().Average();
+            Assert.Equal(meanTerminalPv, lsmcResults.ExpectedStorageProfile[lsmcResults.ExpectedStorageProfile.End].PeriodPv, 6);
+        }
+
+        private Dictionary<Day, double> OneFactorFlatSpotVolsDictionary() => 
+            _oneFactorFlatSpotVols.Indices.ToDictionary(day => day, day => _oneFactorFlatSpotVols[day]);
+
+        [Fact]
+        [Trait("Category", "Lsmc.Streamed")]
+        public void Calculate_MultiFactorModelStreamedWithPseudoInverseLookAhead_NpvWithinStandardErrorsOfMersenneTwister()
+        {
+            const int numSims = 1_000;
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            LsmcStorageValuationResults<Day> mersenneTwisterResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            paramsBuilder.SimulateWithMultiFactorModelStreamed(new[] {16.5}, new[] {OneFactorFlatSpotVolsDictionary()}, new[,] {{1.0}}, 
+                numSims, RandomSeed);
+            paramsBuilder.PseudoInverseLookAhead = 3;
+            paramsBuilder.MaxDegreeOfParallelism = 2;
+            LsmcStorageValuationResults<Day> streamedResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            double maxDifference = 4.0 * (mersenneTwisterResults.ValuationSimStandardError + streamedResults.ValuationSimStandardError);
+            Assert.InRange(streamedResults.Npv, mersenneTwisterResults.Npv - maxDifference, mersenneTwisterResults.Npv + maxDifference);
+            Assert.Equal(numSims, streamedResults.PvBySim.Count);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Streamed")]
+        public void Calculate_MultiFactorModelStreamedWithValuationSimBatchSize_NpvWithinStandardErrorsOfMersenneTwister()
+        {
+            const int numSims = 1_000;
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            LsmcStorageValuationResults<Day> mersenneTwisterResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            paramsBuilder.SimulateWithMultiFactorModelStreamed(new[] {16.5}, new[] {OneFactorFlatSpotVolsDictionary()}, new[,] {{1.0}}, 
+                numSims, RandomSeed);
+            paramsBuilder.ValuationSimBatchSize = 300;
+            paramsBuilder.SimulationDataReturned = SimulationDataReturned.Inventory | SimulationDataReturned.Pv;
+            LsmcStorageValuationResults<Day> streamedResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            double maxDifference = 4.0 * (mersenneTwisterResults.ValuationSimStandardError + streamedResults.ValuationSimStandardError);
+            Assert.InRange(streamedResults.Npv, mersenneTwisterResults.Npv - maxDifference, mersenneTwisterResults.Npv + maxDifference);
+            Assert.Equal(numSims, streamedResults.InventoryBySim.NumCols);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Streamed")]
+        public void Calculate_MultiFactorModelStreamedWithSimulatedSpotPricesReturned_ThrowsArgumentException()
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulateWithMultiFactorModelStreamed(new[] {16.5}, new[] {OneFactorFlatSpotVolsDictionary()}, new[,] {{1.0}}, 
+                100, RandomSeed);
+            paramsBuilder.SimulationDataReturned = SimulationDataReturned.SpotPricesForRegression;
+            Assert.Throws<ArgumentException>(() => LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build()));
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Streamed")]
+        public void CalculateInventoryValueCurve_MultiFactorModelStreamed_ThrowsArgumentException()
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulateWithMultiFactorModelStreamed(new[] {16.5}, new[] {OneFactorFlatSpotVolsDictionary()}, new[,] {{1.0}}, 
+                100, RandomSeed);
+            Assert.Throws<ArgumentException>(() => LsmcStorageValuation.WithNoLogger
+                .CalculateInventoryValueCurve(paramsBuilder, new[] { 0.0, Inventory }));
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.VarianceReduction")]
+        public void Calculate_IntrinsicControlVariate_NpvWithinStandardErrorsAndLowerStandardError()
+        {
+            const int numSims = 1_000;
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            LsmcStorageValuationResults<Day> noControlVariateResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            paramsBuilder.IntrinsicControlVariate = true;
+            LsmcStorageValuationResults<Day> controlVariateResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            _testOutputHelper.WriteLine($"No control variate: {noControlVariateResults.Npv}, standard error {noControlVariateResults.ValuationSimStandardError}");
+            _testOutputHelper.WriteLine($"Control variate: {controlVariateResults.Npv}, standard error {controlVariateResults.ValuationSimStandardError}");
+            Assert.True(controlVariateResults.ValuationSimStandardError < noControlVariateResults.ValuationSimStandardError);
+            double maxDifference = 3.0 * noControlVariateResults.ValuationSimStandardError;
+            Assert.InRange(controlVariateResults.Npv, noControlVariateResults.Npv - maxDifference, noControlVariateResults.Npv + maxDifference);
+            AssertPanelsEqual(noControlVariateResults.InventoryBySim, controlVariateResults.InventoryBySim);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.VarianceReduction")]
+        public void Calculate_AntitheticFalse_NpvWithinStandardErrorsOfAntithetic()
+        {
+            const int numSims = 1_000;
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, 
+                RandomSeed, RandomSeed * 2);
+            LsmcStorageValuationResults<Day> antitheticResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, 
+                RandomSeed, RandomSeed * 2, false);
+            LsmcStorageValuationResults<Day> notAntitheticResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            Assert.NotEqual(antitheticResults.Npv, notAntitheticResults.Npv);
+            double maxDifference = 4.0 * (antitheticResults.ValuationSimStandardError + notAntitheticResults.ValuationSimStandardError);
+            Assert.InRange(notAntitheticResults.Npv, antitheticResults.Npv - maxDifference, antitheticResults.Npv + maxDifference);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.VarianceReduction")]
+        public void Calculate_AntitheticFalse_StandardErrorCalculatedFromIndependentSims()
+        {
+            const int numSims = 600;
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulationDataReturned = SimulationDataReturned.Pv;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, 
+                RandomSeed, RandomSeed * 2, false);
+            LsmcStorageValuationResults<Day> lsmcResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            double meanPv = lsmcResults.PvBySim.Average();
+            double expectedStandardError = Math.Sqrt(lsmcResults.PvBySim.Sum(pv => (pv - meanPv) * (pv - meanPv)) / (numSims - 1)) 
+                                           / Math.Sqrt(numSims);
+            Assert.Equal(expectedStandardError, lsmcResults.ValuationSimStandardError, 6);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.VarianceReduction")]
+        public void Calculate_AntitheticWithIntrinsicControlVariate_StandardErrorCalculatedFromPairAverages()
+        {
+            const int numSims = 1_000;
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulationDataReturned = SimulationDataReturned.Pv;
+            paramsBuilder.IntrinsicControlVariate = true;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, 
+                RandomSeed, RandomSeed * 2);
+            Assert.True(paramsBuilder.AntitheticValuationSims);
+            LsmcStorageValuationResults<Day> antitheticResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, 
+                RandomSeed, RandomSeed * 2);
+            paramsBuilder.AntitheticValuationSims = false;
+            LsmcStorageValuationResults<Day> treatedAsIndependentResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            // Same sims and policy, so only the control variate coefficient and standard error calculation differ
+            Assert.Equal(antitheticResults.PvBySim, treatedAsIndependentResults.PvBySim);
+            Assert.NotEqual(antitheticResults.ValuationSimStandardError, treatedAsIndependentResults.ValuationSimStandardError);
+            double maxDifference = 3.0 * antitheticResults.ValuationSimStandardError;
+            Assert.InRange(treatedAsIndependentResults.Npv, antitheticResults.Npv - maxDifference, antitheticResults.Npv + maxDifference);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ExercisePolicy")]
+        public void Calculate_ExercisePolicyWithSameValuationSims_ResultsIdenticalToValuationWhichCalculatedPolicy()
+        {
+            const int numSims = 500;
+            var multiFactorParams = MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols);
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _dailyStorageWithRatchets;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed, RandomSeed * 2);
+            LsmcStorageValuationResults<Day> policyResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            // Valuation sims generated by the regression sim random number generator, as no regression sims are generated
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed * 2);
+            paramsBuilder.RegressionSpotSimsGenerator = null;
+            paramsBuilder.ExercisePolicy = policyResults.ExercisePolicy;
+            LsmcStorageValuationResults<Day> withPolicyResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            AssertLsmcStorageValuationResultsEqual(policyResults, withPolicyResults);
+            Assert.Same(policyResults.ExercisePolicy, withPolicyResults.ExercisePolicy);
+            Assert.Equal(TimeSpan.Zero, withPolicyResults.Timings.RegressionPriceSimulation);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ExercisePolicy")]
+        public void Calculate_StorageWithTerminalValueExercisePolicyWithSameValuationSims_ResultsIdenticalToValuationWhichCalculatedPolicy()
+        {
+            const int numSims = 500;
+            var multiFactorParams = MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols);
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorageTerminalInventoryValue;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed, RandomSeed * 2);
+            LsmcStorageValuationResults<Day> policyResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            // Forward simulation terminal values use the valuation sim end period spot prices in both valuations
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed * 2);
+            paramsBuilder.RegressionSpotSimsGenerator = null;
+            paramsBuilder.ExercisePolicy = policyResults.ExercisePolicy;
+            LsmcStorageValuationResults<Day> withPolicyResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            AssertLsmcStorageValuationResultsEqual(policyResults, withPolicyResults);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ExercisePolicy")]
+        public void Calculate_ExercisePolicyWithShiftedForwardCurve_NpvWithinStandardErrorsOfFullValuation()
+        {
+            const int numSims = 1_000;
+            var multiFactorParams = MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols);
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed, RandomSeed * 2);
+            LsmcExercisePolicy<Day> exercisePolicy = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build()).ExercisePolicy;
+
+            TimeSeries<Day, double> forwardCurve = paramsBuilder.ForwardCurve;
+            paramsBuilder.ForwardCurve = TimeSeriesFactory.FromMap(forwardCurve.Start, forwardCurve.End, day => forwardCurve[day] + 0.5);
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed, RandomSeed * 2);
+            LsmcStorageValuationResults<Day> fullResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed * 3);
+            paramsBuilder.ExercisePolicy = exercisePolicy;
+            LsmcStorageValuationResults<Day> withPolicyResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            double maxDifference = 4.0 * (fullResults.ValuationSimStandardError + withPolicyResults.ValuationSimStandardError);
+            Assert.InRange(withPolicyResults.Npv, fullResults.Npv - maxDifference, fullResults.Npv + maxDifference);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ExercisePolicy")]
+        public void Build_ExercisePolicyForDifferentInventory_ThrowsInvalidOperationException()
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), 
+                10, RandomSeed);
+            paramsBuilder.ExercisePolicy = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build()).ExercisePolicy;
+            paramsBuilder.Inventory = Inventory + 1.0;
+            Assert.Throws<InvalidOperationException>(() => paramsBuilder.Build());
+        }
+
+        [Theory]
+        [InlineData(1)]
+        [InlineData(3)]
+        [Trait("Category", "Lsmc.ForwardCurveScenarios")]
+        public void CalculateForwardCurveScenarios_ScenarioCurves_ResultsEqualValuationWithEachCurveAndSameRandomSeeds(int maxDegreeOfParallelism)
+        {
+            const int numSims = 500;
+            var multiFactorParams = MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols);
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed, RandomSeed * 2);
+            TimeSeries<Day, double> forwardCurve = paramsBuilder.ForwardCurve;
+            TimeSeries<Day, double>[] scenarioForwardCurves =
+            {
+                TimeSeriesFactory.FromMap(forwardCurve.Start, forwardCurve.End, day => forwardCurve[day] + 2.5),
+                forwardCurve,
+                TimeSeriesFactory.FromMap(forwardCurve.Start, forwardCurve.End, day => forwardCurve[day] * 0.9),
+            };
+
+            IReadOnlyList<LsmcStorageValuationResults<Day>> scenarioResults = LsmcStorageValuation.WithNoLogger
+                .CalculateForwardCurveScenarios(paramsBuilder, scenarioForwardCurves, maxDegreeOfParallelism);
+
+            Assert.Equal(scenarioForwardCurves.Length, scenarioResults.Count);
+            for (int scenarioIndex = 0; scenarioIndex < scenarioForwardCurves.Length; scenarioIndex++)
+            {
+                var scenarioParamsBuilder = paramsBuilder.Clone();
+                scenarioParamsBuilder.ForwardCurve = scenarioForwardCurves[scenarioIndex];
+                scenarioParamsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed, RandomSeed * 2);
+                LsmcStorageValuationResults<Day> expectedResults = LsmcStorageValuation.WithNoLogger.Calculate(scenarioParamsBuilder.Build());
+                LsmcStorageValuationResults<Day> results = scenarioResults[scenarioIndex];
+                Assert.Equal(expectedResults.Npv, results.Npv, 6);
+                Assert.Equal(expectedResults.ValuationSimStandardError, results.ValuationSimStandardError, 6);
+                foreach (Day day in expectedResults.Deltas.Indices)
+                    Assert.Equal(expectedResults.Deltas[day], results.Deltas[day], 6);
+            }
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ForwardCurveScenarios")]
+        public void CalculateForwardCurveScenarios_SimulatedSpotPricesReturned_EqualBaseScenarioSpotPricesRescaledByForwardPriceRatio()
+        {
+            const int numSims = 100;
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulationDataReturned = SimulationDataReturned.SpotPricesForRegression | SimulationDataReturned.SpotPricesForValuation;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), 
+                numSims, RandomSeed, RandomSeed * 2);
+            TimeSeries<Day, double> forwardCurve = paramsBuilder.ForwardCurve;
+            TimeSeries<Day, double> scaledForwardCurve = TimeSeriesFactory.FromMap(forwardCurve.Start, forwardCurve.End, day => forwardCurve[day] * 1.1);
+
+            IReadOnlyList<LsmcStorageValuationResults<Day>> scenarioResults = LsmcStorageValuation.WithNoLogger
+                .CalculateForwardCurveScenarios(paramsBuilder, new[] { forwardCurve, scaledForwardCurve });
+
+            void AssertRescaled(Panel<Day, double> baseSpotPrices, Panel<Day, double> scaledSpotPrices)
+            {
+                Assert.Equal(baseSpotPrices.RowKeys, scaledSpotPrices.RowKeys);
+                for (int rowIndex = 0; rowIndex < baseSpotPrices.NumRows; rowIndex++)
+                for (int simIndex = 0; simIndex < numSims; simIndex++)
+                    Assert.Equal(baseSpotPrices[rowIndex][simIndex] * 1.1, scaledSpotPrices[rowIndex][simIndex], 10);
+            }
+            AssertRescaled(scenarioResults[0].RegressionSpotPriceSim, scenarioResults[1].RegressionSpotPriceSim);
+            AssertRescaled(scenarioResults[0].ValuationSpotPriceSim, scenarioResults[1].ValuationSpotPriceSim);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ForwardCurveScenarios")]
+        public void CalculateForwardCurveScenarios_ProgressUpdate_ReportsFractionOfScenariosValued()
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), 
+                10, RandomSeed);
+            var progresses = new List<double>();
+            paramsBuilder.OnProgressUpdate = progress => progresses.Add(progress);
+            TimeSeries<Day, double> forwardCurve = paramsBuilder.ForwardCurve;
+
+            LsmcStorageValuation.WithNoLogger.CalculateForwardCurveScenarios(paramsBuilder, 
+                new[] {forwardCurve, forwardCurve, forwardCurve, forwardCurve});
+
+            Assert.Equal(new[] {0.25, 0.5, 0.75, 1.0}, progresses);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.ForwardCurveScenarios")]
+        public void CalculateForwardCurveScenarios_ParamsBuilderWithExercisePolicy_ThrowsArgumentException()
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols),
+                10, RandomSeed);
+            paramsBuilder.ExercisePolicy = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build()).ExercisePolicy;
+            Assert.Throws<ArgumentException>(() => LsmcStorageValuation.WithNoLogger.CalculateForwardCurveScenarios(paramsBuilder, 
+                new[] {paramsBuilder.ForwardCurve}));
+        }
+
+        [Theory]
+        [InlineData(1)]
+        [InlineData(2)]
+        [Trait("Category", "Lsmc.Portfolio")]
+        public void CalculatePortfolio_FacilitiesWithSameActivePeriod_ResultsEqualValuationOfEachFacilityWithSameRandomSeeds(int maxDegreeOfParallelism)
+        {
+            const int numSims = 500;
+            var multiFactorParams = MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols);
+            CmdtyStorage<Day>[] storages = { _simpleDailyStorage, _dailyStorageWithRatchets, _simpleDailyStorage };
+            LsmcValuationParameters<Day>.Builder[] facilityParamsBuilders = storages.Select(storage =>
+            {
+                var paramsBuilder = _1FactorParamsBuilder.Clone();
+                paramsBuilder.Storage = storage;
+                paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed, RandomSeed * 2);
+                return paramsBuilder;
+            }).ToArray();
+            facilityParamsBuilders[2].Inventory = Inventory * 0.5;
+
+            IReadOnlyList<LsmcStorageValuationResults<Day>> portfolioResults = LsmcStorageValuation.WithNoLogger
+                .CalculatePortfolio(facilityParamsBuilders, maxDegreeOfParallelism);
+
+            Assert.Equal(storages.Length, portfolioResults.Count);
+            for (int facilityIndex = 0; facilityIndex < storages.Length; facilityIndex++)
+            {
+                var expectedParamsBuilder = facilityParamsBuilders[facilityIndex].Clone();
+                expectedParamsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed, RandomSeed * 2);
+                LsmcStorageValuationResults<Day> expectedResults = LsmcStorageValuation.WithNoLogger.Calculate(expectedParamsBuilder.Build());
+                LsmcStorageValuationResults<Day> results = portfolioResults[facilityIndex];
+                Assert.Equal(expectedResults.Npv, results.Npv);
+                Assert.Equal(expectedResults.ValuationSimStandardError, results.ValuationSimStandardError);
+                Assert.Equal(expectedResults.Deltas.Data, results.Deltas.Data);
+            }
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Portfolio")]
+        public void CalculatePortfolio_FacilitiesWithDifferentCurrentPeriods_ThrowsArgumentException()
+        {
+            var paramsBuilder1 = _1FactorParamsBuilder.Clone();
+            paramsBuilder1.Storage = _simpleDailyStorage;
+            var paramsBuilder2 = paramsBuilder1.Clone();
+            paramsBuilder2.CurrentPeriod = paramsBuilder1.CurrentPeriod + 1;
+            Assert.Throws<ArgumentException>(() => LsmcStorageValuation.WithNoLogger.CalculatePortfolio(
+                new[] { paramsBuilder1, paramsBuilder2 }));
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.InventoryValueCurve")]
+        public void CalculateInventoryValueCurve_SingleStartingInventory_ResultsEqualValuationWithSameRandomSeeds()
+        {
+            const int numSims = 500;
+            var multiFactorParams = MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols);
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed, RandomSeed * 2);
+            IReadOnlyList<LsmcStorageValuationResults<Day>> curveResults = LsmcStorageValuation.WithNoLogger
+                .CalculateInventoryValueCurve(paramsBuilder, new[] { Inventory });
+
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed, RandomSeed * 2);
+            LsmcStorageValuationResults<Day> expectedResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            Assert.Equal(1, curveResults.Count);
+            Assert.Equal(expectedResults.Npv, curveResults[0].Npv);
+            Assert.Equal(expectedResults.Deltas.Data, curveResults[0].Deltas.Data);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.InventoryValueCurve")]
+        public void CalculateInventoryValueCurve_MultipleStartingInventories_NpvsWithinStandardErrorsOfValuationAtEachInventory()
+        {
+            const int numSims = 1_000;
+            var multiFactorParams = MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols);
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed, RandomSeed * 2);
+            double[] startingInventories = { 0.0, Inventory, Inventory * 2.0, Inventory * 4.0 };
+            IReadOnlyList<LsmcStorageValuationResults<Day>> curveResults = LsmcStorageValuation.WithNoLogger
+                .CalculateInventoryValueCurve(paramsBuilder, startingInventories);
+
+            Assert.Equal(startingInventories.Length, curveResults.Count);
+            for (int inventoryIndex = 0; inventoryIndex < startingInventories.Length; inventoryIndex++)
+            {
+                var inventoryParamsBuilder = paramsBuilder.Clone();
+                inventoryParamsBuilder.Inventory = startingInventories[inventoryIndex];
+                inventoryParamsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed, RandomSeed * 2);
+                LsmcStorageValuationResults<Day> expectedResults = LsmcStorageValuation.WithNoLogger.Calculate(inventoryParamsBuilder.Build());
+                LsmcStorageValuationResults<Day> results = curveResults[inventoryIndex];
+                double maxDifference = 4.0 * (expectedResults.ValuationSimStandardError + results.ValuationSimStandardError);
+                Assert.InRange(results.Npv, expectedResults.Npv - maxDifference, expectedResults.Npv + maxDifference);
+            }
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.InventoryValueCurve")]
+        public void CalculateInventoryValueCurve_StorageWithTerminalValue_FirstInventoryResultsEqualValuationWithCurveExercisePolicy()
+        {
+            const int numSims = 500;
+            var multiFactorParams = MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols);
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorageTerminalInventoryValue;
+            paramsBuilder.SimulationDataReturned = SimulationDataReturned.All;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed, RandomSeed * 2);
+            IReadOnlyList<LsmcStorageValuationResults<Day>> curveResults = LsmcStorageValuation.WithNoLogger
+                .CalculateInventoryValueCurve(paramsBuilder, new[] { Inventory, Inventory * 2.0 });
+
+            // All starting inventories are valued by the forward simulation with the curve exercise policy, so the first equals a
+            // valuation with the policy of the same valuation sims, generated by the regression sim random number generator
+            paramsBuilder.Inventory = Inventory;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(multiFactorParams, numSims, RandomSeed * 2);
+            paramsBuilder.RegressionSpotSimsGenerator = null;
+            paramsBuilder.ExercisePolicy = curveResults[0].ExercisePolicy;
+            LsmcStorageValuationResults<Day> withPolicyResults = LsmcStorageValuation.WithNoLogger.Calculate(paramsBuilder.Build());
+
+            AssertLsmcStorageValuationResultsEqual(withPolicyResults, curveResults[0]);
+            Assert.Same(curveResults[0].ExercisePolicy, curveResults[1].ExercisePolicy);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.InventoryValueCurve")]
+        public void CalculateInventoryValueCurve_EmptyStartingInventories_ThrowsArgumentException()
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = _simpleDailyStorage;
+            Assert.Throws<ArgumentException>(() => LsmcStorageValuation.WithNoLogger.CalculateInventoryValueCurve(paramsBuilder, 
+                new double[0]));
+        }
+
+        [Theory]
+        [InlineData(double.NaN)]
+        [InlineData(5.0)]
+        [Trait("Category", "Lsmc.RegressionOnDemand")]
+        public void ReachableGridIndices_DecisionsReachPartOfNextPeriodGrid_ReturnsIndicesBracketingReachableInventories(double gridSpacing)
+        {
+            double[] inventorySpaceGrid = { 10.0, 20.0 };
+            double[][] decisionSets = { new[] { -2.0, 0.0, 4.0 }, new[] { -2.0, 0.0, 3.0 } };
+            double[] nextPeriodInventorySpaceGrid = { 0.0, 5.0, 10.0, 15.0, 20.0, 25.0, 30.0, 35.0, 40.0 };
+
+            (int lowerIndex, int upperIndex) = LsmcStorageValuation.ReachableGridIndices(inventorySpaceGrid, decisionSets, 
+                nextPeriodInventorySpaceGrid, 0.0, gridSpacing);
+
+            Assert.Equal(1, lowerIndex); // Inventory of 8.0 bracketed by 5.0 and 10.0
+            Assert.Equal(5, upperIndex); // Inventory of 23.0 bracketed by 20.0 and 25.0
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.RegressionOnDemand")]
+        public void ReachableGridIndices_ReachableInventoriesOnGridPoints_ReturnsIndicesOfGridPoints()
+        {
+            double[] inventorySpaceGrid = { 10.0, 20.0 };
+            double[][] decisionSets = { new[] { -5.0, 0.0 }, new[] { 0.0, 5.0 } };
+            double[] nextPeriodInventorySpaceGrid = { 0.0, 5.0, 10.0, 15.0, 20.0, 25.0, 30.0 };
+
+            (int lowerIndex, int upperIndex) = LsmcStorageValuation.ReachableGridIndices(inventorySpaceGrid, decisionSets,
+                nextPeriodInventorySpaceGrid, 0.0, double.NaN);
+
+            Assert.Equal(1, lowerIndex);
+            Assert.Equal(5, upperIndex);
+        }
+
+        private void RunAndAssertMaxDegreeOfParallelismDoesNotChangeValuationResults(CmdtyStorage<Day> storage, int maxDegreeOfParallelism)
+        {
+            const int numSims = 200;
+            LsmcStorageValuationResults<Day> singleThreadedResults = RunWithMaxDegreeOfParallelism(storage, 1, numSims);
+            LsmcStorageValuationResults<Day> multiThreadedResults = RunWithMaxDegreeOfParallelism(storage, maxDegreeOfParallelism, numSims);
+            AssertLsmcStorageValuationResultsEqual(singleThreadedResults, multiThreadedResults);
+        }
+
+        private LsmcStorageValuationResults<Day> RunWithMaxDegreeOfParallelism(CmdtyStorage<Day> storage, int maxDegreeOfParallelism, int numSims,
+                                    SimulationDataReturned simulationDataReturned = SimulationDataReturned.None)
+        {
+            var paramsBuilder = _1FactorParamsBuilder.Clone();
+            paramsBuilder.Storage = storage;
+            paramsBuilder.SimulateWithMultiFactorModelAndMersenneTwister(MultiFactorParameters.For1Factor(16.5, _oneFactorFlatSpotVols), numSims, RandomSeed);
+            paramsBuilder.MaxDegreeOfParallelism = maxDegreeOfParallelism;
+            paramsBuilder.SimulationDataReturned = simulationDataReturned;
+            LsmcValuationParameters<Day> lsmcParams = paramsBuilder.Build();
+            return LsmcStorageValuation.WithNoLogger.Calculate(lsmcParams);
+        }
+
         [Fact]
         [Trait("Category", "Lsmc.SimDataReturned")]
         public void Calculate_SimulationDataReturnedAll_AllSimDataRightSize()
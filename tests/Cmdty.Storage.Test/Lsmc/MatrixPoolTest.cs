@@ -0,0 +1,70 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using MathNet.Numerics.LinearAlgebra;
+using Xunit;
+
+namespace Cmdty.Storage.Test
+{
+    public sealed class MatrixPoolTest
+    {
+        [Fact]
+        [Trait("Category", "Lsmc.MatrixPool")]
+        public void Rent_EmptyPool_ReturnsMatrixWithSpecifiedDimensions()
+        {
+            var matrixPool = new MatrixPool();
+            Matrix<double> matrix = matrixPool.Rent(5, 3);
+            Assert.Equal(5, matrix.RowCount);
+            Assert.Equal(3, matrix.ColumnCount);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.MatrixPool")]
+        public void Rent_MatrixOfSameDimensionsReturned_ReusesMatrixWithoutAllocation()
+        {
+            var matrixPool = new MatrixPool();
+            Matrix<double> matrix1 = matrixPool.Rent(5, 3);
+            matrixPool.Return(matrix1);
+            Matrix<double> matrix2 = matrixPool.Rent(5, 3);
+            Assert.Same(matrix1, matrix2);
+            Assert.Equal(1, matrixPool.NumAllocations);
+            Assert.Equal(2, matrixPool.NumRentals);
+            Assert.Equal(15, matrixPool.NumElementsAllocated);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.MatrixPool")]
+        public void Rent_MatrixOfDifferentDimensionsReturned_AllocatesNewMatrix()
+        {
+            var matrixPool = new MatrixPool();
+            Matrix<double> matrix1 = matrixPool.Rent(5, 3);
+            matrixPool.Return(matrix1);
+            Matrix<double> matrix2 = matrixPool.Rent(5, 4);
+            Assert.NotSame(matrix1, matrix2);
+            Assert.Equal(2, matrixPool.NumAllocations);
+        }
+
+    }
+}
@@ -0,0 +1,127 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Linq;
+using Xunit;
+
+namespace Cmdty.Storage.Test
+{
+    public sealed class OptimalDecisionKernelTest
+    {
+        [Fact]
+        [Trait("Category", "Lsmc.OptimalDecisionKernel")]
+        public void CalcStorageValues_NumSimsNotMultipleOfVectorWidth_ResultsIdenticalToScalarCalculation()
+        {
+            const int numSims = 103;
+            const int numGridPoints = 4;
+            var random = new Random(12);
+            double[] simulatedPrices = Enumerable.Range(0, numSims).Select(i => 20.0 + random.NextDouble() * 10.0).ToArray();
+            double[] regressValues = Enumerable.Range(0, numSims * numGridPoints).Select(i => random.NextDouble() * 100.0).ToArray();
+            double[] actualValues = Enumerable.Range(0, numSims * numGridPoints).Select(i => random.NextDouble() * 100.0).ToArray();
+
+            double[] decisionVolumes = { -5.0, 0.0, 2.5, 5.0 };
+            double[] cmdtyUsedForDecisions = { 0.1, 0.0, 0.05, 0.1 };
+            double[] injectWithdrawCostNpvs = { 0.5, 0.0, 0.4, 0.8 };
+            int[] lowerGridOffsets = { 0, numSims, numSims, 2 * numSims };
+            int[] upperGridOffsets = { 0, 2 * numSims, 3 * numSims, 3 * numSims };
+            double[] lowerWeights = { 1.0, 0.3, 0.6, 0.25 };
+            double[] upperWeights = { 0.0, 0.7, 0.4, 0.75 };
+
+            var vectorisedResults = new double[numSims];
+            OptimalDecisionKernel.CalcStorageValues(simulatedPrices, 0.97, 1.2, decisionVolumes, cmdtyUsedForDecisions, injectWithdrawCostNpvs,
+                lowerGridOffsets, upperGridOffsets, lowerWeights, upperWeights, regressValues, actualValues, vectorisedResults);
+
+            var scalarResults = new double[numSims];
+            OptimalDecisionKernel.CalcStorageValuesScalar(0, numSims, simulatedPrices, 0.97, 1.2, decisionVolumes, cmdtyUsedForDecisions, 
+                injectWithdrawCostNpvs, lowerGridOffsets, upperGridOffsets, lowerWeights, upperWeights, regressValues, actualValues, scalarResults);
+
+            Assert.Equal(scalarResults, vectorisedResults);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.OptimalDecisionKernel")]
+        public void CalcStorageValues_DecisionNpvsTied_ChoosesFirstDecision()
+        {
+            const int numSims = 16;
+            double[] simulatedPrices = Enumerable.Repeat(0.0, numSims).ToArray();
+            // Regression continuation values equal for both decisions, actual continuation values differ
+            double[] regressValues = Enumerable.Repeat(10.0, 2 * numSims).ToArray();
+            double[] actualValues = Enumerable.Repeat(3.0, numSims).Concat(Enumerable.Repeat(7.0, numSims)).ToArray();
+
+            var results = new double[numSims];
+            OptimalDecisionKernel.CalcStorageValues(simulatedPrices, 1.0, 0.0, new[] { 0.0, 1.0 }, new[] { 0.0, 0.0 }, new[] { 0.0, 0.0 },
+                new[] { 0, numSims }, new[] { 0, numSims }, new[] { 1.0, 1.0 }, new[] { 0.0, 0.0 }, regressValues, actualValues, results);
+
+            Assert.All(results, result => Assert.Equal(3.0, result));
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.OptimalDecisionKernel")]
+        public void CalcOptimalDecisionIndices_NumSimsNotMultipleOfVectorWidth_ResultsIdenticalToScalarCalculation()
+        {
+            const int numSims = 103;
+            const int numGridPoints = 4;
+            var random = new Random(12);
+            double[] simulatedPrices = Enumerable.Range(0, numSims).Select(i => 20.0 + random.NextDouble() * 10.0).ToArray();
+            double[] regressValues = Enumerable.Range(0, numSims * numGridPoints).Select(i => random.NextDouble() * 100.0).ToArray();
+
+            double[] decisionVolumes = { -5.0, 0.0, 2.5, 5.0 };
+            double[] cmdtyUsedForDecisions = { 0.1, 0.0, 0.05, 0.1 };
+            double[] injectWithdrawCostNpvs = { 0.5, 0.0, 0.4, 0.8 };
+            int[] lowerGridOffsets = { 0, numSims, numSims, 2 * numSims };
+            int[] upperGridOffsets = { 0, 2 * numSims, 3 * numSims, 3 * numSims };
+            double[] lowerWeights = { 1.0, 0.3, 0.6, 0.25 };
+            double[] upperWeights = { 0.0, 0.7, 0.4, 0.75 };
+
+            var vectorisedResults = new int[numSims];
+            OptimalDecisionKernel.CalcOptimalDecisionIndices(simulatedPrices, 0.97, 1.2, decisionVolumes, cmdtyUsedForDecisions, 
+                injectWithdrawCostNpvs, lowerGridOffsets, upperGridOffsets, lowerWeights, upperWeights, regressValues, vectorisedResults);
+
+            var scalarResults = new int[numSims];
+            OptimalDecisionKernel.CalcOptimalDecisionIndicesScalar(0, numSims, simulatedPrices, 0.97, 1.2, decisionVolumes, cmdtyUsedForDecisions,
+                injectWithdrawCostNpvs, lowerGridOffsets, upperGridOffsets, lowerWeights, upperWeights, regressValues, scalarResults);
+
+            Assert.Equal(scalarResults, vectorisedResults);
+            Assert.True(vectorisedResults.Distinct().Count() > 1);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.OptimalDecisionKernel")]
+        public void CalcOptimalDecisionIndices_DecisionNpvsTied_ChoosesFirstDecision()
+        {
+            const int numSims = 16;
+            double[] simulatedPrices = Enumerable.Repeat(0.0, numSims).ToArray();
+            double[] regressValues = Enumerable.Repeat(10.0, 2 * numSims).ToArray();
+
+            var results = Enumerable.Repeat(-1, numSims).ToArray();
+            OptimalDecisionKernel.CalcOptimalDecisionIndices(simulatedPrices, 1.0, 0.0, new[] { 0.0, 1.0 }, new[] { 0.0, 0.0 }, new[] { 0.0, 0.0 },
+                new[] { 0, numSims }, new[] { 0, numSims }, new[] { 1.0, 1.0 }, new[] { 0.0, 0.0 }, regressValues, results);
+
+            Assert.All(results, result => Assert.Equal(0, result));
+        }
+
+    }
+}
@@ -0,0 +1,209 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Cmdty.Core.Simulation;
+using Cmdty.Core.Simulation.MultiFactor;
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+using MathNet.Numerics.Statistics;
+using Xunit;
+using TimeSeriesFactory = Cmdty.TimeSeries.TimeSeries;
+
+namespace Cmdty.Storage.Test
+{
+    public sealed class SobolMultiFactorSpotSimulatorTest
+    {
+        private const double MeanReversion = 2.5;
+        private const double SpotVol = 0.65;
+        private readonly DateTime _currentDate = new DateTime(2020, 1, 1);
+        private readonly Day[] _simulatedPeriods;
+        private readonly TimeSeries<Day, double> _forwardCurve;
+        private readonly Dictionary<Day, double> _spotVols;
+
+        public SobolMultiFactorSpotSimulatorTest()
+        {
+            var firstPeriod = new Day(2020, 1, 2);
+            var lastPeriod = new Day(2020, 1, 31);
+            _simulatedPeriods = firstPeriod.EnumerateTo(lastPeriod).ToArray();
+            _forwardCurve = TimeSeriesFactory.FromMap(firstPeriod, lastPeriod, day => 45.0 + 0.2 * day.OffsetFrom(firstPeriod));
+            _spotVols = _simulatedPeriods.ToDictionary(day => day, day => SpotVol);
+        }
+
+        private SobolMultiFactorSpotSimulator<Day> CreateOneFactorSimulator(int seed)
+        {
+            return new SobolMultiFactorSpotSimulator<Day>(new[] {MeanReversion}, new[] {_spotVols}, new[,] {{1.0}},
+                _currentDate, _forwardCurve, _simulatedPeriods, TimeFunctions.Act365, seed);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.QuasiRandom")]
+        public void Simulate_OneFactor_MarkovFactorVarianceApproximatelyEqualsOrnsteinUhlenbeckVariance()
+        {
+            const int numSims = 4096;
+            ISpotSimResults<Day> simResults = CreateOneFactorSimulator(5).Simulate(numSims);
+            Day lastPeriod = _simulatedPeriods.Last();
+            double[] lastFactorSims = simResults.MarkovFactorsForPeriod(lastPeriod, 0).ToArray();
+            double timeToLast = TimeFunctions.Act365(_currentDate, lastPeriod.Start);
+            double expectedVariance = (1.0 - Math.Exp(-2.0 * MeanReversion * timeToLast)) / (2.0 * MeanReversion);
+            double variance = lastFactorSims.Select(x => x * x).Average();
+            Assert.Equal(expectedVariance, variance, expectedVariance * 0.01);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.QuasiRandom")]
+        public void Simulate_CalledTwice_ContinuesSequence()
+        {
+            SobolMultiFactorSpotSimulator<Day> simulator = CreateOneFactorSimulator(5);
+            double[] firstSpotSims = simulator.Simulate(8).SpotPricesForStepIndex(0).ToArray();
+            double[] secondSpotSims = simulator.Simulate(8).SpotPricesForStepIndex(0).ToArray();
+            Assert.Empty(firstSpotSims.Intersect(secondSpotSims));
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.QuasiRandom")]
+        public void Simulate_AntitheticOddNumSimsCalledTwice_MarkovFactorsOfConsecutiveSimPairsNegated()
+        {
+            var simulator = new SobolMultiFactorSpotSimulator<Day>(new[] {MeanReversion}, new[] {_spotVols}, new[,] {{1.0}},
+                _currentDate, _forwardCurve, _simulatedPeriods, TimeFunctions.Act365, 5, true);
+            Day lastPeriod = _simulatedPeriods.Last();
+            double[] factorSims = simulator.Simulate(5).MarkovFactorsForPeriod(lastPeriod, 0).ToArray()
+                            .Concat(simulator.Simulate(3).MarkovFactorsForPeriod(lastPeriod, 0).ToArray()).ToArray();
+            for (int simIndex = 0; simIndex < factorSims.Length; simIndex += 2)
+                Assert.Equal(-factorSims[simIndex], factorSims[simIndex + 1], 12);
+        }
+
+        // Convergence benchmark: the mean over all periods and simulations of spot divided by forward price is
+        // estimated with independent replications. Scrambled Sobol with a quarter of the simulations should still
+        // have lower root mean square error than Mersenne Twister pseudo-random numbers.
+        [Fact]
+        [Trait("Category", "Lsmc.QuasiRandom")]
+        public void Simulate_QuarterNumSimsOfMersenneTwister_LowerRootMeanSquareErrorOfSpotPriceMean()
+        {
+            const int numReplications = 16;
+            const int sobolNumSims = 512;
+            const int mersenneTwisterNumSims = sobolNumSims * 4;
+
+            var multiFactorParams = MultiFactorParameters.For1Factor(MeanReversion,
+                TimeSeriesFactory.ForConstantData(_simulatedPeriods.First(), _simulatedPeriods.Last(), SpotVol));
+
+            double sobolSumSquaredErrors = 0.0;
+            double mersenneTwisterSumSquaredErrors = 0.0;
+            for (int replicationIndex = 0; replicationIndex < numReplications; replicationIndex++)
+            {
+                int seed = 100 + replicationIndex;
+                ISpotSimResults<Day> sobolSims = CreateOneFactorSimulator(seed).Simulate(sobolNumSims);
+                sobolSumSquaredErrors += Math.Pow(MeanSpotOverForward(sobolSims) - 1.0, 2);
+
+                var mersenneTwisterSimulator = new MultiFactorSpotPriceSimulator<Day>(multiFactorParams, _currentDate,
+                    _forwardCurve, _simulatedPeriods, TimeFunctions.Act365, new MersenneTwisterGenerator(seed, false));
+                ISpotSimResults<Day> mersenneTwisterSims = mersenneTwisterSimulator.Simulate(mersenneTwisterNumSims);
+                mersenneTwisterSumSquaredErrors += Math.Pow(MeanSpotOverForward(mersenneTwisterSims) - 1.0, 2);
+            }
+
+            double sobolRmse = Math.Sqrt(sobolSumSquaredErrors / numReplications);
+            double mersenneTwisterRmse = Math.Sqrt(mersenneTwisterSumSquaredErrors / numReplications);
+            Assert.True(sobolRmse < mersenneTwisterRmse, 
+                $"Sobol RMSE {sobolRmse} not less than Mersenne Twister RMSE {mersenneTwisterRmse}.");
+        }
+
+        // Standard error at a realistic daily horizon: a two-factor model simulated daily for two years, so there are over a
+        // thousand Sobol dimensions, one per day and factor. The estimated value is a strip of daily at-the-money calls on spot.
+        // Standard errors are the standard deviations over independent replications, with the same number of simulations.
+        [Fact]
+        [Trait("Category", "Lsmc.QuasiRandom")]
+        public void Simulate_TwoFactorsDailyForTwoYears_LowerStandardErrorOfDailyCallStripThanMersenneTwister()
+        {
+            const int numReplications = 16;
+            const int numSims = 1024;
+            const double longTermVol = 0.2;
+            const double spotMeanReversion = 12.5;
+            const double spotVol = 0.95;
+            const double factorCorrelation = 0.6;
+
+            var firstPeriod = new Day(2020, 1, 2);
+            var lastPeriod = new Day(2021, 12, 31);
+            Day[] simulatedPeriods = firstPeriod.EnumerateTo(lastPeriod).ToArray();
+            Assert.True(simulatedPeriods.Length * 2 <= SobolSequence.MaxDimensions);
+            TimeSeries<Day, double> forwardCurve = TimeSeriesFactory.FromMap(firstPeriod, lastPeriod,
+                day => 45.0 + 10.0 * Math.Sin(2.0 * Math.PI * day.OffsetFrom(firstPeriod) / 365.0));
+            Dictionary<Day, double> longTermVols = simulatedPeriods.ToDictionary(day => day, day => longTermVol);
+            Dictionary<Day, double> spotVols = simulatedPeriods.ToDictionary(day => day, day => spotVol);
+            var multiFactorParams = MultiFactorParameters.For2Factors(factorCorrelation,
+                new Factor<Day>(0.0, TimeSeriesFactory.ForConstantData(firstPeriod, lastPeriod, longTermVol)),
+                new Factor<Day>(spotMeanReversion, TimeSeriesFactory.ForConstantData(firstPeriod, lastPeriod, spotVol)));
+
+            var sobolEstimates = new double[numReplications];
+            var mersenneTwisterEstimates = new double[numReplications];
+            for (int replicationIndex = 0; replicationIndex < numReplications; replicationIndex++)
+            {
+                int seed = 200 + replicationIndex;
+                var sobolSimulator = new SobolMultiFactorSpotSimulator<Day>(new[] {0.0, spotMeanReversion}, new[] {longTermVols, spotVols},
+                    new[,] {{1.0, factorCorrelation}, {factorCorrelation, 1.0}}, _currentDate, forwardCurve, simulatedPeriods,
+                    TimeFunctions.Act365, seed);
+                sobolEstimates[replicationIndex] = MeanDailyCallPayoff(sobolSimulator.Simulate(numSims), simulatedPeriods, forwardCurve);
+
+                var mersenneTwisterSimulator = new MultiFactorSpotPriceSimulator<Day>(multiFactorParams, _currentDate,
+                    forwardCurve, simulatedPeriods, TimeFunctions.Act365, new MersenneTwisterGenerator(seed, false));
+                mersenneTwisterEstimates[replicationIndex] = MeanDailyCallPayoff(mersenneTwisterSimulator.Simulate(numSims), 
+                    simulatedPeriods, forwardCurve);
+            }
+
+            double sobolStandardError = sobolEstimates.StandardDeviation();
+            double mersenneTwisterStandardError = mersenneTwisterEstimates.StandardDeviation();
+            Assert.True(sobolStandardError < mersenneTwisterStandardError,
+                $"Sobol standard error {sobolStandardError} not less than Mersenne Twister standard error {mersenneTwisterStandardError}.");
+        }
+
+        private static double MeanDailyCallPayoff(ISpotSimResults<Day> spotSims, Day[] simulatedPeriods, TimeSeries<Day, double> forwardCurve)
+        {
+            double sum = 0.0;
+            foreach (Day period in simulatedPeriods)
+            {
+                double forwardPrice = forwardCurve[period];
+                ReadOnlySpan<double> spotPrices = spotSims.SpotPricesForPeriod(period).Span;
+                for (int i = 0; i < spotPrices.Length; i++)
+                    sum += Math.Max(spotPrices[i] - forwardPrice, 0.0);
+            }
+            return sum / (simulatedPeriods.Length * spotSims.NumSims);
+        }
+
+        private double MeanSpotOverForward(ISpotSimResults<Day> spotSims)
+        {
+            double sum = 0.0;
+            foreach (Day period in _simulatedPeriods)
+            {
+                double forwardPrice = _forwardCurve[period];
+                ReadOnlySpan<double> spotPrices = spotSims.SpotPricesForPeriod(period).Span;
+                for (int i = 0; i < spotPrices.Length; i++)
+                    sum += spotPrices[i] / forwardPrice;
+            }
+            return sum / (_simulatedPeriods.Length * spotSims.NumSims);
+        }
+
+    }
+}
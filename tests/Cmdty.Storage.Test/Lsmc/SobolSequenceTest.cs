@@ -0,0 +1,103 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using MathNet.Numerics.Random;
+using Xunit;
+
+namespace Cmdty.Storage.Test
+{
+    public sealed class SobolSequenceTest
+    {
+        [Fact]
+        [Trait("Category", "Lsmc.QuasiRandom")]
+        public void NextPoint_Unscrambled_FirstPointsEqualKnownSobolPoints()
+        {
+            var sobol = new SobolSequence(2, null);
+            var expectedFirstDim = new[] {0.0, 0.5, 0.75, 0.25};
+            var expectedSecondDim = new[] {0.0, 0.5, 0.25, 0.75};
+            const double halfLsb = 0.5 / 4294967296.0;
+            var point = new double[2];
+            for (int i = 0; i < expectedFirstDim.Length; i++)
+            {
+                sobol.NextPoint(point);
+                Assert.Equal(expectedFirstDim[i] + halfLsb, point[0], 15);
+                Assert.Equal(expectedSecondDim[i] + halfLsb, point[1], 15);
+            }
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.QuasiRandom")]
+        public void NextPoint_ScrambledAllDimensions_EachDimensionOfFirstPowerOfTwoPointsStratified()
+        {
+            const int log2NumPoints = 10;
+            const int numPoints = 1 << log2NumPoints;
+            int numDims = SobolSequence.MaxDimensions;
+            var sobol = new SobolSequence(numDims, new MersenneTwister(12));
+            // Points lie in (0, 1) so the stratum index is in range. Stratified if no stratum is hit twice.
+            var stratumHit = new bool[numDims, numPoints];
+            var point = new double[numDims];
+            for (int i = 0; i < numPoints; i++)
+            {
+                sobol.NextPoint(point);
+                for (int dimIndex = 0; dimIndex < numDims; dimIndex++)
+                {
+                    int stratumIndex = (int)(point[dimIndex] * numPoints);
+                    if (stratumHit[dimIndex, stratumIndex])
+                        Assert.True(false, $"Dimension {dimIndex + 1} not stratified over the first {numPoints} points.");
+                    stratumHit[dimIndex, stratumIndex] = true;
+                }
+            }
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.QuasiRandom")]
+        public void NextPoint_DifferentScrambleSeeds_DifferentPoints()
+        {
+            var sobol1 = new SobolSequence(3, new MersenneTwister(1));
+            var sobol2 = new SobolSequence(3, new MersenneTwister(2));
+            var point1 = new double[3];
+            var point2 = new double[3];
+            sobol1.NextPoint(point1);
+            sobol2.NextPoint(point2);
+            Assert.NotEqual(point1, point2);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.QuasiRandom")]
+        public void MaxDimensions_EqualsNumDimensionsOfJoeKuoDirectionNumbers()
+        {
+            Assert.Equal(21201, SobolSequence.MaxDimensions);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.QuasiRandom")]
+        public void Constructor_NumDimensionsGreaterThanMax_ThrowsArgumentOutOfRangeException()
+        {
+            Assert.Throws<ArgumentOutOfRangeException>(() => new SobolSequence(SobolSequence.MaxDimensions + 1, null));
+        }
+
+    }
+}
@@ -0,0 +1,210 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Cmdty.Core.Simulation;
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+using Xunit;
+using TimeSeriesFactory = Cmdty.TimeSeries.TimeSeries;
+
+namespace Cmdty.Storage.Test
+{
+    public sealed class StreamedMultiFactorSpotSimulatorTest
+    {
+        private const double MeanReversion = 2.5;
+        private const double SpotVol = 0.65;
+        private const int NumSims = 20_000;
+        private readonly DateTime _currentDate = new DateTime(2020, 1, 1);
+        private readonly Day[] _simulatedPeriods;
+        private readonly TimeSeries<Day, double> _forwardCurve;
+        private readonly Dictionary<Day, double> _spotVols;
+
+        public StreamedMultiFactorSpotSimulatorTest()
+        {
+            var firstPeriod = new Day(2020, 1, 2);
+            var lastPeriod = new Day(2020, 1, 31);
+            _simulatedPeriods = firstPeriod.EnumerateTo(lastPeriod).ToArray();
+            _forwardCurve = TimeSeriesFactory.FromMap(firstPeriod, lastPeriod, day => 45.0 + 0.2 * day.OffsetFrom(firstPeriod));
+            _spotVols = _simulatedPeriods.ToDictionary(day => day, day => SpotVol);
+        }
+
+        private StreamedMultiFactorSpotSimulator<Day> CreateOneFactorSimulator(bool antithetic = false)
+        {
+            return new StreamedMultiFactorSpotSimulator<Day>(new[] {MeanReversion}, new[] {_spotVols}, new[,] {{1.0}},
+                _currentDate, _forwardCurve, _simulatedPeriods, TimeFunctions.Act365, 5, antithetic);
+        }
+
+        private double OrnsteinUhlenbeckVariance(Day period)
+        {
+            double time = TimeFunctions.Act365(_currentDate, period.Start);
+            return (1.0 - Math.Exp(-2.0 * MeanReversion * time)) / (2.0 * MeanReversion);
+        }
+
+        private static double MeanOfProducts(ReadOnlyMemory<double> sims1, ReadOnlyMemory<double> sims2)
+        {
+            ReadOnlySpan<double> span1 = sims1.Span;
+            ReadOnlySpan<double> span2 = sims2.Span;
+            double sum = 0.0;
+            for (int i = 0; i < span1.Length; i++)
+                sum += span1[i] * span2[i];
+            return sum / span1.Length;
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Streamed")]
+        public void SimulateBackward_OneFactor_MarkovFactorCovariancesApproximatelyEqualOrnsteinUhlenbeckCovariances()
+        {
+            Day firstPeriod = _simulatedPeriods.First();
+            Day lastPeriod = _simulatedPeriods.Last();
+            ISpotSimResults<Day> simResults = CreateOneFactorSimulator().SimulateBackward(NumSims, _simulatedPeriods.Length);
+            ReadOnlyMemory<double> lastFactorSims = simResults.MarkovFactorsForPeriod(lastPeriod, 0);
+            ReadOnlyMemory<double> firstFactorSims = simResults.MarkovFactorsForPeriod(firstPeriod, 0);
+
+            double lastExpectedVariance = OrnsteinUhlenbeckVariance(lastPeriod);
+            Assert.Equal(lastExpectedVariance, MeanOfProducts(lastFactorSims, lastFactorSims), lastExpectedVariance * 0.05);
+            double firstExpectedVariance = OrnsteinUhlenbeckVariance(firstPeriod);
+            Assert.Equal(firstExpectedVariance, MeanOfProducts(firstFactorSims, firstFactorSims), firstExpectedVariance * 0.05);
+            double timeBetween = TimeFunctions.Act365(firstPeriod.Start, lastPeriod.Start);
+            double expectedCovariance = Math.Exp(-MeanReversion * timeBetween) * firstExpectedVariance;
+            double covarianceTolerance = 4.0 * Math.Sqrt(2.0 * firstExpectedVariance * lastExpectedVariance / NumSims); // About 4 standard errors
+            Assert.Equal(expectedCovariance, MeanOfProducts(firstFactorSims, lastFactorSims), covarianceTolerance);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Streamed")]
+        public void SimulateForward_OneFactor_MarkovFactorCovariancesApproximatelyEqualOrnsteinUhlenbeckCovariances()
+        {
+            Day firstPeriod = _simulatedPeriods.First();
+            Day lastPeriod = _simulatedPeriods.Last();
+            ISpotSimResults<Day> simResults = CreateOneFactorSimulator().SimulateForward(NumSims, _simulatedPeriods.Length);
+            ReadOnlyMemory<double> firstFactorSims = simResults.MarkovFactorsForPeriod(firstPeriod, 0);
+            ReadOnlyMemory<double> lastFactorSims = simResults.MarkovFactorsForPeriod(lastPeriod, 0);
+
+            double lastExpectedVariance = OrnsteinUhlenbeckVariance(lastPeriod);
+            Assert.Equal(lastExpectedVariance, MeanOfProducts(lastFactorSims, lastFactorSims), lastExpectedVariance * 0.05);
+            double firstExpectedVariance = OrnsteinUhlenbeckVariance(firstPeriod);
+            double timeBetween = TimeFunctions.Act365(firstPeriod.Start, lastPeriod.Start);
+            double expectedCovariance = Math.Exp(-MeanReversion * timeBetween) * firstExpectedVariance;
+            double covarianceTolerance = 4.0 * Math.Sqrt(2.0 * firstExpectedVariance * lastExpectedVariance / NumSims); // About 4 standard errors
+            Assert.Equal(expectedCovariance, MeanOfProducts(firstFactorSims, lastFactorSims), covarianceTolerance);
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Streamed")]
+        public void SimulateBackward_OneFactor_SpotPriceMeanApproximatelyEqualsForwardPrice()
+        {
+            ISpotSimResults<Day> simResults = CreateOneFactorSimulator().SimulateBackward(NumSims);
+            foreach (Day period in _simulatedPeriods.Reverse())
+            {
+                double forwardPrice = _forwardCurve[period];
+                double spotPriceMean = simResults.SpotPricesForPeriod(period).ToArray().Average();
+                Assert.Equal(forwardPrice, spotPriceMean, forwardPrice * 0.01);
+            }
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Streamed")]
+        public void SimulateBackward_PerfectlyCorrelatedFactorsWithSameMeanReversion_MarkovFactorsEqual()
+        {
+            var simulator = new StreamedMultiFactorSpotSimulator<Day>(new[] {MeanReversion, MeanReversion}, new[] {_spotVols, _spotVols}, 
+                new[,] {{1.0, 1.0}, {1.0, 1.0}}, _currentDate, _forwardCurve, _simulatedPeriods, TimeFunctions.Act365, 5);
+            ISpotSimResults<Day> simResults = simulator.SimulateBackward(100, 2);
+            foreach (Day period in _simulatedPeriods.Reverse())
+            {
+                double[] factor1Sims = simResults.MarkovFactorsForPeriod(period, 0).ToArray();
+                double[] factor2Sims = simResults.MarkovFactorsForPeriod(period, 1).ToArray();
+                for (int simIndex = 0; simIndex < factor1Sims.Length; simIndex++)
+                    Assert.Equal(factor1Sims[simIndex], factor2Sims[simIndex], 6);
+            }
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Streamed")]
+        public void SimulateBackward_Antithetic_MarkovFactorsOfConsecutiveSimPairsNegated()
+        {
+            ISpotSimResults<Day> simResults = CreateOneFactorSimulator(true).SimulateBackward(6);
+            foreach (Day period in _simulatedPeriods.Reverse())
+            {
+                double[] factorSims = simResults.MarkovFactorsForPeriod(period, 0).ToArray();
+                for (int simIndex = 0; simIndex < factorSims.Length; simIndex += 2)
+                    Assert.Equal(-factorSims[simIndex], factorSims[simIndex + 1], 12);
+            }
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Streamed")]
+        public void SimulateBackward_AccessPeriodNoLongerRetained_ThrowsInvalidOperationException()
+        {
+            ISpotSimResults<Day> simResults = CreateOneFactorSimulator().SimulateBackward(10, 2);
+            Day lastPeriod = _simulatedPeriods.Last();
+            simResults.SpotPricesForPeriod(lastPeriod.Offset(-1));
+            simResults.SpotPricesForPeriod(lastPeriod); // Still retained
+            simResults.SpotPricesForPeriod(lastPeriod.Offset(-2));
+            Assert.Throws<InvalidOperationException>(() => simResults.SpotPricesForPeriod(lastPeriod));
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Streamed")]
+        public void SimulateForward_AccessPeriodNoLongerRetained_ThrowsInvalidOperationException()
+        {
+            ISpotSimResults<Day> simResults = CreateOneFactorSimulator().SimulateForward(10);
+            Day firstPeriod = _simulatedPeriods.First();
+            simResults.MarkovFactorsForPeriod(firstPeriod, 0);
+            simResults.MarkovFactorsForPeriod(firstPeriod.Offset(1), 0);
+            Assert.Throws<InvalidOperationException>(() => simResults.MarkovFactorsForPeriod(firstPeriod, 0));
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Streamed")]
+        public void SimulateForward_OnePeriodRetained_SameSimulationsAsAllPeriodsRetained()
+        {
+            // Arrays of released periods are reused, which must not change the simulations of later periods
+            ISpotSimResults<Day> onePeriodRetained = CreateOneFactorSimulator().SimulateForward(10);
+            ISpotSimResults<Day> allPeriodsRetained = CreateOneFactorSimulator().SimulateForward(10, _simulatedPeriods.Length);
+            foreach (Day period in _simulatedPeriods)
+            {
+                Assert.Equal(allPeriodsRetained.MarkovFactorsForPeriod(period, 0).ToArray(), onePeriodRetained.MarkovFactorsForPeriod(period, 0).ToArray());
+                Assert.Equal(allPeriodsRetained.SpotPricesForPeriod(period).ToArray(), onePeriodRetained.SpotPricesForPeriod(period).ToArray());
+            }
+        }
+
+        [Fact]
+        [Trait("Category", "Lsmc.Streamed")]
+        public void SimulateBackward_OnePeriodRetained_SameSimulationsAsAllPeriodsRetained()
+        {
+            ISpotSimResults<Day> onePeriodRetained = CreateOneFactorSimulator().SimulateBackward(10);
+            ISpotSimResults<Day> allPeriodsRetained = CreateOneFactorSimulator().SimulateBackward(10, _simulatedPeriods.Length);
+            foreach (Day period in _simulatedPeriods.Reverse())
+            {
+                Assert.Equal(allPeriodsRetained.MarkovFactorsForPeriod(period, 0).ToArray(), onePeriodRetained.MarkovFactorsForPeriod(period, 0).ToArray());
+                Assert.Equal(allPeriodsRetained.SpotPricesForPeriod(period).ToArray(), onePeriodRetained.SpotPricesForPeriod(period).ToArray());
+            }
+        }
+
+    }
+}
@@ -0,0 +1,97 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System.Linq;
+using Cmdty.Core.Common;
+using Cmdty.Storage.PythonHelpers;
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+using Xunit;
+
+namespace Cmdty.Storage.Test
+{
+    public sealed class ExercisePolicyColumnsTest
+    {
+        private static LsmcExercisePolicy<Day> CreateExercisePolicy()
+        {
+            var gridsStart = new Day(2021, 4, 1);
+            var inventorySpaceGrids = new TimeSeries<Day, double[]>(gridsStart, new[]
+            {
+                new[] {10.0},
+                new[] {0.0, 50.0, 100.0},
+                new[] {0.0, 100.0}
+            });
+            var periodCoefficients = new Panel<int, double>(Enumerable.Range(0, 2), 2);
+            periodCoefficients[0][0] = 1.5;
+            periodCoefficients[0][1] = -2.5;
+            periodCoefficients[1][0] = 3.5;
+            periodCoefficients[1][1] = 4.5;
+            var regressionCoefficients = new TimeSeries<Day, Panel<int, double>>(gridsStart.Offset(1), new[] {periodCoefficients});
+            return new LsmcExercisePolicy<Day>(gridsStart, 10.0, 2, 50.0, inventorySpaceGrids, regressionCoefficients,
+                new[] {5.0, 6.0, 7.0});
+        }
+
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void FromExercisePolicy_FlattensGridsAndRegressionCoefficients()
+        {
+            ExercisePolicyColumns columns = ExercisePolicyColumns.FromExercisePolicy(CreateExercisePolicy());
+
+            Assert.Equal(new[] {1, 3, 2}, columns.GridLengths);
+            Assert.Equal(new[] {10.0, 0.0, 50.0, 100.0, 0.0, 100.0}, columns.GridPoints);
+            Assert.Equal(1, columns.RegressionPeriodOffset);
+            Assert.Equal(1, columns.NumRegressionPeriods);
+            Assert.Equal(new[] {1.5, -2.5, 3.5, 4.5}, columns.RegressionCoefficients);
+            Assert.Equal(new[] {5.0, 6.0, 7.0}, columns.CurrentPeriodContinuationValues);
+        }
+
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void ToExercisePolicy_FromColumns_EqualsOriginalExercisePolicy()
+        {
+            LsmcExercisePolicy<Day> exercisePolicy = CreateExercisePolicy();
+            ExercisePolicyColumns columns = ExercisePolicyColumns.FromExercisePolicy(exercisePolicy);
+
+            LsmcExercisePolicy<Day> fromColumns = ExercisePolicyColumns.ToExercisePolicy(exercisePolicy.CurrentPeriod,
+                exercisePolicy.Inventory, exercisePolicy.NumBasisFunctions, exercisePolicy.InventoryGridSpacing,
+                exercisePolicy.InventorySpaceGrids.Start, columns.GridLengths, columns.GridPoints, columns.RegressionPeriodOffset,
+                columns.NumRegressionPeriods, columns.RegressionCoefficients, columns.CurrentPeriodContinuationValues);
+
+            Assert.Equal(exercisePolicy.CurrentPeriod, fromColumns.CurrentPeriod);
+            Assert.Equal(exercisePolicy.Inventory, fromColumns.Inventory);
+            Assert.Equal(exercisePolicy.NumBasisFunctions, fromColumns.NumBasisFunctions);
+            Assert.Equal(exercisePolicy.InventoryGridSpacing, fromColumns.InventoryGridSpacing);
+            Assert.Equal(exercisePolicy.InventorySpaceGrids.Indices, fromColumns.InventorySpaceGrids.Indices);
+            Assert.Equal(exercisePolicy.InventorySpaceGrids.Data, fromColumns.InventorySpaceGrids.Data);
+            Assert.Equal(exercisePolicy.RegressionCoefficients.Indices, fromColumns.RegressionCoefficients.Indices);
+            Panel<int, double> coefficients = exercisePolicy.RegressionCoefficients.Data[0];
+            Panel<int, double> coefficientsFromColumns = fromColumns.RegressionCoefficients.Data[0];
+            for (int i = 0; i < coefficients.NumRows; i++)
+                Assert.Equal(coefficients[i].ToArray(), coefficientsFromColumns[i].ToArray());
+            Assert.Equal(exercisePolicy.CurrentPeriodContinuationValues, fromColumns.CurrentPeriodContinuationValues);
+        }
+
+    }
+}
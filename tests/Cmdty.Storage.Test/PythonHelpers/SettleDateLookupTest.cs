@@ -0,0 +1,68 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using Cmdty.Storage.PythonHelpers;
+using Cmdty.TimePeriodValueTypes;
+using Xunit;
+
+namespace Cmdty.Storage.Test
+{
+    public sealed class SettleDateLookupTest
+    {
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void SettleDate_PeriodInTable_ReturnsTableValue()
+        {
+            var referenceDay = new Day(1970, 1, 1);
+            var settleDays = new[] {new Day(2021, 2, 20), new Day(2021, 3, 20)};
+            var settleDayOffsets = new[] {settleDays[0].OffsetFrom(referenceDay), settleDays[1].OffsetFrom(referenceDay)};
+            var lookup = new SettleDateLookup<Month>(new Month(2021, 1), referenceDay, settleDayOffsets);
+
+            Assert.Equal(new Day(2021, 2, 20), lookup.SettleDate(new Month(2021, 1)));
+            Assert.Equal(new Day(2021, 3, 20), lookup.SettleDateRule(new Month(2021, 2)));
+        }
+
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void SettleDate_PeriodOutsideTable_CallsFallbackRule()
+        {
+            var lookup = new SettleDateLookup<Month>(new Month(2021, 1), new Day(1970, 1, 1), new[] {18678},
+                month => month.First<Day>());
+
+            Assert.Equal(new Day(2020, 12, 1), lookup.SettleDate(new Month(2020, 12)));
+            Assert.Equal(new Day(2021, 2, 1), lookup.SettleDate(new Month(2021, 2)));
+        }
+
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void SettleDate_PeriodOutsideTableNoFallback_ThrowsArgumentException()
+        {
+            var lookup = new SettleDateLookup<Month>(new Month(2021, 1), new Day(1970, 1, 1), new[] {18678});
+            Assert.Throws<ArgumentException>(() => lookup.SettleDate(new Month(2021, 2)));
+        }
+
+    }
+}
@@ -0,0 +1,56 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using Cmdty.Storage.PythonHelpers;
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+using Xunit;
+
+namespace Cmdty.Storage.Test
+{
+    public sealed class StorageProfileColumnsTest
+    {
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void FromProfile_ColumnsEqualProfileProperties()
+        {
+            var storageProfile = new TimeSeries<Day, StorageProfile>(new Day(2021, 4, 1), new []
+            {
+                new StorageProfile(0.0, 100.0, 1.5, 0.0, -255.5),
+                new StorageProfile(100.0, -50.0, 0.5, 1.0, 130.25)
+            });
+
+            StorageProfileColumns columns = StorageProfileColumns.FromProfile(storageProfile);
+
+            Assert.Equal(new[] {0.0, 100.0}, columns.Inventory);
+            Assert.Equal(new[] {100.0, -50.0}, columns.InjectWithdrawVolume);
+            Assert.Equal(new[] {1.5, 0.5}, columns.CmdtyConsumed);
+            Assert.Equal(new[] {0.0, 1.0}, columns.InventoryLoss);
+            Assert.Equal(new[] {-101.5, 49.5}, columns.NetVolume);
+            Assert.Equal(new[] {-255.5, 130.25}, columns.PeriodPv);
+        }
+
+    }
+}
@@ -0,0 +1,88 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using System;
+using Cmdty.Storage.PythonHelpers;
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+using Xunit;
+
+namespace Cmdty.Storage.Test
+{
+    public sealed class TimeSeriesHelperTest
+    {
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void ContiguousPeriods_ReturnsPeriodsOffsetFromStart()
+        {
+            var start = new Day(2021, 12, 30);
+            Day[] periods = TimeSeriesHelper.ContiguousPeriods(start, 4);
+
+            var expectedPeriods = new[] {new Day(2021, 12, 30), new Day(2021, 12, 31), 
+                                            new Day(2022, 1, 1), new Day(2022, 1, 2)};
+            Assert.Equal(expectedPeriods, periods);
+        }
+
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void ContiguousPeriods_CountZero_ReturnsEmptyArray()
+        {
+            Day[] periods = TimeSeriesHelper.ContiguousPeriods(new Day(2021, 12, 30), 0);
+            Assert.Empty(periods);
+        }
+
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void ContiguousPeriods_NegativeCount_ThrowsArgumentException()
+        {
+            Assert.Throws<ArgumentException>(() => TimeSeriesHelper.ContiguousPeriods(new Day(2021, 12, 30), -1));
+        }
+
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void IsContiguous_ContiguousPeriods_ReturnsTrue()
+        {
+            var periods = new[] {new Month(2021, 11), new Month(2021, 12), new Month(2022, 1)};
+            Assert.True(TimeSeriesHelper.IsContiguous(periods));
+        }
+
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void IsContiguous_PeriodsWithGap_ReturnsFalse()
+        {
+            var periods = new[] {new Month(2021, 11), new Month(2022, 1)};
+            Assert.False(TimeSeriesHelper.IsContiguous(periods));
+        }
+
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void DataToArray_ReturnsTimeSeriesData()
+        {
+            var timeSeries = new TimeSeries<Day, double>(new Day(2021, 12, 30), new[] {1.5, 2.5, 3.5});
+            Assert.Equal(new[] {1.5, 2.5, 3.5}, TimeSeriesHelper.DataToArray(timeSeries));
+        }
+
+    }
+}
@@ -0,0 +1,73 @@
+﻿#region License
+// Copyright (c) 2024 Jake Fowler
+//
+// Permission is hereby granted, free of charge, to any person 
+// obtaining a copy of this software and associated documentation 
+// files (the "Software"), to deal in the Software without 
+// restriction, including without limitation the rights to use, 
+// copy, modify, merge, publish, distribute, sublicense, and/or sell 
+// copies of the Software, and to permit persons to whom the 
+// Software is furnished to do so, subject to the following 
+// conditions:
+//
+// The above copyright notice and this permission notice shall be 
+// included in all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, 
+// EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES 
+// OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND 
+// NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT 
+// HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, 
+// WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING 
+// FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR 
+// OTHER DEALINGS IN THE SOFTWARE.
+#endregion
+
+using Cmdty.Storage.PythonHelpers;
+using Cmdty.TimePeriodValueTypes;
+using Cmdty.TimeSeries;
+using Xunit;
+
+namespace Cmdty.Storage.Test
+{
+    public sealed class TriggerPriceColumnsTest
+    {
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void FromTriggerPrices_MissingValuesAreNaN()
+        {
+            var triggerPrices = new TimeSeries<Day, TriggerPrices>(new Day(2021, 4, 1), new[]
+            {
+                new TriggerPrices(100.0, 25.5, null, null),
+                new TriggerPrices(null, null, -200.0, 40.25)
+            });
+
+            TriggerPriceColumns columns = TriggerPriceColumns.FromTriggerPrices(triggerPrices);
+
+            Assert.Equal(new[] {100.0, double.NaN}, columns.MaxInjectVolume);
+            Assert.Equal(new[] {25.5, double.NaN}, columns.MaxInjectTriggerPrice);
+            Assert.Equal(new[] {double.NaN, -200.0}, columns.MaxWithdrawVolume);
+            Assert.Equal(new[] {double.NaN, 40.25}, columns.MaxWithdrawTriggerPrice);
+        }
+
+        [Fact]
+        [Trait("Category", "PythonHelpers")]
+        public void FromProfiles_FlattensInjectThenWithdrawPointsForEachPeriod()
+        {
+            var triggerProfiles = new TimeSeries<Day, TriggerPriceVolumeProfiles>(new Day(2021, 4, 1), new[]
+            {
+                new TriggerPriceVolumeProfiles(new[] {new TriggerPricePoint(50.0, 20.0), new TriggerPricePoint(100.0, 19.5)},
+                    new[] {new TriggerPricePoint(-100.0, 31.0)}),
+                new TriggerPriceVolumeProfiles(new TriggerPricePoint[0], new[] {new TriggerPricePoint(-50.0, 30.5)})
+            });
+
+            TriggerPriceProfileColumns columns = TriggerPriceProfileColumns.FromProfiles(triggerProfiles);
+
+            Assert.Equal(new[] {0, 0, 0, 1}, columns.PeriodOffset);
+            Assert.Equal(new[] {true, true, false, false}, columns.IsInject);
+            Assert.Equal(new[] {50.0, 100.0, -100.0, -50.0}, columns.Volume);
+            Assert.Equal(new[] {20.0, 19.5, 31.0, 30.5}, columns.Price);
+        }
+
+    }
+}